@@ -4,6 +4,12 @@ set -e
 echo "Waiting for dependencies..."
 sleep 2
 
+if [ -n "$PROMETHEUS_MULTIPROC_DIR" ]; then
+    echo "Resetting Prometheus multiprocess directory..."
+    rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+    mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+fi
+
 echo "Running database migrations..."
 python manage.py migrate --noinput
 
@@ -21,5 +27,18 @@ else:
     print('Superuser already exists')
 END
 
+# Historique des métriques du dashboard : un échantillon par intervalle
+# (DASHBOARD_SNAPSHOT_INTERVAL secondes, 0 pour désactiver)
+SNAPSHOT_INTERVAL="${DASHBOARD_SNAPSHOT_INTERVAL:-3600}"
+if [ "$SNAPSHOT_INTERVAL" -gt 0 ]; then
+    echo "Scheduling dashboard metric snapshots every ${SNAPSHOT_INTERVAL}s..."
+    (
+        while true; do
+            python manage.py snapshot_dashboard_metrics --prune || true
+            sleep "$SNAPSHOT_INTERVAL"
+        done
+    ) &
+fi
+
 echo "Starting server..."
 exec "$@"
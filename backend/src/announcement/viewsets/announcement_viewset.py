@@ -13,9 +13,13 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
-from django.db.models import Q, Count
+from django.db.models import Q
 from django.utils import timezone
 
+from backend.cache import cached_response
+from backend.conditional import ConditionalRequestMixin
+from backend.fieldsets import SparseFieldsetMixin
+from backend.statistics import StatisticsBuilder
 from announcement.models import Announcement
 from announcement.serializers.announcement_serializer import (
     AnnouncementSerializer,
@@ -66,7 +70,7 @@ class IsHRManagerOrAdmin(permissions.BasePermission):
         return False
 
 
-class AnnouncementViewSet(viewsets.ModelViewSet):
+class AnnouncementViewSet(ConditionalRequestMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet pour les annonces.
     
@@ -99,6 +103,11 @@ class AnnouncementViewSet(viewsets.ModelViewSet):
             return AnnouncementListSerializer
         return AnnouncementSerializer
 
+    @cached_response("announcement", "department", "employee")
+    def list(self, request, *args, **kwargs):
+        """Liste des annonces (mise en cache par utilisateur, invalidée par signaux)."""
+        return super().list(request, *args, **kwargs)
+
     def get_queryset(self):
         """
         Optimise et filtre le queryset selon l'utilisateur.
@@ -145,6 +154,7 @@ class AnnouncementViewSet(viewsets.ModelViewSet):
             serializer.save()
 
     @action(detail=False, methods=["get"], url_path="published")
+    @cached_response("announcement", "department", "employee")
     def published(self, request):
         """
         Action personnalisée : Récupérer uniquement les annonces publiées.
@@ -161,6 +171,7 @@ class AnnouncementViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
     @action(detail=False, methods=["get"], url_path="my-announcements")
+    @cached_response("announcement", "department", "employee")
     def my_announcements(self, request):
         """
         Action personnalisée : Récupérer les annonces créées par l'utilisateur connecté.
@@ -184,6 +195,7 @@ class AnnouncementViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
     @action(detail=False, methods=["get"], url_path="visible-to-me")
+    @cached_response("announcement", "department", "employee")
     def visible_to_me(self, request):
         """
         Action personnalisée : Récupérer les annonces visibles pour l'utilisateur connecté.
@@ -221,10 +233,15 @@ class AnnouncementViewSet(viewsets.ModelViewSet):
         GET /api/announcement/announcements/{id}/departments/
         """
         announcement = self.get_object()
-        departments = announcement.departments.all()
+        departments = announcement.departments.select_related("manager").with_counts()
         
         from department.serializers.department_serializer import DepartmentListSerializer
         
+        page = self.paginate_queryset(departments)
+        if page is not None:
+            serializer = DepartmentListSerializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
         serializer = DepartmentListSerializer(departments, many=True)
         return Response(serializer.data)
 
@@ -255,27 +272,27 @@ class AnnouncementViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
     @action(detail=False, methods=["get"], url_path="statistics")
+    @cached_response("announcement", "department", "employee")
     def statistics(self, request):
         """
         Action personnalisée : Statistiques globales sur les annonces.
         GET /api/announcement/announcements/statistics/
         """
-        queryset = self.get_queryset()
-        
-        stats = {
-            "total": queryset.count(),
-            "published": queryset.filter(published=True).count(),
-            "unpublished": queryset.filter(published=False).count(),
-            "visible_to_all": queryset.filter(visible_to_all=True).count(),
-            "by_department": queryset.filter(visible_to_all=False).count(),
-            "this_month": queryset.filter(
-                published_date__month=timezone.now().month,
-                published_date__year=timezone.now().year,
-            ).count(),
-            "by_author": queryset.values("author__first_name", "author__last_name")
-            .annotate(count=Count("id"))
-            .order_by("-count")[:10],
-        }
+        now = timezone.now()
+        stats = (
+            StatisticsBuilder(self.get_queryset())
+            .count("total")
+            .count("published", Q(published=True))
+            .count("unpublished", Q(published=False))
+            .count("visible_to_all", Q(visible_to_all=True))
+            .count("by_department", Q(visible_to_all=False))
+            .count(
+                "this_month",
+                Q(published_date__month=now.month, published_date__year=now.year),
+            )
+            .group_by("by_author", "author__first_name", "author__last_name", limit=10)
+            .build()
+        )
         
         return Response(stats)
 
@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+
+
+class BackendConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'backend'
+
+    def ready(self):
+        """Initialisation de l'application."""
+        import backend.signals  # noqa
+        # Branche l'instrumentation SQL sur chaque connexion ouverte ensuite
+        import backend.instrumentation  # noqa
@@ -3,6 +3,12 @@ ASGI config for backend project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Point d'entrée de production : gunicorn avec des workers uvicorn
+(`gunicorn backend.asgi:application -c gunicorn.conf.py`, voir
+gunicorn.conf.py). Le flux d'événements temps réel (/api/events/,
+Server-Sent Events) garde ses connexions ouvertes et les vues asynchrones
+(`backend.async_api`) n'y sont servies sans bloquer de thread qu'en ASGI.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
 """
@@ -0,0 +1,50 @@
+"""
+Vues DRF asynchrones.
+
+DRF n'exécute que des vues synchrones. `AsyncAPIView` garde son
+fonctionnement (authentification, permissions, limitation de débit,
+négociation du rendu, gestion des exceptions) mais ses méthodes HTTP sont
+des coroutines : servie en ASGI, une vue qui attend la base ne bloque pas
+de thread, et ses requêtes indépendantes peuvent s'exécuter en parallèle
+(`backend.concurrency.gather`).
+
+Les étapes de DRF qui peuvent toucher la base (authentification JWT,
+permissions, limitation de débit) s'exécutent dans le thread de la requête.
+
+Exemple :
+    class OverviewView(AsyncAPIView):
+        permission_classes = [IsAuthenticated]
+
+        async def get(self, request):
+            metrics, activities = await concurrency.gather(read_metrics, read_activities)
+            return Response({...})
+"""
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from rest_framework.views import APIView
+
+
+class AsyncAPIView(APIView):
+    """`APIView` dont les méthodes HTTP (`get`, `post`, ...) sont asynchrones."""
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+            response = handler(request, *args, **kwargs)
+            if iscoroutinefunction(handler):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
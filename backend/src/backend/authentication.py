@@ -0,0 +1,110 @@
+"""
+Authentification JWT avec cache de l'utilisateur.
+
+`JWTAuthentication` de simplejwt relit `CustomUser` en base à chaque requête.
+`CachedJWTAuthentication` conserve les colonnes de l'utilisateur (rôle,
+`is_staff`, `is_active`, `employee_id`, etc. ; jamais le mot de passe) dans
+le cache Django (`AUTH_CACHE_ALIAS`) pendant `AUTH_CACHE_TIMEOUT` secondes
+et reconstruit l'instance sans requête. Le mot de passe reste un champ
+différé : `check_password()` le relit en base, et `save()` ne l'écrase pas.
+
+L'entrée d'un utilisateur est supprimée (`invalidate_users`, appelé par
+`users.signals`) à chaque sauvegarde ou suppression de l'utilisateur — donc
+à sa désactivation — et de l'employé qui lui est lié. Le TTL borne le délai
+de prise en compte d'une écriture qui contourne les signaux (`update()`).
+
+Le principal résolu est aussi mémorisé sur la requête : une seconde
+authentification de la même requête (vue imbriquée, `_authenticate` des
+événements) ne relit ni le cache ni la base.
+
+Sans cache (`AUTH_CACHE_ENABLED = False`) ou si `CHECK_REVOKE_TOKEN` est
+actif (il compare le hachage du mot de passe), le comportement est celui de
+simplejwt.
+"""
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import router, transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+_PRINCIPAL_KEY = "auth-principal:{}"
+# Champs jamais mis en cache (chargés à la demande)
+EXCLUDED_FIELDS = ("password",)
+
+
+def get_cache():
+    """Instance de cache utilisée pour les utilisateurs authentifiés."""
+    return caches[getattr(settings, "AUTH_CACHE_ALIAS", "default")]
+
+
+def is_enabled():
+    return getattr(settings, "AUTH_CACHE_ENABLED", True)
+
+
+def invalidate_users(*user_ids):
+    """Supprime les utilisateurs du cache, maintenant et au commit."""
+    keys = [_PRINCIPAL_KEY.format(user_id) for user_id in user_ids]
+    if not keys or not is_enabled():
+        return
+    get_cache().delete_many(keys)
+    # Une requête concurrente peut avoir remis en cache l'ancienne ligne
+    # avant le commit : nouvelle suppression une fois les données visibles.
+    transaction.on_commit(lambda: get_cache().delete_many(keys))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """`JWTAuthentication` dont l'utilisateur est lu dans le cache."""
+
+    def authenticate(self, request):
+        http_request = getattr(request, "_request", request)
+        header = self.get_header(request)
+        memo = getattr(http_request, "_jwt_principal", None)
+        if memo is not None and memo[0] == header:
+            return memo[1]
+        result = super().authenticate(request)
+        http_request._jwt_principal = (header, result)
+        return result
+
+    def _cached_fields(self):
+        return [
+            field.attname
+            for field in self.user_model._meta.concrete_fields
+            if field.attname not in EXCLUDED_FIELDS
+        ]
+
+    def get_user(self, validated_token):
+        if not is_enabled() or api_settings.CHECK_REVOKE_TOKEN:
+            return super().get_user(validated_token)
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            ) from e
+
+        cache = get_cache()
+        key = _PRINCIPAL_KEY.format(user_id)
+        fields = self._cached_fields()
+        values = cache.get(key)
+        # Entrée écrite avant un changement de schéma : ignorée
+        if values is None or list(values) != fields:
+            row = (
+                self.user_model.objects.filter(**{api_settings.USER_ID_FIELD: user_id})
+                .values_list(*fields)
+                .first()
+            )
+            if row is None:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found")
+            values = dict(zip(fields, row))
+            cache.set(key, values, getattr(settings, "AUTH_CACHE_TIMEOUT", 60))
+
+        user = self.user_model.from_db(
+            router.db_for_read(self.user_model), fields, list(values.values())
+        )
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user
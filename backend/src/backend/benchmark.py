@@ -0,0 +1,331 @@
+"""
+Banc d'essai des endpoints de l'API.
+
+Parcourt toutes les routes enregistrées sous `api/` (routeurs des apps, y
+compris les `@action`, et vues DRF isolées), les appelle en GET sous
+plusieurs rôles et mesure pour chaque couple (route, rôle) :
+- la latence p50 / p95 (ms),
+- le nombre de requêtes SQL,
+- la taille de la réponse (octets).
+
+Les résultats sont comparés à des budgets de requêtes SQL par route et par
+rôle (`query_budgets.json`) : un dépassement signale un N+1 réintroduit.
+Seules les routes GET sont mesurées : les écritures modifieraient le jeu de
+données d'une itération à l'autre.
+
+Voir la commande `benchmark_endpoints`.
+"""
+
+import json
+import logging
+import re
+import statistics
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, get_resolver
+from rest_framework.routers import APIRootView
+from rest_framework_simplejwt.tokens import AccessToken
+
+from department.models import Department
+from employee.models import Employee
+from users.models import CustomUser
+
+BUDGETS_PATH = Path(__file__).resolve().parent / "query_budgets.json"
+
+DEFAULT_ROLES = ("admin", "hr_manager", "manager", "employee")
+
+# Paramètres d'URL : groupes nommés des routeurs ou convertisseurs de path()
+_GROUP = re.compile(r"\(\?P<(\w+)>[^)]*\)|<(?:\w+:)?(\w+)>")
+
+
+@dataclass
+class Route:
+    """Route GET de l'API à mesurer."""
+
+    name: str
+    pattern: str
+    view: type
+    model: type = None
+
+    @property
+    def kwargs(self):
+        return [regex or converter for regex, converter in _GROUP.findall(self.pattern)]
+
+    def build_path(self, values):
+        """Chemin concret de la route avec les paramètres donnés."""
+        path = _GROUP.sub(
+            lambda match: str(values[match.group(1) or match.group(2)]), self.pattern
+        )
+        return "/" + path.replace("^", "").replace("$", "")
+
+
+@dataclass
+class Measure:
+    """Mesures d'une route pour un rôle."""
+
+    route: str
+    role: str
+    path: str
+    status: int
+    queries: int
+    p50_ms: float
+    p95_ms: float
+    size: int
+    budget: int = None
+    skipped: str = None
+
+    @property
+    def over_budget(self):
+        return self.budget is not None and self.queries > self.budget
+
+
+@dataclass
+class Report:
+    """Résultat d'un passage du banc d'essai."""
+
+    measures: list = field(default_factory=list)
+
+    @property
+    def regressions(self):
+        return [m for m in self.measures if m.skipped is None and m.over_budget]
+
+    @property
+    def errors(self):
+        return [m for m in self.measures if m.skipped is None and m.status >= 500]
+
+    @property
+    def unbudgeted(self):
+        return [m for m in self.measures if m.skipped is None and m.budget is None]
+
+    def budgets(self):
+        """Budgets `{route: {rôle: requêtes}}` correspondant aux mesures."""
+        budgets = {}
+        for measure in self.measures:
+            if measure.skipped is None:
+                budgets.setdefault(measure.route, {})[measure.role] = measure.queries
+        return budgets
+
+    def as_dict(self):
+        return {
+            "database": connection.vendor,
+            "measures": [asdict(measure) for measure in self.measures],
+        }
+
+
+def _walk(patterns, prefix=""):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from _walk(pattern.url_patterns, prefix + str(pattern.pattern))
+        elif isinstance(pattern, URLPattern):
+            yield prefix + str(pattern.pattern), pattern
+
+
+def _view_model(view):
+    """Modèle d'un viewset (queryset de classe ou modèle du sérialiseur)."""
+    queryset = getattr(view, "queryset", None)
+    if queryset is not None:
+        return queryset.model
+    meta = getattr(getattr(view, "serializer_class", None), "Meta", None)
+    return getattr(meta, "model", None)
+
+
+def discover_routes(prefix="api/"):
+    """
+    Routes GET de l'API exposées par des vues DRF.
+
+    Les variantes à suffixe de format (`.json`), les racines des routeurs
+    et les vues Django simples (flux SSE) sont ignorées.
+    """
+    routes = []
+    for pattern, url in _walk(get_resolver().url_patterns):
+        view = getattr(url.callback, "cls", None)
+        if not pattern.startswith(prefix) or view is None or not url.name:
+            continue
+        if "<format>" in pattern or issubclass(view, APIRootView):
+            continue
+        actions = getattr(url.callback, "actions", None)
+        if actions is not None:
+            if "get" not in actions:
+                continue
+            model = _view_model(view)
+        elif hasattr(view, "get"):
+            model = None
+        else:
+            continue
+        routes.append(Route(name=url.name, pattern=pattern, view=view, model=model))
+    return routes
+
+
+def resolve_kwargs(route):
+    """
+    Valeurs des paramètres d'URL d'une route, prises dans les données.
+
+    `pk` (ou `<modèle>_id`) est la clé d'une ligne du modèle de la vue ; un
+    autre paramètre
+    (`department_id`, `module`, ...) reçoit la première valeur non nulle du
+    champ du même nom. Retourne None si un paramètre est introuvable.
+    """
+    values = {}
+    for name in route.kwargs:
+        if route.model is None:
+            return None
+        manager = route.model._base_manager.order_by("pk")
+        if name in ("pk", f"{route.model._meta.model_name}_id"):
+            value = manager.values_list("pk", flat=True).first()
+        else:
+            field_names = {f.attname for f in route.model._meta.concrete_fields}
+            if name not in field_names:
+                return None
+            value = (
+                manager.exclude(**{f"{name}__isnull": True})
+                .values_list(name, flat=True)
+                .first()
+            )
+        if value is None:
+            return None
+        values[name] = value
+    return values
+
+
+def _employee_for(role, exclude):
+    """Employé représentatif d'un rôle (manager : responsable de département)."""
+    if role == "manager":
+        manager = (
+            Department.objects.filter(manager__isnull=False)
+            .exclude(manager__in=exclude)
+            .order_by("pk")
+            .values_list("manager", flat=True)
+            .first()
+        )
+        if manager is not None:
+            return Employee.objects.get(pk=manager)
+    return (
+        Employee.objects.filter(manager__isnull=False)
+        .exclude(pk__in=exclude)
+        .order_by("pk")
+        .first()
+    )
+
+
+def create_role_users(roles):
+    """Crée un utilisateur de banc d'essai par rôle, rattaché à un employé."""
+    users = {}
+    used = []
+    for role in roles:
+        employee = _employee_for(role, used)
+        if employee is not None:
+            used.append(employee.pk)
+            # Le lien employé / utilisateur est unique
+            CustomUser.objects.filter(employee=employee).update(employee=None)
+        users[role], _ = CustomUser.objects.update_or_create(
+            username=f"benchmark-{role}",
+            defaults={
+                "email": f"benchmark-{role}@benchmark.local",
+                "role": role,
+                "is_staff": role == "admin",
+                "is_superuser": role == "admin",
+                "employee": employee,
+            },
+        )
+    return users
+
+
+def _percentile(values, ratio):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * ratio))]
+
+
+def measure(client, path, token, iterations):
+    """Appelle `path` : une requête de chauffe puis `iterations` mesurées."""
+    headers = {"HTTP_AUTHORIZATION": f"Bearer {token}"}
+    client.get(path, **headers)
+    timings = []
+    for _ in range(iterations):
+        with CaptureQueriesContext(connection) as captured:
+            start = time.perf_counter()
+            response = client.get(path, **headers)
+            timings.append((time.perf_counter() - start) * 1000)
+    content = b"" if response.streaming else response.content
+    return response.status_code, len(captured), timings, len(content)
+
+
+def load_budgets(path=BUDGETS_PATH):
+    """Budgets de requêtes `{route: {rôle: requêtes}}` (vide si absent)."""
+    path = Path(path)
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())
+
+
+def save_budgets(budgets, path=BUDGETS_PATH):
+    Path(path).write_text(json.dumps(budgets, indent=2, sort_keys=True) + "\n")
+
+
+def run(roles=DEFAULT_ROLES, iterations=10, budgets=None, only=None, stdout=None):
+    """
+    Mesure toutes les routes GET pour chaque rôle.
+
+    `only` restreint aux routes dont le nom contient une des chaînes
+    données. Le cache des réponses est désactivé et le cache vidé avant
+    chaque route (historique de limitation de débit compris) : les mesures
+    portent sur le calcul complet des réponses.
+    """
+    # Les réponses 4xx attendues (rôle non autorisé) ne sont pas journalisées
+    request_logger = logging.getLogger("django.request")
+    level = request_logger.level
+    request_logger.setLevel(logging.ERROR)
+    try:
+        return _run(roles, iterations, budgets, only, stdout)
+    finally:
+        request_logger.setLevel(level)
+
+
+def _run(roles, iterations, budgets, only, stdout):
+    budgets = load_budgets() if budgets is None else budgets
+    users = create_role_users(roles)
+    tokens = {role: str(AccessToken.for_user(user)) for role, user in users.items()}
+    client = Client(raise_request_exception=False)
+    cache = caches[getattr(settings, "RESPONSE_CACHE_ALIAS", "default")]
+    report = Report()
+
+    for route in discover_routes():
+        if only and not any(part in route.name for part in only):
+            continue
+        values = resolve_kwargs(route)
+        for role in roles:
+            if values is None:
+                report.measures.append(Measure(
+                    route=route.name, role=role, path=route.pattern, status=0,
+                    queries=0, p50_ms=0, p95_ms=0, size=0,
+                    skipped="aucune donnée pour les paramètres d'URL",
+                ))
+                continue
+            path = route.build_path(values)
+            cache.clear()
+            status, queries, timings, size = measure(client, path, tokens[role], iterations)
+            result = Measure(
+                route=route.name,
+                role=role,
+                path=path,
+                status=status,
+                queries=queries,
+                p50_ms=round(statistics.median(timings), 2),
+                p95_ms=round(_percentile(timings, 0.95), 2),
+                size=size,
+                budget=budgets.get(route.name, {}).get(role),
+            )
+            report.measures.append(result)
+            if stdout is not None:
+                stdout.write(
+                    f"{route.name:<45} {role:<11} {status:>4} {queries:>4}"
+                    f"{'/' + str(result.budget) if result.budget is not None else '':<5}"
+                    f" {result.p50_ms:>8.1f} {result.p95_ms:>8.1f} {size:>9}"
+                )
+    return report
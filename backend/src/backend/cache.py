@@ -0,0 +1,182 @@
+"""
+Cache des réponses de l'API en lecture.
+
+Les réponses sont stockées dans le cache Django (`RESPONSE_CACHE_ALIAS`) sous
+une clé qui combine :
+- la vue (module + nom de la méthode),
+- la portée : utilisateur (`user`), rôle (`role`) ou globale (`global`),
+- la version de chaque espace de noms dont dépend la réponse,
+- l'URL complète de la requête (hôte, chemin, paramètres).
+
+L'invalidation se fait par incrément de version : `backend.signals` appelle
+`invalidate_on_commit()` à chaque `post_save` / `post_delete` /
+`m2m_changed` sur les modèles d'un espace de noms, ce qui rend orphelines
+toutes les entrées calculées avec l'ancienne version (elles expirent ensuite
+par TTL). Les écritures qui contournent les signaux (`QuerySet.update()`,
+`bulk_create()`...) appellent elles-mêmes `invalidate_on_commit()`.
+
+Avec plusieurs processus, utiliser un cache partagé (Redis ou fichiers) :
+le cache mémoire local n'est pas partagé entre workers.
+"""
+
+import hashlib
+import time
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.http import HttpRequest
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from backend import metrics
+
+SCOPE_USER = "user"
+SCOPE_ROLE = "role"
+SCOPE_GLOBAL = "global"
+
+_VERSION_KEY = "cache-ns:{}"
+
+
+def get_cache():
+    """Instance de cache utilisée pour les réponses."""
+    return caches[getattr(settings, "RESPONSE_CACHE_ALIAS", "default")]
+
+
+def _initial_version():
+    # Une version initiale horodatée évite de réutiliser une version déjà
+    # employée si la clé de version a été évincée du cache.
+    return int(time.time() * 1000)
+
+
+def get_versions(namespaces):
+    """Versions courantes des espaces de noms (initialisées si absentes)."""
+    cache = get_cache()
+    keys = [_VERSION_KEY.format(namespace) for namespace in namespaces]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, _initial_version(), timeout=None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def invalidate(*namespaces):
+    """Invalide toutes les réponses dépendant des espaces de noms donnés."""
+    cache = get_cache()
+    for namespace in namespaces:
+        key = _VERSION_KEY.format(namespace)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, _initial_version(), timeout=None)
+
+
+def invalidate_on_commit(*namespaces):
+    """
+    `invalidate()` immédiat, puis de nouveau au commit de la transaction en
+    cours : une réponse calculée entre-temps par une autre requête (donc sur
+    les anciennes données) est aussi écartée. À appeler après une écriture
+    qui ne déclenche pas les signaux (`QuerySet.update()`, `bulk_create()`).
+    """
+    invalidate(*namespaces)
+    transaction.on_commit(lambda: invalidate(*namespaces))
+
+
+def _scope_part(request, scope):
+    user = request.user
+    if scope == SCOPE_GLOBAL:
+        return "all"
+    if scope == SCOPE_ROLE:
+        return f"r-{getattr(user, 'role', '')}-{int(user.is_staff)}-{int(user.is_superuser)}"
+    return f"u-{user.pk}"
+
+
+def build_key(request, prefix, namespaces, scope=SCOPE_USER):
+    """Construit la clé de cache d'une requête."""
+    versions = ".".join(str(version) for version in get_versions(namespaces))
+    digest = hashlib.md5(
+        request.build_absolute_uri().encode("utf-8"), usedforsecurity=False
+    ).hexdigest()
+    return f"resp:{prefix}:{_scope_part(request, scope)}:{versions}:{digest}"
+
+
+def cached_response(*namespaces, scope=SCOPE_USER, timeout=None):
+    """
+    Met en cache la réponse d'une vue DRF (méthode de ViewSet, `@api_view`
+    ou méthode asynchrone d'une `AsyncAPIView`).
+
+    Seules les requêtes GET/HEAD authentifiées aboutissant à un 200 sont
+    mises en cache. Les permissions et la limitation de débit restent
+    évaluées à chaque requête (elles s'exécutent avant la méthode).
+
+    Exemple :
+        @action(detail=False, methods=["get"])
+        @cached_response("employee", "department", scope=SCOPE_ROLE)
+        def statistics(self, request): ...
+    """
+
+    def decorator(func):
+        prefix = f"{func.__module__}.{func.__qualname__}"
+
+        def lookup(args):
+            """Retourne `(clé, réponse en cache)` ; clé None si non cacheable."""
+            request = next(
+                arg for arg in args if isinstance(arg, (Request, HttpRequest))
+            )
+            if (
+                not getattr(settings, "RESPONSE_CACHE_ENABLED", True)
+                or request.method not in ("GET", "HEAD")
+                or not request.user.is_authenticated
+            ):
+                return None, None
+
+            key = build_key(request, prefix, namespaces, scope)
+            data = get_cache().get(key)
+            if data is None:
+                metrics.count(metrics.CACHE_REQUESTS, "miss")
+                return key, None
+            metrics.count(metrics.CACHE_REQUESTS, "hit")
+            response = Response(data)
+            response["X-Cache"] = "HIT"
+            return key, response
+
+        def store(key, response):
+            if response.status_code == 200 and isinstance(response, Response):
+                get_cache().set(
+                    key,
+                    response.data,
+                    timeout
+                    if timeout is not None
+                    else getattr(settings, "RESPONSE_CACHE_TIMEOUT", 300),
+                )
+                response["X-Cache"] = "MISS"
+            return response
+
+        if iscoroutinefunction(func):
+
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                key, cached = await sync_to_async(lookup)(args)
+                if cached is not None:
+                    return cached
+                response = await func(*args, **kwargs)
+                if key is None:
+                    return response
+                return await sync_to_async(store)(key, response)
+
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key, cached = lookup(args)
+            if cached is not None:
+                return cached
+            response = func(*args, **kwargs)
+            return response if key is None else store(key, response)
+
+        return wrapper
+
+    return decorator
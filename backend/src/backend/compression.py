@@ -0,0 +1,163 @@
+"""
+Compression des réponses négociée sur `Accept-Encoding` (brotli, gzip).
+
+`CompressionMiddleware` remplace `GZipMiddleware` de Django :
+- l'encodage accepté avec le plus fort poids `q` est retenu (`q=0` le
+  refuse, `*` vaut pour les encodages non cités) ; à poids égal, brotli
+  (`br`, si le paquet `brotli` est installé) passe avant gzip (avec la
+  protection BREACH de Django) ;
+- seuls les types textuels (JSON, texte, CSV, JavaScript, XML) au-delà de
+  `COMPRESSION_MIN_SIZE` octets sont compressés : en deçà, le gain ne
+  couvre pas le coût ;
+- les réponses en flux sont compressées au fil de l'eau, sauf les flux
+  d'événements (`text/event-stream`) qui doivent partir sans tampon ;
+- un `ETag` fort devient faible (`W/`), le contenu envoyé n'étant plus
+  identique octet pour octet ; `Vary: Accept-Encoding` est ajouté.
+
+Réglages : `COMPRESSION_ENABLED`, `COMPRESSION_MIN_SIZE` (défaut 1024),
+`COMPRESSION_BROTLI_QUALITY` (défaut 5, de 0 à 11 : au-delà, le temps de
+compression domine pour des réponses dynamiques).
+"""
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.text import compress_sequence, compress_string
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - dépendance recommandée
+    brotli = None
+
+# Octets aléatoires ajoutés à l'en-tête gzip (protection BREACH, comme
+# GZipMiddleware)
+MAX_RANDOM_BYTES = 100
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "application/x-ndjson",
+    "text/",
+)
+
+
+def _weights(accept_encoding):
+    """Poids `q` par encodage d'un en-tête `Accept-Encoding`."""
+    weights = {}
+    for item in accept_encoding.split(","):
+        coding, *params = item.split(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        weight = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[coding] = weight
+    return weights
+
+
+def choose_encoding(accept_encoding):
+    """Encodage retenu pour un en-tête `Accept-Encoding`, None sinon."""
+    weights = _weights(accept_encoding)
+    default = weights.get("*", 0.0)
+    # Ordre de préférence du serveur, départage à poids égal
+    candidates = ("br", "gzip") if brotli is not None else ("gzip",)
+    best, best_weight = None, 0.0
+    for coding in candidates:
+        weight = weights.get(coding, default)
+        if weight > best_weight:
+            best, best_weight = coding, weight
+    return best
+
+
+def brotli_quality():
+    """Niveau de compression brotli (`COMPRESSION_BROTLI_QUALITY`)."""
+    return getattr(settings, "COMPRESSION_BROTLI_QUALITY", 5)
+
+
+def _brotli_sequence(sequence):
+    # flush() après chaque bloc : le client reçoit les données au fil de l'eau
+    compressor = brotli.Compressor(quality=brotli_quality())
+    for item in sequence:
+        data = compressor.process(item) + compressor.flush()
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+async def _brotli_async_sequence(sequence):
+    compressor = brotli.Compressor(quality=brotli_quality())
+    async for item in sequence:
+        data = compressor.process(item) + compressor.flush()
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+def _gzip_sequence(sequence):
+    return compress_sequence(sequence, max_random_bytes=MAX_RANDOM_BYTES)
+
+
+async def _gzip_async_sequence(sequence):
+    # Comme GZipMiddleware : un membre gzip par bloc
+    async for item in sequence:
+        yield compress_string(item, max_random_bytes=MAX_RANDOM_BYTES)
+
+
+def _is_compressible(response):
+    content_type = response.get("Content-Type", "")
+    if content_type.startswith("text/event-stream"):
+        return False
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """Compresse les réponses textuelles selon `Accept-Encoding`."""
+
+    def process_response(self, request, response):
+        if not getattr(settings, "COMPRESSION_ENABLED", True):
+            return response
+        if response.has_header("Content-Encoding") or not _is_compressible(response):
+            return response
+        if not response.streaming and len(response.content) < getattr(
+            settings, "COMPRESSION_MIN_SIZE", 1024
+        ):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = choose_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                sequence = (
+                    _brotli_async_sequence if encoding == "br" else _gzip_async_sequence
+                )
+            else:
+                sequence = _brotli_sequence if encoding == "br" else _gzip_sequence
+            response.streaming_content = sequence(response.streaming_content)
+            del response.headers["Content-Length"]
+        else:
+            if encoding == "br":
+                compressed = brotli.compress(response.content, quality=brotli_quality())
+            else:
+                compressed = compress_string(
+                    response.content, max_random_bytes=MAX_RANDOM_BYTES
+                )
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers["Content-Length"] = str(len(response.content))
+
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = encoding
+        return response
@@ -0,0 +1,119 @@
+"""
+Exécution concurrente de requêtes ORM indépendantes.
+
+Une vue agrégée (dashboard, statistiques) enchaîne plusieurs requêtes qui
+ne dépendent pas les unes des autres : leur durée s'additionne alors
+qu'elles peuvent s'exécuter en même temps, chacune sur sa propre connexion.
+
+- `gather(*fonctions)` (vues asynchrones) et `run_concurrently(*fonctions)`
+  (code synchrone) exécutent des fonctions synchrones dans un pool de
+  threads borné (`ASYNC_QUERY_WORKERS`) et retournent leurs résultats dans
+  l'ordre,
+- `run(fonction)` exécute une seule fonction depuis une vue asynchrone, dans
+  le thread de la requête.
+
+Chaque thread du pool a sa propre connexion à la base. Les threads du pool
+sont durables : leurs connexions sont réutilisées pendant
+`ASYNC_QUERY_CONN_MAX_AGE` secondes, quel que soit `CONN_MAX_AGE` (nul par
+défaut, les threads des requêtes ASGI n'étant pas réutilisés). Les
+requêtes SQL restent comptées par l'instrumentation (`backend.instrumentation`).
+
+Repli séquentiel : `ASYNC_QUERY_CONCURRENCY=False`, une seule fonction, ou
+appel depuis une transaction ouverte (`transaction.atomic`, tests) dont les
+autres connexions ne verraient pas les écritures.
+"""
+
+import asyncio
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections, connections
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, "ASYNC_QUERY_WORKERS", 8),
+                    thread_name_prefix="queries",
+                )
+    return _executor
+
+
+def _in_transaction():
+    return any(
+        connection.in_atomic_block for connection in connections.all(initialized_only=True)
+    )
+
+
+def _sequential(functions):
+    return (
+        len(functions) < 2
+        or not getattr(settings, "ASYNC_QUERY_CONCURRENCY", True)
+        or _in_transaction()
+    )
+
+
+def _keep_alive():
+    """Durée de vie `ASYNC_QUERY_CONN_MAX_AGE` des connexions ouvertes par le thread."""
+    max_age = getattr(settings, "ASYNC_QUERY_CONN_MAX_AGE", 0)
+    for connection in connections.all(initialized_only=True):
+        if connection.connection is None:
+            continue
+        # Connexion (re)ouverte depuis le dernier appel : échéance recalculée
+        if getattr(connection, "_pool_connection", None) is not connection.connection:
+            connection._pool_connection = connection.connection
+            connection.close_at = None if max_age is None else time.monotonic() + max_age
+
+
+def _call(function):
+    """Exécute `function` dans un thread du pool, connexions comprises."""
+    close_old_connections()
+    try:
+        return function()
+    finally:
+        _keep_alive()
+        close_old_connections()
+
+
+def _submit(function):
+    # Le contexte (enregistreur de l'instrumentation, ...) suit la fonction
+    context = contextvars.copy_context()
+    return _get_executor().submit(context.run, _call, function)
+
+
+def run_concurrently(*functions):
+    """Exécute des fonctions synchrones en parallèle et retourne leurs résultats."""
+    if _sequential(functions):
+        return [function() for function in functions]
+    futures = [_submit(function) for function in functions]
+    return [future.result() for future in futures]
+
+
+def _run_if_sequential(functions):
+    if _sequential(functions):
+        return True, [function() for function in functions]
+    return False, None
+
+
+async def gather(*functions):
+    """Équivalent asynchrone de `run_concurrently`, sans bloquer la boucle."""
+    done, results = await sync_to_async(_run_if_sequential)(functions)
+    if done:
+        return results
+    futures = [asyncio.wrap_future(_submit(function)) for function in functions]
+    return list(await asyncio.gather(*futures))
+
+
+async def run(function, *args, **kwargs):
+    """Exécute une fonction synchrone (ORM) depuis une vue asynchrone."""
+    return await sync_to_async(function)(*args, **kwargs)
@@ -0,0 +1,206 @@
+"""
+Requêtes conditionnelles (`ETag`) sur les ViewSets.
+
+Liste : l'ETag combine `MAX(updated_at)` et `COUNT(*)` du queryset filtré,
+l'URL complète (filtres, curseur, champs), l'utilisateur et les versions des
+espaces de noms du cache (`backend.cache`) dont dépend la représentation ;
+une modification d'un objet lié (nom du département d'un employé) change
+donc aussi l'ETag. Détail : l'ETag vaut `"<ligne>.<contexte>"`, où `<ligne>`
+ne dépend que de la clé primaire et du `updated_at` de la ligne.
+
+Un `If-None-Match` satisfait renvoie `304 Not Modified` sans sérialiser,
+pour le coût d'une requête d'agrégation (liste) ou d'une lecture de
+`updated_at` par clé primaire (détail).
+
+Pas de `Last-Modified` : `MAX(updated_at)` ne bouge ni après une
+suppression ni après la modification d'un objet lié, et un
+`If-Modified-Since` renverrait alors une `304` périmée. Seul l'ETag, qui
+intègre `COUNT(*)` et les versions du cache, sert de validateur.
+
+En écriture (PUT/PATCH), `If-Match` ne compare que la partie `<ligne>` de
+l'ETag de détail : une version périmée renvoie `412 Precondition Failed`
+(verrouillage optimiste), sans qu'une modification d'un autre objet ne
+provoque de faux conflit.
+
+Désactivé pour un ViewSet dont le modèle n'a pas de `updated_at`, dont un
+espace de noms n'est pas suivi par `RESPONSE_CACHE_NAMESPACES` (messagerie,
+connexion : leurs changements n'incrémentent aucune version) ou qui définit
+`conditional_requests = False`.
+"""
+
+import hashlib
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+
+from backend.cache import get_versions
+
+
+class PreconditionFailed(APIException):
+    status_code = status.HTTP_412_PRECONDITION_FAILED
+    default_detail = "La ressource a été modifiée depuis sa dernière lecture."
+    default_code = "precondition_failed"
+
+
+class NotModified(Exception):
+    """Interrompt le traitement : la représentation du client est à jour."""
+
+
+def _digest(*parts):
+    value = "|".join(str(part) for part in parts)
+    return hashlib.md5(value.encode("utf-8"), usedforsecurity=False).hexdigest()[:20]
+
+
+def default_namespaces(model):
+    """Labels d'app du modèle et de tous les modèles qui lui sont liés."""
+    labels = {model._meta.app_label}
+    for field in model._meta.get_fields():
+        if field.is_relation and field.related_model is not None:
+            labels.add(field.related_model._meta.app_label)
+    return sorted(labels)
+
+
+def check_conditions(request, etag):
+    """Lève `NotModified` ou `PreconditionFailed` selon les en-têtes conditionnels."""
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        return
+    if response.status_code == status.HTTP_304_NOT_MODIFIED:
+        raise NotModified()
+    raise PreconditionFailed()
+
+
+class ConditionalRequestMixin:
+    """
+    Mixin de ViewSet : `ETag` sur `list` et `retrieve`, `304` avant
+    sérialisation, `If-Match` sur `update` / `partial_update`.
+    """
+
+    conditional_requests = True
+    # Espaces de noms dont dépend la représentation (défaut : apps liées)
+    etag_namespaces = None
+
+    def _conditional_model(self):
+        return self.get_queryset().model
+
+    def _conditional_namespaces(self):
+        if self.etag_namespaces is not None:
+            return list(self.etag_namespaces)
+        return default_namespaces(self._conditional_model())
+
+    def _conditional_enabled(self):
+        if not self.conditional_requests:
+            return False
+        try:
+            self._conditional_model()._meta.get_field("updated_at")
+        except FieldDoesNotExist:
+            return False
+        tracked = set(getattr(settings, "RESPONSE_CACHE_NAMESPACES", ()))
+        return tracked.issuperset(self._conditional_namespaces())
+
+    def _context_token(self, request):
+        """Empreinte de tout ce qui, hors lignes, influence la représentation."""
+        return _digest(
+            f"{type(self).__module__}.{type(self).__qualname__}",
+            self.action,
+            request.build_absolute_uri(),
+            request.user.pk,
+            *get_versions(self._conditional_namespaces()),
+        )
+
+    def _row_version(self):
+        """`updated_at` de l'objet désigné par l'URL, None s'il est hors de portée."""
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        return (
+            self.filter_queryset(self.get_queryset())
+            .filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+            .values_list("updated_at", flat=True)
+            .first()
+        )
+
+    def _row_token(self, updated_at):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        return _digest(
+            self._conditional_model()._meta.label,
+            self.kwargs[lookup_url_kwarg],
+            updated_at.isoformat(),
+        )
+
+    def _list_etag(self, request):
+        stats = (
+            self.filter_queryset(self.get_queryset())
+            .order_by()
+            .aggregate(last=Max("updated_at"), count=Count("pk"))
+        )
+        etag = _digest(self._context_token(request), stats["last"], stats["count"])
+        return f'"{etag}"'
+
+    def _detail_etag(self, request, updated_at):
+        return f'"{self._row_token(updated_at)}.{self._context_token(request)}"'
+
+    def _check_if_match(self, request):
+        etags = parse_etags(request.META["HTTP_IF_MATCH"])
+        if "*" in etags:
+            return
+        updated_at = self._row_version()
+        if updated_at is None:
+            # Objet absent : la vue renverra elle-même une 404
+            return
+        row = self._row_token(updated_at)
+        # Un ETag affaibli par la compression (W/"...") reste valable
+        if not any(
+            etag.removeprefix("W/").strip('"').split(".")[0] == row for etag in etags
+        ):
+            raise PreconditionFailed()
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self._etag = None
+        if not self._conditional_enabled():
+            return
+
+        if request.method in SAFE_METHODS and self.action == "list":
+            self._etag = self._list_etag(request)
+        elif request.method in SAFE_METHODS and self.action == "retrieve":
+            updated_at = self._row_version()
+            if updated_at is not None:
+                self._etag = self._detail_etag(request, updated_at)
+        elif self.action in ("update", "partial_update"):
+            if "HTTP_IF_MATCH" in request.META:
+                self._check_if_match(request)
+            return
+
+        if self._etag is not None:
+            check_conditions(request, self._etag)
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return Response(status=status.HTTP_304_NOT_MODIFIED)
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        etag = getattr(self, "_etag", None)
+        if (
+            etag is None
+            and response.status_code == status.HTTP_200_OK
+            and getattr(self, "action", None) in ("update", "partial_update")
+            and self._conditional_enabled()
+        ):
+            # Nouvel ETag pour enchaîner une autre écriture avec If-Match
+            updated_at = self._row_version()
+            if updated_at is not None:
+                etag = self._detail_etag(request, updated_at)
+
+        if etag is not None and response.status_code in (
+            status.HTTP_200_OK,
+            status.HTTP_304_NOT_MODIFIED,
+        ):
+            response["ETag"] = etag
+        return super().finalize_response(request, response, *args, **kwargs)
@@ -0,0 +1,214 @@
+"""
+Bus d'événements temps réel (publication / abonnement).
+
+Les signaux publient des événements (`publish`) sur des canaux :
+- `user:<id>` : événements destinés à un utilisateur,
+- `staff` : événements destinés aux admins / RH (activités du dashboard).
+
+Les connexions SSE (`backend.views.event_stream`) s'abonnent aux canaux de
+l'utilisateur connecté et reçoivent les événements au fil de l'eau, ce qui
+évite aux clients d'interroger périodiquement l'API.
+
+Le courtier (`EVENTS_BROKER`) est interchangeable :
+- `backend.events.LocalBroker` (défaut) : en mémoire, limité au processus,
+- `backend.events.RedisBroker` : Redis pub/sub, partagé entre workers
+  (nécessite le paquet `redis` et `EVENTS_REDIS_URL`).
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+STAFF_CHANNEL = "staff"
+
+
+def user_channel(user_id):
+    """Canal personnel d'un utilisateur."""
+    return f"user:{user_id}"
+
+
+def channels_for(user):
+    """Canaux auxquels un utilisateur connecté est abonné."""
+    channels = [user_channel(user.pk)]
+    if user.is_staff or getattr(user, "role", None) in ("admin", "hr_manager"):
+        channels.append(STAFF_CHANNEL)
+    return channels
+
+
+class Subscription:
+    """
+    Abonnement d'une connexion à un ensemble de canaux.
+
+    Les messages sont remis depuis n'importe quel thread vers la boucle
+    asyncio de la connexion. Si le client ne consomme pas assez vite, les
+    messages les plus anciens sont abandonnés (file bornée).
+    """
+
+    def __init__(self, broker, channels, maxsize=100):
+        self.broker = broker
+        self.channels = tuple(channels)
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=maxsize)
+
+    def deliver(self, message):
+        """Remet un message (appelable depuis n'importe quel thread)."""
+        self._loop.call_soon_threadsafe(self._put, message)
+
+    def _put(self, message):
+        if self._queue.full():
+            self._queue.get_nowait()
+        self._queue.put_nowait(message)
+
+    async def get(self, timeout=None):
+        """Prochain message, ou None si rien n'arrive avant `timeout` secondes."""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        """Se désabonne de tous les canaux."""
+        self.broker.unsubscribe(self)
+
+
+class LocalBroker:
+    """Courtier en mémoire : les abonnés doivent être dans le même processus."""
+
+    def __init__(self):
+        self._subscribers = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def subscribe(self, channels):
+        """Crée un abonnement (à appeler depuis la boucle asyncio de la connexion)."""
+        subscription = Subscription(self, channels)
+        with self._lock:
+            for channel in subscription.channels:
+                self._subscribers[channel].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            for channel in subscription.channels:
+                subscribers = self._subscribers.get(channel)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._subscribers[channel]
+
+    def publish(self, channel, message):
+        """Diffuse un message (chaîne JSON) aux abonnés locaux du canal."""
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for subscription in subscribers:
+            subscription.deliver(message)
+
+
+class RedisBroker(LocalBroker):
+    """
+    Courtier Redis pub/sub, partagé entre processus.
+
+    Chaque processus publie sur Redis et entretient une seule connexion
+    d'écoute (thread dédié, démarré au premier abonnement) qui redistribue
+    les messages à ses abonnés locaux.
+    """
+
+    def __init__(self):
+        super().__init__()
+        try:
+            import redis
+        except ImportError as exc:
+            raise ImproperlyConfigured(
+                "RedisBroker nécessite le paquet `redis` (pip install redis)."
+            ) from exc
+        url = getattr(settings, "EVENTS_REDIS_URL", "redis://127.0.0.1:6379/0")
+        self._prefix = getattr(settings, "EVENTS_REDIS_PREFIX", "quantech:events:")
+        self._client = redis.Redis.from_url(url)
+        self._listener = None
+        self._listener_lock = threading.Lock()
+
+    def subscribe(self, channels):
+        self._ensure_listener()
+        return super().subscribe(channels)
+
+    def publish(self, channel, message):
+        self._client.publish(f"{self._prefix}{channel}", message)
+
+    def _ensure_listener(self):
+        with self._listener_lock:
+            if self._listener is None or not self._listener.is_alive():
+                self._listener = threading.Thread(
+                    target=self._listen, name="events-redis-listener", daemon=True
+                )
+                self._listener.start()
+
+    def _listen(self):
+        while True:
+            try:
+                pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+                pubsub.psubscribe(f"{self._prefix}*")
+                for item in pubsub.listen():
+                    channel = item["channel"].decode()[len(self._prefix):]
+                    super().publish(channel, item["data"].decode())
+            except Exception:
+                logger.exception("Écoute Redis interrompue, reconnexion")
+                time.sleep(1)
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """Courtier configuré (`EVENTS_BROKER`), instancié une fois par processus."""
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                path = getattr(settings, "EVENTS_BROKER", "backend.events.LocalBroker")
+                _broker = import_string(path)()
+    return _broker
+
+
+def encode(event_type, data):
+    """Sérialise un événement en JSON."""
+    return json.dumps(
+        {"id": str(time.time_ns()), "type": event_type, "data": data},
+        cls=DjangoJSONEncoder,
+    )
+
+
+def _deliver(channels, message):
+    try:
+        broker = get_broker()
+        for channel in channels:
+            broker.publish(channel, message)
+    except Exception:
+        # La diffusion ne doit jamais faire échouer l'écriture d'origine
+        logger.exception("Échec de publication d'un événement")
+
+
+def publish(event_type, data, users=(), channels=()):
+    """
+    Publie un événement aux utilisateurs et canaux donnés.
+
+    La diffusion a lieu après le commit de la transaction courante : un
+    événement n'est jamais reçu pour une écriture annulée.
+    """
+    if not getattr(settings, "EVENTS_ENABLED", True):
+        return
+    targets = [user_channel(user_id) for user_id in users] + list(channels)
+    if not targets:
+        return
+    message = encode(event_type, data)
+    transaction.on_commit(lambda: _deliver(targets, message))
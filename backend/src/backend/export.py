@@ -0,0 +1,261 @@
+"""
+Exports en flux (CSV, JSON Lines, XLSX) des listes de l'API.
+
+`ExportMixin` ajoute à un ViewSet l'action
+`GET /<ressource>/export/<format>/` (`csv`, `jsonl` ou `xlsx`). Les lignes
+sont lues par `values()` sur les colonnes de `export_fields` (pas
+d'instance de modèle, pas de serializer ni de `SerializerMethodField`) et
+par blocs de `chunk_size` avec `iterator()`, puis encodées et envoyées au
+fil de l'eau dans une `StreamingHttpResponse` : la mémoire reste bornée par
+la taille d'un bloc, quel que soit le nombre de lignes. En ASGI, le flux
+est lu bloc par bloc par un itérateur asynchrone (`aiter_chunks`) : Django
+lirait sinon un flux synchrone d'une traite avant de l'envoyer.
+
+Le queryset est celui de `get_queryset()` passé par `filter_queryset()` :
+un export contient exactement les lignes que la liste montrerait à
+l'utilisateur (même périmètre, mêmes filtres, recherche et tri).
+`?fields=a,b` limite l'export à une partie de `export_fields`.
+
+Exemple :
+    class CandidateViewSet(..., ExportMixin, viewsets.ModelViewSet):
+        export_fields = ["id", "first_name", "email", "position__title"]
+
+Le XLSX est écrit directement (feuille unique, cellules texte ou nombre)
+dans une archive ZIP produite au fil de l'eau, sans dépendance externe.
+"""
+
+import csv
+import datetime
+import io
+import re
+import zipfile
+from decimal import Decimal
+from itertools import islice
+from xml.sax.saxutils import escape
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.text import slugify
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+
+from backend.fieldsets import FIELDS_PARAM, _names
+from backend.renderers import dumps
+
+CHUNK_SIZE = 2000
+
+CONTENT_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "jsonl": "application/x-ndjson",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+def _cell(value):
+    """Valeur texte d'une cellule CSV ou XLSX."""
+    if value is None:
+        return ""
+    if isinstance(value, datetime.datetime):
+        if timezone.is_aware(value):
+            value = timezone.localtime(value)
+        return value.isoformat(sep=" ", timespec="seconds")
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    return str(value)
+
+
+def _chunks(rows, size):
+    while chunk := list(islice(rows, size)):
+        yield chunk
+
+
+def iter_csv(header, rows, chunk_size=CHUNK_SIZE):
+    """Encode les lignes (tuples) en CSV UTF-8, un bloc d'octets par bloc de lignes."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    # BOM : accents lisibles à l'ouverture dans un tableur
+    yield ("\ufeff" + buffer.getvalue()).encode("utf-8")
+    for chunk in _chunks(rows, chunk_size):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([_cell(value) for value in row] for row in chunk)
+        yield buffer.getvalue().encode("utf-8")
+
+
+def _json_value(value):
+    # Décimaux en chaîne, comme `DecimalField` dans l'API (pas d'arrondi)
+    return str(value) if isinstance(value, Decimal) else value
+
+
+def iter_jsonl(header, rows, chunk_size=CHUNK_SIZE):
+    """Encode les lignes en JSON Lines (un objet par ligne)."""
+    for chunk in _chunks(rows, chunk_size):
+        yield b"".join(
+            dumps({name: _json_value(value) for name, value in zip(header, row)}) + b"\n"
+            for row in chunk
+        )
+
+
+# Caractères interdits en XML 1.0
+_XML_INVALID = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+
+_XLSX_PARTS = {
+    "[Content_Types].xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        "</Types>"
+    ),
+    "_rels/.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+        "</Relationships>"
+    ),
+    "xl/workbook.xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="Export" sheetId="1" r:id="rId1"/></sheets>'
+        "</workbook>"
+    ),
+    "xl/_rels/workbook.xml.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+        "</Relationships>"
+    ),
+}
+
+
+def _xlsx_row(row):
+    cells = []
+    for value in row:
+        if isinstance(value, (int, float, Decimal)) and not isinstance(value, bool):
+            cells.append(f"<c><v>{value}</v></c>")
+        else:
+            text = escape(_XML_INVALID.sub("", _cell(value)))
+            cells.append(f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>')
+    return f"<row>{''.join(cells)}</row>"
+
+
+class _Sink:
+    """Fichier en écriture seule dont le contenu est vidé à chaque lecture."""
+
+    def __init__(self):
+        self._parts = []
+
+    def write(self, data):
+        self._parts.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data, self._parts = b"".join(self._parts), []
+        return data
+
+
+def iter_xlsx(header, rows, chunk_size=CHUNK_SIZE):
+    """Classeur XLSX d'une feuille, produit au fil de l'eau (archive ZIP en flux)."""
+    sink = _Sink()
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, content in _XLSX_PARTS.items():
+            archive.writestr(name, content)
+        with archive.open("xl/worksheets/sheet1.xml", "w", force_zip64=True) as sheet:
+            sheet.write(
+                (
+                    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                    f"<sheetData>{_xlsx_row(header)}"
+                ).encode("utf-8")
+            )
+            for chunk in _chunks(rows, chunk_size):
+                sheet.write("".join(_xlsx_row(row) for row in chunk).encode("utf-8"))
+                yield sink.drain()
+            sheet.write(b"</sheetData></worksheet>")
+    yield sink.drain()
+
+
+ENCODERS = {"csv": iter_csv, "jsonl": iter_jsonl, "xlsx": iter_xlsx}
+
+
+async def aiter_chunks(chunks):
+    """Itérateur asynchrone sur un flux synchrone, un bloc par `sync_to_async`."""
+    iterator = iter(chunks)
+    done = object()
+    # thread_sensitive : même thread, donc même connexion, pour tout le flux
+    read = sync_to_async(next, thread_sensitive=True)
+    try:
+        while (chunk := await read(iterator, done)) is not done:
+            yield chunk
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            # Client déconnecté : libère le curseur dans le thread qui l'a ouvert
+            await sync_to_async(close, thread_sensitive=True)()
+
+
+class ExportMixin:
+    """
+    Mixin de ViewSet : `GET export/<format>/` en flux (voir le docstring du module).
+
+    `export_fields` liste les colonnes exportées (champs du modèle ou
+    chemins `relation__champ`) ; `export_filename` le nom du fichier
+    (défaut : nom du modèle au pluriel).
+    """
+
+    export_fields = ()
+    export_filename = None
+    export_chunk_size = CHUNK_SIZE
+
+    def get_export_fields(self):
+        fields = list(self.export_fields)
+        requested = _names(self.request, FIELDS_PARAM)
+        if requested is None:
+            return fields
+        unknown = requested.difference(fields)
+        if unknown:
+            raise ValidationError(
+                {FIELDS_PARAM: [f"Champs non exportables : {', '.join(sorted(unknown))}."]}
+            )
+        return [name for name in fields if name in requested]
+
+    def get_export_queryset(self, fields):
+        queryset = super().filter_queryset(self.get_queryset())
+        # Base choisie maintenant : le flux est lu après la fin de la vue,
+        # hors du contexte de routage de `ReplicaRoutingMiddleware`.
+        return (
+            queryset.select_related(None)
+            .prefetch_related(None)
+            .using(queryset.db)
+            .values_list(*fields)
+        )
+
+    @action(detail=False, methods=["get"], url_path="export/(?P<file_format>csv|jsonl|xlsx)")
+    def export(self, request, file_format=None):
+        """
+        Action : Export en flux de la liste (CSV, JSON Lines ou XLSX).
+        GET .../export/csv/ (mêmes filtres que la liste, `?fields=` en option)
+        """
+        fields = self.get_export_fields()
+        rows = self.get_export_queryset(fields).iterator(chunk_size=self.export_chunk_size)
+        content = ENCODERS[file_format](fields, rows, self.export_chunk_size)
+        if isinstance(request._request, ASGIRequest):
+            content = aiter_chunks(content)
+        response = StreamingHttpResponse(content, content_type=CONTENT_TYPES[file_format])
+        filename = self.export_filename or slugify(
+            self.get_queryset().model._meta.verbose_name_plural
+        )
+        stamp = timezone.localdate().strftime("%Y%m%d")
+        response["Content-Disposition"] = (
+            f'attachment; filename="{filename}-{stamp}.{file_format}"'
+        )
+        return response
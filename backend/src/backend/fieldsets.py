@@ -0,0 +1,261 @@
+"""
+Sélection des champs renvoyés par l'API : `?fields=`, `?exclude=`, `?expand=`.
+
+- `?fields=id,first_name` : ne renvoie que les champs listés ;
+- `?exclude=salary,address` : renvoie tous les champs sauf ceux listés ;
+- `?expand=manager` : remplace la clé étrangère par l'objet imbriqué décrit
+  dans `Meta.expandable_fields` du serializer.
+
+Un champ retiré n'est pas calculé (sa méthode `get_<champ>` n'est jamais
+appelée) et le queryset est allégé en conséquence : les `select_related`,
+`prefetch_related` et annotations qui ne servent qu'aux champs retirés sont
+supprimés. Une liste déroulante (`?fields=id,name`) coûte ainsi une seule
+requête étroite.
+
+Dépendances d'un champ envers le queryset :
+- champ concret du modèle, `get_<champ>_display` ou clé primaire d'une
+  relation : aucune ;
+- source traversant une relation (`department.name`) : la relation ;
+- source nommant une annotation : l'annotation ;
+- `Meta.field_dependencies = {"champ": ("relation", "annotation")}` pour les
+  champs calculés (`SerializerMethodField`, propriétés du modèle).
+
+Si la dépendance d'un champ conservé est inconnue, le queryset est laissé
+tel quel. Le filtrage ne s'applique qu'aux requêtes en lecture : en
+écriture, tous les champs restent nécessaires à la validation.
+
+Exemple :
+    class EmployeeSerializer(serializers.ModelSerializer):
+        class Meta:
+            model = Employee
+            fields = [...]
+            field_dependencies = {"manager_name": ("manager",)}
+            expandable_fields = {
+                "manager": (
+                    "employee.serializers.EmployeeListSerializer",
+                    ("manager__department", "manager__position"),
+                ),
+            }
+"""
+
+import re
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models.constants import LOOKUP_SEP
+from django.utils.module_loading import import_string
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+FIELDS_PARAM = "fields"
+EXCLUDE_PARAM = "exclude"
+EXPAND_PARAM = "expand"
+
+_DISPLAY_SOURCE = re.compile(r"^get_(\w+)_display$")
+
+
+def _names(request, param):
+    """Noms passés dans un paramètre (`?p=a,b` ou `?p=a&p=b`), None si absent."""
+    values = request.query_params.getlist(param)
+    if not values:
+        return None
+    return {
+        name.strip() for value in values for name in value.split(",") if name.strip()
+    }
+
+
+def get_selection(request):
+    """
+    Sélection demandée `(fields, exclude, expand)`.
+
+    Retourne None pour une requête en écriture ou sans aucun des trois
+    paramètres ; un paramètre absent vaut None.
+    """
+    if request is None or request.method not in SAFE_METHODS:
+        return None
+    selection = tuple(
+        _names(request, param) for param in (FIELDS_PARAM, EXCLUDE_PARAM, EXPAND_PARAM)
+    )
+    if all(part is None for part in selection):
+        return None
+    return selection
+
+
+def _unwrap(serializer):
+    if isinstance(serializer, serializers.ListSerializer):
+        return serializer.child
+    return serializer
+
+
+def _meta(serializer, name):
+    return getattr(getattr(serializer, "Meta", None), name, None) or {}
+
+
+def _expanded_field(serializer, name, spec):
+    path = spec[0]
+    serializer_class = import_string(path) if isinstance(path, str) else path
+    model_field = serializer.Meta.model._meta.get_field(name)
+    return serializer_class(
+        many=model_field.many_to_many or model_field.one_to_many,
+        read_only=True,
+    )
+
+
+def apply_selection(serializer, selection):
+    """Retire les champs non demandés et développe ceux de `expand`."""
+    serializer = _unwrap(serializer)
+    wanted, excluded, expand = selection
+    expandable = _meta(serializer, "expandable_fields")
+    expand = (expand or set()) & expandable.keys()
+
+    for name in expand:
+        serializer.fields[name] = _expanded_field(serializer, name, expandable[name])
+
+    for name in list(serializer.fields):
+        if name in expand:
+            continue
+        if (wanted is not None and name not in wanted) or (
+            excluded is not None and name in excluded
+        ):
+            serializer.fields.pop(name)
+    return serializer
+
+
+def _dependencies(serializer, queryset):
+    """
+    `(chemins, chargements)` nécessaires aux champs lisibles du serializer.
+
+    `chemins` : relations et annotations lues, None si au moins une
+    dépendance est inconnue ; `chargements` : relations à charger en plus
+    pour les champs développés.
+    """
+    serializer = _unwrap(serializer)
+    model = queryset.model
+    declared = _meta(serializer, "field_dependencies")
+    expandable = _meta(serializer, "expandable_fields")
+    annotations = queryset.query.annotations
+    needed, loads, unknown = set(), set(), False
+
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        if name in declared:
+            needed.update(declared[name])
+            continue
+        if name in expandable and isinstance(field, serializers.BaseSerializer):
+            needed.add(name)
+            loads.update((name, *expandable[name][1]))
+            continue
+        if isinstance(field, serializers.PrimaryKeyRelatedField):
+            # Lit directement la colonne `<relation>_id`
+            continue
+        if field.source == "*":
+            unknown = True
+            continue
+
+        root = field.source_attrs[0]
+        display = _DISPLAY_SOURCE.match(root)
+        if display:
+            root = display.group(1)
+        if root == "pk" or root in annotations:
+            needed.add(root)
+            continue
+        try:
+            model_field = model._meta.get_field(root)
+        except FieldDoesNotExist:
+            # Propriété ou méthode du modèle : dépendances inconnues
+            unknown = True
+            continue
+        if model_field.is_relation:
+            needed.add(root)
+
+    return (None if unknown else needed), loads
+
+
+def _select_paths(tree, prefix=""):
+    """Chemins `a__b` d'un arbre `select_related` (feuilles uniquement)."""
+    paths = []
+    for name, children in tree.items():
+        path = f"{prefix}{name}"
+        paths.extend(_select_paths(children, f"{path}{LOOKUP_SEP}") if children else [path])
+    return paths
+
+
+def _is_single_valued(model, path):
+    """Le chemin ne traverse-t-il que des clés étrangères ou des relations 1-1 ?"""
+    for name in path.split(LOOKUP_SEP):
+        field = model._meta.get_field(name)
+        if not (field.many_to_one or field.one_to_one):
+            return False
+        model = field.related_model
+    return True
+
+
+def trim_queryset(queryset, serializer):
+    """
+    Ne garde du queryset que les chargements utiles aux champs du serializer.
+
+    Les annotations sans agrégat inutilisées sont masquées (elles restent
+    utilisables par les filtres et le tri déjà posés) ; les relations des
+    champs développés sont ajoutées.
+    """
+    needed, loads = _dependencies(serializer, queryset)
+    query = queryset.query
+
+    if needed is not None:
+        roots = {path.split(LOOKUP_SEP)[0] for path in needed}
+
+        if isinstance(query.select_related, dict):
+            paths = _select_paths(query.select_related)
+            kept = [path for path in paths if path.split(LOOKUP_SEP)[0] in roots]
+            if len(kept) != len(paths):
+                queryset = queryset.select_related(None)
+                if kept:
+                    queryset = queryset.select_related(*kept)
+
+        lookups = queryset._prefetch_related_lookups
+        kept = [
+            lookup
+            for lookup in lookups
+            if getattr(lookup, "prefetch_through", lookup).split(LOOKUP_SEP)[0]
+            in roots
+        ]
+        if len(kept) != len(lookups):
+            queryset = queryset.prefetch_related(None).prefetch_related(*kept)
+
+        selected = query.annotation_select
+        unused = {
+            name
+            for name, annotation in selected.items()
+            if name not in roots and not annotation.contains_aggregate
+        }
+        if unused:
+            queryset = queryset.all()
+            queryset.query.set_annotation_mask(set(selected) - unused)
+
+    for path in sorted(loads):
+        if _is_single_valued(queryset.model, path):
+            queryset = queryset.select_related(path)
+        else:
+            queryset = queryset.prefetch_related(path)
+    return queryset
+
+
+class SparseFieldsetMixin:
+    """
+    Mixin de ViewSet appliquant `?fields=`, `?exclude=` et `?expand=` au
+    serializer et au queryset (liste, détail et actions qui passent par
+    `filter_queryset()`).
+    """
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        selection = get_selection(getattr(self, "request", None))
+        if selection is not None:
+            apply_selection(serializer, selection)
+        return serializer
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if get_selection(getattr(self, "request", None)) is None:
+            return queryset
+        return trim_queryset(queryset, self.get_serializer())
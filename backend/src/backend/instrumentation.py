@@ -0,0 +1,246 @@
+"""
+Instrumentation des requêtes HTTP : temps total, requêtes SQL, doublons.
+
+`InstrumentationMiddleware` rattache un enregistreur (`QueryRecorder`) au
+contexte de la requête. Un `execute_wrapper` installé sur chaque connexion
+(`install`, y compris celles ouvertes par les threads de
+`backend.concurrency`) lui transmet les requêtes SQL : il les compte, cumule leur durée et regroupe les requêtes par empreinte
+(SQL normalisé, sans valeurs) : une même empreinte exécutée N fois est la
+signature d'un N+1.
+
+En sortie :
+- en-tête `Server-Timing` (`db`, `app`, `total`), lisible dans l'onglet
+  réseau des navigateurs,
+- journal structuré (JSON) `backend.requests`, échantillonné
+  (`INSTRUMENTATION_SAMPLE_RATE`) mais toujours écrit pour les requêtes
+  lentes ou contenant des doublons,
+- journal `backend.slow_queries` des requêtes SQL plus lentes que
+  `INSTRUMENTATION_SLOW_QUERY_MS`, avec le SQL normalisé,
+- métriques Prometheus (`backend.metrics`).
+
+Le coût par requête SQL se limite à deux lectures d'horloge et à une
+normalisation mise en cache : l'instrumentation peut rester active en
+production.
+"""
+
+import hashlib
+import json
+import logging
+import random
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import ExitStack
+from contextvars import ContextVar
+from functools import lru_cache
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+from backend import metrics
+
+request_logger = logging.getLogger("backend.requests")
+slow_query_logger = logging.getLogger("backend.slow_queries")
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%s|\?")
+_IN_LIST = re.compile(r"\bIN \((?:\s*\?\s*,?)+\)", re.IGNORECASE)
+_VALUES = re.compile(r"\bVALUES\s*\([?,\s]*\)(?:\s*,\s*\([?,\s]*\))*", re.IGNORECASE)
+_SPACES = re.compile(r"\s+")
+
+_recorder = ContextVar("query_recorder", default=None)
+
+
+@lru_cache(maxsize=2048)
+def normalize_sql(sql):
+    """
+    SQL sans valeurs : littéraux et paramètres remplacés par `?`, listes
+    `IN (...)` et `VALUES (...)` réduites, espaces compactés.
+    """
+    sql = _STRING.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _PLACEHOLDER.sub("?", sql)
+    sql = _IN_LIST.sub("IN (...)", sql)
+    sql = _VALUES.sub("VALUES (...)", sql)
+    return _SPACES.sub(" ", sql).strip()
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(sql):
+    """Empreinte courte du SQL normalisé."""
+    return hashlib.md5(normalize_sql(sql).encode(), usedforsecurity=False).hexdigest()[:12]
+
+
+class QueryRecorder:
+    """`execute_wrapper` qui mesure les requêtes SQL d'une requête HTTP."""
+
+    def __init__(self, view_name=None):
+        self.view_name = view_name
+        self.started = time.perf_counter()
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints = Counter()
+        self._samples = {}
+        # Requêtes exécutées en parallèle (`backend.concurrency`)
+        self._lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            key = fingerprint(sql)
+            with self._lock:
+                self.count += 1
+                self.duration += elapsed
+                self.fingerprints[key] += 1
+                self._samples.setdefault(key, sql)
+            slow_ms = getattr(settings, "INSTRUMENTATION_SLOW_QUERY_MS", 100)
+            if elapsed * 1000 >= slow_ms:
+                self._log_slow_query(sql, elapsed, context)
+
+    def _log_slow_query(self, sql, elapsed, context):
+        slow_query_logger.warning(json.dumps({
+            "duration_ms": round(elapsed * 1000, 2),
+            "view": self.view_name,
+            "database": context["connection"].alias,
+            "fingerprint": fingerprint(sql),
+            "sql": normalize_sql(sql),
+        }))
+
+    def duplicates(self, limit=5):
+        """Empreintes exécutées plusieurs fois, les plus fréquentes d'abord."""
+        return [
+            {"fingerprint": key, "count": count, "sql": normalize_sql(self._samples[key])[:300]}
+            for key, count in self.fingerprints.most_common(limit)
+            if count > 1
+        ]
+
+
+def _record(execute, sql, params, many, context):
+    recorder = _recorder.get()
+    if recorder is None:
+        return execute(sql, params, many, context)
+    return recorder(execute, sql, params, many, context)
+
+
+def install(connection):
+    """Branche l'instrumentation sur une connexion (idempotent)."""
+    if _record not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record)
+
+
+def _install_on_connect(sender, connection, **kwargs):
+    install(connection)
+
+
+connection_created.connect(_install_on_connect)
+
+
+def server_timing(total_ms, db_ms, queries):
+    """Valeur de l'en-tête `Server-Timing`."""
+    return (
+        f'db;dur={db_ms:.1f};desc="{queries} queries", '
+        f"app;dur={max(total_ms - db_ms, 0):.1f}, "
+        f"total;dur={total_ms:.1f}"
+    )
+
+
+class InstrumentationMiddleware:
+    """
+    Mesure chaque requête HTTP (temps, SQL, doublons) et publie les mesures.
+
+    Les mesures sont aussi exposées sur `request.instrumentation` pour les
+    autres composants. Les requêtes SQL exécutées pendant la diffusion
+    d'une réponse en flux ne sont pas comptées. Compatible WSGI et ASGI.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not getattr(settings, "INSTRUMENTATION_ENABLED", True):
+            return self.get_response(request)
+
+        # Connexions ouvertes avant le chargement du middleware
+        for connection in connections.all():
+            install(connection)
+        recorder = self._start(request)
+        with ExitStack() as stack:
+            stack.enter_context(metrics.in_progress(request.method))
+            stack.callback(_recorder.reset, _recorder.set(recorder))
+            response = self.get_response(request)
+        return self._finish(request, response, recorder)
+
+    async def __acall__(self, request):
+        if not getattr(settings, "INSTRUMENTATION_ENABLED", True):
+            return await self.get_response(request)
+
+        recorder = self._start(request)
+        token = _recorder.set(recorder)
+        try:
+            with metrics.in_progress(request.method):
+                response = await self.get_response(request)
+        finally:
+            _recorder.reset(token)
+        return self._finish(request, response, recorder)
+
+    def _start(self, request):
+        recorder = QueryRecorder()
+        request.instrumentation = recorder
+        return recorder
+
+    def _finish(self, request, response, recorder):
+        total_ms = (time.perf_counter() - recorder.started) * 1000
+        db_ms = recorder.duration * 1000
+        metrics.observe_request(
+            request.method,
+            recorder.view_name,
+            response.status_code,
+            total_ms / 1000,
+            recorder.count,
+            recorder.duration,
+        )
+
+        if getattr(settings, "INSTRUMENTATION_SERVER_TIMING", True):
+            response["Server-Timing"] = server_timing(total_ms, db_ms, recorder.count)
+        self._log_request(request, response, recorder, total_ms, db_ms)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        recorder = getattr(request, "instrumentation", None)
+        if recorder is not None and request.resolver_match is not None:
+            recorder.view_name = request.resolver_match.view_name
+
+    def _log_request(self, request, response, recorder, total_ms, db_ms):
+        if not request_logger.isEnabledFor(logging.INFO):
+            return
+        duplicates = recorder.duplicates()
+        slow = total_ms >= getattr(settings, "INSTRUMENTATION_SLOW_REQUEST_MS", 500)
+        sample_rate = getattr(settings, "INSTRUMENTATION_SAMPLE_RATE", 0.1)
+        if not (slow or duplicates or random.random() < sample_rate):
+            return
+        request_logger.info(json.dumps({
+            "method": request.method,
+            "path": request.path,
+            "view": recorder.view_name,
+            "status": response.status_code,
+            "duration_ms": round(total_ms, 2),
+            "db_ms": round(db_ms, 2),
+            "queries": recorder.count,
+            "duplicates": duplicates,
+            "slow": slow,
+        }))
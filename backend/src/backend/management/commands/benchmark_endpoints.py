@@ -0,0 +1,156 @@
+"""
+Commande de management pour mesurer les endpoints de l'API.
+Usage: python manage.py benchmark_endpoints [--scale 50] [--iterations 10] [--output baseline.json]
+
+Crée une base de test jetable, la remplit avec `seed_database --scale`,
+puis appelle chaque route GET de l'API sous les rôles admin, hr_manager,
+manager et employee (voir `backend.benchmark`). Affiche p50 / p95, nombre
+de requêtes SQL et taille de réponse, et écrit le tout en JSON avec
+`--output`.
+
+Échoue si une route dépasse son budget de requêtes SQL
+(`backend/query_budgets.json`) ou répond en erreur 5xx. Après une
+optimisation volontaire, `--update-budgets` réécrit les budgets.
+"""
+
+import json
+import tempfile
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import override_settings
+
+from backend import benchmark
+from users.models import CustomUser
+
+
+class Command(BaseCommand):
+    help = "Mesure latence, requêtes SQL et taille des réponses de chaque route de l'API"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scale',
+            type=float,
+            # Assez de lignes pour que chaque liste renvoie des pages pleines :
+            # un N+1 s'y voit à pleine taille de page
+            default=50.0,
+            help='Volume du jeu de données (seed_database --scale, défaut : 50)',
+        )
+        parser.add_argument(
+            '--existing-db',
+            action='store_true',
+            help='Mesurer la base configurée telle quelle (écritures annulées)',
+        )
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=10,
+            help='Requêtes mesurées par route et par rôle (défaut : 10)',
+        )
+        parser.add_argument(
+            '--role',
+            action='append',
+            dest='roles',
+            choices=[code for code, _ in CustomUser.ROLE_CHOICES],
+            help='Rôle à mesurer (répétable). Par défaut : admin, hr_manager, manager, employee.',
+        )
+        parser.add_argument(
+            '--only',
+            action='append',
+            help='Ne mesurer que les routes dont le nom contient cette chaîne (répétable)',
+        )
+        parser.add_argument(
+            '--output',
+            help='Fichier JSON où écrire les mesures',
+        )
+        parser.add_argument(
+            '--budgets',
+            default=str(benchmark.BUDGETS_PATH),
+            help='Fichier des budgets de requêtes SQL',
+        )
+        parser.add_argument(
+            '--update-budgets',
+            action='store_true',
+            help='Réécrire les budgets avec les mesures courantes',
+        )
+
+    def handle(self, *args, **options):
+        media_root = tempfile.mkdtemp(prefix='benchmark-media-')
+        isolated = override_settings(
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'],
+            RESPONSE_CACHE_ENABLED=False,
+            CACHES={'default': {
+                'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                'LOCATION': 'benchmark',
+            }},
+            MEDIA_ROOT=media_root,
+        )
+        with isolated:
+            old_name = None
+            if not options['existing_db']:
+                old_name = connection.creation.create_test_db(
+                    verbosity=0, autoclobber=True, serialize=False
+                )
+            try:
+                if old_name is not None:
+                    self.stdout.write(f"Jeu de données (scale={options['scale']})...")
+                    call_command('seed_database', scale=options['scale'], stdout=self.stdout)
+                report = self._run(options)
+            finally:
+                if old_name is not None:
+                    connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        if options['output']:
+            data = report.as_dict()
+            data.update(scale=options['scale'], iterations=options['iterations'])
+            with open(options['output'], 'w') as output:
+                json.dump(data, output, indent=2)
+            self.stdout.write(f"Mesures écrites dans {options['output']}")
+
+        if options['update_budgets']:
+            budgets = benchmark.load_budgets(options['budgets'])
+            budgets.update(report.budgets())
+            benchmark.save_budgets(budgets, options['budgets'])
+            self.stdout.write(self.style.SUCCESS(f"✓ Budgets mis à jour : {options['budgets']}"))
+            return
+
+        self._check(report)
+
+    def _run(self, options):
+        self.stdout.write(
+            f"{'route':<45} {'rôle':<11} {'code':>4} {'SQL':>4}{'':<5}"
+            f" {'p50 (ms)':>8} {'p95 (ms)':>8} {'octets':>9}"
+        )
+        # Les écritures faites pendant les mesures (utilisateurs, journaux) sont annulées
+        with transaction.atomic():
+            report = benchmark.run(
+                roles=options['roles'] or benchmark.DEFAULT_ROLES,
+                iterations=options['iterations'],
+                budgets=benchmark.load_budgets(options['budgets']),
+                only=options['only'],
+                stdout=self.stdout,
+            )
+            transaction.set_rollback(True)
+        return report
+
+    def _check(self, report):
+        for measure in report.unbudgeted:
+            self.stdout.write(self.style.WARNING(
+                f'  sans budget : {measure.route} ({measure.role})'
+            ))
+        failures = [
+            f'{m.route} ({m.role}) : {m.queries} requêtes SQL, budget {m.budget}'
+            for m in report.regressions
+        ] + [
+            f'{m.route} ({m.role}) : réponse {m.status}'
+            for m in report.errors
+        ]
+        if failures:
+            raise CommandError(
+                'Régressions détectées :\n  ' + '\n  '.join(failures)
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ {len(report.measures)} mesure(s), aucun budget dépassé'
+        ))
@@ -0,0 +1,151 @@
+"""
+Commande de management pour mesurer l'encodage JSON et la compression.
+Usage: python manage.py benchmark_rendering [--scale 20] [--iterations 20] [--output rendering.json]
+
+Crée une base de test jetable remplie par `seed_database --scale`, puis
+sérialise toute la table des employés (`EmployeeSerializer`, 30 champs) et
+des candidats (`CandidateSerializer`) comme le feraient leurs listes. Pour
+chaque jeu, mesure :
+- le temps d'encodage (p50) de `JSONRenderer` (DRF) et de `FastJSONRenderer`,
+- les octets transférés sans compression, en gzip et en brotli, et le temps
+  de compression correspondant.
+"""
+
+import json
+import statistics
+import tempfile
+import time
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import override_settings
+from django.utils.text import compress_string
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from backend import compression
+from backend.renderers import FastJSONRenderer
+from employee.models import Employee
+from employee.serializers import EmployeeSerializer
+from recruitment.models import Candidate
+from recruitment.serializers import CandidateSerializer
+
+CASES = {
+    "employee-list": lambda: (
+        Employee.objects.select_related("department", "position", "manager")
+        .prefetch_related("subordinates")
+        .order_by("last_name", "first_name", "pk"),
+        EmployeeSerializer,
+    ),
+    "candidate-list": lambda: (
+        Candidate.objects.select_related("position", "position__department")
+        .prefetch_related("hiring_process")
+        .order_by("-applied_date", "pk"),
+        CandidateSerializer,
+    ),
+}
+
+
+def _timed(func, iterations):
+    """Résultat de `func()` et durée p50 (ms) sur `iterations` appels."""
+    durations = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        result = func()
+        durations.append((time.perf_counter() - started) * 1000)
+    return result, statistics.median(durations)
+
+
+class Command(BaseCommand):
+    help = "Mesure le temps d'encodage JSON et la taille compressée des listes employés et candidats"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scale',
+            type=float,
+            default=20.0,
+            help='Volume du jeu de données (seed_database --scale, défaut : 20)',
+        )
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=20,
+            help='Encodages mesurés par jeu et par variante (défaut : 20)',
+        )
+        parser.add_argument(
+            '--output',
+            help='Fichier JSON où écrire les mesures',
+        )
+
+    def handle(self, *args, **options):
+        media_root = tempfile.mkdtemp(prefix='benchmark-media-')
+        isolated = override_settings(
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'],
+            MEDIA_ROOT=media_root,
+            RESPONSE_CACHE_ENABLED=False,
+        )
+        with isolated:
+            old_name = connection.creation.create_test_db(
+                verbosity=0, autoclobber=True, serialize=False
+            )
+            try:
+                self.stdout.write(f"Jeu de données (scale={options['scale']})...")
+                call_command('seed_database', scale=options['scale'], stdout=self.stdout)
+                results = {
+                    name: self._measure(*factory(), options['iterations'])
+                    for name, factory in CASES.items()
+                }
+            finally:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        self._print(results)
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(
+                    {'scale': options['scale'], 'iterations': options['iterations'], 'results': results},
+                    output,
+                    indent=2,
+                )
+            self.stdout.write(f"Mesures écrites dans {options['output']}")
+
+    def _measure(self, queryset, serializer_class, iterations):
+        request = Request(APIRequestFactory().get('/'))
+        data = serializer_class(queryset, many=True, context={'request': request}).data
+
+        drf, drf_ms = _timed(lambda: JSONRenderer().render(data), iterations)
+        fast, fast_ms = _timed(lambda: FastJSONRenderer().render(data), iterations)
+        gzipped, gzip_ms = _timed(lambda: compress_string(fast), iterations)
+        result = {
+            'rows': len(data),
+            'encode_drf_ms': round(drf_ms, 2),
+            'encode_fast_ms': round(fast_ms, 2),
+            'bytes_drf': len(drf),
+            'bytes': len(fast),
+            'bytes_gzip': len(gzipped),
+            'gzip_ms': round(gzip_ms, 2),
+            'bytes_br': None,
+            'br_ms': None,
+        }
+        if compression.brotli is not None:
+            quality = compression.brotli_quality()
+            compressed, br_ms = _timed(
+                lambda: compression.brotli.compress(fast, quality=quality), iterations
+            )
+            result.update(bytes_br=len(compressed), br_ms=round(br_ms, 2))
+        return result
+
+    def _print(self, results):
+        self.stdout.write(
+            f"{'jeu':<15} {'lignes':>6} {'DRF (ms)':>9} {'orjson':>8}"
+            f" {'octets':>9} {'gzip':>8} {'(ms)':>6} {'brotli':>8} {'(ms)':>6}"
+        )
+        for name, r in results.items():
+            br = f"{r['bytes_br']:>8} {r['br_ms']:>6.1f}" if r['bytes_br'] else f"{'-':>8} {'-':>6}"
+            self.stdout.write(
+                f"{name:<15} {r['rows']:>6} {r['encode_drf_ms']:>9.1f} {r['encode_fast_ms']:>8.1f}"
+                f" {r['bytes']:>9} {r['bytes_gzip']:>8}"
+                f" {r['gzip_ms']:>6.1f} {br}"
+            )
@@ -0,0 +1,178 @@
+"""
+Commande de management pour mesurer le débit d'écriture concurrent de SQLite.
+Usage: python manage.py benchmark_sqlite_writes [--writers 8] [--readers 4] [--transactions 200]
+
+Compare deux profils sur une base fichier jetable :
+- `défaut` : moteur `django.db.backends.sqlite3` sans options (journal
+  rollback, transactions DEFERRED),
+- `optimisé` : moteur et options de `DATABASES["default"]` (voir
+  `backend.sqlite`).
+
+Chaque écrivain enchaîne des transactions « lecture puis écriture »
+(comme un envoi de message : lecture du dernier numéro, insertion, mise à
+jour d'un compteur) pendant que des lecteurs interrogent la table en
+continu. Affiche le débit d'écriture, les échecs (`database is locked`) et
+la latence des lectures.
+"""
+
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connections, transaction
+
+PROFILES = {
+    "défaut": {"ENGINE": "django.db.backends.sqlite3", "OPTIONS": {}},
+    "optimisé": None,  # Réglages de DATABASES["default"]
+}
+
+
+class Command(BaseCommand):
+    help = "Mesure le débit d'écriture concurrent de SQLite, profil par défaut et optimisé"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--writers',
+            type=int,
+            default=8,
+            help="Threads écrivains (défaut : 8)",
+        )
+        parser.add_argument(
+            '--readers',
+            type=int,
+            default=4,
+            help="Threads lecteurs (défaut : 4)",
+        )
+        parser.add_argument(
+            '--transactions',
+            type=int,
+            default=200,
+            help="Transactions par écrivain (défaut : 200)",
+        )
+
+    def handle(self, *args, **options):
+        default = connections.settings["default"]
+        if default["ENGINE"] not in ("backend.sqlite", "django.db.backends.sqlite3"):
+            self.stdout.write(self.style.WARNING("La base par défaut n'est pas SQLite."))
+
+        self.stdout.write(
+            f"{'profil':<10} {'écritures/s':>12} {'échecs':>7}"
+            f" {'lecture p50':>12} {'lecture p95':>12} {'échecs lect.':>13}"
+        )
+        results = {}
+        with tempfile.TemporaryDirectory(prefix='sqlite-bench-') as directory:
+            for name, overrides in PROFILES.items():
+                settings_dict = {
+                    **default,
+                    **(overrides or {}),
+                    "NAME": str(Path(directory) / f"{len(results)}.sqlite3"),
+                    "CONN_MAX_AGE": None,
+                }
+                results[name] = result = self._run_profile(settings_dict, options)
+                self.stdout.write(
+                    f"{name:<10} {result['writes_per_second']:>12.0f} {result['write_errors']:>7}"
+                    f" {result['read_p50_ms']:>10.2f}ms {result['read_p95_ms']:>10.2f}ms"
+                    f" {result['read_errors']:>13}"
+                )
+
+        before, after = results["défaut"], results["optimisé"]
+        ratio = after["writes_per_second"] / max(before["writes_per_second"], 1)
+        self.stdout.write(self.style.SUCCESS(
+            f"✓ Débit d'écriture × {ratio:.1f}, échecs {before['write_errors']} → "
+            f"{after['write_errors']}"
+        ))
+
+    def _run_profile(self, settings_dict, options):
+        alias = f"sqlite-benchmark-{id(settings_dict)}"
+        connections.settings[alias] = settings_dict
+        try:
+            with connections[alias].cursor() as cursor:
+                cursor.execute(
+                    "CREATE TABLE bench_event (id INTEGER PRIMARY KEY AUTOINCREMENT,"
+                    " stream INTEGER NOT NULL, seq INTEGER NOT NULL, payload TEXT NOT NULL)"
+                )
+                cursor.execute("CREATE INDEX bench_event_stream ON bench_event (stream, seq)")
+                cursor.execute("CREATE TABLE bench_counter (id INTEGER PRIMARY KEY, value INTEGER)")
+                cursor.execute("INSERT INTO bench_counter (id, value) VALUES (1, 0)")
+            return self._measure(alias, options)
+        finally:
+            connections[alias].close()
+            del connections[alias]
+            del connections.settings[alias]
+
+    def _measure(self, alias, options):
+        done = threading.Event()
+        lock = threading.Lock()
+        totals = {"writes": 0, "write_errors": 0, "read_errors": 0}
+        latencies = []
+
+        def add(key):
+            with lock:
+                totals[key] += 1
+
+        def write(stream):
+            try:
+                for _ in range(options['transactions']):
+                    try:
+                        with transaction.atomic(using=alias):
+                            with connections[alias].cursor() as cursor:
+                                cursor.execute(
+                                    "SELECT COALESCE(MAX(seq), 0) FROM bench_event WHERE stream = %s",
+                                    [stream],
+                                )
+                                seq = cursor.fetchone()[0] + 1
+                                cursor.execute(
+                                    "INSERT INTO bench_event (stream, seq, payload) VALUES (%s, %s, %s)",
+                                    [stream, seq, "x" * 200],
+                                )
+                                cursor.execute(
+                                    "UPDATE bench_counter SET value = value + 1 WHERE id = 1"
+                                )
+                        add("writes")
+                    except OperationalError:
+                        add("write_errors")
+            finally:
+                connections[alias].close()
+
+        def read():
+            try:
+                while not done.is_set():
+                    start = time.perf_counter()
+                    try:
+                        with connections[alias].cursor() as cursor:
+                            cursor.execute("SELECT COUNT(*), MAX(seq) FROM bench_event")
+                            cursor.fetchone()
+                    except OperationalError:
+                        add("read_errors")
+                        continue
+                    with lock:
+                        latencies.append((time.perf_counter() - start) * 1000)
+            finally:
+                connections[alias].close()
+
+        writers = [
+            threading.Thread(target=write, args=(stream,))
+            for stream in range(options['writers'])
+        ]
+        readers = [threading.Thread(target=read) for _ in range(options['readers'])]
+        start = time.perf_counter()
+        for thread in writers + readers:
+            thread.start()
+        for thread in writers:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        done.set()
+        for thread in readers:
+            thread.join()
+
+        ordered = sorted(latencies) or [0.0]
+        return {
+            "writes_per_second": totals["writes"] / elapsed,
+            "write_errors": totals["write_errors"],
+            "read_p50_ms": statistics.median(ordered),
+            "read_p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+            "read_errors": totals["read_errors"],
+        }
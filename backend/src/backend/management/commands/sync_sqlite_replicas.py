@@ -0,0 +1,58 @@
+"""
+Commande de management pour copier la base SQLite vers ses réplicas locaux.
+Usage: python manage.py sync_sqlite_replicas [--interval 5]
+
+Copie la base `default` dans chaque réplica SQLite de `DATABASE_REPLICAS`
+avec l'API de sauvegarde de SQLite (copie cohérente, sans bloquer les
+écritures). Simule en local la réplication d'un serveur PostgreSQL :
+avec `--interval`, la copie est répétée jusqu'à interruption (Ctrl+C).
+"""
+
+import sqlite3
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from backend import replicas
+
+
+class Command(BaseCommand):
+    help = "Copie la base SQLite principale vers les réplicas locaux"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval',
+            type=float,
+            help='Répéter la copie toutes les N secondes',
+        )
+
+    def handle(self, *args, **options):
+        aliases = [
+            alias for alias in replicas.replica_aliases()
+            if connections[alias].vendor == 'sqlite'
+        ]
+        if connections[DEFAULT_DB_ALIAS].vendor != 'sqlite' or not aliases:
+            raise CommandError('Aucun réplica SQLite configuré (DB_REPLICAS).')
+
+        while True:
+            for alias in aliases:
+                self._copy(alias)
+            self.stdout.write(self.style.SUCCESS(
+                f"✓ {len(aliases)} réplica(s) à jour : {', '.join(aliases)}"
+            ))
+            if not options['interval']:
+                return
+            try:
+                time.sleep(options['interval'])
+            except KeyboardInterrupt:
+                return
+
+    def _copy(self, alias):
+        source = sqlite3.connect(str(connections[DEFAULT_DB_ALIAS].settings_dict['NAME']))
+        target = sqlite3.connect(str(connections[alias].settings_dict['NAME']))
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+            source.close()
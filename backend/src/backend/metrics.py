@@ -0,0 +1,127 @@
+"""
+Métriques Prometheus de l'API, exposées sur /metrics (`backend.views.metrics`).
+
+- `quantech_http_request_duration_seconds` : durée des requêtes par
+  méthode, route (nom de la vue) et code de réponse,
+- `quantech_http_requests_in_progress` : requêtes en cours,
+- `quantech_db_queries_per_request` / `quantech_db_duration_seconds` :
+  nombre et durée cumulée des requêtes SQL par requête HTTP,
+- `quantech_response_cache_requests_total` : succès / échecs du cache des
+  réponses (ratio : hit / (hit + miss)),
+- `quantech_login_attempts_total` / `quantech_login_lockouts_total` :
+  issues des connexions (`login_view`) et blocages déclenchés,
+- `quantech_messages_sent_total` : messages envoyés par type de conversation.
+
+Les mesures HTTP et SQL sont relevées par
+`backend.instrumentation.InstrumentationMiddleware`.
+
+Plusieurs processus (workers gunicorn / uvicorn) : définir
+`PROMETHEUS_MULTIPROC_DIR` (répertoire vidé au démarrage, voir
+docker-entrypoint.sh). Chaque processus écrit ses valeurs dans des fichiers
+de ce répertoire, agrégées à la lecture de /metrics.
+"""
+
+import os
+from contextlib import contextmanager
+
+from django.conf import settings
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+REQUEST_DURATION = Histogram(
+    "quantech_http_request_duration_seconds",
+    "Durée des requêtes HTTP",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "quantech_http_requests_in_progress",
+    "Requêtes HTTP en cours de traitement",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+DB_QUERIES = Histogram(
+    "quantech_db_queries_per_request",
+    "Nombre de requêtes SQL par requête HTTP",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 200),
+)
+DB_DURATION = Histogram(
+    "quantech_db_duration_seconds",
+    "Durée cumulée des requêtes SQL par requête HTTP",
+    ["route"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+CACHE_REQUESTS = Counter(
+    "quantech_response_cache_requests",
+    "Consultations du cache des réponses",
+    ["result"],
+)
+LOGIN_ATTEMPTS = Counter(
+    "quantech_login_attempts",
+    "Tentatives de connexion par issue",
+    ["outcome"],
+)
+LOGIN_LOCKOUTS = Counter(
+    "quantech_login_lockouts",
+    "Blocages déclenchés après trop d'échecs de connexion",
+)
+MESSAGES_SENT = Counter(
+    "quantech_messages_sent",
+    "Messages envoyés",
+    ["conversation_type"],
+)
+
+
+def enabled():
+    return getattr(settings, "METRICS_ENABLED", True)
+
+
+@contextmanager
+def in_progress(method):
+    """Compte une requête HTTP en cours le temps du bloc."""
+    if not enabled():
+        yield
+        return
+    gauge = REQUESTS_IN_PROGRESS.labels(method)
+    gauge.inc()
+    try:
+        yield
+    finally:
+        gauge.dec()
+
+
+def observe_request(method, route, status, duration, queries, db_duration):
+    """Enregistre les mesures d'une requête HTTP terminée (durées en secondes)."""
+    if not enabled():
+        return
+    route = route or UNMATCHED_ROUTE
+    REQUEST_DURATION.labels(method, route, str(status)).observe(duration)
+    DB_QUERIES.labels(route).observe(queries)
+    DB_DURATION.labels(route).observe(db_duration)
+
+
+def count(counter, *labels):
+    """Incrémente un compteur (avec ses étiquettes) si les métriques sont actives."""
+    if enabled():
+        (counter.labels(*labels) if labels else counter).inc()
+
+
+def exposition():
+    """Corps et type de contenu de la réponse /metrics."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -0,0 +1,223 @@
+"""
+Pagination par curseur (keyset) commune à toute l'API.
+
+Contrairement à la pagination par OFFSET, chaque page est obtenue par un
+filtre sur la clé de tri (`WHERE (a, b, pk) > (...)`), ce qui garde le coût
+d'une page proportionnel à sa taille, quelle que soit sa profondeur.
+
+Ordre utilisé, par priorité :
+1. l'ordre explicite du queryset (`order_by()` d'une action, `?ordering=`)
+2. l'attribut `cursor_ordering` de la vue
+3. le `Meta.ordering` du modèle
+4. l'attribut `ordering` de la vue
+5. `-pk`
+
+Un ordre n'est retenu que s'il ne porte que sur des champs concrets et non
+relationnels du modèle. La clé primaire est toujours ajoutée en dernier
+critère pour rendre la position unique.
+
+Une valeur NULL est classée après toutes les autres dans l'ordre croissant
+(avant dans l'ordre décroissant), quel que soit le SGBD : le tri et le filtre
+du curseur la traitent comme une valeur plus grande que toute autre.
+"""
+
+import datetime
+import decimal
+import json
+import uuid
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+
+
+def _reverse_ordering(ordering):
+    """Inverse le sens de chaque critère de tri."""
+    return tuple(
+        field[1:] if field.startswith("-") else "-" + field for field in ordering
+    )
+
+
+def _order_by(model, ordering):
+    """Critères de tri ; sur un champ nullable, NULL est la plus grande valeur."""
+    criteria = []
+    for field in ordering:
+        name = field.lstrip("-")
+        if name == "pk" or not model._meta.get_field(name).null:
+            criteria.append(field)
+        elif field.startswith("-"):
+            criteria.append(F(name).desc(nulls_first=True))
+        else:
+            criteria.append(F(name).asc(nulls_last=True))
+    return criteria
+
+
+def _compare(name, lookup, value):
+    """`name > value` (`gt`) ou `name < value` (`lt`), NULL étant le plus grand."""
+    if value is None:
+        # Rien n'est plus grand que NULL ; toute valeur non nulle est plus petite
+        return Q(pk__in=[]) if lookup == "gt" else Q(**{f"{name}__isnull": False})
+    if lookup == "gt":
+        return Q(**{f"{name}__gt": value}) | Q(**{f"{name}__isnull": True})
+    return Q(**{f"{name}__lt": value})
+
+
+def _encode_value(value):
+    """Convertit une valeur de champ en valeur JSON sans perte de précision."""
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (decimal.Decimal, uuid.UUID)):
+        return str(value)
+    return value
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    Pagination par curseur sur la clé de tri complète du modèle.
+
+    La position encodée dans le curseur contient la valeur de chaque critère
+    de tri (clé primaire comprise), si bien que l'offset de DRF reste à zéro
+    même lorsque plusieurs lignes partagent le même premier critère.
+    """
+
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 200
+    ordering = ("-pk",)
+
+    def get_ordering(self, request, queryset, view):
+        model = queryset.model
+        candidates = [
+            [f for f in queryset.query.order_by if isinstance(f, str)],
+            getattr(view, "cursor_ordering", None),
+            model._meta.ordering,
+            getattr(view, "ordering", None),
+        ]
+
+        for candidate in candidates:
+            if not candidate:
+                continue
+            if isinstance(candidate, str):
+                candidate = (candidate,)
+            if all(self._is_keyset_field(model, field) for field in candidate):
+                return self._with_tie_breaker(model, tuple(candidate))
+
+        return ("-pk",)
+
+    @staticmethod
+    def _is_keyset_field(model, field):
+        """Indique si un critère de tri peut servir de clé de curseur."""
+        if not isinstance(field, str):
+            return False
+        name = field.lstrip("-")
+        if not name or name == "?" or "__" in name:
+            return False
+        if name == "pk":
+            return True
+        try:
+            model_field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return False
+        return model_field.concrete and not model_field.is_relation
+
+    @staticmethod
+    def _with_tie_breaker(model, ordering):
+        """Ajoute la clé primaire, dans le sens du premier critère, si absente."""
+        pk_name = model._meta.pk.name
+        names = {field.lstrip("-") for field in ordering}
+        if "pk" in names or pk_name in names:
+            return ordering
+        prefix = "-" if ordering[0].startswith("-") else ""
+        return ordering + (prefix + "pk",)
+
+    def _get_position_from_instance(self, instance, ordering):
+        values = []
+        for field in ordering:
+            name = field.lstrip("-")
+            if isinstance(instance, dict):
+                value = instance[name]
+            else:
+                value = getattr(instance, name)
+            values.append(_encode_value(value))
+        return json.dumps(values, separators=(",", ":"))
+
+    def _decode_position(self, position):
+        """Décode la position du curseur en liste de valeurs."""
+        try:
+            values = json.loads(position)
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return values
+
+    def _keyset_filter(self, values, reverse):
+        """Construit la comparaison lexicographique `(a, b, pk) > (...)`."""
+        condition = Q()
+        equal = Q()
+        for field, value in zip(self.ordering, values):
+            name = field.lstrip("-")
+            # (curseur inversé) XOR (critère décroissant)
+            lookup = "lt" if reverse != field.startswith("-") else "gt"
+            condition |= equal & _compare(name, lookup, value)
+            equal &= Q(**{f"{name}__isnull": True} if value is None else {name: value})
+        return condition
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            (offset, reverse, current_position) = (0, False, None)
+        else:
+            (offset, reverse, current_position) = self.cursor
+
+        if reverse:
+            queryset = queryset.order_by(*_order_by(queryset.model, _reverse_ordering(self.ordering)))
+        else:
+            queryset = queryset.order_by(*_order_by(queryset.model, self.ordering))
+
+        if current_position is not None:
+            values = self._decode_position(current_position)
+            queryset = queryset.filter(self._keyset_filter(values, reverse))
+
+        # Une ligne supplémentaire permet de savoir s'il existe une page suivante.
+        results = list(queryset[offset : offset + self.page_size + 1])
+        self.page = list(results[: self.page_size])
+
+        if len(results) > len(self.page):
+            has_following_position = True
+            following_position = self._get_position_from_instance(
+                results[-1], self.ordering
+            )
+        else:
+            has_following_position = False
+            following_position = None
+
+        if reverse:
+            self.page = list(reversed(self.page))
+            self.has_next = (current_position is not None) or (offset > 0)
+            self.has_previous = has_following_position
+            if self.has_next:
+                self.next_position = current_position
+            if self.has_previous:
+                self.previous_position = following_position
+        else:
+            self.has_next = has_following_position
+            self.has_previous = (current_position is not None) or (offset > 0)
+            if self.has_next:
+                self.next_position = following_position
+            if self.has_previous:
+                self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
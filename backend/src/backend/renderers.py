@@ -0,0 +1,64 @@
+"""
+Encodage et décodage JSON rapides pour l'API.
+
+`FastJSONRenderer` / `FastJSONParser` remplacent `JSONRenderer` /
+`JSONParser` de DRF par `orjson` (encodage natif des dict, listes, dates,
+UUID), avec la même sortie : dates UTC en `Z`, types non natifs (`Decimal`,
+chaînes paresseuses, `timedelta`, querysets) confiés à l'encodeur de DRF.
+Sans `orjson`, ils se comportent exactement comme ceux de DRF ; l'indentation
+demandée par `Accept: application/json; indent=4` passe aussi par DRF.
+Les exports volumineux passent par `backend.export`.
+"""
+
+import json
+
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dépendance recommandée
+    orjson = None
+
+_encoder = JSONEncoder()
+
+
+def dumps(data):
+    """Encode `data` en JSON compact (octets UTF-8)."""
+    if orjson is None:
+        return json.dumps(
+            data, cls=JSONEncoder, ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8")
+    return orjson.dumps(
+        data,
+        default=_encoder.default,
+        option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z,
+    )
+
+
+class FastJSONRenderer(JSONRenderer):
+    """Renderer JSON fondé sur `orjson` (repli sur celui de DRF)."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if orjson is None or self.get_indent(
+            accepted_media_type or "", renderer_context or {}
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        return dumps(data)
+
+
+class FastJSONParser(JSONParser):
+    """Parser JSON fondé sur `orjson` (repli sur celui de DRF)."""
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
+
@@ -0,0 +1,231 @@
+"""
+Routage des lectures vers des réplicas de la base.
+
+`ReplicaRouter` (DATABASE_ROUTERS) envoie les écritures sur `default` et
+les lectures sur un réplica (`DATABASE_REPLICAS`) lorsque c'est sûr :
+- pendant une requête HTTP de lecture (GET, HEAD, OPTIONS), marquée par
+  `ReplicaRoutingMiddleware`,
+- dans un bloc `read_only()` ou pour un queryset passé à `on_replica()`
+  (exports, tâches d'analyse hors requête HTTP).
+
+Les lectures restent sur `default` :
+- dans une transaction ouverte sur `default`,
+- après une écriture dans la même requête (lecture de ses propres écritures),
+- pendant `DATABASE_REPLICA_PIN_SECONDS` après une requête d'écriture du
+  même client : la réponse pose le cookie `db_pin` et l'en-tête `X-DB-Pin`
+  (échéance) ; un client sans cookie renvoie l'en-tête,
+- si aucun réplica n'a un retard inférieur à `DATABASE_REPLICA_MAX_LAG`
+  secondes (ou si aucun ne répond). Le retard est mesuré au plus toutes
+  les `DATABASE_REPLICA_CHECK_SECONDS` secondes.
+
+En local : deux fichiers SQLite (`DB_REPLICAS`, copie par
+`sync_sqlite_replicas`) ou deux instances PostgreSQL en réplication.
+"""
+
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+PIN_COOKIE = "db_pin"
+PIN_HEADER = "X-DB-Pin"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+_routing = ContextVar("replica_routing", default=None)
+_lag_cache = {}
+_lag_lock = threading.Lock()
+
+
+class RoutingState:
+    """Droit de lire sur un réplica pour le contexte courant."""
+
+    def __init__(self, allowed):
+        self.allowed = allowed
+        self.wrote = False
+
+
+def replica_aliases():
+    return list(getattr(settings, "DATABASE_REPLICAS", []))
+
+
+def _probe_lag(alias):
+    """Retard du réplica en secondes (None s'il ne répond pas)."""
+    connection = connections[alias]
+    try:
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT COALESCE(EXTRACT(EPOCH FROM now() - "
+                    "pg_last_xact_replay_timestamp()), 0)"
+                )
+                return float(cursor.fetchone()[0])
+        if connection.vendor == "sqlite":
+            # Fichiers copiés par sync_sqlite_replicas : écart entre la
+            # dernière écriture du primaire et la dernière copie
+            primary = str(connections[DEFAULT_DB_ALIAS].settings_dict["NAME"])
+            replica = str(connection.settings_dict["NAME"])
+            if not os.path.exists(primary) or not os.path.exists(replica):
+                return 0.0
+            written = max(
+                os.path.getmtime(path)
+                for path in (primary, f"{primary}-wal")
+                if os.path.exists(path)
+            )
+            return max(written - os.path.getmtime(replica), 0.0)
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        return 0.0
+    except (DatabaseError, OSError):
+        return None
+
+
+def replica_lag(alias):
+    """Retard du réplica, mesuré au plus toutes les DATABASE_REPLICA_CHECK_SECONDS."""
+    interval = getattr(settings, "DATABASE_REPLICA_CHECK_SECONDS", 5)
+    now = time.monotonic()
+    cached = _lag_cache.get(alias)
+    if cached is not None and now - cached[0] < interval:
+        return cached[1]
+    lag = _probe_lag(alias)
+    with _lag_lock:
+        _lag_cache[alias] = (now, lag)
+    return lag
+
+
+def healthy_replicas():
+    """Réplicas joignables dont le retard est acceptable."""
+    max_lag = getattr(settings, "DATABASE_REPLICA_MAX_LAG", 5)
+    return [
+        alias
+        for alias in replica_aliases()
+        if (lag := replica_lag(alias)) is not None and lag <= max_lag
+    ]
+
+
+def choose_replica():
+    """Un réplica sain au hasard, ou `default` à défaut."""
+    replicas = healthy_replicas()
+    return random.choice(replicas) if replicas else DEFAULT_DB_ALIAS
+
+
+@contextmanager
+def read_only():
+    """Autorise les lectures sur réplica le temps du bloc (hors requête HTTP)."""
+    token = _routing.set(RoutingState(allowed=True))
+    try:
+        yield
+    finally:
+        _routing.reset(token)
+
+
+def on_replica(queryset):
+    """Queryset en lecture seule, évalué sur un réplica sain."""
+    if not replica_aliases():
+        return queryset
+    return queryset.using(choose_replica())
+
+
+class ReplicaRouter:
+    """Écritures sur `default`, lectures sûres sur un réplica."""
+
+    def db_for_read(self, model, **hints):
+        state = _routing.get()
+        if state is None or not state.allowed or state.wrote or not replica_aliases():
+            return None
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+        # Objets liés : même base que l'instance d'origine
+        instance = hints.get("instance")
+        if instance is not None and instance._state.db:
+            return instance._state.db
+        return choose_replica()
+
+    def db_for_write(self, model, **hints):
+        state = _routing.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        pool = {DEFAULT_DB_ALIAS, *replica_aliases()}
+        if obj1._state.db in pool and obj2._state.db in pool:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Le schéma des réplicas vient du primaire (réplication ou copie)
+        if db in replica_aliases():
+            return False
+        return None
+
+
+def _pinned_until(request):
+    value = request.COOKIES.get(PIN_COOKIE) or request.headers.get(PIN_HEADER)
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Autorise les lectures sur réplica pour les requêtes de lecture et
+    épingle le client sur `default` après une écriture.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not replica_aliases():
+            return self.get_response(request)
+        token = _routing.set(self._state(request))
+        try:
+            response = self.get_response(request)
+        finally:
+            _routing.reset(token)
+        return self._pin(request, response)
+
+    async def __acall__(self, request):
+        if not replica_aliases():
+            return await self.get_response(request)
+        token = _routing.set(self._state(request))
+        try:
+            response = await self.get_response(request)
+        finally:
+            _routing.reset(token)
+        return self._pin(request, response)
+
+    def _state(self, request):
+        allowed = request.method in SAFE_METHODS and _pinned_until(request) < time.time()
+        return RoutingState(allowed=allowed)
+
+    def _pin(self, request, response):
+        if request.method in SAFE_METHODS:
+            return response
+        seconds = getattr(settings, "DATABASE_REPLICA_PIN_SECONDS", 10)
+        until = f"{time.time() + seconds:.3f}"
+        response.set_cookie(
+            PIN_COOKIE,
+            until,
+            max_age=seconds,
+            secure=request.is_secure(),
+            httponly=True,
+            samesite="Lax",
+        )
+        response[PIN_HEADER] = until
+        return response
@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
 import os
+import sys
 from datetime import timedelta
 from pathlib import Path
 
@@ -55,6 +56,7 @@ INSTALLED_APPS = [
     "drf_yasg",
     "rest_framework_simplejwt",
     # custom apps
+    "backend.apps.BackendConfig",
     "dashboard.apps.DashboardConfig",
     "users.apps.UsersConfig",
     "employee.apps.EmployeeConfig",
@@ -70,6 +72,9 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "backend.compression.CompressionMiddleware",
+    "backend.instrumentation.InstrumentationMiddleware",
+    "backend.replicas.ReplicaRoutingMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -105,7 +110,8 @@ AUTH_USER_MODEL = "users.CustomUser"
 # Configuration DRF
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        # JWT, utilisateur lu dans le cache (voir backend/authentication.py)
+        "backend.authentication.CachedJWTAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
@@ -120,6 +126,19 @@ REST_FRAMEWORK = {
         "user": "1000/hour",     # Utilisateurs authentifiés
         "login": "5/minute",     # Tentatives de login
     },
+    # Encodage / décodage JSON par orjson (voir backend/renderers.py)
+    "DEFAULT_RENDERER_CLASSES": [
+        "backend.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "backend.renderers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
+    # Pagination par curseur (keyset) sur toutes les listes et actions
+    "DEFAULT_PAGINATION_CLASS": "backend.pagination.KeysetCursorPagination",
+    "PAGE_SIZE": 50,
 }
 
 SIMPLE_JWT = {
@@ -136,14 +155,160 @@ SIMPLE_JWT = {
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
+# Moteur SQLite réglé (voir backend/sqlite) : WAL et pragmas à la connexion,
+# écritures sérialisées (BEGIN IMMEDIATE + verrou d'écriture du processus).
+# DB_CONN_MAX_AGE : durée de vie des connexions persistantes (secondes,
+# 0 = une connexion par requête, le défaut). Le serveur par défaut est ASGI :
+# chaque requête synchrone y a son propre thread, et une connexion persistante
+# ouverte dans ce thread ne serait jamais réutilisée ni fermée avant le
+# ramasse-miettes. À augmenter seulement en WSGI. Les threads durables du pool
+# de backend.concurrency gardent leurs connexions ASYNC_QUERY_CONN_MAX_AGE
+# secondes.
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.sqlite3",
+        "ENGINE": "backend.sqlite",
         "NAME": BASE_DIR / "db.sqlite3",
+        "CONN_MAX_AGE": int(os.environ.get("DB_CONN_MAX_AGE", "0")),
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {
+            "transaction_mode": "IMMEDIATE",
+            # Attente maximale d'un verrou d'écriture (secondes)
+            "timeout": int(os.environ.get("DB_LOCK_TIMEOUT", "20")),
+        },
     }
 }
 
 
+# Réplicas en lecture (voir backend/replicas.py). DB_REPLICAS : chemins de
+# fichiers SQLite séparés par des virgules (alias replica1, replica2, ...),
+# tenus à jour par `sync_sqlite_replicas`. Les lectures des requêtes GET y
+# sont envoyées ; le client est épinglé sur `default` pendant
+# DB_REPLICA_PIN_SECONDS après une écriture.
+DATABASE_REPLICAS = []
+for _index, _path in enumerate(
+    (path.strip() for path in os.environ.get("DB_REPLICAS", "").split(",") if path.strip()),
+    start=1,
+):
+    DATABASES[f"replica{_index}"] = {
+        **DATABASES["default"],
+        "NAME": _path,
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(f"replica{_index}")
+
+DATABASE_ROUTERS = ["backend.replicas.ReplicaRouter"]
+DATABASE_REPLICA_MAX_LAG = float(os.environ.get("DB_REPLICA_MAX_LAG", "5"))
+DATABASE_REPLICA_CHECK_SECONDS = float(os.environ.get("DB_REPLICA_CHECK_SECONDS", "5"))
+DATABASE_REPLICA_PIN_SECONDS = int(os.environ.get("DB_REPLICA_PIN_SECONDS", "10"))
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# CACHE_BACKEND : locmem (défaut, un cache par processus), file ou redis
+# (tout serveur compatible protocole Redis ; nécessite le paquet `redis`).
+
+CACHE_BACKEND = os.environ.get("CACHE_BACKEND", "locmem")
+
+if CACHE_BACKEND == "redis":
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ.get("CACHE_URL", "redis://127.0.0.1:6379/1"),
+            "KEY_PREFIX": "quantech",
+        }
+    }
+elif CACHE_BACKEND == "file":
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": os.environ.get("CACHE_LOCATION", "/var/tmp/quantech_cache"),
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "quantech",
+        }
+    }
+
+TESTING = len(sys.argv) > 1 and sys.argv[1] == "test"
+
+# Cache des réponses de l'API (voir backend/cache.py). Désactivé pendant les
+# tests : le cache survit d'un test à l'autre alors que la base est remise à zéro.
+RESPONSE_CACHE_ENABLED = (
+    os.environ.get("RESPONSE_CACHE_ENABLED", "True") == "True" and not TESTING
+)
+RESPONSE_CACHE_ALIAS = "default"
+RESPONSE_CACHE_TIMEOUT = int(os.environ.get("RESPONSE_CACHE_TIMEOUT", "300"))
+# Apps dont les modifications invalident le cache (espace de noms = label d'app)
+RESPONSE_CACHE_NAMESPACES = [
+    "announcement",
+    "dashboard",
+    "department",
+    "employee",
+    "recruitment",
+    "schedule",
+    "settings",
+    "support",
+    "users",
+]
+
+# Cache des utilisateurs authentifiés par JWT (voir backend/authentication.py).
+# Désactivé pendant les tests pour la même raison que le cache des réponses.
+AUTH_CACHE_ENABLED = os.environ.get("AUTH_CACHE_ENABLED", "True") == "True" and not TESTING
+AUTH_CACHE_ALIAS = "default"
+AUTH_CACHE_TIMEOUT = int(os.environ.get("AUTH_CACHE_TIMEOUT", "60"))
+
+# Compression des réponses (voir backend/compression.py) : brotli si le
+# client l'accepte, sinon gzip, au-delà de COMPRESSION_MIN_SIZE octets.
+COMPRESSION_ENABLED = os.environ.get("COMPRESSION_ENABLED", "True") == "True"
+COMPRESSION_MIN_SIZE = int(os.environ.get("COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_BROTLI_QUALITY = int(os.environ.get("COMPRESSION_BROTLI_QUALITY", "5"))
+
+# Événements temps réel (voir backend/events.py), diffusés en SSE sur
+# /api/events/. Avec plusieurs workers, utiliser le courtier Redis
+# (EVENTS_BROKER=redis ; nécessite le paquet `redis`).
+EVENTS_ENABLED = os.environ.get("EVENTS_ENABLED", "True") == "True"
+# EVENTS_BROKER : local, redis ou chemin d'une classe de courtier
+_events_broker = os.environ.get("EVENTS_BROKER", "local")
+EVENTS_BROKER = {
+    "local": "backend.events.LocalBroker",
+    "redis": "backend.events.RedisBroker",
+}.get(_events_broker, _events_broker)
+EVENTS_REDIS_URL = os.environ.get(
+    "EVENTS_REDIS_URL", os.environ.get("CACHE_URL", "redis://127.0.0.1:6379/0")
+)
+EVENTS_HEARTBEAT_SECONDS = int(os.environ.get("EVENTS_HEARTBEAT_SECONDS", "15"))
+
+# Instrumentation des requêtes (voir backend/instrumentation.py) : en-tête
+# Server-Timing, journal `backend.requests` échantillonné (toujours écrit
+# pour les requêtes lentes ou avec requêtes SQL en double) et journal
+# `backend.slow_queries`.
+INSTRUMENTATION_ENABLED = os.environ.get("INSTRUMENTATION_ENABLED", "True") == "True"
+INSTRUMENTATION_SERVER_TIMING = (
+    os.environ.get("INSTRUMENTATION_SERVER_TIMING", "True") == "True"
+)
+INSTRUMENTATION_SAMPLE_RATE = float(os.environ.get("INSTRUMENTATION_SAMPLE_RATE", "0.1"))
+INSTRUMENTATION_SLOW_REQUEST_MS = int(
+    os.environ.get("INSTRUMENTATION_SLOW_REQUEST_MS", "500")
+)
+INSTRUMENTATION_SLOW_QUERY_MS = int(os.environ.get("INSTRUMENTATION_SLOW_QUERY_MS", "100"))
+
+# Requêtes ORM indépendantes exécutées en parallèle (voir
+# backend/concurrency.py) : vues asynchrones du dashboard, statistiques.
+# ASYNC_QUERY_WORKERS borne le nombre de connexions simultanées par processus.
+ASYNC_QUERY_CONCURRENCY = os.environ.get("ASYNC_QUERY_CONCURRENCY", "True") == "True"
+ASYNC_QUERY_WORKERS = int(os.environ.get("ASYNC_QUERY_WORKERS", "8"))
+# Durée de vie des connexions des threads du pool (secondes)
+ASYNC_QUERY_CONN_MAX_AGE = int(os.environ.get("ASYNC_QUERY_CONN_MAX_AGE", "600"))
+
+# Métriques Prometheus sur /metrics (voir backend/metrics.py). Avec plusieurs
+# processus, définir PROMETHEUS_MULTIPROC_DIR. METRICS_TOKEN : jeton Bearer
+# exigé pour lire /metrics (vide = accès libre, à filtrer côté proxy).
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "True") == "True"
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -215,9 +380,13 @@ CORS_ALLOW_HEADERS = [
     "origin",
     "user-agent",
     "x-csrftoken",
+    "x-db-pin",
     "x-requested-with",
 ]
 
+# Échéance d'épinglage sur la base primaire (voir backend/replicas.py)
+CORS_EXPOSE_HEADERS = ["x-db-pin"]
+
 CORS_ALLOW_METHODS = [
     "DELETE",
     "GET",
@@ -226,3 +395,11 @@ CORS_ALLOW_METHODS = [
     "POST",
     "PUT",
 ]
+
+# Historique des métriques du dashboard : rétention en jours par granularité
+# (None = conservation illimitée). Voir dashboard/snapshots.py.
+DASHBOARD_METRIC_RETENTION = {
+    "hour": int(os.environ.get("DASHBOARD_HOURLY_RETENTION_DAYS", "14")),
+    "day": int(os.environ.get("DASHBOARD_DAILY_RETENTION_DAYS", "400")),
+    "month": None,
+}
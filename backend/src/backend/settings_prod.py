@@ -55,6 +55,9 @@ SECURE_CONTENT_TYPE_NOSNIFF = True
 SECURE_BROWSER_XSS_FILTER = True
 X_FRAME_OPTIONS = 'DENY'  # Protection clickjacking
 
+# Sondes internes (healthcheck, Prometheus) appelées en HTTP simple
+SECURE_REDIRECT_EXEMPT = [r'^healthz$', r'^metrics$']
+
 # Proxy SSL Header (si derrière un reverse proxy)
 SECURE_PROXY_SSL_HEADER = ('HTTP_X_FORWARDED_PROTO', 'https')
 
@@ -81,6 +84,7 @@ CORS_ALLOW_HEADERS = [
     "origin",
     "user-agent",
     "x-csrftoken",
+    "x-db-pin",
     "x-requested-with",
 ]
 
@@ -119,8 +123,19 @@ REST_FRAMEWORK = {
 #         'OPTIONS': {
 #             'sslmode': 'require',
 #         },
-#     }
+#     },
+#     # Réplica en lecture (réplication en flux) ; voir backend/replicas.py
+#     'replica1': {
+#         'ENGINE': 'django.db.backends.postgresql',
+#         'NAME': os.environ.get('DB_NAME'),
+#         'USER': os.environ.get('DB_USER'),
+#         'PASSWORD': os.environ.get('DB_PASSWORD'),
+#         'HOST': os.environ.get('DB_REPLICA_HOST'),
+#         'PORT': os.environ.get('DB_PORT', '5432'),
+#         'TEST': {'MIRROR': 'default'},
+#     },
 # }
+# DATABASE_REPLICAS = ['replica1']
 
 # ========================================
 # LOGGING - Configuration avancée
@@ -134,6 +149,11 @@ LOGGING = {
             'format': '{levelname} {asctime} {module} {message}',
             'style': '{',
         },
+        # Une ligne JSON par entrée (voir backend/instrumentation.py)
+        'json': {
+            'format': '{{"time": "{asctime}", "level": "{levelname}", "event": {message}}}',
+            'style': '{',
+        },
     },
     'handlers': {
         'file': {
@@ -148,6 +168,22 @@ LOGGING = {
             'filename': BASE_DIR / 'logs' / 'security.log',
             'formatter': 'verbose',
         },
+        'requests_file': {
+            'level': 'INFO',
+            'class': 'logging.handlers.RotatingFileHandler',
+            'filename': BASE_DIR / 'logs' / 'requests.log',
+            'maxBytes': 50 * 1024 * 1024,
+            'backupCount': 5,
+            'formatter': 'json',
+        },
+        'slow_queries_file': {
+            'level': 'WARNING',
+            'class': 'logging.handlers.RotatingFileHandler',
+            'filename': BASE_DIR / 'logs' / 'slow_queries.log',
+            'maxBytes': 50 * 1024 * 1024,
+            'backupCount': 5,
+            'formatter': 'json',
+        },
     },
     'loggers': {
         'django': {
@@ -160,9 +196,24 @@ LOGGING = {
             'level': 'WARNING',
             'propagate': False,
         },
+        'backend.requests': {
+            'handlers': ['requests_file'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+        'backend.slow_queries': {
+            'handlers': ['slow_queries_file'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
     },
 }
 
+# Server-Timing expose des durées internes : désactivable en production
+INSTRUMENTATION_SERVER_TIMING = (
+    os.environ.get('INSTRUMENTATION_SERVER_TIMING', 'True') == 'True'
+)
+
 # Créer le dossier logs s'il n'existe pas
 logs_dir = BASE_DIR / 'logs'
 logs_dir.mkdir(exist_ok=True)
@@ -0,0 +1,46 @@
+"""
+Signaux Django du projet.
+
+Invalide le cache des réponses (`backend.cache`) lorsqu'un modèle d'une app
+suivie est créé, modifié, supprimé ou voit ses relations M2M changer.
+L'espace de noms invalidé est le label de l'app du modèle.
+"""
+
+from django.conf import settings
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from backend.cache import invalidate_on_commit
+
+
+def _namespace(sender):
+    app_label = sender._meta.app_label
+    if app_label in getattr(settings, "RESPONSE_CACHE_NAMESPACES", ()):
+        return app_label
+    return None
+
+
+def _invalidate(sender):
+    namespace = _namespace(sender)
+    if namespace is None:
+        return
+    invalidate_on_commit(namespace)
+
+
+@receiver(post_save, dispatch_uid="response_cache_post_save")
+def invalidate_on_save(sender, **kwargs):
+    """Invalide l'espace de noms du modèle sauvegardé."""
+    _invalidate(sender)
+
+
+@receiver(post_delete, dispatch_uid="response_cache_post_delete")
+def invalidate_on_delete(sender, **kwargs):
+    """Invalide l'espace de noms du modèle supprimé."""
+    _invalidate(sender)
+
+
+@receiver(m2m_changed, dispatch_uid="response_cache_m2m_changed")
+def invalidate_on_m2m_change(sender, action, **kwargs):
+    """Invalide l'espace de noms de la table de liaison modifiée."""
+    if action in ("post_add", "post_remove", "post_clear"):
+        _invalidate(sender)
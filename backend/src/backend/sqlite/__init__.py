@@ -0,0 +1,20 @@
+"""
+Moteur SQLite réglé pour un serveur web (`ENGINE: "backend.sqlite"`).
+
+Par rapport à `django.db.backends.sqlite3` :
+- pragmas appliqués à chaque connexion (`DEFAULT_PRAGMAS`, surchargeables
+  par `OPTIONS["pragmas"]`) : journal WAL (les lectures ne bloquent plus
+  les écritures et inversement), `synchronous=NORMAL` (pas de fsync à
+  chaque commit en WAL, durabilité assurée au checkpoint), cache de pages
+  et lecture par mmap,
+- écritures sérialisées : une transaction (`transaction.atomic`) prend le
+  verrou d'écriture du processus puis celui de SQLite (`BEGIN IMMEDIATE`,
+  `OPTIONS["transaction_mode"]`). Les écrivains attendent leur tour dans
+  une file au lieu d'échouer en `database is locked` lorsqu'une
+  transaction lectrice tente de devenir écrivaine. Entre processus, le
+  verrou de SQLite et son délai d'attente (`OPTIONS["timeout"]`) jouent le
+  même rôle.
+
+Voir la commande `benchmark_sqlite_writes` pour mesurer le débit
+d'écriture des deux profils.
+"""
@@ -0,0 +1,80 @@
+import threading
+
+from django.db.backends.sqlite3 import base
+
+# Valeurs retenues pour un serveur web ; `OPTIONS["pragmas"]` les surcharge
+DEFAULT_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    # Taille négative : en Kio (64 Mio de cache de pages par connexion)
+    "cache_size": -64000,
+    "mmap_size": 256 * 1024 * 1024,
+    "temp_store": "MEMORY",
+}
+
+_write_locks = {}
+_write_locks_guard = threading.Lock()
+
+
+def write_lock(name):
+    """Verrou d'écriture du processus pour une base (chemin du fichier)."""
+    name = str(name)
+    with _write_locks_guard:
+        return _write_locks.setdefault(name, threading.Lock())
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._write_lock = None
+        self._holds_write_lock = False
+
+    def get_connection_params(self):
+        kwargs = super().get_connection_params()
+        self.pragmas = {**DEFAULT_PRAGMAS, **kwargs.pop("pragmas", {})}
+        self.serialize_writes = kwargs.pop("serialize_writes", True)
+        # Délai d'attente d'un verrou (SQLite comme file d'écriture)
+        self.lock_timeout = kwargs.get("timeout", 5)
+        self._write_lock = write_lock(self.settings_dict["NAME"])
+        return kwargs
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        for pragma, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {pragma} = {value}")
+        return conn
+
+    def _start_transaction_under_autocommit(self):
+        if self.serialize_writes and not self._holds_write_lock:
+            if not self._write_lock.acquire(timeout=self.lock_timeout):
+                with self.wrap_database_errors:
+                    raise self.Database.OperationalError("database is locked")
+            self._holds_write_lock = True
+        try:
+            super()._start_transaction_under_autocommit()
+        except BaseException:
+            self._release_write_lock()
+            raise
+
+    def _release_write_lock(self):
+        if self._holds_write_lock:
+            self._holds_write_lock = False
+            self._write_lock.release()
+
+    def _commit(self):
+        try:
+            return super()._commit()
+        finally:
+            self._release_write_lock()
+
+    def _rollback(self):
+        try:
+            return super()._rollback()
+        finally:
+            self._release_write_lock()
+
+    def _close(self):
+        try:
+            return super()._close()
+        finally:
+            self._release_write_lock()
@@ -0,0 +1,111 @@
+"""
+Construction de statistiques par agrégation conditionnelle.
+
+`StatisticsBuilder` accumule des compteurs (`Count(filter=Q(...))`) et des
+agrégats (`Avg`, `Sum`, ...) puis les calcule en un seul `aggregate()`, soit
+une requête SQL par modèle au lieu d'une requête par valeur. Les
+regroupements sur des valeurs ouvertes (`group_by`) ajoutent une requête
+`GROUP BY` chacun ; indépendantes, ces requêtes s'exécutent en parallèle
+(`backend.concurrency`).
+
+Exemple :
+    stats = (
+        StatisticsBuilder(Employee.objects.all())
+        .count("total")
+        .count_by("by_status", "status", Employee.STATUS_CHOICES)
+        .aggregate("average_salary", Avg("salary"))
+        .group_by("by_department", "department__name")
+        .build()
+    )
+"""
+
+from django.db.models import Count, Q
+
+from backend import concurrency
+
+
+class StatisticsBuilder:
+    """Statistiques d'un queryset calculées en une seule requête d'agrégation."""
+
+    def __init__(self, queryset):
+        # Le tri est inutile pour une agrégation et gênerait un GROUP BY
+        self.queryset = queryset.order_by()
+        self._aggregates = {}
+        self._groups = {}
+        self._steps = []
+
+    def _alias(self):
+        return f"stat_{len(self._aggregates)}"
+
+    def count(self, key, condition=None):
+        """Nombre de lignes, éventuellement filtrées par un `Q`."""
+        alias = self._alias()
+        self._aggregates[alias] = Count("pk", filter=condition)
+        self._steps.append((key, lambda values: values[alias]))
+        return self
+
+    def count_by(self, key, field, choices, rows=False):
+        """
+        Nombre de lignes par valeur d'un champ à choix.
+
+        Par défaut `{valeur: nombre}` pour chaque choix ; avec `rows=True`,
+        une liste `[{field: valeur, "count": nombre}]` triée par nombre
+        décroissant et sans les valeurs absentes (format d'un `GROUP BY`).
+        """
+        aliases = []
+        for value, _label in choices:
+            alias = self._alias()
+            self._aggregates[alias] = Count("pk", filter=Q(**{field: value}))
+            aliases.append((value, alias))
+
+        def resolve(values):
+            counts = {value: values[alias] for value, alias in aliases}
+            if not rows:
+                return counts
+            ordered = sorted(counts.items(), key=lambda item: -item[1])
+            return [{field: value, "count": total} for value, total in ordered if total]
+
+        self._steps.append((key, resolve))
+        return self
+
+    def aggregate(self, key, expression, transform=float, default=0):
+        """Agrégat quelconque (`Avg`, `Sum`, `Max`, ...)."""
+        alias = self._alias()
+        self._aggregates[alias] = expression
+
+        def resolve(values):
+            value = values[alias]
+            return transform(value if value is not None else default)
+
+        self._steps.append((key, resolve))
+        return self
+
+    def group_by(self, key, *fields, limit=None):
+        """Nombre de lignes par valeur d'un ou plusieurs champs (requête dédiée)."""
+        alias = f"group_{len(self._groups)}"
+
+        def query():
+            grouped = (
+                self.queryset.values(*fields)
+                .annotate(count=Count("pk"))
+                .order_by("-count")
+            )
+            return list(grouped[:limit] if limit else grouped)
+
+        self._groups[alias] = query
+        self._steps.append((key, lambda values: values[alias]))
+        return self
+
+    def build(self):
+        """Exécute les requêtes (en parallèle) et retourne le dictionnaire de statistiques."""
+        queries = list(self._groups.items())
+        if self._aggregates:
+            queries.insert(0, (None, lambda: self.queryset.aggregate(**self._aggregates)))
+        results = concurrency.run_concurrently(*(query for _, query in queries))
+        values = {}
+        for (alias, _), result in zip(queries, results):
+            if alias is None:
+                values.update(result)
+            else:
+                values[alias] = result
+        return {key: resolve(values) for key, resolve in self._steps}
@@ -0,0 +1,1425 @@
+"""
+Tests pour l'infrastructure commune du projet (pagination, cache, etc.).
+"""
+import json
+import threading
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Q, Sum
+from django.test import AsyncClient, SimpleTestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from backend import benchmark, concurrency, events, instrumentation, metrics, replicas
+from backend.pagination import KeysetCursorPagination
+from backend.statistics import StatisticsBuilder
+from department.models import Department
+from employee.models import Employee
+from messaging.models import Conversation, Message
+
+CustomUser = get_user_model()
+
+
+class KeysetCursorPaginationTest(APITestCase):
+    """Tests pour la pagination par curseur."""
+
+    def setUp(self):
+        """Configuration initiale."""
+        self.client = APIClient()
+        self.user = CustomUser.objects.create_user(
+            username='hr',
+            email='hr@example.com',
+            password='testpass123',
+            first_name='HR',
+            last_name='Manager',
+            role='hr_manager'
+        )
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+        self.department = Department.objects.create(
+            name='IT',
+            code='IT001',
+            description='IT Department',
+            location='Paris',
+            budget=100000.00
+        )
+        # Plusieurs employés partagent le même nom et prénom : seule la clé
+        # primaire les départage.
+        for index in range(8):
+            Employee.objects.create(
+                first_name='Jean' if index % 2 else 'Anne',
+                last_name='Doe',
+                email=f'doe{index}@example.com',
+                date_of_birth=date(1990, 1, 1),
+                gender=Employee.GENDER_MALE,
+                employee_id=f'EMP{index:03d}',
+                hire_date=date(2020, 1, 1),
+                department=self.department,
+                salary=50000.00,
+                status=Employee.STATUS_ACTIVE,
+            )
+
+    def _walk(self, url):
+        """Parcourt toutes les pages en suivant les liens `next`."""
+        ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids.extend(item['id'] for item in response.data['results'])
+            url = response.data['next']
+        return ids
+
+    def test_custom_action_is_paginated(self):
+        """Les actions personnalisées renvoient une page et non toute la table."""
+        response = self.client.get('/api/employee/employees/active/?page_size=3')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 3)
+        self.assertIsNotNone(response.data['next'])
+        self.assertIsNone(response.data['previous'])
+
+    def test_walk_all_pages_without_duplicates(self):
+        """Le parcours complet suit l'ordre naturel sans doublon ni oubli."""
+        ids = self._walk('/api/employee/employees/active/?page_size=3')
+        expected = list(
+            Employee.objects.order_by('last_name', 'first_name', 'pk')
+            .values_list('id', flat=True)
+        )
+        self.assertEqual(ids, expected)
+
+    def test_previous_link_returns_previous_page(self):
+        """Le lien `previous` ramène exactement la page précédente."""
+        first = self.client.get('/api/employee/employees/?page_size=3')
+        second = self.client.get(first.data['next'])
+        back = self.client.get(second.data['previous'])
+        self.assertEqual(
+            [item['id'] for item in back.data['results']],
+            [item['id'] for item in first.data['results']],
+        )
+
+    def test_invalid_cursor(self):
+        """Un curseur invalide renvoie une 404."""
+        response = self.client.get('/api/employee/employees/?cursor=invalide')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_ordering_adds_primary_key_tie_breaker(self):
+        """La clé primaire est ajoutée dans le sens du premier critère."""
+        paginator = KeysetCursorPagination()
+        ordering = paginator.get_ordering(
+            None, Employee.objects.order_by('-hire_date'), None
+        )
+        self.assertEqual(ordering, ('-hire_date', '-pk'))
+
+    def test_ordering_keeps_nullable_fields(self):
+        """Un ordre sur un champ nullable est conservé."""
+        paginator = KeysetCursorPagination()
+        ordering = paginator.get_ordering(
+            None, Conversation.objects.order_by('-last_message_at'), None
+        )
+        self.assertEqual(ordering, ('-last_message_at', '-pk'))
+
+    def test_walk_nullable_ordering(self):
+        """`?ordering=` sur un champ nullable : NULL en dernier, sans doublon."""
+        CustomUser.objects.filter(pk=self.user.pk).update(is_staff=True)
+        for index in range(5):
+            user = CustomUser.objects.create_user(
+                username=f'user{index}', email=f'user{index}@example.com', password='x'
+            )
+            if index < 3:
+                CustomUser.objects.filter(pk=user.pk).update(
+                    last_login=datetime(2024, 1, 1 + index % 2, tzinfo=dt_timezone.utc)
+                )
+        expected = [
+            pk for pk, _ in sorted(
+                CustomUser.objects.values_list('pk', 'last_login'),
+                key=lambda row: (row[1] is None, row[1], row[0]),
+            )
+        ]
+        for ordering, ids in (('last_login', expected), ('-last_login', expected[::-1])):
+            with self.subTest(ordering=ordering):
+                url = f'/api/users/custom-users/?ordering={ordering}&page_size=2'
+                self.assertEqual(self._walk(url), ids)
+                # Le lien `previous` de la dernière page ramène l'avant-dernière
+                pages = []
+                while url:
+                    response = self.client.get(url)
+                    pages.append([item['id'] for item in response.data['results']])
+                    url = response.data['next']
+                back = self.client.get(response.data['previous'])
+                self.assertEqual([item['id'] for item in back.data['results']], pages[-2])
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=True)
+class ResponseCacheTest(APITestCase):
+    """Tests pour le cache des réponses et son invalidation par signaux."""
+
+    def setUp(self):
+        """Configuration initiale."""
+        cache.clear()
+        self.client = APIClient()
+        self.user = CustomUser.objects.create_user(
+            username='hr',
+            email='hr@example.com',
+            password='testpass123',
+            role='hr_manager'
+        )
+        self.client.force_authenticate(user=self.user)
+        Department.objects.create(name='IT', code='IT001', budget=100000.00)
+
+    def _names(self, response):
+        return [item['name'] for item in response.data['results']]
+
+    def test_second_read_is_served_from_cache(self):
+        """La seconde lecture est servie depuis le cache."""
+        first = self.client.get('/api/department/departments/')
+        self.assertEqual(first['X-Cache'], 'MISS')
+        second = self.client.get('/api/department/departments/')
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(second.data, first.data)
+
+    def test_save_invalidates_namespace(self):
+        """Une création dans un espace de noms invalide les réponses qui en dépendent."""
+        self.client.get('/api/department/departments/')
+        Department.objects.create(name='RH', code='RH001', budget=50000.00)
+        response = self.client.get('/api/department/departments/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(self._names(response), ['IT', 'RH'])
+
+    def test_related_namespace_invalidates(self):
+        """Une modification d'un modèle lié (employé) invalide aussi la liste."""
+        self.client.get('/api/department/departments/statistics/')
+        Employee.objects.create(
+            first_name='Jean',
+            last_name='Doe',
+            email='jean@example.com',
+            date_of_birth=date(1990, 1, 1),
+            gender=Employee.GENDER_MALE,
+            employee_id='EMP001',
+            hire_date=date(2020, 1, 1),
+            department=Department.objects.get(code='IT001'),
+            salary=50000.00,
+        )
+        response = self.client.get('/api/department/departments/statistics/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['total_employees'], 1)
+
+    def test_m2m_change_invalidates(self):
+        """Un changement M2M invalide l'espace de noms concerné."""
+        from announcement.models import Announcement
+
+        announcement = Announcement.objects.create(
+            title='Annonce', content='Contenu', published=True
+        )
+        self.client.get('/api/announcement/announcements/')
+        announcement.departments.add(Department.objects.get(code='IT001'))
+        response = self.client.get('/api/announcement/announcements/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+
+    def test_user_scope_is_not_shared(self):
+        """Les réponses de portée utilisateur ne sont pas partagées entre comptes."""
+        other = CustomUser.objects.create_user(
+            username='other',
+            email='other@example.com',
+            password='testpass123',
+            role='hr_manager'
+        )
+        self.client.get('/api/employee/employees/statistics/')
+        self.client.force_authenticate(user=other)
+        response = self.client.get('/api/employee/employees/statistics/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+
+
+    def test_update_without_signals_invalidates(self):
+        """Les écritures par `update()` invalident elles-mêmes leur espace de noms."""
+        from users.models import UserNotification
+
+        UserNotification.objects.create(user=self.user, title='A', message='A')
+        url = '/api/users/user-notifications/statistics/'
+        self.assertEqual(self.client.get(url).data['unread'], 1)
+        self.client.post('/api/users/user-notifications/mark-all-read/')
+        response = self.client.get(url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual((response.data['unread'], response.data['read']), (0, 1))
+
+    def test_dashboard_history_invalidated_by_snapshots(self):
+        """Un nouvel échantillon (bulk_create) invalide l'historique du dashboard."""
+        from dashboard import snapshots
+        from dashboard.models import DashboardMetric
+
+        DashboardMetric.objects.create(metric_type='departments_count', value=1)
+        url = '/api/dashboard/metrics/history/?metric=departments_count'
+        self.client.get(url)
+        snapshots.record()
+        response = self.client.get(url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+
+
+class StatisticsBuilderTest(APITestCase):
+    """Tests pour le constructeur de statistiques par agrégation conditionnelle."""
+
+    def setUp(self):
+        """Configuration initiale."""
+        self.department = Department.objects.create(
+            name='IT', code='IT001', budget=100000.00
+        )
+        for index, (gender, employee_status) in enumerate([
+            (Employee.GENDER_MALE, Employee.STATUS_ACTIVE),
+            (Employee.GENDER_FEMALE, Employee.STATUS_ACTIVE),
+            (Employee.GENDER_FEMALE, Employee.STATUS_INACTIVE),
+        ]):
+            Employee.objects.create(
+                first_name='Jean',
+                last_name='Doe',
+                email=f'doe{index}@example.com',
+                date_of_birth=date(1990, 1, 1),
+                gender=gender,
+                employee_id=f'EMP{index:03d}',
+                hire_date=date(2020, 1, 1),
+                department=self.department,
+                salary=1000.00 * (index + 1),
+                status=employee_status,
+            )
+
+    def test_counts_in_single_query(self):
+        """Compteurs, répartitions et agrégats sont calculés en une requête."""
+        with self.assertNumQueries(1):
+            stats = (
+                StatisticsBuilder(Employee.objects.all())
+                .count('total')
+                .count('female', Q(gender=Employee.GENDER_FEMALE))
+                .count_by('by_status', 'status', Employee.STATUS_CHOICES)
+                .aggregate('total_salary', Sum('salary'))
+                .build()
+            )
+        self.assertEqual(stats['total'], 3)
+        self.assertEqual(stats['female'], 2)
+        self.assertEqual(stats['by_status'][Employee.STATUS_ACTIVE], 2)
+        self.assertEqual(stats['by_status'][Employee.STATUS_INACTIVE], 1)
+        self.assertEqual(stats['total_salary'], 6000.0)
+
+    def test_rows_format_matches_group_by(self):
+        """Le format `rows` reproduit celui d'un GROUP BY trié par nombre."""
+        stats = (
+            StatisticsBuilder(Employee.objects.all())
+            .count_by('by_gender', 'gender', Employee.GENDER_CHOICES, rows=True)
+            .group_by('by_department', 'department__name')
+            .build()
+        )
+        self.assertEqual(
+            stats['by_gender'],
+            [
+                {'gender': Employee.GENDER_FEMALE, 'count': 2},
+                {'gender': Employee.GENDER_MALE, 'count': 1},
+            ],
+        )
+        self.assertEqual(
+            stats['by_department'], [{'department__name': 'IT', 'count': 3}]
+        )
+
+    def test_empty_queryset_defaults(self):
+        """Un queryset vide donne des compteurs nuls et des agrégats par défaut."""
+        stats = (
+            StatisticsBuilder(Employee.objects.none())
+            .count('total')
+            .aggregate('total_salary', Sum('salary'))
+            .build()
+        )
+        self.assertEqual(stats, {'total': 0, 'total_salary': 0.0})
+
+
+class EventStreamTest(APITestCase):
+    """Tests pour le bus d'événements et le flux SSE."""
+
+    def setUp(self):
+        """Configuration initiale."""
+        self.user = CustomUser.objects.create_user(
+            username='user1',
+            email='user1@example.com',
+            password='testpass123'
+        )
+        self.other = CustomUser.objects.create_user(
+            username='user2',
+            email='user2@example.com',
+            password='testpass123'
+        )
+        self.token = str(RefreshToken.for_user(self.user).access_token)
+
+    def test_stream_requires_authentication(self):
+        """Le flux refuse les connexions sans jeton valide."""
+        response = self.client.get('/api/events/')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        response = self.client.get('/api/events/?token=invalide')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_notification_published_after_commit(self):
+        """Une notification est publiée au commit sur le canal de son destinataire."""
+        from users.models import UserNotification
+
+        with mock.patch('backend.events._deliver') as deliver:
+            with self.captureOnCommitCallbacks(execute=False) as callbacks:
+                UserNotification.objects.create(
+                    user=self.user, title='Titre', message='Contenu'
+                )
+            deliver.assert_not_called()
+            for callback in callbacks:
+                callback()
+        channels, message = deliver.call_args.args
+        self.assertEqual(channels, [events.user_channel(self.user.pk)])
+        self.assertEqual(json.loads(message)['type'], 'notification.created')
+
+    def test_message_published_to_other_participants(self):
+        """Un nouveau message est publié aux participants autres que l'expéditeur."""
+        conversation = Conversation.objects.create(
+            created_by=self.user, conversation_type='direct'
+        )
+        conversation.participants.add(self.user, self.other)
+        with mock.patch('backend.events._deliver') as deliver:
+            with self.captureOnCommitCallbacks(execute=True):
+                Message.send(
+                    conversation=conversation,
+                    sender=self.user,
+                    recipient=self.other,
+                    content='Bonjour'
+                )
+        channels, message = deliver.call_args.args
+        self.assertEqual(channels, [events.user_channel(self.other.pk)])
+        self.assertEqual(json.loads(message)['data']['conversation'], conversation.pk)
+
+    async def test_stream_delivers_events(self):
+        """Le flux SSE reçoit les événements publiés sur les canaux de l'utilisateur."""
+        response = await self.async_client.get(f'/api/events/?token={self.token}')
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = response.streaming_content
+        self.assertTrue((await anext(stream)).startswith(b'retry:'))
+
+        events._deliver(
+            [events.user_channel(self.other.pk)], events.encode('ignored', {})
+        )
+        events._deliver(
+            [events.user_channel(self.user.pk)],
+            events.encode('notification.created', {'id': 1}),
+        )
+        chunk = (await anext(stream)).decode()
+        self.assertIn('event: notification.created', chunk)
+        self.assertIn('data: {"id": 1}', chunk)
+        await stream.aclose()
+
+
+class EndpointBenchmarkTest(APITestCase):
+    """Tests pour le banc d'essai des endpoints."""
+
+    def setUp(self):
+        """Configuration initiale."""
+        self.department = Department.objects.create(
+            name='IT', code='IT', description='IT', location='Paris', budget=1000
+        )
+        manager = Employee.objects.create(
+            first_name='Ada', last_name='Manager', email='ada@example.com',
+            date_of_birth=date(1985, 1, 1), gender='F', employee_id='EMP001',
+            hire_date=date(2020, 1, 1), department=self.department, salary=1000,
+        )
+        Employee.objects.create(
+            first_name='Bob', last_name='Report', email='bob@example.com',
+            date_of_birth=date(1990, 1, 1), gender='M', employee_id='EMP002',
+            hire_date=date(2021, 1, 1), department=self.department, salary=1000,
+            manager=manager,
+        )
+        Department.objects.filter(pk=self.department.pk).update(manager=manager)
+
+    def test_discover_routes(self):
+        """Les routes GET des routeurs et leurs actions sont découvertes."""
+        routes = {route.name: route for route in benchmark.discover_routes()}
+        self.assertIn('employee-list', routes)
+        self.assertIn('employee-statistics', routes)
+        self.assertIn('department-employees', routes)
+        # Actions POST uniquement, racines des routeurs et flux SSE exclus
+        self.assertNotIn('custom-user-activate', routes)
+        self.assertNotIn('api-root', routes)
+        self.assertNotIn('event-stream', routes)
+
+        path = routes['department-employees'].build_path(
+            benchmark.resolve_kwargs(routes['department-employees'])
+        )
+        self.assertEqual(path, f'/api/department/departments/{self.department.pk}/employees/')
+
+    def test_run_reports_budget_regressions(self):
+        """Un dépassement de budget est signalé, un budget respecté ne l'est pas."""
+        report = benchmark.run(
+            roles=['admin', 'employee'],
+            iterations=2,
+            budgets={'employee-statistics': {'admin': 0, 'employee': 100}},
+            only=['employee-statistics'],
+        )
+        self.assertEqual(len(report.measures), 2)
+        admin, employee = report.measures
+        self.assertEqual(admin.status, status.HTTP_200_OK)
+        self.assertGreater(admin.queries, 0)
+        self.assertEqual([m.role for m in report.regressions], ['admin'])
+        self.assertEqual(report.budgets()['employee-statistics']['employee'], employee.queries)
+
+
+class InstrumentationTest(APITestCase):
+    """Tests pour le middleware d'instrumentation des requêtes."""
+
+    def setUp(self):
+        """Configuration initiale."""
+        self.user = CustomUser.objects.create_user(
+            username='admin',
+            email='admin@example.com',
+            password='testpass123',
+            is_staff=True
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def test_normalize_sql(self):
+        """Les valeurs disparaissent : même empreinte quel que soit le nombre de paramètres."""
+        self.assertEqual(
+            instrumentation.normalize_sql(
+                "SELECT * FROM t WHERE a = 'x' AND b IN (%s, %s,\n %s) LIMIT 21"
+            ),
+            'SELECT * FROM t WHERE a = ? AND b IN (...) LIMIT ?',
+        )
+        self.assertEqual(
+            instrumentation.fingerprint('INSERT INTO t (a, b) VALUES (%s, %s)'),
+            instrumentation.fingerprint('INSERT INTO t (a, b) VALUES (%s, %s), (%s, %s)'),
+        )
+
+    def test_server_timing_header(self):
+        """Chaque réponse porte un en-tête Server-Timing avec le nombre de requêtes."""
+        response = self.client.get('/api/department/departments/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        header = response['Server-Timing']
+        self.assertRegex(header, r'db;dur=[\d.]+;desc="\d+ queries", app;dur=[\d.]+, total;dur=[\d.]+')
+        self.assertEqual(
+            response.wsgi_request.instrumentation.view_name, 'department-list'
+        )
+
+    @override_settings(INSTRUMENTATION_SLOW_QUERY_MS=0, INSTRUMENTATION_SAMPLE_RATE=0)
+    def test_logs_duplicates_and_slow_queries(self):
+        """Les doublons (N+1) sont journalisés, les requêtes lentes aussi."""
+        for index in range(3):
+            Department.objects.create(
+                name=f'D{index}', code=f'D{index}', description='', location='', budget=0
+            )
+        with self.assertLogs('backend.requests', 'INFO') as requests_log, \
+                self.assertLogs('backend.slow_queries', 'WARNING') as slow_log:
+            with mock.patch(
+                'department.viewsets.department_viewset.DepartmentViewSet.get_queryset',
+                lambda viewset: Department.objects.all(),
+            ):
+                self.client.get('/api/department/departments/')
+
+        record = json.loads(requests_log.records[-1].getMessage())
+        self.assertEqual(record['view'], 'department-list')
+        self.assertGreater(record['queries'], 0)
+        self.assertTrue(any(d['count'] >= 3 for d in record['duplicates']))
+        slow = json.loads(slow_log.records[0].getMessage())
+        self.assertEqual(slow['database'], 'default')
+        self.assertNotIn("'", slow['sql'])
+
+
+class MetricsTest(APITestCase):
+    """Tests pour /metrics et /healthz."""
+
+    def _sample(self, name, **labels):
+        from prometheus_client import REGISTRY
+
+        return REGISTRY.get_sample_value(name, labels) or 0
+
+    def test_healthz(self):
+        """La sonde répond sans authentification après un SELECT 1."""
+        with self.assertNumQueries(1):
+            response = self.client.get('/healthz')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), {'status': 'ok', 'database': True})
+
+    def test_request_metrics_exposed(self):
+        """Les requêtes HTTP alimentent les histogrammes par route."""
+        name = 'quantech_http_request_duration_seconds_count'
+        labels = {'method': 'GET', 'route': 'healthz', 'status': '200'}
+        before = self._sample(name, **labels)
+        self.client.get('/healthz')
+        self.assertEqual(self._sample(name, **labels), before + 1)
+
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        body = response.content.decode()
+        self.assertIn('quantech_http_requests_in_progress', body)
+        self.assertIn('quantech_db_queries_per_request_bucket{le="1.0",route="healthz"}', body)
+
+    @override_settings(METRICS_TOKEN='secret')
+    def test_metrics_token(self):
+        """Avec METRICS_TOKEN, /metrics exige le jeton."""
+        self.assertEqual(self.client.get('/metrics').status_code, 401)
+        response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer secret')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_login_and_message_counters(self):
+        """Connexions réussies / échouées et messages envoyés sont comptés."""
+        user = CustomUser.objects.create_user(
+            username='user1', email='user1@example.com', password='testpass123'
+        )
+        other = CustomUser.objects.create_user(
+            username='user2', email='user2@example.com', password='testpass123'
+        )
+        failures = self._sample('quantech_login_attempts_total', outcome='failure')
+        successes = self._sample('quantech_login_attempts_total', outcome='success')
+        self.client.post('/api/login/login/', {'username': 'user1', 'password': 'wrong'})
+        self.client.post('/api/login/login/', {'username': 'user1', 'password': 'testpass123'})
+        self.assertEqual(
+            self._sample('quantech_login_attempts_total', outcome='failure'), failures + 1
+        )
+        self.assertEqual(
+            self._sample('quantech_login_attempts_total', outcome='success'), successes + 1
+        )
+
+        sent = self._sample('quantech_messages_sent_total', conversation_type='direct')
+        conversation = Conversation.objects.create(created_by=user, conversation_type='direct')
+        conversation.participants.add(user, other)
+        Message.send(conversation=conversation, sender=user, recipient=other, content='Bonjour')
+        self.assertEqual(
+            self._sample('quantech_messages_sent_total', conversation_type='direct'), sent + 1
+        )
+
+
+    def test_lockouts_counted_once_per_lockout(self):
+        """Les échecs pendant un blocage ne comptent pas de nouveau blocage."""
+        from login.models import LoginAttempt
+        from login.views.auth_views import record_failed_login_attempt
+
+        lockouts = self._sample('quantech_login_lockouts_total')
+        for _ in range(8):
+            record_failed_login_attempt('user1', '10.0.0.1')
+        self.assertEqual(self._sample('quantech_login_lockouts_total'), lockouts + 1)
+
+        # Blocage expiré : l'échec suivant en déclenche un nouveau
+        LoginAttempt.objects.update(locked_until=timezone.now() - timedelta(minutes=1))
+        record_failed_login_attempt('user1', '10.0.0.1')
+        self.assertEqual(self._sample('quantech_login_lockouts_total'), lockouts + 2)
+class ConcurrencyTest(TransactionTestCase):
+    """Tests pour l'exécution concurrente des requêtes ORM."""
+
+    def _create_departments(self, count):
+        for index in range(count):
+            Department.objects.create(
+                name=f'D{index}', code=f'D{index}', description='', location='', budget=0
+            )
+
+    def _count_in_thread(self):
+        return threading.get_ident(), Department.objects.count()
+
+    def test_run_concurrently_uses_pool_threads(self):
+        """Hors transaction, chaque fonction s'exécute dans un thread du pool."""
+        self._create_departments(2)
+        results = concurrency.run_concurrently(
+            self._count_in_thread, self._count_in_thread, lambda: 'fin'
+        )
+        self.assertEqual([count for _, count in results[:2]], [2, 2])
+        self.assertNotIn(threading.get_ident(), [ident for ident, _ in results[:2]])
+        self.assertEqual(results[2], 'fin')
+
+    def test_pool_threads_keep_connections(self):
+        """Les connexions des threads du pool durent ASYNC_QUERY_CONN_MAX_AGE."""
+        import time
+
+        connection.ensure_connection()
+        saved = connection.close_at
+        try:
+            with self.settings(ASYNC_QUERY_CONN_MAX_AGE=600):
+                concurrency._keep_alive()
+            self.assertGreater(connection.close_at, time.monotonic() + 500)
+            # Même connexion : l'échéance n'est pas repoussée à chaque appel
+            deadline = connection.close_at
+            concurrency._keep_alive()
+            self.assertEqual(connection.close_at, deadline)
+        finally:
+            connection.close_at = saved
+            del connection._pool_connection
+
+    def test_gather_from_async_code(self):
+        """`gather` retourne les résultats dans l'ordre des fonctions."""
+        self._create_departments(3)
+
+        async def main():
+            return await concurrency.gather(
+                Department.objects.count,
+                lambda: list(Department.objects.order_by('code').values_list('code', flat=True)),
+            )
+
+        self.assertEqual(async_to_sync(main)(), [3, ['D0', 'D1', 'D2']])
+
+    def test_sequential_inside_transaction(self):
+        """Dans une transaction, les fonctions restent dans le thread appelant."""
+        from django.db import transaction
+
+        with transaction.atomic():
+            self._create_departments(1)
+            results = concurrency.run_concurrently(self._count_in_thread, self._count_in_thread)
+        self.assertEqual(results, [(threading.get_ident(), 1)] * 2)
+
+    def test_statistics_and_instrumentation_across_threads(self):
+        """Les requêtes des threads du pool sont comptées pour la requête HTTP."""
+        self._create_departments(2)
+        recorder = instrumentation.QueryRecorder()
+        token = instrumentation._recorder.set(recorder)
+        try:
+            stats = (
+                StatisticsBuilder(Department.objects.all())
+                .count('total')
+                .group_by('by_code', 'code')
+                .build()
+            )
+        finally:
+            instrumentation._recorder.reset(token)
+        self.assertEqual(stats['total'], 2)
+        self.assertEqual(len(stats['by_code']), 2)
+        self.assertEqual(recorder.count, 2)
+
+
+class AsyncAPIViewTest(APITestCase):
+    """Tests pour les vues DRF asynchrones (dashboard) servies en ASGI."""
+
+    def setUp(self):
+        """Configuration initiale."""
+        self.user = CustomUser.objects.create_user(
+            username='admin',
+            email='admin@example.com',
+            password='testpass123',
+            role='admin',
+            is_staff=True
+        )
+        self.token = RefreshToken.for_user(self.user).access_token
+
+    def test_async_client_with_async_middleware(self):
+        """En ASGI, authentification, instrumentation et rendu fonctionnent."""
+        response = async_to_sync(AsyncClient().get)(
+            '/api/dashboard/overview/', headers={'Authorization': f'Bearer {self.token}'}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        body = response.json()
+        self.assertIn('recent_activities', body)
+        self.assertIn('total', body['statistics']['employees'])
+        self.assertRegex(response['Server-Timing'], r'desc="[1-9]\d* queries"')
+
+    def test_authentication_and_permissions(self):
+        """Les classes d'authentification et de permission de DRF s'appliquent."""
+        client = AsyncClient()
+        response = async_to_sync(client.get)('/api/dashboard/metrics/aggregated/')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        employee = CustomUser.objects.create_user(
+            username='employee', email='employee@example.com', password='testpass123'
+        )
+        token = RefreshToken.for_user(employee).access_token
+        headers = {'Authorization': f'Bearer {token}'}
+        response = async_to_sync(client.get)(
+            '/api/dashboard/metrics/aggregated/', headers=headers
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # Écriture refusée par IsAdminOrHR, puis méthode absente pour un admin
+        response = async_to_sync(client.post)(
+            '/api/dashboard/metrics/aggregated/', headers=headers
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        response = async_to_sync(client.post)(
+            '/api/dashboard/metrics/aggregated/',
+            headers={'Authorization': f'Bearer {self.token}'},
+        )
+        self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+    @override_settings(RESPONSE_CACHE_ENABLED=True)
+    def test_async_view_response_cache(self):
+        """Le cache des réponses s'applique aussi aux méthodes asynchrones."""
+        from dashboard import counters
+
+        # Compteurs initialisés : leur création invaliderait le cache
+        counters.reconcile()
+        cache.clear()
+        self.client.force_authenticate(user=self.user)
+        first = self.client.get('/api/dashboard/overview/')
+        second = self.client.get('/api/dashboard/overview/')
+        self.assertEqual(first['X-Cache'], 'MISS')
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(first.json(), second.json())
+
+
+class SQLiteProfileTest(TransactionTestCase):
+    """Tests pour le moteur SQLite réglé (backend.sqlite)."""
+
+    def test_connection_pragmas(self):
+        """Les pragmas du profil sont appliqués à la connexion."""
+        from django.db import connection
+
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA synchronous')
+            self.assertEqual(cursor.fetchone()[0], 1)  # NORMAL
+            cursor.execute('PRAGMA busy_timeout')
+            self.assertGreater(cursor.fetchone()[0], 0)
+        self.assertEqual(connection.transaction_mode, 'IMMEDIATE')
+
+    def test_write_lock_held_for_transaction(self):
+        """Une transaction détient le verrou d'écriture jusqu'au commit ou rollback."""
+        from django.db import connection, transaction
+
+        from backend.sqlite.base import write_lock
+
+        lock = write_lock(connection.settings_dict['NAME'])
+        with transaction.atomic():
+            Department.objects.create(
+                name='D', code='D', description='', location='', budget=0
+            )
+            self.assertTrue(lock.locked())
+        self.assertFalse(lock.locked())
+
+        with self.assertRaises(ValueError):
+            with transaction.atomic():
+                self.assertTrue(lock.locked())
+                raise ValueError
+        self.assertFalse(lock.locked())
+
+
+@override_settings(DATABASE_REPLICAS=['replica'])
+class ReplicaRouterTest(SimpleTestCase):
+    """Tests pour le routage des lectures vers les réplicas."""
+
+    def setUp(self):
+        self.router = replicas.ReplicaRouter()
+        patcher = mock.patch('backend.replicas.replica_lag', return_value=0.0)
+        self.replica_lag = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_reads_on_replica_only_when_allowed(self):
+        """Hors contexte autorisé, les lectures restent sur la base par défaut."""
+        self.assertIsNone(self.router.db_for_read(Department))
+        with replicas.read_only():
+            self.assertEqual(self.router.db_for_read(Department), 'replica')
+            self.assertEqual(self.router.db_for_write(Department), 'default')
+            # Lecture de ses propres écritures
+            self.assertIsNone(self.router.db_for_read(Department))
+        self.assertFalse(self.router.allow_migrate('replica', 'department'))
+
+    def test_lagging_or_unreachable_replica_falls_back(self):
+        """Un réplica en retard ou injoignable est écarté."""
+        with replicas.read_only():
+            self.replica_lag.return_value = 60.0
+            self.assertEqual(self.router.db_for_read(Department), 'default')
+            self.replica_lag.return_value = None
+            self.assertEqual(self.router.db_for_read(Department), 'default')
+
+
+@override_settings(DATABASE_REPLICAS=['replica'], DATABASE_REPLICA_PIN_SECONDS=30)
+class ReplicaRoutingMiddlewareTest(TransactionTestCase):
+    """Tests pour l'épinglage sur la base primaire après une écriture."""
+
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(
+            username='admin',
+            email='admin@example.com',
+            password='testpass123',
+            role='admin',
+            is_staff=True
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        # Le réplica « choisi » est la base de test elle-même
+        patcher = mock.patch('backend.replicas.choose_replica', return_value='default')
+        self.choose_replica = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_reads_routed_then_pinned_after_write(self):
+        response = self.client.get('/api/department/departments/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(self.choose_replica.called)
+        self.assertNotIn(replicas.PIN_COOKIE, response.cookies)
+
+        response = self.client.post('/api/department/departments/', {
+            'name': 'Finance', 'code': 'FIN', 'description': '', 'location': 'Paris', 'budget': 0,
+        })
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertIn(replicas.PIN_COOKIE, response.cookies)
+        self.assertEqual(response[replicas.PIN_HEADER], response.cookies[replicas.PIN_COOKIE].value)
+
+        # Le cookie est renvoyé : lectures sur la base primaire
+        self.choose_replica.reset_mock()
+        self.client.get('/api/department/departments/')
+        self.assertFalse(self.choose_replica.called)
+
+        # Sans cookie mais avec l'en-tête
+        self.client.cookies.clear()
+        self.client.get(
+            '/api/department/departments/',
+            HTTP_X_DB_PIN=response[replicas.PIN_HEADER],
+        )
+        self.assertFalse(self.choose_replica.called)
+        self.client.get('/api/department/departments/')
+        self.assertTrue(self.choose_replica.called)
+
+
+class SparseFieldsetTest(APITestCase):
+    """Tests pour `?fields=`, `?exclude=` et `?expand=`."""
+
+    def setUp(self):
+        """Configuration initiale."""
+        self.client = APIClient()
+        self.user = CustomUser.objects.create_user(
+            username='hr',
+            email='hr@example.com',
+            password='testpass123',
+            role='hr_manager'
+        )
+        self.client.force_authenticate(user=self.user)
+        department = Department.objects.create(
+            name='IT', code='IT001', location='Paris', budget=100000.00
+        )
+        self.manager = None
+        for index in range(3):
+            self.manager = Employee.objects.create(
+                first_name=f'Jean{index}',
+                last_name='Doe',
+                email=f'doe{index}@example.com',
+                date_of_birth=date(1990, 1, 1),
+                gender=Employee.GENDER_MALE,
+                employee_id=f'EMP{index:03d}',
+                hire_date=date(2020, 1, 1),
+                department=department,
+                manager=self.manager,
+                salary=50000.00,
+            )
+
+    def test_fields_returns_a_single_narrow_query(self):
+        """Seuls les champs demandés sont renvoyés, par une requête sans jointure."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/employee/employees/?fields=id,first_name')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        for item in response.data['results']:
+            self.assertEqual(set(item), {'id', 'first_name'})
+        # Agrégat de l'ETag (backend.conditional) puis la page elle-même
+        self.assertEqual(len(queries), 2)
+        self.assertNotIn('JOIN', queries[1]['sql'])
+
+    def test_excluded_method_fields_are_not_computed(self):
+        """Un champ calculé exclu n'appelle pas sa méthode."""
+        from employee.serializers.employee_serializer import EmployeeSerializer
+
+        with mock.patch.object(EmployeeSerializer, 'get_age') as get_age:
+            response = self.client.get(
+                f'/api/employee/employees/{self.manager.pk}/?exclude=age,subordinates_count'
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('age', response.data)
+        self.assertNotIn('subordinates_count', response.data)
+        self.assertIn('years_of_service', response.data)
+        get_age.assert_not_called()
+
+    def test_expand_nests_related_object(self):
+        """`?expand=` remplace la clé étrangère par l'objet imbriqué."""
+        response = self.client.get(
+            '/api/employee/employees/?fields=id&expand=manager&ordering=first_name'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        first, second = response.data['results'][:2]
+        self.assertIsNone(first['manager'])
+        self.assertEqual(second['manager']['full_name'], 'Jean0 Doe')
+        self.assertEqual(second['manager']['department_name'], 'IT')
+
+    def test_unused_annotations_are_dropped(self):
+        """Les annotations des compteurs non demandés ne sont pas calculées."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/department/departments/?fields=id,name')
+        self.assertEqual(response.data['results'][0], {'id': mock.ANY, 'name': 'IT'})
+        self.assertNotIn('employee_employee', queries[-1]['sql'])
+
+    def test_writes_ignore_selection(self):
+        """En écriture, la sélection est ignorée (tous les champs sont validés)."""
+        response = self.client.post('/api/department/departments/?fields=id', {
+            'name': 'Finance', 'code': 'FIN', 'location': 'Paris', 'budget': 0,
+        })
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['code'], 'FIN')
+
+
+class ConditionalRequestTest(APITestCase):
+    """Tests pour les ETag, `304 Not Modified` et `If-Match`."""
+
+    def setUp(self):
+        """Configuration initiale."""
+        cache.clear()
+        self.client = APIClient()
+        self.user = CustomUser.objects.create_user(
+            username='hr',
+            email='hr@example.com',
+            password='testpass123',
+            role='hr_manager'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.department = Department.objects.create(
+            name='IT', code='IT001', location='Paris', budget=100000.00
+        )
+        self.url = f'/api/department/departments/{self.department.pk}/'
+
+    def test_list_not_modified_without_serializing(self):
+        """Un ETag de liste inchangé renvoie une 304 sans sérialiser."""
+        from department.serializers import DepartmentListSerializer
+
+        first = self.client.get('/api/department/departments/')
+        self.assertIn('ETag', first)
+        self.assertNotIn('Last-Modified', first)
+        with mock.patch.object(DepartmentListSerializer, 'to_representation') as rendered:
+            second = self.client.get(
+                '/api/department/departments/', HTTP_IF_NONE_MATCH=first['ETag']
+            )
+        self.assertEqual(second.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(second['ETag'], first['ETag'])
+        rendered.assert_not_called()
+
+    def test_if_modified_since_ignored_after_delete(self):
+        """Une suppression ne laisse pas passer de 304 via If-Modified-Since."""
+        Department.objects.create(name='RH', code='RH001', location='Lyon', budget=0)
+        first = self.client.get('/api/department/departments/')
+        Department.objects.filter(code='RH001').delete()
+        response = self.client.get(
+            '/api/department/departments/',
+            HTTP_IF_MODIFIED_SINCE='Fri, 01 Jan 2100 00:00:00 GMT',
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertNotEqual(response['ETag'], first['ETag'])
+
+    def test_list_etag_changes_with_data_and_query(self):
+        """L'ETag change avec les données, les paramètres et l'utilisateur."""
+        etag = self.client.get('/api/department/departments/')['ETag']
+        self.assertNotEqual(
+            self.client.get('/api/department/departments/?fields=id')['ETag'], etag
+        )
+        Department.objects.create(name='RH', code='RH001', location='Lyon', budget=0)
+        response = self.client.get(
+            '/api/department/departments/', HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+        etag = response['ETag']
+        other = CustomUser.objects.create_user(
+            username='other', email='other@example.com', password='testpass123',
+            role='hr_manager'
+        )
+        self.client.force_authenticate(user=other)
+        self.assertNotEqual(self.client.get('/api/department/departments/')['ETag'], etag)
+
+    def test_detail_etag_follows_related_changes(self):
+        """Le détail d'un employé change quand son département est renommé."""
+        employee = Employee.objects.create(
+            first_name='Jean', last_name='Doe', email='jean@example.com',
+            date_of_birth=date(1990, 1, 1), gender=Employee.GENDER_MALE,
+            employee_id='EMP001', hire_date=date(2020, 1, 1),
+            department=self.department, salary=50000.00,
+        )
+        url = f'/api/employee/employees/{employee.pk}/'
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(
+            self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code,
+            status.HTTP_304_NOT_MODIFIED,
+        )
+        self.department.name = 'Informatique'
+        self.department.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['department_name'], 'Informatique')
+
+    def test_if_match_rejects_stale_update(self):
+        """`If-Match` périmé : 412 ; à jour : la modification passe."""
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.patch(self.url, {'location': 'Lyon'}, HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+        response = self.client.patch(self.url, {'location': 'Nice'}, HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.department.refresh_from_db()
+        self.assertEqual(self.department.location, 'Lyon')
+
+    def test_if_match_accepts_weakened_etag(self):
+        """Un ETag affaibli par la compression (W/) reste accepté par If-Match."""
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.patch(self.url, {'location': 'Lyon'}, HTTP_IF_MATCH=f'W/{etag}')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_if_match_ignores_unrelated_changes(self):
+        """Une écriture sur un autre objet ne provoque pas de faux conflit."""
+        etag = self.client.get(self.url)['ETag']
+        Department.objects.create(name='RH', code='RH001', location='Lyon', budget=0)
+        response = self.client.patch(self.url, {'location': 'Lyon'}, HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_disabled_without_tracked_namespace(self):
+        """La messagerie, non suivie par le cache, n'émet pas d'ETag."""
+        response = self.client.get('/api/messages/conversations/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('ETag', response)
+
+
+
+@override_settings(AUTH_CACHE_ENABLED=True)
+class CachedJWTAuthenticationTest(APITestCase):
+    """Tests pour l'authentification JWT avec cache de l'utilisateur."""
+
+    def setUp(self):
+        """Configuration initiale."""
+        cache.clear()
+        self.employee = Employee.objects.create(
+            first_name='Jean',
+            last_name='Doe',
+            email='jean.doe@example.com',
+            date_of_birth=date(1990, 1, 1),
+            gender=Employee.GENDER_MALE,
+            employee_id='EMP001',
+            hire_date=date(2020, 1, 1),
+            department=Department.objects.create(name='IT', code='IT001', budget=100000.00),
+            salary=50000.00,
+            status=Employee.STATUS_ACTIVE,
+        )
+        self.user = CustomUser.objects.create_user(
+            username='jean',
+            email='jean@example.com',
+            password='testpass123',
+            role='employee',
+            employee=self.employee,
+        )
+        self.request_token = str(RefreshToken.for_user(self.user).access_token)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.request_token}')
+        self.url = '/api/employee/employees/'
+
+    def _user_queries(self, url=None):
+        """Requêtes SQL sur la table des utilisateurs pendant un GET."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url or self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        table = CustomUser._meta.db_table
+        return [q['sql'] for q in queries.captured_queries if f'"{table}"' in q['sql']]
+
+    def test_user_read_from_cache(self):
+        """Seule la première requête relit l'utilisateur en base."""
+        self.assertEqual(len(self._user_queries()), 1)
+        self.assertEqual(self._user_queries(), [])
+
+    def test_employee_scope_without_employee_query(self):
+        """Le filtrage par employé lié n'a besoin que de `employee_id`."""
+        self._user_queries()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        self.assertEqual([row['id'] for row in response.data['results']], [self.employee.pk])
+        # Ni l'utilisateur ni son employé ne sont relus par clé primaire
+        lookups = [
+            q['sql'] for q in queries.captured_queries
+            if f'"id" = {self.employee.pk} LIMIT' in q['sql']
+            or f'"{CustomUser._meta.db_table}"' in q['sql']
+        ]
+        self.assertEqual(lookups, [])
+
+    def test_invalidated_on_save_and_deactivation(self):
+        """Un changement de rôle puis une désactivation sont pris en compte."""
+        self._user_queries()
+        self.user.role = 'hr_manager'
+        self.user.save()
+        self.assertEqual(len(self._user_queries()), 1)
+
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_invalidated_on_employee_delete(self):
+        """Supprimer l'employé lié retire l'utilisateur du cache."""
+        self._user_queries()
+        self.employee.delete()
+        self.assertEqual(len(self._user_queries()), 1)
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['results'], [])
+
+    def test_password_never_cached(self):
+        """Le mot de passe reste différé mais `check_password` fonctionne."""
+        from backend.authentication import CachedJWTAuthentication
+
+        authentication = CachedJWTAuthentication()
+        token = authentication.get_validated_token(self.request_token)
+        authentication.get_user(token)
+        user = authentication.get_user(token)
+        self.assertIn('password', user.get_deferred_fields())
+        self.assertTrue(user.check_password('testpass123'))
+
+class RenderingTest(SimpleTestCase):
+    """Tests pour le renderer / parser JSON rapides et le flux JSON."""
+
+    def test_fast_renderer_matches_drf(self):
+        """La sortie décodée est identique à celle du renderer de DRF."""
+        from django.utils.translation import gettext_lazy
+        from rest_framework.renderers import JSONRenderer
+
+        from backend.renderers import FastJSONRenderer
+
+        data = {
+            'amount': Decimal('12.50'),
+            'at': datetime(2024, 5, 1, 8, 30, tzinfo=dt_timezone.utc),
+            'day': date(2024, 5, 1),
+            'label': gettext_lazy('Actif'),
+            'by_id': {1: 'un'},
+            'items': [{'id': 1, 'name': 'Énergie'}],
+        }
+        self.assertEqual(
+            json.loads(FastJSONRenderer().render(data)),
+            json.loads(JSONRenderer().render(data)),
+        )
+        self.assertEqual(FastJSONRenderer().render(None), b'')
+
+    def test_fast_parser(self):
+        """Le parser décode le JSON et signale un corps invalide."""
+        import io
+
+        from rest_framework.exceptions import ParseError
+
+        from backend.renderers import FastJSONParser
+
+        parser = FastJSONParser()
+        self.assertEqual(parser.parse(io.BytesIO(b'{"a": [1, 2]}')), {'a': [1, 2]})
+        with self.assertRaises(ParseError):
+            parser.parse(io.BytesIO(b'{"a":'))
+
+@override_settings(COMPRESSION_MIN_SIZE=1024)
+class CompressionMiddlewareTest(SimpleTestCase):
+    """Tests pour la compression négociée des réponses."""
+
+    def _process(self, response, accept='gzip, deflate, br'):
+        from django.test import RequestFactory
+
+        from backend.compression import CompressionMiddleware
+
+        request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING=accept)
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def _json(self, size=4000):
+        from django.http import HttpResponse
+
+        response = HttpResponse(
+            json.dumps([{'name': 'Jean Doe'}] * (size // 20)),
+            content_type='application/json',
+        )
+        response['ETag'] = '"abc"'
+        return response
+
+    def test_brotli_preferred_then_gzip(self):
+        """Brotli si accepté, sinon gzip ; ETag affaibli et Vary ajouté."""
+        import gzip
+
+        import brotli
+
+        original = self._json().content
+        response = self._process(self._json())
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(brotli.decompress(response.content), original)
+        self.assertEqual(response['ETag'], 'W/"abc"')
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+        response = self._process(self._json(), accept='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), original)
+
+    def test_quality_values_respected(self):
+        """`q=0` refuse un encodage ; le poids le plus fort l'emporte."""
+        from backend.compression import choose_encoding
+
+        self.assertEqual(choose_encoding('gzip, br;q=0'), 'gzip')
+        self.assertEqual(choose_encoding('br;q=0.5, gzip;q=0.8'), 'gzip')
+        self.assertEqual(choose_encoding('br;q=0.8, gzip'), 'gzip')
+        self.assertEqual(choose_encoding('gzip;q=0.5, br'), 'br')
+        self.assertEqual(choose_encoding('*'), 'br')
+        self.assertEqual(choose_encoding('*;q=0, gzip;q=0.1'), 'gzip')
+        self.assertIsNone(choose_encoding('br;q=0, gzip;q=0'))
+        self.assertIsNone(choose_encoding('identity, deflate'))
+
+        response = self._process(self._json(), accept='br;q=0, gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+
+    def test_small_or_binary_responses_untouched(self):
+        """Sous le seuil, ou pour un type non textuel, rien n'est compressé."""
+        from django.http import HttpResponse
+
+        self.assertFalse(self._process(self._json(size=200)).has_header('Content-Encoding'))
+        image = HttpResponse(b'\x89PNG' * 1000, content_type='image/png')
+        self.assertFalse(self._process(image).has_header('Content-Encoding'))
+        self.assertFalse(self._process(self._json(), accept='identity').has_header('Content-Encoding'))
+
+    def test_streaming_compressed_except_event_stream(self):
+        """Un flux JSON est compressé au fil de l'eau, pas un flux SSE."""
+        import brotli
+        from django.http import StreamingHttpResponse
+
+        from backend.export import iter_jsonl
+
+        rows = [(i, 'Jean Doe') for i in range(2000)]
+        stream = StreamingHttpResponse(
+            iter_jsonl(['id', 'name'], iter(rows), chunk_size=100),
+            content_type='application/x-ndjson',
+        )
+        response = self._process(stream)
+        self.assertEqual(response['Content-Encoding'], 'br')
+        lines = brotli.decompress(b''.join(response.streaming_content)).splitlines()
+        self.assertEqual([tuple(json.loads(line).values()) for line in lines], rows)
+
+        events = StreamingHttpResponse(iter([b'data: 1\n\n']), content_type='text/event-stream')
+        self.assertFalse(self._process(events).has_header('Content-Encoding'))
+
+
+class ExportTest(APITestCase):
+    """Tests pour les exports en flux (CSV, JSON Lines, XLSX)."""
+
+    def setUp(self):
+        """Configuration initiale."""
+        self.client = APIClient()
+        self.hr = CustomUser.objects.create_user(
+            username='hr', email='hr@example.com', password='testpass123', role='hr_manager'
+        )
+        department = Department.objects.create(
+            name='IT', code='IT001', location='Paris', budget=100000.00
+        )
+        for index in range(5):
+            Employee.objects.create(
+                first_name=f'Zoé{index}',
+                last_name='Doe',
+                email=f'doe{index}@example.com',
+                date_of_birth=date(1990, 1, 1),
+                gender=Employee.GENDER_FEMALE,
+                employee_id=f'EMP{index:03d}',
+                hire_date=date(2020, 1, 1),
+                department=department,
+                salary=Decimal('50000.50'),
+            )
+
+    def _content(self, response):
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content)
+
+    def test_csv_export_uses_one_narrow_query(self):
+        """Toutes les lignes, en une requête `values()` par bloc, sans serializer."""
+        import csv
+        import io
+
+        self.client.force_authenticate(user=self.hr)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/employee/employees/export/csv/?ordering=employee_id')
+            content = self._content(response)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('attachment; filename="employes-', response['Content-Disposition'])
+        rows = list(csv.DictReader(io.StringIO(content.decode('utf-8-sig'))))
+        self.assertEqual([row['employee_id'] for row in rows], [f'EMP{i:03d}' for i in range(5)])
+        self.assertEqual(rows[0]['first_name'], 'Zoé0')
+        self.assertEqual(rows[0]['department__name'], 'IT')
+        self.assertEqual(rows[0]['salary'], '50000.50')
+        self.assertEqual(len(queries), 1)
+
+    def test_export_is_streamed_by_chunk(self):
+        """Un bloc d'octets par bloc de lignes."""
+        from backend.export import iter_csv, iter_jsonl
+
+        rows = [(index, f'nom{index}') for index in range(7)]
+        self.assertEqual(len(list(iter_csv(['id', 'name'], iter(rows), chunk_size=3))), 4)
+        lines = b''.join(iter_jsonl(['id', 'name'], iter(rows), chunk_size=3)).splitlines()
+        self.assertEqual([json.loads(line) for line in lines][6], {'id': 6, 'name': 'nom6'})
+
+    def test_jsonl_export_respects_fields_and_filters(self):
+        """`?fields=` et les filtres de la liste s'appliquent à l'export."""
+        self.client.force_authenticate(user=self.hr)
+        response = self.client.get(
+            '/api/employee/employees/export/jsonl/?fields=employee_id,salary&search=Zoé3'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        lines = self._content(response).splitlines()
+        self.assertEqual([json.loads(line) for line in lines], [
+            {'employee_id': 'EMP003', 'salary': '50000.50'},
+        ])
+        response = self.client.get('/api/employee/employees/export/jsonl/?fields=password')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_xlsx_export_is_a_valid_workbook(self):
+        """Archive ZIP lisible, feuille avec en-tête, textes et nombres."""
+        import io
+        import zipfile
+        from xml.etree import ElementTree
+
+        self.client.force_authenticate(user=self.hr)
+        response = self.client.get(
+            '/api/employee/employees/export/xlsx/?fields=employee_id,first_name,salary'
+        )
+        archive = zipfile.ZipFile(io.BytesIO(self._content(response)))
+        self.assertIsNone(archive.testzip())
+        namespace = {'s': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'}
+        sheet = ElementTree.fromstring(archive.read('xl/worksheets/sheet1.xml'))
+        rows = sheet.findall('s:sheetData/s:row', namespace)
+        self.assertEqual(len(rows), 6)
+        header = [cell.findtext('s:is/s:t', namespaces=namespace) for cell in rows[0]]
+        self.assertEqual(header, ['employee_id', 'first_name', 'salary'])
+        self.assertEqual(rows[1][2].findtext('s:v', namespaces=namespace), '50000.50')
+
+    def test_export_respects_queryset_scope(self):
+        """Un utilisateur n'exporte que les lignes que la liste lui montre."""
+        from support.models import SupportTicket
+
+        other = CustomUser.objects.create_user(
+            username='other', email='other@example.com', password='testpass123'
+        )
+        SupportTicket.objects.create(title='Le mien', description='.', created_by=other)
+        SupportTicket.objects.create(title='Autre', description='.', created_by=self.hr)
+        self.client.force_authenticate(user=other)
+        response = self.client.get('/api/support/support-tickets/export/jsonl/?fields=title')
+        lines = self._content(response).splitlines()
+        self.assertEqual([json.loads(line) for line in lines], [{'title': 'Le mien'}])
+
+    def test_asgi_export_is_read_chunk_by_chunk(self):
+        """En ASGI, le flux est asynchrone et chaque bloc est produit à la demande."""
+        from backend import export
+        from employee.viewsets.employee_viewset import EmployeeViewSet
+
+        produced = []
+
+        def encoder(header, rows, chunk_size):
+            for chunk in export.iter_csv(header, rows, chunk_size):
+                produced.append(chunk)
+                yield chunk
+
+        async def read(response):
+            chunks = []
+            async for chunk in response.streaming_content:
+                # Les blocs suivants ne sont pas encore encodés
+                self.assertEqual(len(produced), len(chunks) + 1)
+                chunks.append(chunk)
+            return chunks
+
+        token = RefreshToken.for_user(self.hr).access_token
+        with mock.patch.dict(export.ENCODERS, csv=encoder), mock.patch.object(
+            EmployeeViewSet, 'export_chunk_size', 2
+        ):
+            response = async_to_sync(AsyncClient().get)(
+                '/api/employee/employees/export/csv/?fields=employee_id&ordering=employee_id',
+                headers={'Authorization': f'Bearer {token}'},
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertTrue(response.is_async)
+            chunks = async_to_sync(read)(response)
+        self.assertEqual(len(chunks), 4)
+        self.assertEqual(
+            b''.join(chunks).decode('utf-8-sig').split(),
+            ['employee_id'] + [f'EMP{index:03d}' for index in range(5)],
+        )
+
+    def test_export_requires_authentication(self):
+        response = self.client.get('/api/login/history/export/csv/')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -19,6 +19,9 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
+from django.contrib.staticfiles.urls import staticfiles_urlpatterns
+
+from backend.views import event_stream, healthz, metrics
 
 urlpatterns = [
     path("admin/", admin.site.urls),
@@ -33,8 +36,13 @@ urlpatterns = [
     path("api/settings/", include("settings.urls")),
     path("api/support/", include("support.urls")),
     path("api/messages/", include("messaging.urls")),
+    path("api/events/", event_stream, name="event-stream"),
+    path("metrics", metrics, name="metrics"),
+    path("healthz", healthz, name="healthz"),
 ]
 
-# Servir les fichiers média en développement
+# Servir les fichiers média et statiques en développement (runserver sert
+# les statiques de lui-même, pas gunicorn / uvicorn)
 if settings.DEBUG:
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+    urlpatterns += staticfiles_urlpatterns()
@@ -0,0 +1,134 @@
+"""
+Vues transverses du projet.
+
+`event_stream` diffuse les événements temps réel (`backend.events`) en
+Server-Sent Events. La connexion reste ouverte : servir l'application en
+ASGI (`backend.asgi`) pour qu'une connexion n'immobilise pas un worker.
+
+`metrics` expose les métriques Prometheus (`backend.metrics`) et `healthz`
+vérifie la connexion à la base, sans authentification DRF ni gabarit.
+"""
+
+import hmac
+import json
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import DatabaseError, connections
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+
+from backend import events, metrics as metrics_registry
+from backend.authentication import CachedJWTAuthentication
+
+
+def _authenticate(request):
+    """
+    Authentifie la requête par jeton JWT.
+
+    `EventSource` ne permet pas d'envoyer d'en-tête : le jeton d'accès est
+    alors accepté en paramètre `?token=`. Retourne `(utilisateur, expiration)`
+    ou `(None, None)`.
+    """
+    authentication = CachedJWTAuthentication()
+    try:
+        raw_token = request.GET.get("token")
+        if raw_token:
+            token = authentication.get_validated_token(raw_token)
+            return authentication.get_user(token), token.get("exp")
+        result = authentication.authenticate(request)
+    except (InvalidToken, AuthenticationFailed):
+        return None, None
+    if result is None:
+        return None, None
+    user, token = result
+    return user, token.get("exp")
+
+
+def _format(message):
+    """Met en forme un événement au format SSE."""
+    event = json.loads(message)
+    data = json.dumps(event["data"])
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {data}\n\n"
+
+
+async def _stream(subscription, expires_at):
+    heartbeat = getattr(settings, "EVENTS_HEARTBEAT_SECONDS", 15)
+    try:
+        yield f"retry: {getattr(settings, 'EVENTS_RETRY_MS', 3000)}\n\n"
+        while True:
+            timeout = heartbeat
+            if expires_at is not None:
+                remaining = expires_at - time.time()
+                if remaining <= 0:
+                    # Jeton expiré : le client se reconnecte avec un jeton neuf
+                    yield "event: token.expired\ndata: {}\n\n"
+                    return
+                timeout = min(timeout, remaining)
+            message = await subscription.get(timeout=timeout)
+            if message is None:
+                # Commentaire SSE : garde la connexion ouverte derrière les proxys
+                yield ": ping\n\n"
+                continue
+            yield _format(message)
+    finally:
+        subscription.close()
+
+
+async def event_stream(request):
+    """
+    Flux d'événements de l'utilisateur connecté.
+    GET /api/events/?token=<jeton d'accès>
+
+    Événements : `message.created`, `notification.created`,
+    `activity.created` (admins / RH), `token.expired`.
+    """
+    user, expires_at = await sync_to_async(_authenticate)(request)
+    if user is None or not user.is_active:
+        return JsonResponse(
+            {"detail": "Authentification requise."}, status=401
+        )
+
+    subscription = events.get_broker().subscribe(events.channels_for(user))
+    response = StreamingHttpResponse(
+        _stream(subscription, expires_at), content_type="text/event-stream"
+    )
+    response["Cache-Control"] = "no-cache"
+    # Désactive la mise en tampon de nginx pour ce flux
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+@require_GET
+def metrics(request):
+    """
+    Métriques au format d'exposition Prometheus.
+    GET /metrics
+
+    Si `METRICS_TOKEN` est défini, l'en-tête `Authorization: Bearer <jeton>`
+    est exigé.
+    """
+    token = getattr(settings, "METRICS_TOKEN", "")
+    if token:
+        provided = request.headers.get("Authorization", "").removeprefix("Bearer ")
+        if not hmac.compare_digest(provided.encode(), token.encode()):
+            return HttpResponse(status=401)
+    body, content_type = metrics_registry.exposition()
+    return HttpResponse(body, content_type=content_type)
+
+
+@require_GET
+def healthz(request):
+    """
+    Sonde de disponibilité : une requête `SELECT 1` sur la base.
+    GET /healthz
+    """
+    try:
+        with connections["default"].cursor() as cursor:
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+    except DatabaseError:
+        return JsonResponse({"status": "unavailable", "database": False}, status=503)
+    return JsonResponse({"status": "ok", "database": True})
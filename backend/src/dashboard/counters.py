@@ -0,0 +1,318 @@
+"""
+Compteurs du dashboard entretenus par deltas.
+
+Chaque compteur associe une métrique (`DashboardMetric.metric_type`) à un
+modèle, à un filtre SQL (utilisé pour la réconciliation) et au prédicat Python
+équivalent (utilisé par les signaux). À chaque sauvegarde ou suppression, les
+signaux comparent le prédicat avant/après et appliquent un `UPDATE value =
+value ± 1` : la lecture du dashboard devient une simple lecture des lignes
+`DashboardMetric`.
+
+Les compteurs à fenêtre temporelle (`new_employees`, `upcoming_tasks`, ...)
+changent sans écriture, lorsque des lignes sortent de la fenêtre : `read()`
+les recompte à chaque lecture (une agrégation indexée par modèle) et corrige la valeur stockée.
+Les opérations qui contournent les signaux (`QuerySet.update()`,
+`bulk_create()`, SQL brut) sont recalées par `reconcile()` (commande
+`reconcile_dashboard_metrics`). Pour les traitements de masse passant par
+l'ORM (purge, import), `suspended()` coupe les deltas et recompte une seule
+fois à la fin.
+"""
+
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from backend.cache import invalidate_on_commit
+
+from dashboard.models.dashboard_metric import DashboardMetric
+from department.models import Department
+from employee.models.employee import Employee
+from recruitment.models.candidate import Candidate
+from recruitment.models.job_position import JobPosition
+from recruitment.models.talent_request import TalentRequest
+from schedule.models.meeting import Meeting
+from schedule.models.schedule_task import Schedule
+
+
+class Counter:
+    """Définition d'un compteur : modèle, filtre SQL et prédicat équivalent."""
+
+    def __init__(
+        self, metric_type, model, fields=(), condition=None, matches=None, windowed=False
+    ):
+        self.metric_type = metric_type
+        self.model = model
+        # Fenêtre relative à « maintenant » : recompté à chaque lecture
+        self.windowed = windowed
+        # Champs lus par le prédicat
+        self.fields = tuple(fields)
+        # Callables pour permettre les fenêtres relatives à « maintenant »
+        self.condition = condition or Q
+        self.matches = matches or (lambda values: True)
+
+    def count(self):
+        """Valeur exacte du compteur (requête COUNT)."""
+        return self.model.objects.filter(self.condition()).count()
+
+
+def _week_ago():
+    return timezone.now() - timedelta(days=7)
+
+
+def _after(value, bound):
+    if value is None:
+        return False
+    if isinstance(value, datetime) and timezone.is_naive(value):
+        value = timezone.make_aware(value)
+    return value >= bound
+
+
+_ACTIVE_CANDIDATE_EXCLUDED = (Candidate.STATUS_REJECTED, Candidate.STATUS_HIRED)
+
+COUNTERS = {
+    counter.metric_type: counter
+    for counter in [
+        # Employés
+        Counter("total_employees", Employee),
+        Counter(
+            "active_employees",
+            Employee,
+            fields=("status",),
+            condition=lambda: Q(status=Employee.STATUS_ACTIVE),
+            matches=lambda v: v["status"] == Employee.STATUS_ACTIVE,
+        ),
+        Counter(
+            "men_count",
+            Employee,
+            fields=("status", "gender"),
+            condition=lambda: Q(
+                status=Employee.STATUS_ACTIVE, gender=Employee.GENDER_MALE
+            ),
+            matches=lambda v: v["status"] == Employee.STATUS_ACTIVE
+            and v["gender"] == Employee.GENDER_MALE,
+        ),
+        Counter(
+            "women_count",
+            Employee,
+            fields=("status", "gender"),
+            condition=lambda: Q(
+                status=Employee.STATUS_ACTIVE, gender=Employee.GENDER_FEMALE
+            ),
+            matches=lambda v: v["status"] == Employee.STATUS_ACTIVE
+            and v["gender"] == Employee.GENDER_FEMALE,
+        ),
+        Counter(
+            "new_employees",
+            Employee,
+            fields=("created_at",),
+            condition=lambda: Q(created_at__gte=_week_ago()),
+            matches=lambda v: _after(v["created_at"], _week_ago()),
+            windowed=True,
+        ),
+        Counter(
+            "new_hires_this_week",
+            Employee,
+            fields=("hire_date",),
+            condition=lambda: Q(hire_date__gte=_week_ago().date()),
+            matches=lambda v: _after(v["hire_date"], _week_ago().date()),
+            windowed=True,
+        ),
+        # Départements
+        Counter("departments_count", Department),
+        # Recrutement
+        Counter(
+            "available_positions",
+            JobPosition,
+            fields=("status",),
+            condition=lambda: Q(status=JobPosition.STATUS_OPEN),
+            matches=lambda v: v["status"] == JobPosition.STATUS_OPEN,
+        ),
+        Counter(
+            "urgent_positions",
+            JobPosition,
+            fields=("status", "urgency"),
+            condition=lambda: Q(status=JobPosition.STATUS_OPEN, urgency=True),
+            matches=lambda v: v["status"] == JobPosition.STATUS_OPEN
+            and bool(v["urgency"]),
+        ),
+        Counter("total_candidates", Candidate),
+        Counter(
+            "active_candidates",
+            Candidate,
+            fields=("status",),
+            condition=lambda: ~Q(status__in=_ACTIVE_CANDIDATE_EXCLUDED),
+            matches=lambda v: v["status"] not in _ACTIVE_CANDIDATE_EXCLUDED,
+        ),
+        Counter("talent_requests", TalentRequest),
+        Counter(
+            "pending_talent_requests",
+            TalentRequest,
+            fields=("status",),
+            condition=lambda: Q(status=TalentRequest.STATUS_PENDING),
+            matches=lambda v: v["status"] == TalentRequest.STATUS_PENDING,
+        ),
+        # Planning
+        Counter(
+            "upcoming_tasks",
+            Schedule,
+            fields=("completed", "scheduled_date"),
+            condition=lambda: Q(completed=False, scheduled_date__gte=timezone.now()),
+            matches=lambda v: not v["completed"]
+            and _after(v["scheduled_date"], timezone.now()),
+            windowed=True,
+        ),
+        Counter(
+            "upcoming_meetings",
+            Meeting,
+            fields=("start_time",),
+            condition=lambda: Q(start_time__gte=timezone.now()),
+            matches=lambda v: _after(v["start_time"], timezone.now()),
+            windowed=True,
+        ),
+    ]
+}
+
+
+_COUNTERS_BY_MODEL = {}
+for _counter in COUNTERS.values():
+    _COUNTERS_BY_MODEL.setdefault(_counter.model, []).append(_counter)
+
+_TRACKED_FIELDS = {
+    model: tuple(sorted({field for counter in model_counters for field in counter.fields}))
+    for model, model_counters in _COUNTERS_BY_MODEL.items()
+}
+
+
+def counters_for_model(model):
+    """Compteurs portant sur un modèle donné."""
+    return _COUNTERS_BY_MODEL.get(model, [])
+
+
+def tracked_fields(model):
+    """Champs lus par les compteurs d'un modèle."""
+    return _TRACKED_FIELDS.get(model, ())
+
+
+_state = threading.local()
+
+
+def is_suspended():
+    """Indique si les deltas sont suspendus dans le thread courant."""
+    return getattr(_state, "depth", 0) > 0
+
+
+@contextmanager
+def suspended():
+    """
+    Suspend la mise à jour des compteurs par les signaux, puis les recalcule.
+
+    Évite un `UPDATE` par ligne lors des suppressions ou écritures de masse.
+    """
+    _state.depth = getattr(_state, "depth", 0) + 1
+    try:
+        yield
+    finally:
+        _state.depth -= 1
+    if not is_suspended():
+        reconcile()
+
+
+def apply_delta(metric_type, delta):
+    """Applique un delta atomique sur la valeur stockée d'une métrique."""
+    if not delta or is_suspended():
+        return
+    updated = DashboardMetric.objects.filter(metric_type=metric_type).update(
+        value=F("value") + delta, updated_at=timezone.now()
+    )
+    if not updated:
+        # Première utilisation : la ligne est initialisée avec le comptage exact
+        reconcile([metric_type])
+    else:
+        invalidate_on_commit("dashboard")
+
+
+def reconcile(metric_types=None):
+    """
+    Recalcule les compteurs par COUNT et corrige les valeurs stockées.
+
+    Retourne un dictionnaire `{metric_type: (valeur stockée, valeur exacte)}`
+    des métriques corrigées ou créées.
+    """
+    metric_types = list(metric_types or COUNTERS)
+    stored = {
+        metric.metric_type: metric
+        for metric in DashboardMetric.objects.filter(metric_type__in=metric_types)
+    }
+    corrected = {}
+    for metric_type in metric_types:
+        value = COUNTERS[metric_type].count()
+        metric = stored.get(metric_type)
+        if metric is None:
+            DashboardMetric.objects.create(metric_type=metric_type, value=value)
+            corrected[metric_type] = (None, value)
+        elif metric.value != value:
+            DashboardMetric.objects.filter(metric_type=metric_type).update(
+                value=value, updated_at=timezone.now()
+            )
+            corrected[metric_type] = (metric.value, value)
+    if corrected:
+        invalidate_on_commit("dashboard")
+    return corrected
+
+
+def refresh_windows(metrics):
+    """
+    Recompte les compteurs à fenêtre temporelle de `metrics` (`{metric_type:
+    DashboardMetric}`, modifié en place et retourné), en une requête
+    d'agrégation par modèle, et corrige les valeurs stockées qui ont dérivé.
+    """
+    by_model, corrected = {}, False
+    for metric_type in metrics:
+        counter = COUNTERS.get(metric_type)
+        if counter is not None and counter.windowed:
+            by_model.setdefault(counter.model, []).append(counter)
+    for model, model_counters in by_model.items():
+        values = model.objects.aggregate(
+            **{
+                counter.metric_type: Count("pk", filter=counter.condition())
+                for counter in model_counters
+            }
+        )
+        for metric_type, value in values.items():
+            metric = metrics[metric_type]
+            if metric.value != value:
+                DashboardMetric.objects.filter(metric_type=metric_type).update(
+                    value=value, updated_at=timezone.now()
+                )
+                metric.value = value
+                corrected = True
+    if corrected:
+        invalidate_on_commit("dashboard")
+    return metrics
+
+
+def read(metric_types=None):
+    """
+    Lit les compteurs en une requête, initialise ceux qui manquent et
+    recompte ceux à fenêtre temporelle.
+
+    Retourne un dictionnaire `{metric_type: DashboardMetric}`.
+    """
+    metric_types = list(metric_types or COUNTERS)
+    metrics = refresh_windows(
+        {
+            metric.metric_type: metric
+            for metric in DashboardMetric.objects.filter(metric_type__in=metric_types)
+        }
+    )
+    missing = [m for m in metric_types if m not in metrics and m in COUNTERS]
+    if missing:
+        reconcile(missing)
+        metrics.update(
+            (metric.metric_type, metric)
+            for metric in DashboardMetric.objects.filter(metric_type__in=missing)
+        )
+    return metrics
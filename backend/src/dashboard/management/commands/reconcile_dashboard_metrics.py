@@ -0,0 +1,38 @@
+"""
+Commande de management pour recaler les compteurs du dashboard.
+Usage: python manage.py reconcile_dashboard_metrics [--metric total_employees ...]
+
+Corrige la dérive des compteurs entretenus par deltas après une écriture
+qui contourne les signaux (`QuerySet.update()`, `bulk_create()`, SQL brut).
+Les compteurs à fenêtre temporelle sont déjà recomptés à chaque lecture.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from dashboard import counters
+
+
+class Command(BaseCommand):
+    help = 'Recalcule les compteurs du dashboard et corrige les écarts'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--metric',
+            action='append',
+            dest='metrics',
+            help='Métrique à recaler (répétable). Par défaut : toutes.',
+        )
+
+    def handle(self, *args, **options):
+        metrics = options['metrics']
+        unknown = set(metrics or []) - set(counters.COUNTERS)
+        if unknown:
+            raise CommandError(f"Métriques inconnues : {', '.join(sorted(unknown))}")
+
+        corrected = counters.reconcile(metrics)
+
+        for metric_type, (stored, value) in sorted(corrected.items()):
+            self.stdout.write(f'  {metric_type}: {stored} -> {value}')
+        self.stdout.write(
+            self.style.SUCCESS(f'✓ {len(corrected)} compteur(s) corrigé(s)')
+        )
@@ -0,0 +1,32 @@
+"""
+Commande de management pour historiser les métriques du dashboard.
+Usage: python manage.py snapshot_dashboard_metrics [--prune]
+
+Ajoute un point horaire par métrique et met à jour les agrégats journaliers
+et mensuels. L'entrypoint Docker la lance toutes les heures
+(`DASHBOARD_SNAPSHOT_INTERVAL`).
+"""
+
+from django.core.management.base import BaseCommand
+
+from dashboard import snapshots
+
+
+class Command(BaseCommand):
+    help = "Enregistre un point d'historique pour chaque métrique du dashboard"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--prune',
+            action='store_true',
+            help='Supprimer les points au-delà de leur durée de rétention',
+        )
+
+    def handle(self, *args, **options):
+        count = snapshots.record()
+        self.stdout.write(self.style.SUCCESS(f'✓ {count} métrique(s) historisée(s)'))
+
+        if options['prune']:
+            deleted = snapshots.prune()
+            for granularity, total in deleted.items():
+                self.stdout.write(f'  {granularity}: {total} point(s) supprimé(s)')
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-17 00:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='dashboardmetric',
+            name='metric_type',
+            field=models.CharField(db_index=True, max_length=100),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.8 on 2026-10-17 00:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0003_dashboardmetric_metric_type_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MetricSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('metric_type', models.CharField(max_length=100)),
+                ('granularity', models.CharField(choices=[('hour', 'Heure'), ('day', 'Jour'), ('month', 'Mois')], max_length=10)),
+                ('bucket', models.DateTimeField()),
+                ('value', models.IntegerField()),
+                ('min_value', models.IntegerField()),
+                ('max_value', models.IntegerField()),
+            ],
+            options={
+                'verbose_name': 'Historique de métrique',
+                'verbose_name_plural': 'Historique des métriques',
+                'ordering': ['metric_type', 'granularity', 'bucket'],
+                'constraints': [models.UniqueConstraint(fields=('metric_type', 'granularity', 'bucket'), name='unique_metric_snapshot_bucket')],
+            },
+        ),
+    ]
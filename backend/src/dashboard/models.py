@@ -2,8 +2,10 @@
 
 from .models.activity import Activity
 from .models.dashboard_metric import DashboardMetric
+from .models.metric_snapshot import MetricSnapshot
 
 __all__ = [
     "Activity",
     "DashboardMetric",
+    "MetricSnapshot",
 ]
@@ -1,7 +1,9 @@
 from .activity import Activity
 from .dashboard_metric import DashboardMetric
+from .metric_snapshot import MetricSnapshot
 
 __all__ = [
     "Activity",
     "DashboardMetric",
+    "MetricSnapshot",
 ]
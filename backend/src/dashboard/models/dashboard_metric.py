@@ -6,7 +6,7 @@ from django.db import models
 class DashboardMetric(models.Model):
     """Métriques agrégées pour le tableau de bord."""
 
-    metric_type = models.CharField(max_length=100)
+    metric_type = models.CharField(max_length=100, db_index=True)
     value = models.IntegerField()
     previous_value = models.IntegerField(null=True, blank=True)
     change_percentage = models.FloatField(null=True, blank=True)
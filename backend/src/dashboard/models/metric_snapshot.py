@@ -0,0 +1,44 @@
+"""Modèle stockant l'historique des métriques du dashboard."""
+
+from django.db import models
+
+
+class MetricSnapshot(models.Model):
+    """
+    Point d'une série temporelle de métrique.
+
+    Une ligne par métrique, granularité et intervalle (`bucket` = début de
+    l'intervalle). `value` est la dernière valeur observée dans l'intervalle,
+    `min_value` / `max_value` ses extrêmes.
+    """
+
+    GRANULARITY_HOUR = "hour"
+    GRANULARITY_DAY = "day"
+    GRANULARITY_MONTH = "month"
+
+    GRANULARITY_CHOICES = [
+        (GRANULARITY_HOUR, "Heure"),
+        (GRANULARITY_DAY, "Jour"),
+        (GRANULARITY_MONTH, "Mois"),
+    ]
+
+    metric_type = models.CharField(max_length=100)
+    granularity = models.CharField(max_length=10, choices=GRANULARITY_CHOICES)
+    bucket = models.DateTimeField()
+    value = models.IntegerField()
+    min_value = models.IntegerField()
+    max_value = models.IntegerField()
+
+    class Meta:
+        verbose_name = "Historique de métrique"
+        verbose_name_plural = "Historique des métriques"
+        ordering = ["metric_type", "granularity", "bucket"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["metric_type", "granularity", "bucket"],
+                name="unique_metric_snapshot_bucket",
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.metric_type} [{self.granularity} {self.bucket:%Y-%m-%d %H:%M}]: {self.value}"
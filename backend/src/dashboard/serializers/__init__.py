@@ -2,9 +2,11 @@
 
 from .activity_serializer import ActivitySerializer
 from .dashboard_metric_serializer import DashboardMetricSerializer
+from .metric_snapshot_serializer import MetricSnapshotSerializer
 
 __all__ = [
     "DashboardMetricSerializer",
     "ActivitySerializer",
+    "MetricSnapshotSerializer",
 ]
 
@@ -0,0 +1,18 @@
+"""Serializer pour le modèle MetricSnapshot (historique des métriques)."""
+
+from rest_framework import serializers
+from dashboard.models.metric_snapshot import MetricSnapshot
+
+
+class MetricSnapshotSerializer(serializers.ModelSerializer):
+    """Point d'une série temporelle, sans le type de métrique (porté par la série)."""
+
+    class Meta:
+        model = MetricSnapshot
+        fields = [
+            "bucket",
+            "value",
+            "min_value",
+            "max_value",
+        ]
+        read_only_fields = fields
@@ -0,0 +1,123 @@
+"""
+Signaux Django pour l'application dashboard.
+
+Maintient les compteurs de `dashboard.counters` à jour : l'état des champs
+suivis est mémorisé au chargement de l'instance (`post_init`), puis comparé
+après chaque sauvegarde ou suppression pour appliquer les deltas.
+
+Pousse également les nouvelles activités sur le flux temps réel
+(`backend.events`).
+"""
+
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from backend import events
+from dashboard import counters
+from dashboard.models.activity import Activity
+
+_SNAPSHOT_ATTR = "_dashboard_counter_snapshot"
+
+
+def _current_values(instance, fields):
+    """Valeurs courantes des champs suivis, ou None si l'un d'eux est différé."""
+    values = {}
+    for name in fields:
+        field = instance._meta.get_field(name)
+        if field.attname not in instance.__dict__:
+            return None
+        values[name] = field.to_python(instance.__dict__[field.attname])
+    return values
+
+
+def _stored_values(instance, fields):
+    """État connu en base avant la sauvegarde courante."""
+    snapshot = getattr(instance, _SNAPSHOT_ATTR, None)
+    if snapshot is not None:
+        return snapshot
+    # Instance chargée avec des champs différés : relire l'état en base
+    return (
+        type(instance)._base_manager.filter(pk=instance.pk).values(*fields).first()
+    )
+
+
+def remember_counter_fields(sender, instance, **kwargs):
+    """Mémorise l'état des champs suivis d'une instance existante."""
+    if instance.pk is None:
+        setattr(instance, _SNAPSHOT_ATTR, None)
+        return
+    fields = counters.tracked_fields(sender)
+    setattr(instance, _SNAPSHOT_ATTR, _current_values(instance, fields))
+
+
+def update_counters_on_save(sender, instance, created, **kwargs):
+    """Applique les deltas de compteurs après une création ou une modification."""
+    if counters.is_suspended():
+        return
+    fields = counters.tracked_fields(sender)
+    new_values = _current_values(instance, fields)
+    if new_values is None:
+        new_values = type(instance)._base_manager.filter(pk=instance.pk).values(
+            *fields
+        ).first()
+    old_values = None if created else _stored_values(instance, fields)
+
+    for counter in counters.counters_for_model(sender):
+        was_counted = old_values is not None and counter.matches(old_values)
+        is_counted = counter.matches(new_values)
+        counters.apply_delta(counter.metric_type, int(is_counted) - int(was_counted))
+
+    setattr(instance, _SNAPSHOT_ATTR, new_values)
+
+
+def update_counters_on_delete(sender, instance, **kwargs):
+    """Retire l'instance supprimée des compteurs qui l'incluaient."""
+    if counters.is_suspended():
+        return
+    model_counters = counters.counters_for_model(sender)
+    values = getattr(instance, _SNAPSHOT_ATTR, None) or _current_values(
+        instance, counters.tracked_fields(sender)
+    )
+    if values is None:
+        # État inconnu : la ligne n'existe plus, un recomptage est exact
+        counters.reconcile([counter.metric_type for counter in model_counters])
+        return
+    for counter in model_counters:
+        if counter.matches(values):
+            counters.apply_delta(counter.metric_type, -1)
+
+
+for _model in {counter.model for counter in counters.COUNTERS.values()}:
+    _name = _model.__name__
+    post_init.connect(
+        remember_counter_fields, sender=_model, dispatch_uid=f"dashboard_init_{_name}"
+    )
+    post_save.connect(
+        update_counters_on_save, sender=_model, dispatch_uid=f"dashboard_save_{_name}"
+    )
+    post_delete.connect(
+        update_counters_on_delete, sender=_model, dispatch_uid=f"dashboard_del_{_name}"
+    )
+
+
+@receiver(post_save, sender=Activity, dispatch_uid="dashboard_activity_event")
+def publish_activity(sender, instance, created, **kwargs):
+    """Pousse une nouvelle activité aux admins / RH et à l'employé concerné."""
+    if not created:
+        return
+    from users.models import CustomUser
+
+    events.publish(
+        "activity.created",
+        {
+            "id": instance.id,
+            "activity_type": instance.activity_type,
+            "description": instance.description,
+            "employee": instance.user_id,
+            "created_at": instance.created_at,
+        },
+        users=CustomUser.objects.filter(employee_id=instance.user_id).values_list(
+            "pk", flat=True
+        ),
+        channels=[events.STAFF_CHANNEL],
+    )
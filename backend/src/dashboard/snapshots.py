@@ -0,0 +1,180 @@
+"""
+Historique des métriques du dashboard (séries temporelles).
+
+`record()` échantillonne les lignes `DashboardMetric` et met à jour, pour
+chaque métrique, les intervalles horaire, journalier et mensuel courants :
+les agrégats (dernière valeur, min, max) sont donc tenus à jour au fil de
+l'eau, sans relecture des données brutes. `prune()` applique la rétention
+par granularité (`DASHBOARD_METRIC_RETENTION`) : une fois les points horaires
+supprimés, seuls les agrégats journaliers et mensuels subsistent.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from backend.cache import invalidate_on_commit
+
+from dashboard import counters
+from dashboard.models.dashboard_metric import DashboardMetric
+from dashboard.models.metric_snapshot import MetricSnapshot
+
+HOUR = MetricSnapshot.GRANULARITY_HOUR
+DAY = MetricSnapshot.GRANULARITY_DAY
+MONTH = MetricSnapshot.GRANULARITY_MONTH
+
+GRANULARITIES = (HOUR, DAY, MONTH)
+
+# Durée de conservation par granularité (None = illimitée)
+DEFAULT_RETENTION = {
+    HOUR: timedelta(days=14),
+    DAY: timedelta(days=400),
+    MONTH: None,
+}
+
+
+def get_retention():
+    """Rétention effective, surchargeable via `DASHBOARD_METRIC_RETENTION`."""
+    retention = dict(DEFAULT_RETENTION)
+    for granularity, days in getattr(settings, "DASHBOARD_METRIC_RETENTION", {}).items():
+        retention[granularity] = None if days is None else timedelta(days=days)
+    return retention
+
+
+def truncate(moment, granularity):
+    """Début de l'intervalle contenant `moment` (dans le fuseau courant)."""
+    moment = timezone.localtime(moment)
+    moment = moment.replace(minute=0, second=0, microsecond=0)
+    if granularity in (DAY, MONTH):
+        moment = moment.replace(hour=0)
+    if granularity == MONTH:
+        moment = moment.replace(day=1)
+    return moment
+
+
+def previous_bucket(bucket, granularity):
+    """Début de l'intervalle précédant `bucket`."""
+    if granularity == HOUR:
+        return bucket - timedelta(hours=1)
+    if granularity == DAY:
+        return truncate(bucket - timedelta(days=1), DAY)
+    return truncate(bucket - timedelta(days=1), MONTH)
+
+
+def record(now=None):
+    """
+    Enregistre un échantillon de toutes les métriques.
+
+    Met également à jour `previous_value` / `change_percentage` de chaque
+    `DashboardMetric` par rapport à la clôture de la veille.
+
+    Retourne le nombre de métriques échantillonnées.
+    """
+    now = now or timezone.now()
+    metrics = list(
+        counters.refresh_windows(
+            {metric.metric_type: metric for metric in DashboardMetric.objects.all()}
+        ).values()
+    )
+    if not metrics:
+        return 0
+
+    buckets = {granularity: truncate(now, granularity) for granularity in GRANULARITIES}
+    yesterday = previous_bucket(buckets[DAY], DAY)
+    metric_types = [metric.metric_type for metric in metrics]
+
+    existing = {
+        (snapshot.metric_type, snapshot.granularity, snapshot.bucket): snapshot
+        for snapshot in MetricSnapshot.objects.filter(
+            metric_type__in=metric_types,
+            bucket__in=list(buckets.values()) + [yesterday],
+        )
+    }
+
+    snapshots = []
+    for metric in metrics:
+        for granularity, bucket in buckets.items():
+            current = existing.get((metric.metric_type, granularity, bucket))
+            snapshots.append(
+                MetricSnapshot(
+                    metric_type=metric.metric_type,
+                    granularity=granularity,
+                    bucket=bucket,
+                    value=metric.value,
+                    min_value=min(metric.value, current.min_value)
+                    if current
+                    else metric.value,
+                    max_value=max(metric.value, current.max_value)
+                    if current
+                    else metric.value,
+                )
+            )
+
+        closing = existing.get((metric.metric_type, DAY, yesterday))
+        if closing is not None:
+            metric.previous_value = closing.value
+            metric.change_percentage = (
+                (metric.value - closing.value) / closing.value * 100
+                if closing.value
+                else None
+            )
+
+    MetricSnapshot.objects.bulk_create(
+        snapshots,
+        update_conflicts=True,
+        unique_fields=["metric_type", "granularity", "bucket"],
+        update_fields=["value", "min_value", "max_value"],
+    )
+    DashboardMetric.objects.bulk_update(
+        metrics, ["previous_value", "change_percentage"]
+    )
+    invalidate_on_commit("dashboard")
+    return len(metrics)
+
+
+def prune(now=None):
+    """
+    Supprime les points au-delà de leur rétention.
+
+    Retourne un dictionnaire `{granularité: nombre de lignes supprimées}`.
+    """
+    now = now or timezone.now()
+    deleted = {}
+    for granularity, keep in get_retention().items():
+        if keep is None:
+            continue
+        deleted[granularity], _ = MetricSnapshot.objects.filter(
+            granularity=granularity, bucket__lt=truncate(now - keep, granularity)
+        ).delete()
+    if any(deleted.values()):
+        invalidate_on_commit("dashboard")
+    return deleted
+
+
+def pick_granularity(start, end):
+    """Granularité par défaut selon l'étendue demandée."""
+    span = end - start
+    if span <= timedelta(days=2):
+        return HOUR
+    if span <= timedelta(days=92):
+        return DAY
+    return MONTH
+
+
+def series(metric_types, granularity, start, end):
+    """
+    Séries temporelles des métriques entre `start` et `end` (inclus).
+
+    Retourne `{metric_type: [MetricSnapshot, ...]}` trié par intervalle.
+    """
+    result = {metric_type: [] for metric_type in metric_types}
+    queryset = MetricSnapshot.objects.filter(
+        metric_type__in=metric_types,
+        granularity=granularity,
+        bucket__gte=truncate(start, granularity),
+        bucket__lte=end,
+    ).order_by("metric_type", "bucket")
+    for snapshot in queryset:
+        result[snapshot.metric_type].append(snapshot)
+    return result
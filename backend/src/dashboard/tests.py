@@ -99,3 +99,237 @@ class DashboardAPITest(APITestCase):
         response = self.client.get('/api/dashboard/metrics/')
         # Peut être 200 ou 404 selon l'implémentation
         self.assertIn(response.status_code, [status.HTTP_200_OK, status.HTTP_404_NOT_FOUND])
+
+
+class DashboardCounterTest(TestCase):
+    """Tests pour les compteurs du dashboard entretenus par signaux."""
+
+    def setUp(self):
+        """Configuration initiale."""
+        from department.models import Department
+
+        self.department = Department.objects.create(
+            name='IT',
+            code='IT001',
+            description='IT Department',
+            location='Paris',
+            budget=100000.00
+        )
+
+    def _create_employee(self, index, **kwargs):
+        from datetime import date
+        from employee.models import Employee
+
+        data = {
+            'first_name': 'John',
+            'last_name': f'Doe{index}',
+            'email': f'john{index}@example.com',
+            'date_of_birth': date(1990, 1, 1),
+            'gender': Employee.GENDER_MALE,
+            'employee_id': f'EMP{index:03d}',
+            'hire_date': date(2020, 1, 1),
+            'department': self.department,
+            'salary': 50000.00,
+            'status': Employee.STATUS_ACTIVE,
+        }
+        data.update(kwargs)
+        return Employee.objects.create(**data)
+
+    def _value(self, metric_type):
+        return DashboardMetric.objects.get(metric_type=metric_type).value
+
+    def test_counters_follow_create_update_delete(self):
+        """Les créations, transitions de statut et suppressions ajustent les compteurs."""
+        from dashboard import counters
+        from employee.models import Employee
+
+        counters.reconcile()
+        first = self._create_employee(1)
+        self._create_employee(2, gender=Employee.GENDER_FEMALE)
+        self.assertEqual(self._value('total_employees'), 2)
+        self.assertEqual(self._value('active_employees'), 2)
+        self.assertEqual(self._value('men_count'), 1)
+        self.assertEqual(self._value('women_count'), 1)
+
+        employee = Employee.objects.get(pk=first.pk)
+        employee.status = Employee.STATUS_ON_LEAVE
+        employee.save()
+        self.assertEqual(self._value('active_employees'), 1)
+        self.assertEqual(self._value('men_count'), 0)
+
+        # Une sauvegarde sans changement des champs suivis ne modifie rien
+        employee.city = 'Lyon'
+        employee.save()
+        self.assertEqual(self._value('active_employees'), 1)
+
+        employee.delete()
+        self.assertEqual(self._value('total_employees'), 1)
+        self.assertEqual(self._value('departments_count'), 1)
+
+    def test_reconcile_command_corrects_drift(self):
+        """La commande de réconciliation corrige les écarts (mises à jour en masse)."""
+        from io import StringIO
+        from django.core.management import call_command
+        from employee.models import Employee
+
+        self._create_employee(1)
+        self._create_employee(2)
+        # update() contourne les signaux
+        Employee.objects.update(status=Employee.STATUS_INACTIVE)
+        self.assertEqual(self._value('active_employees'), 2)
+
+        out = StringIO()
+        call_command('reconcile_dashboard_metrics', stdout=out)
+        self.assertEqual(self._value('active_employees'), 0)
+        self.assertIn('active_employees: 2 -> 0', out.getvalue())
+
+    def test_suspended_counters_reconcile_once(self):
+        """Suspendus, les signaux n'écrivent aucun delta ; la sortie recompte."""
+        from dashboard import counters
+
+        counters.reconcile()
+        with counters.suspended():
+            first = self._create_employee(1)
+            self._create_employee(2)
+            first.delete()
+            self.assertEqual(self._value('total_employees'), 0)
+        self.assertEqual(self._value('total_employees'), 1)
+
+    def test_aggregated_reads_counters_without_counting(self):
+        """L'endpoint agrégé lit les compteurs en une requête ; seul le
+        compteur à fenêtre temporelle (`new_employees`) est recompté."""
+        from dashboard import counters
+
+        user = CustomUser.objects.create_user(
+            username='hr',
+            email='hr@example.com',
+            password='testpass123',
+            role='hr_manager'
+        )
+        self._create_employee(1)
+        counters.reconcile()
+
+        client = APIClient()
+        client.force_authenticate(user=user)
+        with self.assertNumQueries(2):
+            response = client.get('/api/dashboard/metrics/aggregated/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['total_employees'], 1)
+        self.assertEqual(response.data['departments_count'], 1)
+
+
+    def test_windowed_counters_age_out_on_read(self):
+        """Un employé sorti de la fenêtre n'est plus compté, sans réconciliation."""
+        from datetime import date, timedelta
+        from dashboard import counters
+        from employee.models import Employee
+
+        counters.reconcile()
+        employee = self._create_employee(1, hire_date=date.today())
+        self.assertEqual(counters.read(['new_hires_this_week'])['new_hires_this_week'].value, 1)
+
+        # Le temps passe : aucune écriture ne touche le compteur
+        Employee.objects.filter(pk=employee.pk).update(
+            hire_date=date.today() - timedelta(days=30)
+        )
+        self.assertEqual(counters.read(['new_hires_this_week'])['new_hires_this_week'].value, 0)
+        self.assertEqual(self._value('new_hires_this_week'), 0)
+
+
+class MetricSnapshotTest(APITestCase):
+    """Tests pour l'historique des métriques et l'API de séries temporelles."""
+
+    def setUp(self):
+        """Configuration initiale."""
+        from datetime import datetime, timezone as dt_timezone
+
+        self.user = CustomUser.objects.create_user(
+            username='hr',
+            email='hr@example.com',
+            password='testpass123',
+            role='hr_manager'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.metric = DashboardMetric.objects.create(
+            metric_type='total_employees', value=10
+        )
+        self.day1 = datetime(2025, 3, 10, 9, 30, tzinfo=dt_timezone.utc)
+
+    def _record(self, value, moment):
+        from dashboard import snapshots
+
+        DashboardMetric.objects.filter(pk=self.metric.pk).update(value=value)
+        snapshots.record(now=moment)
+
+    def test_record_rolls_up_hour_day_month(self):
+        """Chaque échantillon met à jour les intervalles heure, jour et mois."""
+        from datetime import timedelta
+        from dashboard.models import MetricSnapshot
+
+        self._record(10, self.day1)
+        self._record(14, self.day1 + timedelta(minutes=10))
+        self._record(12, self.day1 + timedelta(hours=2))
+
+        hourly = MetricSnapshot.objects.filter(granularity='hour')
+        self.assertEqual(hourly.count(), 2)
+        daily = MetricSnapshot.objects.get(granularity='day')
+        self.assertEqual((daily.value, daily.min_value, daily.max_value), (12, 10, 14))
+        monthly = MetricSnapshot.objects.get(granularity='month')
+        self.assertEqual(monthly.bucket.day, 1)
+
+    def test_change_percentage_against_previous_day(self):
+        """La variation est calculée par rapport à la clôture de la veille."""
+        from datetime import timedelta
+
+        self._record(10, self.day1)
+        self._record(15, self.day1 + timedelta(days=1))
+        self.metric.refresh_from_db()
+        self.assertEqual(self.metric.previous_value, 10)
+        self.assertEqual(self.metric.change_percentage, 50.0)
+
+    def test_prune_keeps_rollups(self):
+        """La rétention supprime les points horaires anciens mais garde les agrégats."""
+        from datetime import timedelta
+        from dashboard import snapshots
+        from dashboard.models import MetricSnapshot
+
+        self._record(10, self.day1)
+        deleted = snapshots.prune(now=self.day1 + timedelta(days=30))
+        self.assertEqual(deleted['hour'], 1)
+        self.assertFalse(MetricSnapshot.objects.filter(granularity='hour').exists())
+        self.assertTrue(MetricSnapshot.objects.filter(granularity='day').exists())
+
+    def test_history_endpoint(self):
+        """L'API renvoie les séries de la période demandée."""
+        from datetime import timedelta
+
+        for day in range(3):
+            self._record(10 + day, self.day1 + timedelta(days=day))
+
+        response = self.client.get(
+            '/api/dashboard/metrics/history/',
+            {'metric': 'total_employees', 'start': '2025-03-10', 'end': '2025-03-11'},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['granularity'], 'hour')
+        points = response.data['series']['total_employees']
+        self.assertEqual([p['value'] for p in points], [10, 11])
+
+        response = self.client.get(
+            '/api/dashboard/metrics/history/',
+            {'metric': 'total_employees', 'granularity': 'day',
+             'start': '2025-03-01', 'end': '2025-03-31'},
+        )
+        self.assertEqual(len(response.data['series']['total_employees']), 3)
+
+    def test_history_endpoint_rejects_invalid_parameters(self):
+        """Les paramètres invalides renvoient une 400."""
+        response = self.client.get(
+            '/api/dashboard/metrics/history/', {'granularity': 'week'}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(
+            '/api/dashboard/metrics/history/', {'start': 'hier'}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
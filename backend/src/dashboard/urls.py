@@ -3,8 +3,9 @@ URLs pour l'application dashboard.
 
 Ce fichier configure les routes REST pour les endpoints du dashboard :
 - /api/dashboard/metrics/ : Gestion des métriques
+- /api/dashboard/metrics/aggregated/ : Métriques agrégées (vue asynchrone)
 - /api/dashboard/activities/ : Gestion des activités
-- /api/dashboard/overview/ : Vue d'ensemble complète
+- /api/dashboard/overview/ : Vue d'ensemble complète (vue asynchrone)
 
 Utilise le DefaultRouter de DRF pour générer automatiquement les routes CRUD.
 """
@@ -12,7 +13,7 @@ Utilise le DefaultRouter de DRF pour générer automatiquement les routes CRUD.
 from django.urls import path
 from rest_framework.routers import DefaultRouter
 from dashboard.viewsets import DashboardMetricViewSet, ActivityViewSet
-from dashboard.views import dashboard_overview
+from dashboard.views import aggregated_metrics, dashboard_overview
 
 router = DefaultRouter()
 router.register(r"metrics", DashboardMetricViewSet, basename="dashboard-metric")
@@ -20,5 +21,11 @@ router.register(r"activities", ActivityViewSet, basename="activity")
 
 urlpatterns = [
     path("overview/", dashboard_overview, name="dashboard-overview"),
+    # Avant les routes du routeur : "aggregated" serait pris pour un id
+    path(
+        "metrics/aggregated/",
+        aggregated_metrics,
+        name="dashboard-metric-aggregated",
+    ),
 ] + router.urls
 
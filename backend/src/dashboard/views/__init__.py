@@ -1,6 +1,5 @@
 """Vues personnalisées pour l'application dashboard."""
 
-from .dashboard_views import dashboard_overview
-
-__all__ = ["dashboard_overview"]
+from .dashboard_views import aggregated_metrics, dashboard_overview
 
+__all__ = ["aggregated_metrics", "dashboard_overview"]
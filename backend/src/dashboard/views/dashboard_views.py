@@ -7,26 +7,37 @@ Ces vues fournissent des endpoints agrégés pour le dashboard :
 """
 
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from django.db.models import Count, Q
-from django.utils import timezone
-from datetime import timedelta
-
-from employee.models.employee import Employee
-from recruitment.models.job_position import JobPosition
-from recruitment.models.candidate import Candidate
-from recruitment.models.talent_request import TalentRequest
-from schedule.models.schedule_task import Schedule
-from schedule.models.meeting import Meeting
+
+from backend import concurrency
+from backend.async_api import AsyncAPIView
+from backend.cache import cached_response, SCOPE_ROLE
+from dashboard import counters
 from dashboard.models.activity import Activity
 from dashboard.models.dashboard_metric import DashboardMetric
+from dashboard.serializers.activity_serializer import ActivitySerializer
+from dashboard.viewsets.dashboard_metric_viewset import IsAdminOrHR
+
+
+def _read_metrics():
+    """Compteurs entretenus par signaux (initialisés s'ils manquent)."""
+    metrics = {metric.metric_type: metric for metric in DashboardMetric.objects.all()}
+    if not set(counters.COUNTERS) <= set(metrics):
+        metrics.update(counters.read())
+        return metrics
+    return counters.refresh_windows(metrics)
+
+
+def _read_recent_activities():
+    """Les 10 dernières activités, sérialisées."""
+    recent_activities = Activity.objects.select_related(
+        "user", "related_position", "related_candidate", "related_employee"
+    ).order_by("-created_at")[:10]
+    return ActivitySerializer(recent_activities, many=True).data
 
 
-@api_view(["GET"])
-@permission_classes([IsAuthenticated])
-def dashboard_overview(request):
+class DashboardOverviewView(AsyncAPIView):
     """
     Vue d'ensemble complète du dashboard.
     
@@ -36,71 +47,121 @@ def dashboard_overview(request):
     - Métriques principales
     - Activités récentes
     - Statistiques consolidées
+
+    Métriques et activités sont lues en parallèle.
     """
-    # Récalculer les métriques si nécessaire (optionnel)
-    # metric_viewset = DashboardMetricViewSet()
-    # metric_viewset._calculate_all_metrics()
-
-    # Récupérer les métriques
-    metrics = DashboardMetric.objects.all()
-    metrics_data = {
-        metric.metric_type: {
-            "value": metric.value,
-            "previous_value": metric.previous_value,
-            "change_percentage": metric.change_percentage,
+
+    permission_classes = [IsAuthenticated]
+
+    @cached_response(
+        "dashboard", "employee", "department", "recruitment", "schedule", scope=SCOPE_ROLE
+    )
+    async def get(self, request):
+        metrics, recent_activities = await concurrency.gather(
+            _read_metrics, _read_recent_activities
+        )
+        metrics_data = {
+            metric.metric_type: {
+                "value": metric.value,
+                "previous_value": metric.previous_value,
+                "change_percentage": metric.change_percentage,
+            }
+            for metric in metrics.values()
         }
-        for metric in metrics
-    }
 
-    # Récupérer les activités récentes (10 dernières)
-    recent_activities = Activity.objects.select_related(
-        "user", "related_position", "related_candidate", "related_employee"
-    ).order_by("-created_at")[:10]
+        # Statistiques supplémentaires
+        def value(metric_type):
+            return metrics[metric_type].value
 
-    from dashboard.serializers.activity_serializer import ActivitySerializer
-
-    activities_serializer = ActivitySerializer(recent_activities, many=True)
-
-    # Statistiques supplémentaires
-    today = timezone.now().date()
-    week_ago = today - timedelta(days=7)
-
-    stats = {
-        "employees": {
-            "total": Employee.objects.count(),
-            "active": Employee.objects.filter(status=Employee.STATUS_ACTIVE).count(),
-            "new_this_week": Employee.objects.filter(hire_date__gte=week_ago).count(),
-        },
-        "recruitment": {
-            "open_positions": JobPosition.objects.filter(
-                status=JobPosition.STATUS_OPEN
-            ).count(),
-            "urgent_positions": JobPosition.objects.filter(
-                status=JobPosition.STATUS_OPEN, urgency=True
-            ).count(),
-            "active_candidates": Candidate.objects.exclude(
-                status__in=[Candidate.STATUS_REJECTED, Candidate.STATUS_HIRED]
-            ).count(),
-            "pending_requests": TalentRequest.objects.filter(
-                status=TalentRequest.STATUS_PENDING
-            ).count(),
-        },
-        "schedule": {
-            "upcoming_tasks": Schedule.objects.filter(
-                completed=False, scheduled_date__gte=timezone.now()
-            ).count(),
-            "upcoming_meetings": Meeting.objects.filter(
-                start_time__gte=timezone.now()
-            ).count(),
-        },
-    }
-
-    return Response(
-        {
-            "metrics": metrics_data,
-            "recent_activities": activities_serializer.data,
-            "statistics": stats,
-        },
-        status=status.HTTP_200_OK,
+        stats = {
+            "employees": {
+                "total": value("total_employees"),
+                "active": value("active_employees"),
+                "new_this_week": value("new_hires_this_week"),
+            },
+            "recruitment": {
+                "open_positions": value("available_positions"),
+                "urgent_positions": value("urgent_positions"),
+                "active_candidates": value("active_candidates"),
+                "pending_requests": value("pending_talent_requests"),
+            },
+            "schedule": {
+                "upcoming_tasks": value("upcoming_tasks"),
+                "upcoming_meetings": value("upcoming_meetings"),
+            },
+        }
+
+        return Response(
+            {
+                "metrics": metrics_data,
+                "recent_activities": recent_activities,
+                "statistics": stats,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+dashboard_overview = DashboardOverviewView.as_view()
+
+
+class AggregatedMetricsView(AsyncAPIView):
+    """
+    Toutes les métriques agrégées pour le dashboard.
+    GET /api/dashboard/metrics/aggregated/
+
+    Retourne un format structuré avec toutes les métriques nécessaires au dashboard.
+    """
+
+    permission_classes = [IsAuthenticated, IsAdminOrHR]
+
+    @cached_response(
+        "dashboard", "employee", "department", "recruitment", "schedule", scope=SCOPE_ROLE
     )
+    async def get(self, request):
+        # Compteurs entretenus par signaux : une seule lecture indexée
+        metrics = await concurrency.run(
+            counters.read,
+            [
+                "total_employees",
+                "active_employees",
+                "men_count",
+                "women_count",
+                "new_employees",
+                "departments_count",
+                "available_positions",
+                "urgent_positions",
+                "talent_requests",
+            ],
+        )
+
+        def value(metric_type):
+            return metrics[metric_type].value
+
+        def change(metric_type):
+            return int(metrics[metric_type].change_percentage or 0)
+
+        available_positions = value("available_positions")
+        return Response(
+            {
+                "available_positions": available_positions,
+                "urgent_positions": value("urgent_positions"),
+                "job_open": available_positions,  # Alias
+                "active_hiring": available_positions,
+                "new_employees": value("new_employees"),
+                "departments_count": value("departments_count"),
+                # Les employés actifs sont comptés ici (comportement historique)
+                "total_employees": value("active_employees"),
+                "men_count": value("men_count"),
+                "women_count": value("women_count"),
+                "employees_change": change("total_employees"),
+                "talent_requests": value("talent_requests"),
+                # TalentRequest n'a pas de gender_preference : à calculer depuis
+                # les candidats associés si nécessaire
+                "talent_men": 0,
+                "talent_women": 0,
+                "talent_change": change("talent_requests"),
+            }
+        )
+
 
+aggregated_metrics = AggregatedMetricsView.as_view()
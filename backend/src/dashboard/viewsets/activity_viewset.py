@@ -15,6 +15,9 @@ from rest_framework.filters import SearchFilter, OrderingFilter
 from django.utils import timezone
 from datetime import timedelta
 
+from backend.conditional import ConditionalRequestMixin
+from backend.export import ExportMixin
+from backend.fieldsets import SparseFieldsetMixin
 from dashboard.models.activity import Activity
 from dashboard.serializers.activity_serializer import ActivitySerializer
 
@@ -38,7 +41,7 @@ class IsAdminOrHR(permissions.BasePermission):
         return request.user and request.user.is_authenticated
 
 
-class ActivityViewSet(viewsets.ModelViewSet):
+class ActivityViewSet(ConditionalRequestMixin, SparseFieldsetMixin, ExportMixin, viewsets.ModelViewSet):
     """
     ViewSet pour les activités du dashboard.
     
@@ -51,6 +54,7 @@ class ActivityViewSet(viewsets.ModelViewSet):
     - GET /api/dashboard/activities/today/ : Activités d'aujourd'hui
     - GET /api/dashboard/activities/by-type/{type}/ : Activités par type
     - GET /api/dashboard/activities/my-activities/ : Mes activités
+    - GET /api/dashboard/activities/export/{csv|jsonl|xlsx}/ : Export en flux
     """
     
     queryset = Activity.objects.select_related(
@@ -63,6 +67,16 @@ class ActivityViewSet(viewsets.ModelViewSet):
     search_fields = ["description"]
     ordering_fields = ["created_at"]
     ordering = ["-created_at"]
+    export_fields = [
+        "id",
+        "activity_type",
+        "description",
+        "user__employee_id",
+        "related_position_id",
+        "related_candidate_id",
+        "related_employee_id",
+        "created_at",
+    ]
 
     def get_queryset(self):
         """Filtre le queryset selon les permissions."""
@@ -98,6 +112,11 @@ class ActivityViewSet(viewsets.ModelViewSet):
         """
         seven_days_ago = timezone.now() - timedelta(days=7)
         queryset = self.get_queryset().filter(created_at__gte=seven_days_ago)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
 
@@ -109,6 +128,11 @@ class ActivityViewSet(viewsets.ModelViewSet):
         """
         today_start = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
         queryset = self.get_queryset().filter(created_at__gte=today_start)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
 
@@ -123,6 +147,11 @@ class ActivityViewSet(viewsets.ModelViewSet):
         GET /api/dashboard/activities/by-type/{activity_type}/
         """
         queryset = self.get_queryset().filter(activity_type=activity_type)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
 
@@ -139,6 +168,11 @@ class ActivityViewSet(viewsets.ModelViewSet):
             )
 
         queryset = self.get_queryset().filter(user=request.user.employee)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
 
@@ -5,6 +5,7 @@ Ce ViewSet gère les métriques affichées sur le dashboard :
 - Consultation des métriques
 - Calcul et mise à jour automatique des métriques
 - Actions personnalisées : recalculer toutes les métriques, métriques spécifiques
+- Historique : séries temporelles (heure, jour, mois) des métriques
 """
 
 from rest_framework import viewsets, permissions, status
@@ -13,17 +14,34 @@ from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import OrderingFilter
 from django.utils import timezone
-from datetime import timedelta
-from django.db.models import Count, Q, Sum
+from django.utils.dateparse import parse_date, parse_datetime
+from datetime import datetime, time, timedelta
 
+from backend.conditional import ConditionalRequestMixin
+from backend.fieldsets import SparseFieldsetMixin
+from dashboard import counters, snapshots
+from backend.cache import cached_response, SCOPE_ROLE
 from dashboard.models.dashboard_metric import DashboardMetric
 from dashboard.serializers.dashboard_metric_serializer import (
     DashboardMetricSerializer,
 )
-from employee.models.employee import Employee
-from recruitment.models.job_position import JobPosition
-from recruitment.models.talent_request import TalentRequest
-from department.models import Department
+from dashboard.serializers.metric_snapshot_serializer import (
+    MetricSnapshotSerializer,
+)
+
+
+def _parse_moment(value, end_of_day=False):
+    """Convertit une date ou date-heure ISO en datetime aware (None si invalide)."""
+    day = parse_date(value)
+    if day is not None:
+        moment = datetime.combine(day, time.max if end_of_day else time.min)
+    else:
+        moment = parse_datetime(value)
+        if moment is None:
+            return None
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
 
 
 class IsAdminOrHR(permissions.BasePermission):
@@ -46,7 +64,7 @@ class IsAdminOrHR(permissions.BasePermission):
         )
 
 
-class DashboardMetricViewSet(viewsets.ModelViewSet):
+class DashboardMetricViewSet(ConditionalRequestMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet pour les métriques du dashboard.
     
@@ -55,7 +73,9 @@ class DashboardMetricViewSet(viewsets.ModelViewSet):
     - GET /api/dashboard/metrics/{id}/ : Détails d'une métrique
     - POST /api/dashboard/metrics/recalculate/ : Recalculer toutes les métriques
     - POST /api/dashboard/metrics/recalculate/{metric_type}/ : Recalculer une métrique spécifique
-    - GET /api/dashboard/metrics/aggregated/ : Métriques agrégées pour le dashboard
+    - GET /api/dashboard/metrics/aggregated/ : Métriques agrégées (vue asynchrone,
+      voir dashboard.views.AggregatedMetricsView)
+    - GET /api/dashboard/metrics/history/ : Séries temporelles des métriques
     """
     
     queryset = DashboardMetric.objects.all()
@@ -66,95 +86,60 @@ class DashboardMetricViewSet(viewsets.ModelViewSet):
     ordering_fields = ["metric_type", "updated_at"]
     ordering = ["metric_type"]
 
-    @action(detail=False, methods=["get"], url_path="aggregated")
-    def aggregated(self, request):
+    @action(detail=False, methods=["get"], url_path="history")
+    @cached_response("dashboard", scope=SCOPE_ROLE)
+    def history(self, request):
         """
-        Action personnalisée : Retourner toutes les métriques agrégées pour le dashboard.
-        GET /api/dashboard/metrics/aggregated/
-        
-        Retourne un format structuré avec toutes les métriques nécessaires au dashboard.
+        Action personnalisée : Séries temporelles des métriques.
+        GET /api/dashboard/metrics/history/?metric=total_employees&granularity=day&start=2025-01-01&end=2025-01-31
+
+        Paramètres :
+        - metric : type(s) de métrique (répétable ou séparé par des virgules), toutes par défaut
+        - granularity : hour, day ou month (déduite de l'étendue par défaut)
+        - start / end : date ou date-heure ISO (30 derniers jours par défaut)
         """
-        # Récupérer ou calculer toutes les métriques
-        self._ensure_all_metrics_exist()
-        
-        # Récupérer les métriques depuis la base de données
-        metrics = DashboardMetric.objects.all()
-        metrics_dict = {m.metric_type: m.value for m in metrics}
-        
-        # Calculer les métriques supplémentaires nécessaires
-        employees = Employee.objects.filter(status=Employee.STATUS_ACTIVE)
-        total_employees = employees.count()
-        men_count = employees.filter(gender='M').count()
-        women_count = employees.filter(gender='F').count()
-        
-        # Calculer les changements
-        employees_change = 0
-        talent_change = 0
+        params = request.query_params
         try:
-            total_employees_metric = DashboardMetric.objects.get(metric_type="total_employees")
-            if total_employees_metric.change_percentage:
-                employees_change = int(total_employees_metric.change_percentage)
-        except DashboardMetric.DoesNotExist:
-            pass
-            
-        try:
-            talent_requests_metric = DashboardMetric.objects.get(metric_type="talent_requests")
-            if talent_requests_metric.change_percentage:
-                talent_change = int(talent_requests_metric.change_percentage)
-        except DashboardMetric.DoesNotExist:
-            pass
-        
-        # Métriques des positions ouvertes
-        job_positions = JobPosition.objects.filter(status=JobPosition.STATUS_OPEN)
-        available_positions = job_positions.count()
-        urgent_positions = job_positions.filter(urgency=True).count()
-        active_hiring = job_positions.filter(status=JobPosition.STATUS_OPEN).count()
-        
-        # Nouvelles recrues (7 derniers jours)
-        seven_days_ago = timezone.now() - timedelta(days=7)
-        new_employees = Employee.objects.filter(created_at__gte=seven_days_ago).count()
-        departments_count = Department.objects.count()
-        
-        # Talent requests
-        talent_requests = TalentRequest.objects.count()
-        # TalentRequest n'a pas de gender_preference, on divise approximativement
-        # ou on utilise les candidats associés si disponibles
-        talent_men = 0  # À calculer depuis les candidats associés si nécessaire
-        talent_women = 0  # À calculer depuis les candidats associés si nécessaire
-        
-        # Construire la réponse
-        aggregated_metrics = {
-            "available_positions": available_positions,
-            "urgent_positions": urgent_positions,
-            "job_open": available_positions,  # Alias
-            "active_hiring": active_hiring,
-            "new_employees": new_employees,
-            "departments_count": departments_count,
-            "total_employees": total_employees,
-            "men_count": men_count,
-            "women_count": women_count,
-            "employees_change": employees_change,
-            "talent_requests": talent_requests,
-            "talent_men": talent_men,
-            "talent_women": talent_women,
-            "talent_change": talent_change,
-        }
-        
-        return Response(aggregated_metrics)
+            end = timezone.now()
+            if "end" in params:
+                end = _parse_moment(params["end"], end_of_day=True)
+            start = end - timedelta(days=30) if end else None
+            if "start" in params:
+                start = _parse_moment(params["start"])
+        except ValueError:
+            start = end = None
+        if start is None or end is None or start > end:
+            return Response(
+                {"detail": "Paramètres start/end invalides."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        granularity = params.get("granularity") or snapshots.pick_granularity(start, end)
+        if granularity not in snapshots.GRANULARITIES:
+            return Response(
+                {"detail": f"Granularité '{granularity}' invalide."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
-    def _ensure_all_metrics_exist(self):
-        """S'assure que toutes les métriques existent dans la base de données."""
-        metrics_to_ensure = [
-            "total_employees",
-            "active_employees",
-            "available_positions",
-            "urgent_positions",
-            "talent_requests",
-        ]
-        
-        for metric_type in metrics_to_ensure:
-            if not DashboardMetric.objects.filter(metric_type=metric_type).exists():
-                self._calculate_metric(metric_type)
+        metric_types = [
+            metric_type
+            for value in params.getlist("metric")
+            for metric_type in value.split(",")
+            if metric_type
+        ] or list(counters.COUNTERS)
+
+        data = snapshots.series(metric_types, granularity, start, end)
+        return Response(
+            {
+                "granularity": granularity,
+                "start": start,
+                "end": end,
+                "series": {
+                    metric_type: MetricSnapshotSerializer(points, many=True).data
+                    for metric_type, points in data.items()
+                },
+            }
+        )
 
     @action(detail=False, methods=["post"], url_path="recalculate")
     def recalculate_all(self, request):
@@ -190,16 +175,7 @@ class DashboardMetricViewSet(viewsets.ModelViewSet):
 
     def _calculate_all_metrics(self):
         """Calcule toutes les métriques du dashboard."""
-        metrics_to_calculate = [
-            "total_employees",
-            "active_employees",
-            "available_positions",
-            "urgent_positions",
-            "total_candidates",
-            "active_candidates",
-            "talent_requests",
-            "pending_talent_requests",
-        ]
+        metrics_to_calculate = list(counters.COUNTERS)
 
         for metric_type in metrics_to_calculate:
             self._calculate_metric(metric_type)
@@ -214,35 +190,10 @@ class DashboardMetricViewSet(viewsets.ModelViewSet):
             previous_value = None
 
         # Calculer la nouvelle valeur selon le type
-        value = 0
-        if metric_type == "total_employees":
-            value = Employee.objects.count()
-        elif metric_type == "active_employees":
-            value = Employee.objects.filter(status=Employee.STATUS_ACTIVE).count()
-        elif metric_type == "available_positions":
-            value = JobPosition.objects.filter(
-                status=JobPosition.STATUS_OPEN
-            ).count()
-        elif metric_type == "urgent_positions":
-            value = JobPosition.objects.filter(
-                status=JobPosition.STATUS_OPEN, urgency=True
-            ).count()
-        elif metric_type == "total_candidates":
-            from recruitment.models.candidate import Candidate
-            value = Candidate.objects.count()
-        elif metric_type == "active_candidates":
-            from recruitment.models.candidate import Candidate
-            value = Candidate.objects.exclude(
-                status__in=[Candidate.STATUS_REJECTED, Candidate.STATUS_HIRED]
-            ).count()
-        elif metric_type == "talent_requests":
-            value = TalentRequest.objects.count()
-        elif metric_type == "pending_talent_requests":
-            value = TalentRequest.objects.filter(
-                status=TalentRequest.STATUS_PENDING
-            ).count()
-        else:
+        counter = counters.COUNTERS.get(metric_type)
+        if counter is None:
             return  # Type de métrique inconnu
+        value = counter.count()
 
         # Calculer le pourcentage de changement
         change_percentage = None
@@ -1,4 +1,43 @@
 from django.db import models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def _count_subquery(model_label, **filters):
+    """Sous-requête corrélée comptant les lignes liées au département courant."""
+    from django.apps import apps
+
+    model = apps.get_model(model_label)
+    counted = (
+        model.objects.filter(department=OuterRef("pk"), **filters)
+        .order_by()
+        .values("department")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    return Coalesce(Subquery(counted, output_field=IntegerField()), Value(0))
+
+
+class DepartmentQuerySet(models.QuerySet):
+    """QuerySet des départements."""
+
+    def with_counts(self):
+        """
+        Annote les compteurs d'employés et d'offres en une seule requête SQL.
+
+        Les compteurs sont des sous-requêtes corrélées : aucune ligne
+        d'employé ou d'offre n'est chargée en mémoire.
+        """
+        return self.annotate(
+            total_employees_count=_count_subquery("employee.Employee"),
+            active_employees_count=_count_subquery(
+                "employee.Employee", status="active"
+            ),
+            job_positions_total=_count_subquery("recruitment.JobPosition"),
+            open_positions_total=_count_subquery(
+                "recruitment.JobPosition", status="open"
+            ),
+        )
 
 
 class Department(models.Model):
@@ -17,6 +56,8 @@ class Department(models.Model):
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    objects = DepartmentQuerySet.as_manager()
     
     class Meta:
         verbose_name = "Département"
@@ -27,4 +68,7 @@ class Department(models.Model):
     
     @property
     def employee_count(self):
+        """Nombre d'employés actifs (annoté par `with_counts()` si disponible)."""
+        if "active_employees_count" in self.__dict__:
+            return self.active_employees_count
         return self.employees.filter(status='active').count()
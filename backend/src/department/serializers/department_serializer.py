@@ -12,13 +12,9 @@ class DepartmentSerializer(serializers.ModelSerializer):
         source="manager.email", read_only=True, allow_null=True
     )
     employee_count = serializers.IntegerField(read_only=True)
-    total_employees = serializers.IntegerField(
-        source="employees.count", read_only=True
-    )
+    total_employees = serializers.SerializerMethodField()
     active_employees = serializers.SerializerMethodField()
-    job_positions_count = serializers.IntegerField(
-        source="job_positions.count", read_only=True
-    )
+    job_positions_count = serializers.SerializerMethodField()
     open_positions_count = serializers.SerializerMethodField()
 
     class Meta:
@@ -42,6 +38,15 @@ class DepartmentSerializer(serializers.ModelSerializer):
             "updated_at",
         ]
         read_only_fields = ["created_at", "updated_at"]
+        # Annotations de Department.objects.with_counts() (voir backend.fieldsets)
+        field_dependencies = {
+            "manager_name": ("manager",),
+            "employee_count": ("active_employees_count",),
+            "total_employees": ("total_employees_count",),
+            "active_employees": ("active_employees_count",),
+            "job_positions_count": ("job_positions_total",),
+            "open_positions_count": ("open_positions_total",),
+        }
 
     def get_manager_name(self, obj):
         """Retourne le nom complet du manager."""
@@ -49,16 +54,31 @@ class DepartmentSerializer(serializers.ModelSerializer):
             return f"{obj.manager.first_name} {obj.manager.last_name}"
         return None
 
+    # Les compteurs proviennent de Department.objects.with_counts() ; le
+    # comptage direct ne sert que pour une instance non annotée (création).
+
+    def get_total_employees(self, obj):
+        """Retourne le nombre total d'employés."""
+        if hasattr(obj, "total_employees_count"):
+            return obj.total_employees_count
+        return obj.employees.count()
+
     def get_active_employees(self, obj):
         """Retourne le nombre d'employés actifs."""
-        from employee.models.employee import Employee
+        return obj.employee_count
 
-        return obj.employees.filter(status=Employee.STATUS_ACTIVE).count()
+    def get_job_positions_count(self, obj):
+        """Retourne le nombre d'offres d'emploi."""
+        if hasattr(obj, "job_positions_total"):
+            return obj.job_positions_total
+        return obj.job_positions.count()
 
     def get_open_positions_count(self, obj):
         """Retourne le nombre d'offres d'emploi ouvertes."""
         from recruitment.models.job_position import JobPosition
 
+        if hasattr(obj, "open_positions_total"):
+            return obj.open_positions_total
         return obj.job_positions.filter(status=JobPosition.STATUS_OPEN).count()
 
     def validate_code(self, value):
@@ -98,6 +118,10 @@ class DepartmentListSerializer(serializers.ModelSerializer):
             "employee_count",
             "budget",
         ]
+        field_dependencies = {
+            "manager_name": ("manager",),
+            "employee_count": ("active_employees_count",),
+        }
 
     def get_manager_name(self, obj):
         """Retourne le nom complet du manager."""
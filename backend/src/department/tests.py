@@ -109,3 +109,77 @@ class DepartmentAPITest(APITestCase):
         response = self.client.get(f'/api/department/departments/{self.department.id}/')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['name'], 'IT')
+
+
+class DepartmentCountsTest(APITestCase):
+    """Tests pour les compteurs annotés des départements."""
+
+    def setUp(self):
+        """Configuration initiale."""
+        from recruitment.models import JobPosition
+
+        self.client = APIClient()
+        self.user = CustomUser.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123',
+            role='hr_manager'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.department = Department.objects.create(
+            name='IT', code='IT001', location='Paris', budget=100000.00
+        )
+        for index, status_val in enumerate(
+            [Employee.STATUS_ACTIVE, Employee.STATUS_ACTIVE, Employee.STATUS_INACTIVE]
+        ):
+            Employee.objects.create(
+                first_name='John',
+                last_name=f'Doe{index}',
+                email=f'john{index}@example.com',
+                date_of_birth=date(1990, 1, 1),
+                gender=Employee.GENDER_MALE,
+                employee_id=f'EMP{index:03d}',
+                hire_date=date(2020, 1, 1),
+                department=self.department,
+                salary=50000.00,
+                status=status_val,
+            )
+        for status_val in [JobPosition.STATUS_OPEN, JobPosition.STATUS_CLOSED]:
+            JobPosition.objects.create(
+                title='Développeur',
+                description='Poste',
+                department=self.department,
+                status=status_val,
+            )
+
+    def test_with_counts_annotations(self):
+        """Les compteurs sont annotés en une seule requête."""
+        with self.assertNumQueries(1):
+            department = Department.objects.with_counts().get(pk=self.department.pk)
+            self.assertEqual(department.total_employees_count, 3)
+            self.assertEqual(department.employee_count, 2)
+            self.assertEqual(department.job_positions_total, 2)
+            self.assertEqual(department.open_positions_total, 1)
+
+    def test_detail_uses_annotated_counts(self):
+        """Le détail expose les compteurs annotés."""
+        response = self.client.get(f'/api/department/departments/{self.department.id}/')
+        self.assertEqual(response.data['total_employees'], 3)
+        self.assertEqual(response.data['active_employees'], 2)
+        self.assertEqual(response.data['job_positions_count'], 2)
+        self.assertEqual(response.data['open_positions_count'], 1)
+
+    def test_list_query_count_is_constant(self):
+        """Le nombre de requêtes de la liste ne dépend pas du nombre de départements."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as few:
+            self.client.get('/api/department/departments/statistics/')
+            self.client.get('/api/department/departments/')
+        for index in range(5):
+            Department.objects.create(name=f'D{index}', code=f'D{index}', location='Lyon')
+        with CaptureQueriesContext(connection) as many:
+            self.client.get('/api/department/departments/statistics/')
+            self.client.get('/api/department/departments/')
+        self.assertEqual(len(few), len(many))
@@ -12,8 +12,12 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
-from django.db.models import Count, Sum, Avg
+from django.db.models import Q, Sum, Avg
 
+from backend.cache import cached_response, SCOPE_ROLE
+from backend.conditional import ConditionalRequestMixin
+from backend.fieldsets import SparseFieldsetMixin
+from backend.statistics import StatisticsBuilder
 from department.models import Department
 from department.serializers.department_serializer import (
     DepartmentSerializer,
@@ -41,7 +45,7 @@ class IsHRManagerOrAdmin(permissions.BasePermission):
         )
 
 
-class DepartmentViewSet(viewsets.ModelViewSet):
+class DepartmentViewSet(ConditionalRequestMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet pour les départements.
     
@@ -57,9 +61,7 @@ class DepartmentViewSet(viewsets.ModelViewSet):
     - GET /api/department/departments/statistics/ : Statistiques globales
     """
     
-    queryset = Department.objects.select_related("manager").prefetch_related(
-        "employees", "job_positions"
-    ).all()
+    queryset = Department.objects.select_related("manager").with_counts()
     serializer_class = DepartmentSerializer
     permission_classes = [permissions.IsAuthenticated, IsHRManagerOrAdmin]
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
@@ -74,6 +76,16 @@ class DepartmentViewSet(viewsets.ModelViewSet):
             return DepartmentListSerializer
         return DepartmentSerializer
 
+    @cached_response("department", "employee", "recruitment", scope=SCOPE_ROLE)
+    def list(self, request, *args, **kwargs):
+        """Liste des départements (mise en cache, invalidée par signaux)."""
+        return super().list(request, *args, **kwargs)
+
+    @cached_response("department", "employee", "recruitment", scope=SCOPE_ROLE)
+    def retrieve(self, request, *args, **kwargs):
+        """Détail d'un département (mis en cache, invalidé par signaux)."""
+        return super().retrieve(request, *args, **kwargs)
+
     @action(detail=True, methods=["get"], url_path="employees")
     def employees(self, request, pk=None):
         """
@@ -87,7 +99,16 @@ class DepartmentViewSet(viewsets.ModelViewSet):
 
         from employee.serializers.employee_serializer import EmployeeListSerializer
 
-        serializer = EmployeeListSerializer(employees, many=True)
+        page = self.paginate_queryset(employees)
+        if page is not None:
+            serializer = EmployeeListSerializer(
+                page, many=True, context=self.get_serializer_context()
+            )
+            return self.get_paginated_response(serializer.data)
+
+        serializer = EmployeeListSerializer(
+            employees, many=True, context=self.get_serializer_context()
+        )
         return Response(serializer.data)
 
     @action(detail=True, methods=["get"], url_path="job-positions")
@@ -105,10 +126,20 @@ class DepartmentViewSet(viewsets.ModelViewSet):
             JobPositionSerializer,
         )
 
-        serializer = JobPositionSerializer(job_positions, many=True)
+        page = self.paginate_queryset(job_positions)
+        if page is not None:
+            serializer = JobPositionSerializer(
+                page, many=True, context=self.get_serializer_context()
+            )
+            return self.get_paginated_response(serializer.data)
+
+        serializer = JobPositionSerializer(
+            job_positions, many=True, context=self.get_serializer_context()
+        )
         return Response(serializer.data)
 
     @action(detail=True, methods=["get"], url_path="statistics")
+    @cached_response("department", "employee", "recruitment", scope=SCOPE_ROLE)
     def statistics(self, request, pk=None):
         """
         Action personnalisée : Statistiques détaillées d'un département.
@@ -120,39 +151,26 @@ class DepartmentViewSet(viewsets.ModelViewSet):
         from recruitment.models.job_position import JobPosition
         from recruitment.models.candidate import Candidate
 
-        # Statistiques des employés
-        employees = department.employees.all()
-        employees_stats = {
-            "total": employees.count(),
-            "by_status": {
-                status: employees.filter(status=status).count()
-                for status, _ in Employee.STATUS_CHOICES
-            },
-            "by_gender": {
-                gender: employees.filter(gender=gender).count()
-                for gender, _ in Employee.GENDER_CHOICES
-            },
-            "average_salary": float(
-                employees.aggregate(avg=Avg("salary"))["avg"] or 0
-            ),
-            "total_salary": float(
-                employees.aggregate(total=Sum("salary"))["total"] or 0
-            ),
-        }
-
-        # Statistiques des offres d'emploi
-        job_positions = department.job_positions.all()
-        job_positions_stats = {
-            "total": job_positions.count(),
-            "by_status": {
-                status: job_positions.filter(status=status).count()
-                for status, _ in JobPosition.STATUS_CHOICES
-            },
-            "urgent": job_positions.filter(urgency=True).count(),
-            "total_candidates": Candidate.objects.filter(
-                position__department=department
-            ).count(),
-        }
+        # Une requête d'agrégation par modèle
+        employees_stats = (
+            StatisticsBuilder(department.employees.all())
+            .count("total")
+            .count_by("by_status", "status", Employee.STATUS_CHOICES)
+            .count_by("by_gender", "gender", Employee.GENDER_CHOICES)
+            .aggregate("average_salary", Avg("salary"))
+            .aggregate("total_salary", Sum("salary"))
+            .build()
+        )
+        job_positions_stats = (
+            StatisticsBuilder(department.job_positions.all())
+            .count("total")
+            .count_by("by_status", "status", JobPosition.STATUS_CHOICES)
+            .count("urgent", Q(urgency=True))
+            .build()
+        )
+        job_positions_stats["total_candidates"] = Candidate.objects.filter(
+            position__department=department
+        ).count()
 
         stats = {
             "department": {
@@ -168,27 +186,24 @@ class DepartmentViewSet(viewsets.ModelViewSet):
         return Response(stats)
 
     @action(detail=False, methods=["get"], url_path="statistics")
+    @cached_response("department", "employee", "recruitment", scope=SCOPE_ROLE)
     def global_statistics(self, request):
         """
         Action personnalisée : Statistiques globales de tous les départements.
         GET /api/department/departments/statistics/
         """
-        from employee.models.employee import Employee
-        from recruitment.models.job_position import JobPosition
-
-        departments = self.get_queryset()
+        # Une seule requête : les compteurs sont annotés sur chaque département
+        departments = list(self.get_queryset())
 
         stats = {
-            "total_departments": departments.count(),
-            "total_budget": float(
-                departments.aggregate(total=Sum("budget"))["total"] or 0
+            "total_departments": len(departments),
+            "total_budget": float(sum(dept.budget for dept in departments)),
+            "total_employees": sum(
+                dept.total_employees_count for dept in departments
+            ),
+            "total_job_positions": sum(
+                dept.job_positions_total for dept in departments
             ),
-            "total_employees": Employee.objects.filter(
-                department__in=departments
-            ).count(),
-            "total_job_positions": JobPosition.objects.filter(
-                department__in=departments
-            ).count(),
             "by_department": [
                 {
                     "id": dept.id,
@@ -1,3 +1,43 @@
+"""
+Configuration de l'admin Django pour les employés.
+
+Les modifications faites dans l'admin sont historisées comme celles de
+l'API (`employee.history`), au nom de l'employé lié à l'administrateur.
+"""
+
 from django.contrib import admin
 
-# Register your models here.
+from employee import history
+from employee.models import Employee, EmployeeHistory
+
+
+@admin.register(Employee)
+class EmployeeAdmin(admin.ModelAdmin):
+    """Admin pour les employés."""
+
+    list_display = ["employee_id", "first_name", "last_name", "email", "department", "status"]
+    list_filter = ["status", "department"]
+    search_fields = ["employee_id", "first_name", "last_name", "email"]
+    raw_id_fields = ["manager"]
+    readonly_fields = ["created_at", "updated_at"]
+    list_select_related = ["department"]
+
+    def save_model(self, request, obj, form, change):
+        with history.changed_by(getattr(request.user, "employee_id", None)):
+            super().save_model(request, obj, form, change)
+
+
+@admin.register(EmployeeHistory)
+class EmployeeHistoryAdmin(admin.ModelAdmin):
+    """Admin (lecture seule) pour l'historique des employés."""
+
+    list_display = ["employee", "change_type", "old_value", "new_value", "changed_by", "changed_at"]
+    list_filter = ["change_type"]
+    search_fields = ["employee__first_name", "employee__last_name", "employee__employee_id"]
+    list_select_related = ["employee", "changed_by"]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
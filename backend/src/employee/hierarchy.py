@@ -0,0 +1,224 @@
+"""
+Hiérarchie des employés : maintenance et requêtes de la table de fermeture.
+
+`EmployeeHierarchy` contient un lien (ancêtre, descendant, profondeur) pour
+chaque paire d'employés d'une même branche de l'organigramme. Les signaux de
+`employee.signals` appellent :
+- `move()` à la création d'un employé ou au changement de son manager : les
+  liens du sous-arbre vers ses anciens ancêtres sont supprimés, puis recréés
+  vers la chaîne du nouveau manager ;
+- `detach_reports()` avant la suppression d'un employé : ses subordonnés
+  deviennent des racines (la clé étrangère passe à NULL sans signal).
+
+Une création en masse (`bulk_create()`) ajoute ses liens par
+`add_employees()` ; toute autre écriture qui contourne les signaux
+(`update()`, SQL) doit être suivie de `rebuild()` (commande
+`rebuild_org_hierarchy`).
+
+Requêtes (une requête indexée chacune) :
+    Employee.objects.filter(id__in=subtree(manager_id))   # subordonnés
+    Employee.objects.filter(id__in=chain(employee_id))    # chaîne hiérarchique
+    span_of_control(employee_id)                          # étendue, profondeur
+"""
+
+from collections import defaultdict
+
+from django.db import connection
+from django.db.models import Count, Max, Q
+
+from employee.models import EmployeeHierarchy
+
+BATCH_SIZE = 1000
+
+
+class HierarchyCycleError(ValueError):
+    """Le manager demandé fait partie du sous-arbre de l'employé."""
+
+
+def build_links(parents):
+    """
+    Liens `(ancêtre, descendant, profondeur)` d'un organigramme.
+
+    `parents` associe à chaque id d'employé l'id de son manager (ou None).
+    Un cycle éventuel est coupé au premier employé déjà rencontré.
+    """
+    for employee_id in parents:
+        seen = {employee_id}
+        yield employee_id, employee_id, 0
+        depth, current = 1, parents.get(employee_id)
+        while current is not None and current not in seen:
+            yield current, employee_id, depth
+            seen.add(current)
+            depth, current = depth + 1, parents.get(current)
+
+
+def _raw_delete(queryset):
+    # Sans signal par ligne : la sauvegarde ou la suppression de l'employé
+    # invalide déjà le cache des réponses de l'app.
+    return queryset._raw_delete(queryset.db)
+
+
+def _bulk_create(links):
+    batch = []
+    for ancestor_id, descendant_id, depth in links:
+        batch.append(
+            EmployeeHierarchy(
+                ancestor_id=ancestor_id, descendant_id=descendant_id, depth=depth
+            )
+        )
+        if len(batch) >= BATCH_SIZE:
+            EmployeeHierarchy.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        EmployeeHierarchy.objects.bulk_create(batch)
+
+
+def subtree(employee_id, include_self=False, max_depth=None):
+    """Sous-requête des ids des subordonnés (directs et indirects)."""
+    links = EmployeeHierarchy.objects.filter(ancestor_id=employee_id)
+    if not include_self:
+        links = links.filter(depth__gt=0)
+    if max_depth is not None:
+        links = links.filter(depth__lte=max_depth)
+    return links.values("descendant_id")
+
+
+def chain(employee_id):
+    """Sous-requête des ids des managers de l'employé, jusqu'à la racine."""
+    return EmployeeHierarchy.objects.filter(
+        descendant_id=employee_id, depth__gt=0
+    ).values("ancestor_id")
+
+
+def is_report(manager_id, employee_id):
+    """Vrai si `employee_id` est un subordonné (direct ou non) de `manager_id`."""
+    return EmployeeHierarchy.objects.filter(
+        ancestor_id=manager_id, descendant_id=employee_id, depth__gt=0
+    ).exists()
+
+
+def manager_of(employee_id):
+    """Id du manager enregistré dans la hiérarchie (None : racine ou inconnu)."""
+    return (
+        EmployeeHierarchy.objects.filter(descendant_id=employee_id, depth=1)
+        .values_list("ancestor_id", flat=True)
+        .first()
+    )
+
+
+def span_of_control(employee_id):
+    """
+    Étendue de contrôle et position de l'employé, en une requête :
+    subordonnés directs, subordonnés au total, niveaux sous l'employé et
+    profondeur de l'employé (0 pour une racine).
+    """
+    mine = Q(ancestor_id=employee_id)
+    stats = EmployeeHierarchy.objects.filter(
+        mine | Q(descendant_id=employee_id)
+    ).aggregate(
+        direct_reports=Count("pk", filter=mine & Q(depth=1)),
+        total_reports=Count("pk", filter=mine & Q(depth__gt=0)),
+        levels_below=Max("depth", filter=mine),
+        depth=Max("depth", filter=Q(descendant_id=employee_id)),
+    )
+    return {key: value or 0 for key, value in stats.items()}
+
+
+def move(employee_id, manager_id):
+    """
+    Rattache l'employé et tout son sous-arbre à `manager_id` (None : racine).
+
+    Lève `HierarchyCycleError` si le manager est l'employé lui-même ou l'un
+    de ses subordonnés.
+    """
+    links = dict(
+        EmployeeHierarchy.objects.filter(ancestor_id=employee_id).values_list(
+            "descendant_id", "depth"
+        )
+    )
+    if manager_id is not None and (manager_id == employee_id or manager_id in links):
+        raise HierarchyCycleError(
+            "Un employé ne peut pas être rattaché à l'un de ses subordonnés."
+        )
+
+    new = []
+    if not links:
+        # Nouvel employé : le lien vers lui-même
+        links = {employee_id: 0}
+        new.append((employee_id, employee_id, 0))
+    else:
+        members = subtree(employee_id, include_self=True)
+        _raw_delete(
+            EmployeeHierarchy.objects.filter(descendant_id__in=members).exclude(
+                ancestor_id__in=members
+            )
+        )
+
+    if manager_id is not None:
+        ancestors = EmployeeHierarchy.objects.filter(
+            descendant_id=manager_id
+        ).values_list("ancestor_id", "depth")
+        new.extend(
+            (ancestor_id, descendant_id, above + below + 1)
+            for ancestor_id, above in ancestors
+            for descendant_id, below in links.items()
+        )
+    _bulk_create(new)
+
+
+def add_employees(parents):
+    """
+    Ajoute les liens d'employés créés sans signal (`bulk_create()`).
+
+    `parents` associe à chaque nouvel employé l'id de son manager, qui peut
+    être un employé existant ou un autre nouvel employé. Les nouveaux
+    employés n'ont pas encore de subordonnés existants.
+    """
+    existing = {
+        manager_id
+        for manager_id in parents.values()
+        if manager_id is not None and manager_id not in parents
+    }
+    ancestors = defaultdict(list)
+    for descendant_id, ancestor_id, depth in EmployeeHierarchy.objects.filter(
+        descendant_id__in=existing
+    ).values_list("descendant_id", "ancestor_id", "depth"):
+        ancestors[descendant_id].append((ancestor_id, depth))
+
+    def links():
+        for employee_id in parents:
+            depth, current, seen = 0, employee_id, set()
+            # Remonte d'abord les nouveaux employés, puis la chaîne existante
+            while current in parents and current not in seen:
+                yield current, employee_id, depth
+                seen.add(current)
+                depth, current = depth + 1, parents[current]
+            for ancestor_id, above in ancestors.get(current, ()):
+                yield ancestor_id, employee_id, depth + above
+
+    _bulk_create(links())
+
+
+def detach_reports(employee_id):
+    """Fait des subordonnés de l'employé des racines (avant sa suppression)."""
+    _raw_delete(
+        EmployeeHierarchy.objects.filter(
+            descendant_id__in=subtree(employee_id),
+            ancestor_id__in=EmployeeHierarchy.objects.filter(
+                descendant_id=employee_id
+            ).values("ancestor_id"),
+        )
+    )
+
+
+def rebuild():
+    """Reconstruit toute la table à partir de `Employee.manager`."""
+    from employee.models import Employee
+
+    parents = dict(Employee.objects.values_list("pk", "manager_id"))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {connection.ops.quote_name(EmployeeHierarchy._meta.db_table)}"
+        )
+    _bulk_create(build_links(parents))
+    return len(parents)
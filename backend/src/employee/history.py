@@ -0,0 +1,210 @@
+"""
+Historique des modifications des employés (`EmployeeHistory`).
+
+Un employé lu en base garde les valeurs de ses champs historisés
+(`Employee.HISTORY_FIELDS`, relations sous forme d'ids) dans
+`_loaded_values`. À la sauvegarde, `employee.signals` compare ces valeurs à
+celles de l'instance et écrit une ligne `<champ>_changed` par champ modifié,
+en un seul `bulk_create`, quel que soit l'appelant (API, admin, script).
+Aucune requête n'est faite pour lire l'ancienne version ni les objets liés :
+pour une relation, `old_value` / `new_value` contiennent les ids.
+
+L'auteur des modifications est celui du bloc `changed_by()` en cours :
+    with history.changed_by(request.user.employee_id):
+        serializer.save()
+
+Les écritures en masse, qui ne déclenchent pas les signaux, passent par
+`update()` (`QuerySet.update()`) ou `bulk_update()` (instances modifiées),
+qui tiennent aussi à jour les intervalles datés (`employee.temporal`) :
+    history.update(Employee.objects.filter(department=it), status="inactive")
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import transaction
+from django.utils import timezone
+
+from backend.cache import invalidate_on_commit
+from dashboard import counters
+from employee import hierarchy, temporal
+from employee.models import Employee, EmployeeHistory
+from employee.models.employee import HISTORY_ATTNAMES
+
+_changed_by = ContextVar("employee_history_changed_by", default=None)
+
+# Nom historisé (`department`) de chaque colonne (`department_id`)
+_FIELD_NAMES = {
+    Employee._meta.get_field(name).attname: name for name in Employee.HISTORY_FIELDS
+}
+
+
+@contextmanager
+def changed_by(employee_id):
+    """Attribue à `employee_id` les modifications faites dans le bloc."""
+    token = _changed_by.set(employee_id)
+    try:
+        yield
+    finally:
+        _changed_by.reset(token)
+
+
+def current_author():
+    """Id de l'employé auteur des modifications en cours (ou None)."""
+    return _changed_by.get()
+
+
+def _text(value):
+    return "" if value is None else str(value)[:255]
+
+
+def _entries(employee_id, old, new, changed_by_id):
+    """Lignes d'historique des colonnes dont la valeur a changé."""
+    return [
+        EmployeeHistory(
+            employee_id=employee_id,
+            change_type=f"{_FIELD_NAMES[attname]}_changed",
+            old_value=_text(old[attname]),
+            new_value=_text(new[attname]),
+            changed_by_id=changed_by_id,
+        )
+        for attname in _FIELD_NAMES
+        if attname in old and attname in new and old[attname] != new[attname]
+    ]
+
+
+def _current_values(instance):
+    return {
+        attname: instance.__dict__[attname]
+        for attname in HISTORY_ATTNAMES
+        if attname in instance.__dict__
+    }
+
+
+def changes(instance, update_fields=None):
+    """
+    Lignes d'historique (non enregistrées) des modifications de l'instance
+    depuis sa lecture en base ; vide pour une instance jamais lue.
+    """
+    old = dict(getattr(instance, "_loaded_values", {}))
+    if update_fields is not None:
+        saved = {Employee._meta.get_field(name).attname for name in update_fields}
+        old = {attname: value for attname, value in old.items() if attname in saved}
+    return _entries(instance.pk, old, _current_values(instance), current_author())
+
+
+def mark_saved(instance):
+    """Les valeurs de l'instance deviennent la référence des prochains changements."""
+    instance._loaded_values = _current_values(instance)
+
+
+def record_created(instance):
+    """Ligne `created` d'un nouvel employé."""
+    EmployeeHistory.objects.create(
+        employee=instance,
+        change_type="created",
+        new_value=f"Employé créé : {instance.first_name} {instance.last_name}",
+        changed_by_id=current_author(),
+    )
+
+
+def _refresh(moved):
+    """Ce que les signaux auraient fait après une écriture en masse."""
+    for employee_id, manager_id in moved.items():
+        hierarchy.move(employee_id, manager_id)
+    invalidate_on_commit("employee")
+    counters.reconcile(
+        [counter.metric_type for counter in counters.counters_for_model(Employee)]
+    )
+
+
+def update(queryset, **values):
+    """
+    `queryset.update(**values)` avec historique, en un nombre fixe de
+    requêtes : lecture des valeurs avant et après, mise à jour, puis un
+    `bulk_create` des lignes d'historique. Retourne le nombre d'employés
+    mis à jour.
+    """
+    # `auto_now` n'agit pas sur `update()` : ETags et caches en dépendent
+    values.setdefault("updated_at", timezone.now())
+    attnames = sorted(HISTORY_ATTNAMES)
+    author = current_author()
+    with transaction.atomic():
+        before = {
+            row[0]: dict(zip(attnames, row[1:]))
+            for row in queryset.values_list("pk", *attnames)
+        }
+        if not before:
+            return 0
+        rows = Employee.objects.filter(pk__in=before)
+        count = rows.update(**values)
+        after = {
+            row[0]: dict(zip(attnames, row[1:]))
+            for row in rows.values_list("pk", *attnames)
+        }
+        EmployeeHistory.objects.bulk_create(
+            [
+                entry
+                for employee_id, new in after.items()
+                for entry in _entries(employee_id, before[employee_id], new, author)
+            ]
+        )
+        temporal.record_changes(
+            {
+                employee_id: tuple(new[attname] for attname in temporal.ATTNAMES)
+                for employee_id, new in after.items()
+                if any(
+                    new[attname] != before[employee_id][attname]
+                    for attname in temporal.ATTNAMES
+                )
+            }
+        )
+        _refresh(
+            {
+                employee_id: new["manager_id"]
+                for employee_id, new in after.items()
+                if new["manager_id"] != before[employee_id]["manager_id"]
+            }
+        )
+    return count
+
+
+def bulk_update(employees, fields, batch_size=None):
+    """
+    `Employee.objects.bulk_update()` avec historique : les modifications de
+    chaque instance depuis sa lecture sont écrites en un `bulk_create`.
+    """
+    entries = [entry for employee in employees for entry in changes(employee, fields)]
+    changed = {
+        entry.employee_id
+        for entry in entries
+        if entry.change_type.removesuffix("_changed") in temporal.FIELDS
+    }
+    moved = {}
+    if "manager" in fields or "manager_id" in fields:
+        moved = {
+            employee.pk: employee.manager_id
+            for employee in employees
+            if getattr(employee, "_loaded_values", {}).get("manager_id", employee.manager_id)
+            != employee.manager_id
+        }
+    # `auto_now` n'agit pas sur `bulk_update()`
+    now = timezone.now()
+    for employee in employees:
+        employee.updated_at = now
+    if "updated_at" not in fields:
+        fields = [*fields, "updated_at"]
+    with transaction.atomic():
+        count = Employee.objects.bulk_update(employees, fields, batch_size=batch_size)
+        EmployeeHistory.objects.bulk_create(entries)
+        temporal.record_changes(
+            {
+                employee.pk: temporal.values_of(employee)
+                for employee in employees
+                if employee.pk in changed
+            }
+        )
+        _refresh(moved)
+    for employee in employees:
+        mark_saved(employee)
+    return count
@@ -0,0 +1,306 @@
+"""
+Import en masse d'employés depuis un fichier CSV ou JSON Lines.
+
+Le fichier est lu en flux et traité par lots de `batch_size` lignes. Pour
+chaque lot :
+- chaque ligne est validée par `EmployeeImportSerializer` (sans requête) ;
+- l'unicité des emails et identifiants, l'existence des départements, postes
+  et managers sont vérifiées en une requête par type de donnée pour tout le
+  lot (et contre les lignes déjà importées du fichier) ;
+- les identifiants manquants sont réservés d'un bloc dans la séquence
+  `EmployeeIdSequence`, en sautant ceux déjà pris en base ou dans le lot ;
+- employés, lignes d'historique, liens de l'organigramme et intervalles
+  datés sont écrits par `bulk_create`, dans une transaction par lot.
+
+Une ligne invalide est écartée et signalée (numéro de ligne et erreurs par
+champ) sans bloquer les autres ; il en va de même d'une ligne qui n'est pas
+en UTF-8, chaque ligne étant décodée séparément. Un manager peut être désigné par son id
+(`manager`) ou par son identifiant (`manager_employee_id`), y compris celui
+d'une ligne précédente du fichier.
+
+`bulk_create` ne déclenche pas les signaux : le cache des réponses et les
+compteurs du dashboard sont recalculés une fois, à la fin de l'import.
+
+Exemple :
+    report = EmployeeImporter(changed_by_id=hr.employee_id).run(read_csv(file))
+"""
+
+import codecs
+import csv
+import io
+import json
+from dataclasses import dataclass, field
+from itertools import islice
+
+from django.db import transaction
+from rest_framework import serializers
+
+from backend.cache import invalidate
+from dashboard import counters
+from department.models import Department
+from employee import hierarchy, temporal
+from employee.models import Employee, EmployeeHistory, EmployeeIdSequence
+from employee.serializers import EmployeeImportSerializer
+
+BATCH_SIZE = 500
+
+FORMATS = ("csv", "jsonl")
+
+# Donnée d'une ligne qui n'est pas en UTF-8
+UNDECODABLE = object()
+
+
+def _lines(stream):
+    """Lignes du fichier décodées une à une en UTF-8 ; None si l'une ne l'est pas."""
+    if isinstance(stream, io.TextIOBase):
+        yield from stream
+        return
+    for line_number, line in enumerate(stream, start=1):
+        if line_number == 1:
+            # BOM ajouté par les tableurs
+            line = line.removeprefix(codecs.BOM_UTF8)
+        try:
+            yield line.decode("utf-8")
+        except UnicodeDecodeError:
+            yield None
+
+
+def read_csv(stream):
+    """
+    Lignes `(numéro, dict)` d'un CSV avec en-tête ; cellules vides ignorées.
+
+    Une ligne mal encodée donne `(numéro, UNDECODABLE)` ; un en-tête mal
+    encodé arrête la lecture.
+    """
+    undecodable = []
+
+    def lines():
+        for line_number, line in enumerate(_lines(stream), start=1):
+            if line is None:
+                undecodable.append(line_number)
+                # Ligne vide : ignorée par le lecteur CSV
+                line = "\n"
+            yield line
+
+    reader = csv.DictReader(lines())
+    if not reader.fieldnames and undecodable:
+        # En-tête illisible : les colonnes sont inconnues
+        yield undecodable.pop(), UNDECODABLE
+        return
+    for row in reader:
+        while undecodable and undecodable[0] < reader.line_num:
+            yield undecodable.pop(0), UNDECODABLE
+        yield reader.line_num, {
+            key.strip(): value.strip()
+            for key, value in row.items()
+            if key and value is not None and value.strip()
+        }
+    for line_number in undecodable:
+        yield line_number, UNDECODABLE
+
+
+def read_jsonl(stream):
+    """Lignes `(numéro, dict)` d'un fichier JSON Lines ; None si illisible."""
+    for line_number, line in enumerate(_lines(stream), start=1):
+        if line is None:
+            yield line_number, UNDECODABLE
+            continue
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError:
+            data = None
+        yield line_number, data if isinstance(data, dict) else None
+
+
+def reader_for(file_format=None, filename=""):
+    """Lecteur correspondant au format (ou à l'extension du fichier)."""
+    if not file_format:
+        file_format = "jsonl" if filename.endswith((".jsonl", ".ndjson")) else "csv"
+    if file_format not in FORMATS:
+        raise ValueError(f"Format inconnu : {file_format} (attendu : {', '.join(FORMATS)}).")
+    return read_csv if file_format == "csv" else read_jsonl
+
+
+@dataclass
+class ImportReport:
+    """Résultat d'un import : lignes lues, employés créés, erreurs par ligne."""
+
+    rows: int = 0
+    created: int = 0
+    errors: list = field(default_factory=list)
+
+    def add_error(self, line, errors):
+        self.errors.append({"line": line, "errors": errors})
+
+    def as_dict(self):
+        return {"rows": self.rows, "created": self.created, "errors": self.errors}
+
+
+class EmployeeImporter:
+    """Importe des employés par lots (voir le docstring du module)."""
+
+    def __init__(self, changed_by_id=None, batch_size=BATCH_SIZE):
+        self.changed_by_id = changed_by_id
+        self.batch_size = batch_size
+        self.report = ImportReport()
+        self._serializer = EmployeeImportSerializer()
+        # Emails et identifiants déjà importés, id des employés par identifiant
+        self._emails = set()
+        self._imported = {}
+
+    def run(self, rows):
+        """Importe les lignes `(numéro, dict)` et retourne le rapport."""
+        rows = iter(rows)
+        try:
+            while chunk := list(islice(rows, self.batch_size)):
+                self._import_chunk(chunk)
+        finally:
+            if self.report.created:
+                invalidate("employee")
+                counters.reconcile(
+                    [counter.metric_type for counter in counters.counters_for_model(Employee)]
+                )
+        return self.report
+
+    def _validate(self, chunk):
+        """Validation ligne par ligne ; retourne `[(numéro, attrs)]`."""
+        valid = []
+        for line, data in chunk:
+            self.report.rows += 1
+            if data is UNDECODABLE:
+                self.report.add_error(
+                    line, {"non_field_errors": ["Encodage invalide (UTF-8 attendu)."]}
+                )
+                continue
+            if data is None:
+                self.report.add_error(line, {"non_field_errors": ["Ligne illisible."]})
+                continue
+            try:
+                valid.append((line, self._serializer.run_validation(data)))
+            except serializers.ValidationError as exc:
+                self.report.add_error(line, exc.detail)
+        return valid
+
+    def _import_chunk(self, chunk):
+        rows = self._validate(chunk)
+        emails = {attrs["email"] for _, attrs in rows}
+        given_ids = {attrs["employee_id"] for _, attrs in rows if attrs.get("employee_id")}
+        manager_ids = {attrs["manager"] for _, attrs in rows if attrs.get("manager")}
+        manager_refs = {
+            attrs["manager_employee_id"]
+            for _, attrs in rows
+            if attrs.get("manager_employee_id")
+        } - self._imported.keys()
+
+        # Une requête par type de donnée pour tout le lot
+        taken_emails = set(
+            Employee.objects.filter(email__in=emails).values_list("email", flat=True)
+        )
+        taken_ids = set(
+            Employee.objects.filter(employee_id__in=given_ids).values_list(
+                "employee_id", flat=True
+            )
+        )
+        departments = set(
+            Department.objects.filter(
+                pk__in={
+                    attrs[name]
+                    for _, attrs in rows
+                    for name in ("department", "position")
+                    if attrs.get(name)
+                }
+            ).values_list("pk", flat=True)
+        )
+        managers = set(
+            Employee.objects.filter(pk__in=manager_ids).values_list("pk", flat=True)
+        )
+        known_refs = dict(
+            Employee.objects.filter(employee_id__in=manager_refs).values_list(
+                "employee_id", "pk"
+            )
+        )
+
+        accepted = []
+        chunk_ids = set()
+        for line, attrs in rows:
+            errors = {}
+            if attrs["email"] in taken_emails or attrs["email"] in self._emails:
+                errors["email"] = ["Un employé avec cet email existe déjà."]
+            employee_id = attrs.get("employee_id")
+            if employee_id and (
+                employee_id in taken_ids
+                or employee_id in self._imported
+                or employee_id in chunk_ids
+            ):
+                errors["employee_id"] = ["Un employé avec cet ID existe déjà."]
+            for name in ("department", "position"):
+                if attrs.get(name) and attrs[name] not in departments:
+                    errors[name] = ["Département introuvable."]
+            if attrs.get("manager") and attrs["manager"] not in managers:
+                errors["manager"] = ["Manager introuvable."]
+            reference = attrs.get("manager_employee_id")
+            if reference and reference not in known_refs and reference not in self._imported:
+                # Manager d'une ligne précédente du même lot : résolu après écriture
+                if reference not in chunk_ids:
+                    errors["manager_employee_id"] = [
+                        "Manager introuvable (il doit exister ou précéder ses subordonnés)."
+                    ]
+            if errors:
+                self.report.add_error(line, errors)
+                continue
+            self._emails.add(attrs["email"])
+            if employee_id:
+                chunk_ids.add(employee_id)
+            accepted.append(attrs)
+
+        if accepted:
+            self._write(accepted, known_refs)
+
+    def _write(self, accepted, known_refs):
+        # Identifiants du lot pas encore écrits : à ne pas générer une seconde fois
+        given = {attrs["employee_id"] for attrs in accepted if attrs.get("employee_id")}
+        generated = iter(
+            EmployeeIdSequence.next_ids(
+                sum(1 for attrs in accepted if not attrs.get("employee_id")), exclude=given
+            )
+        )
+        employees = []
+        pending = []
+        for attrs in accepted:
+            reference = attrs.pop("manager_employee_id", None)
+            manager_id = attrs.pop("manager", None)
+            if reference:
+                manager_id = known_refs.get(reference) or self._imported.get(reference)
+            attrs["department_id"] = attrs.pop("department", None)
+            attrs["position_id"] = attrs.pop("position", None)
+            attrs["employee_id"] = attrs.get("employee_id") or next(generated)
+            employee = Employee(manager_id=manager_id, **attrs)
+            if reference and manager_id is None:
+                pending.append((employee, reference))
+            employees.append(employee)
+
+        with transaction.atomic():
+            Employee.objects.bulk_create(employees, batch_size=self.batch_size)
+            self._imported.update((e.employee_id, e.pk) for e in employees)
+            # Managers créés dans le même lot
+            for employee, reference in pending:
+                employee.manager_id = self._imported[reference]
+            if pending:
+                Employee.objects.bulk_update([e for e, _ in pending], ["manager"])
+            EmployeeHistory.objects.bulk_create(
+                [
+                    EmployeeHistory(
+                        employee=employee,
+                        change_type="created",
+                        new_value=f"Employé créé : {employee.first_name} {employee.last_name}",
+                        changed_by_id=self.changed_by_id,
+                    )
+                    for employee in employees
+                ],
+                batch_size=self.batch_size,
+            )
+            hierarchy.add_employees({e.pk: e.manager_id for e in employees})
+            temporal.open_states(employees)
+        self.report.created += len(employees)
@@ -0,0 +1,52 @@
+"""
+Commande de management pour importer des employés en masse.
+Usage: python manage.py import_employees employes.csv [--format csv|jsonl] [--batch-size 500]
+
+Lit le fichier en flux et l'importe par lots (voir `employee.importer`) :
+les lignes invalides sont écartées et listées avec leurs erreurs.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from employee import importer
+
+
+class Command(BaseCommand):
+    help = "Importe des employés depuis un fichier CSV ou JSON Lines"
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Fichier CSV (avec en-tête) ou JSON Lines')
+        parser.add_argument(
+            '--format',
+            choices=importer.FORMATS,
+            help="Format du fichier (défaut : d'après l'extension)",
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=importer.BATCH_SIZE,
+            help=f'Lignes par lot (défaut : {importer.BATCH_SIZE})',
+        )
+
+    def handle(self, *args, **options):
+        read = importer.reader_for(options['format'], options['path'])
+        start = time.perf_counter()
+        try:
+            with open(options['path'], 'rb') as stream:
+                report = importer.EmployeeImporter(batch_size=options['batch_size']).run(
+                    read(stream)
+                )
+        except OSError as exc:
+            raise CommandError(str(exc))
+
+        for error in report.errors:
+            self.stderr.write(f"Ligne {error['line']} : {error['errors']}")
+        style = self.style.SUCCESS if not report.errors else self.style.WARNING
+        self.stdout.write(
+            style(
+                f"{report.created} employé(s) créé(s) sur {report.rows} ligne(s), "
+                f"{len(report.errors)} erreur(s) ({time.perf_counter() - start:.1f} s)"
+            )
+        )
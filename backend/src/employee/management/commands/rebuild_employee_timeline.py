@@ -0,0 +1,30 @@
+"""
+Commande de management pour reconstruire les états datés des employés.
+Usage: python manage.py rebuild_employee_timeline
+
+Recalcule les intervalles `EmployeeState` (département, manager, statut,
+salaire) à partir de l'état courant des employés et de `EmployeeHistory`,
+après une écriture qui contourne les signaux (`update()`, import SQL).
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from backend.cache import invalidate
+from employee import temporal
+from employee.models import EmployeeState
+
+
+class Command(BaseCommand):
+    help = "Reconstruit les états datés des employés à partir de l'historique"
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            employees = temporal.rebuild()
+        invalidate("employee")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✅ États reconstruits : {employees} employés, "
+                f"{EmployeeState.objects.count()} intervalles"
+            )
+        )
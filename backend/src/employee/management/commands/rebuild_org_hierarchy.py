@@ -0,0 +1,30 @@
+"""
+Commande de management pour reconstruire la hiérarchie des employés.
+Usage: python manage.py rebuild_org_hierarchy
+
+Recalcule la table de fermeture `EmployeeHierarchy` à partir de
+`Employee.manager`, après une écriture qui contourne les signaux
+(`bulk_create()`, `update()`, import SQL).
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from backend.cache import invalidate
+from employee import hierarchy
+from employee.models import EmployeeHierarchy
+
+
+class Command(BaseCommand):
+    help = "Reconstruit la table de fermeture de l'organigramme des employés"
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            employees = hierarchy.rebuild()
+        invalidate("employee")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✅ Hiérarchie reconstruite : {employees} employés, "
+                f"{EmployeeHierarchy.objects.count()} liens"
+            )
+        )
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.8 on 2026-10-17 02:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def build_hierarchy(apps, schema_editor):
+    """Construit la table de fermeture à partir de `Employee.manager`."""
+    from employee.hierarchy import build_links
+
+    Employee = apps.get_model("employee", "Employee")
+    EmployeeHierarchy = apps.get_model("employee", "EmployeeHierarchy")
+    parents = dict(Employee.objects.values_list("pk", "manager_id"))
+    EmployeeHierarchy.objects.bulk_create(
+        (
+            EmployeeHierarchy(ancestor_id=ancestor, descendant_id=descendant, depth=depth)
+            for ancestor, descendant, depth in build_links(parents)
+        ),
+        batch_size=1000,
+    )
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmployeeHierarchy',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('depth', models.PositiveIntegerField()),
+                ('ancestor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='descendant_links', to='employee.employee')),
+                ('descendant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ancestor_links', to='employee.employee')),
+            ],
+            options={
+                'verbose_name': 'Lien hiérarchique',
+                'verbose_name_plural': 'Liens hiérarchiques',
+                'indexes': [models.Index(fields=['ancestor', 'depth'], name='employee_em_ancesto_b77374_idx'), models.Index(fields=['descendant', 'depth'], name='employee_em_descend_558192_idx')],
+                'constraints': [models.UniqueConstraint(fields=('ancestor', 'descendant'), name='employee_hierarchy_unique_link')],
+            },
+        ),
+        migrations.RunPython(build_hierarchy, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.8 on 2026-10-17 03:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def build_timeline(apps, schema_editor):
+    """Reconstitue les intervalles datés à partir de l'historique existant."""
+    from employee.temporal import backfill
+
+    backfill(
+        apps.get_model("employee", "Employee"),
+        apps.get_model("employee", "EmployeeHistory"),
+        apps.get_model("employee", "EmployeeState"),
+        apps.get_model("department", "Department"),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('department', '0002_initial'),
+        ('employee', '0003_employeeidsequence'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmployeeState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('active', 'Actif'), ('on_leave', 'En congé'), ('inactive', 'Inactif')], max_length=20)),
+                ('salary', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('valid_from', models.DateTimeField()),
+                ('valid_to', models.DateTimeField(blank=True, null=True)),
+                ('department', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='department.department')),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='states', to='employee.employee')),
+                ('manager', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='employee.employee')),
+            ],
+            options={
+                'verbose_name': "État d'un employé",
+                'verbose_name_plural': 'États des employés',
+                'ordering': ['employee', 'valid_from'],
+                'indexes': [models.Index(fields=['valid_from', 'valid_to'], name='employee_em_valid_f_b2868a_idx'), models.Index(fields=['employee', 'valid_from'], name='employee_em_employe_841e4c_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('valid_to__isnull', True)), fields=('employee',), name='employee_state_one_current')],
+            },
+        ),
+        migrations.RunPython(build_timeline, migrations.RunPython.noop),
+    ]
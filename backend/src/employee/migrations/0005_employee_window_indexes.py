@@ -0,0 +1,22 @@
+# Generated by Django 5.2.8 on 2026-10-17 03:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('department', '0002_initial'),
+        ('employee', '0004_employeestate'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['created_at'], name='employee_em_created_772a0a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['hire_date'], name='employee_em_hire_da_332649_idx'),
+        ),
+    ]
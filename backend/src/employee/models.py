@@ -2,8 +2,14 @@
 
 from .models.employee import Employee
 from .models.employee_history import EmployeeHistory
+from .models.employee_hierarchy import EmployeeHierarchy
+from .models.employee_id_sequence import EmployeeIdSequence
+from .models.employee_state import EmployeeState
 
 __all__ = [
     "Employee",
     "EmployeeHistory",
+    "EmployeeHierarchy",
+    "EmployeeIdSequence",
+    "EmployeeState",
 ]
@@ -1,7 +1,13 @@
 from .employee import Employee
 from .employee_history import EmployeeHistory
+from .employee_hierarchy import EmployeeHierarchy
+from .employee_id_sequence import EmployeeIdSequence
+from .employee_state import EmployeeState
 
 __all__ = [
     "Employee",
     "EmployeeHistory",
+    "EmployeeHierarchy",
+    "EmployeeIdSequence",
+    "EmployeeState",
 ]
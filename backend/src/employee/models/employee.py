@@ -73,11 +73,49 @@ class Employee(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Champs dont les modifications sont historisées (voir employee.history)
+    HISTORY_FIELDS = (
+        "first_name",
+        "last_name",
+        "email",
+        "phone",
+        "department",
+        "position",
+        "manager",
+        "salary",
+        "status",
+    )
+
     class Meta:
         verbose_name = "Employé"
         verbose_name_plural = "Employés"
         ordering = ["last_name", "first_name"]
+        indexes = [
+            # Compteurs du dashboard à fenêtre temporelle
+            models.Index(fields=["created_at"]),
+            models.Index(fields=["hire_date"]),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Valeurs lues en base des champs historisés (clés étrangères : ids)
+        instance._loaded_values = {
+            name: value
+            for name, value in zip(field_names, values)
+            if name in HISTORY_ATTNAMES
+        }
+        return instance
 
     def __str__(self) -> str:
         return f"{self.first_name} {self.last_name}"
 
+    def get_full_name(self) -> str:
+        """Nom complet (même interface que l'utilisateur)."""
+        return f"{self.first_name} {self.last_name}"
+
+
+
+HISTORY_ATTNAMES = frozenset(
+    Employee._meta.get_field(name).attname for name in Employee.HISTORY_FIELDS
+)
@@ -0,0 +1,48 @@
+"""Table de fermeture de la hiérarchie des employés (`Employee.manager`)."""
+
+from django.db import models
+
+from .employee import Employee
+
+
+class EmployeeHierarchy(models.Model):
+    """
+    Lien ancêtre → descendant de l'organigramme (table de fermeture).
+
+    Chaque employé a un lien vers lui-même (`depth = 0`), vers son manager
+    (`depth = 1`), vers le manager de son manager (`depth = 2`), etc. Les
+    subordonnés (directs ou non) d'un employé, sa chaîne hiérarchique, son
+    étendue de contrôle et sa profondeur s'obtiennent ainsi chacun en une
+    requête indexée. La table est tenue à jour par `employee.hierarchy`.
+    """
+
+    ancestor = models.ForeignKey(
+        Employee,
+        on_delete=models.CASCADE,
+        related_name="descendant_links",
+    )
+    descendant = models.ForeignKey(
+        Employee,
+        on_delete=models.CASCADE,
+        related_name="ancestor_links",
+    )
+    depth = models.PositiveIntegerField()
+
+    class Meta:
+        verbose_name = "Lien hiérarchique"
+        verbose_name_plural = "Liens hiérarchiques"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["ancestor", "descendant"],
+                name="employee_hierarchy_unique_link",
+            ),
+        ]
+        indexes = [
+            # Sous-arbre d'un employé, éventuellement limité en profondeur
+            models.Index(fields=["ancestor", "depth"]),
+            # Chaîne hiérarchique d'un employé, du manager direct à la racine
+            models.Index(fields=["descendant", "depth"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.ancestor_id} → {self.descendant_id} ({self.depth})"
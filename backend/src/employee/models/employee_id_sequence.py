@@ -0,0 +1,79 @@
+"""Séquence des identifiants employés générés (`Employee.employee_id`)."""
+
+from django.db import models, transaction
+from django.db.models import F
+from django.utils import timezone
+
+
+class EmployeeIdSequence(models.Model):
+    """
+    Dernier numéro attribué pour un préfixe d'identifiant (`EMPAAAAMMJJ`).
+
+    `next_ids()` réserve un bloc de numéros par une seule mise à jour
+    atomique, au lieu de compter les identifiants existants à chaque
+    création (coûteux, et sujet aux doublons en cas de créations simultanées).
+    """
+
+    PREFIX = "EMP"
+
+    prefix = models.CharField(max_length=20, unique=True)
+    last_value = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Séquence d'identifiants employés"
+        verbose_name_plural = "Séquences d'identifiants employés"
+
+    def __str__(self) -> str:
+        return f"{self.prefix} ({self.last_value})"
+
+    @classmethod
+    def _highest(cls, prefix):
+        """Plus grand suffixe numérique des identifiants déjà attribués au préfixe."""
+        from .employee import Employee
+
+        suffixes = (
+            employee_id[len(prefix):]
+            for employee_id in Employee.objects.filter(
+                employee_id__startswith=prefix
+            ).values_list("employee_id", flat=True)
+        )
+        return max((int(suffix) for suffix in suffixes if suffix.isdigit()), default=0)
+
+    @classmethod
+    def next_ids(cls, count, day=None, exclude=()):
+        """
+        Réserve `count` identifiants `EMPAAAAMMJJNNNN` libres pour le jour donné.
+
+        Les numéros déjà pris (identifiant saisi à la main en base, ou présent
+        dans `exclude`) sont sautés.
+        """
+        if count <= 0:
+            return []
+        from .employee import Employee
+
+        prefix = f"{cls.PREFIX}{(day or timezone.localdate()):%Y%m%d}"
+        exclude = set(exclude)
+        ids = []
+        with transaction.atomic():
+            # Premier identifiant du jour : la séquence reprend après le plus
+            # grand numéro déjà attribué avec ce préfixe
+            sequence, _ = cls.objects.get_or_create(
+                prefix=prefix, defaults={"last_value": lambda: cls._highest(prefix)}
+            )
+            while len(ids) < count:
+                wanted = count - len(ids)
+                # Le verrou de ligne pris par l'UPDATE sérialise les réservations
+                cls.objects.filter(pk=sequence.pk).update(
+                    last_value=F("last_value") + wanted
+                )
+                last = cls.objects.values_list("last_value", flat=True).get(pk=sequence.pk)
+                block = [
+                    f"{prefix}{value:04d}" for value in range(last - wanted + 1, last + 1)
+                ]
+                taken = exclude.union(
+                    Employee.objects.filter(employee_id__in=block).values_list(
+                        "employee_id", flat=True
+                    )
+                )
+                ids.extend(employee_id for employee_id in block if employee_id not in taken)
+        return ids
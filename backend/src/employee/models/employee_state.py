@@ -0,0 +1,62 @@
+"""Historique daté de l'état d'un employé (département, manager, statut, salaire)."""
+
+from django.db import models
+from django.db.models import Q
+
+from .employee import Employee
+
+
+class EmployeeState(models.Model):
+    """
+    État d'un employé pendant l'intervalle `[valid_from, valid_to)`.
+
+    Chaque changement de département, de manager, de statut ou de salaire
+    ferme l'intervalle courant (`valid_to` NULL) et en ouvre un nouveau. L'état
+    à une date donnée (effectif par département, masse salariale...) se lit
+    ainsi en une requête indexée, comme l'état courant. La table est tenue à
+    jour par `employee.temporal`.
+    """
+
+    employee = models.ForeignKey(
+        Employee,
+        on_delete=models.CASCADE,
+        related_name="states",
+    )
+    department = models.ForeignKey(
+        "department.Department",
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="+",
+    )
+    manager = models.ForeignKey(
+        Employee,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="+",
+    )
+    status = models.CharField(max_length=20, choices=Employee.STATUS_CHOICES)
+    salary = models.DecimalField(max_digits=12, decimal_places=2)
+    valid_from = models.DateTimeField()
+    valid_to = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "État d'un employé"
+        verbose_name_plural = "États des employés"
+        ordering = ["employee", "valid_from"]
+        constraints = [
+            # Un seul intervalle ouvert (l'état courant) par employé
+            models.UniqueConstraint(
+                fields=["employee"],
+                condition=Q(valid_to__isnull=True),
+                name="employee_state_one_current",
+            ),
+        ]
+        indexes = [
+            # États valides à une date donnée
+            models.Index(fields=["valid_from", "valid_to"]),
+            # Chronologie d'un employé
+            models.Index(fields=["employee", "valid_from"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.employee_id} : {self.valid_from} → {self.valid_to or '…'}"
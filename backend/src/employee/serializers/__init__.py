@@ -2,10 +2,12 @@
 
 from .employee_serializer import EmployeeSerializer, EmployeeListSerializer
 from .employee_history_serializer import EmployeeHistorySerializer
+from .employee_import_serializer import EmployeeImportSerializer
 
 __all__ = [
     "EmployeeSerializer",
     "EmployeeListSerializer",
     "EmployeeHistorySerializer",
+    "EmployeeImportSerializer",
 ]
 
@@ -0,0 +1,55 @@
+"""Serializer d'une ligne d'import d'employés (voir `employee.importer`)."""
+
+from rest_framework import serializers
+
+from employee.serializers.employee_serializer import EmployeeSerializer
+
+
+class EmployeeImportSerializer(EmployeeSerializer):
+    """
+    Valide une ligne d'import sans requête SQL.
+
+    Reprend les règles de `EmployeeSerializer` (dates, salaire), mais les
+    relations sont de simples ids et l'unicité de l'email et de l'identifiant
+    est vérifiée par l'importeur, en une requête par lot de lignes.
+    """
+
+    employee_id = serializers.CharField(max_length=50, required=False, allow_blank=True)
+    department = serializers.IntegerField(required=False, allow_null=True)
+    position = serializers.IntegerField(required=False, allow_null=True)
+    manager = serializers.IntegerField(required=False, allow_null=True)
+    # Manager désigné par son identifiant : employé existant ou ligne
+    # précédente du même fichier
+    manager_employee_id = serializers.CharField(
+        max_length=50, required=False, allow_blank=True
+    )
+
+    class Meta(EmployeeSerializer.Meta):
+        fields = [
+            "first_name",
+            "last_name",
+            "email",
+            "phone",
+            "date_of_birth",
+            "gender",
+            "employee_id",
+            "hire_date",
+            "position",
+            "department",
+            "manager",
+            "manager_employee_id",
+            "salary",
+            "status",
+            "address",
+            "city",
+            "country",
+        ]
+        read_only_fields = []
+        # Unicité vérifiée par lot (voir employee.importer)
+        extra_kwargs = {"email": {"validators": []}}
+
+    def validate_email(self, value):
+        return value
+
+    def validate_employee_id(self, value):
+        return value
@@ -1,6 +1,7 @@
 """Serializer pour le modèle Employee (employés)."""
 
 from rest_framework import serializers
+from employee import hierarchy
 from employee.models.employee import Employee
 
 
@@ -61,6 +62,19 @@ class EmployeeSerializer(serializers.ModelSerializer):
             "updated_at",
         ]
         read_only_fields = ["created_at", "updated_at", "employee_id"]
+        # Relations lues par les champs calculés (voir backend.fieldsets)
+        field_dependencies = {
+            "full_name": (),
+            "manager_name": ("manager",),
+            "age": (),
+            "years_of_service": (),
+        }
+        expandable_fields = {
+            "manager": (
+                "employee.serializers.employee_serializer.EmployeeListSerializer",
+                ("manager__department", "manager__position"),
+            ),
+        }
 
     def get_full_name(self, obj):
         """Retourne le nom complet de l'employé."""
@@ -172,6 +186,11 @@ class EmployeeSerializer(serializers.ModelSerializer):
                 raise serializers.ValidationError(
                     "Un employé ne peut pas être son propre manager."
                 )
+            # Ni l'un de ses subordonnés, directs ou non (organigramme cyclique)
+            if hierarchy.is_report(self.instance.id, manager.id):
+                raise serializers.ValidationError(
+                    "Un employé ne peut pas être rattaché à l'un de ses subordonnés."
+                )
 
         return attrs
 
@@ -203,6 +222,8 @@ class EmployeeListSerializer(serializers.ModelSerializer):
             "hire_date",
             "profile_picture",
         ]
+        field_dependencies = {"full_name": ()}
+        expandable_fields = EmployeeSerializer.Meta.expandable_fields
 
     def get_full_name(self, obj):
         """Retourne le nom complet de l'employé."""
@@ -0,0 +1,74 @@
+"""
+Signaux Django pour l'application employee.
+
+Tient à jour la table de fermeture de l'organigramme (`employee.hierarchy`)
+lorsqu'un employé est créé, change de manager ou est supprimé, et enregistre
+l'historique de ses modifications (`employee.history`, `employee.temporal`).
+"""
+
+from django.db.models.signals import post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from employee import hierarchy, history, temporal
+from employee.models import Employee, EmployeeHistory
+
+
+@receiver(pre_save, sender=Employee)
+def check_manager_change(sender, instance, raw=False, **kwargs):
+    """Relève l'ancien manager et refuse un rattachement circulaire."""
+    if raw or instance.pk is None:
+        instance._hierarchy_moved = True
+        return
+    loaded = getattr(instance, "_loaded_values", {})
+    if "manager_id" in loaded:
+        # Instance lue en base : comparaison sans requête
+        previous = loaded["manager_id"]
+    else:
+        previous = hierarchy.manager_of(instance.pk)
+    instance._hierarchy_moved = previous != instance.manager_id
+    if (
+        instance._hierarchy_moved
+        and instance.manager_id is not None
+        and (
+            instance.manager_id == instance.pk
+            or hierarchy.is_report(instance.pk, instance.manager_id)
+        )
+    ):
+        raise hierarchy.HierarchyCycleError(
+            "Un employé ne peut pas être rattaché à l'un de ses subordonnés."
+        )
+
+
+@receiver(post_save, sender=Employee)
+def update_hierarchy(sender, instance, raw=False, **kwargs):
+    """Rattache l'employé (et son sous-arbre) à son manager."""
+    if raw or not getattr(instance, "_hierarchy_moved", True):
+        return
+    hierarchy.move(instance.pk, instance.manager_id)
+
+
+@receiver(post_save, sender=Employee)
+def record_history(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    """
+    Historise la création ou les champs modifiés (un seul INSERT) et tient à
+    jour les intervalles datés (`employee.temporal`).
+    """
+    if raw:
+        return
+    if created:
+        history.record_created(instance)
+        temporal.open_states([instance])
+    else:
+        entries = history.changes(instance, update_fields)
+        if entries:
+            EmployeeHistory.objects.bulk_create(entries)
+        changed = {entry.change_type.removesuffix("_changed") for entry in entries}
+        if changed.intersection(temporal.FIELDS):
+            temporal.record_changes({instance.pk: temporal.values_of(instance)})
+    history.mark_saved(instance)
+
+
+@receiver(pre_delete, sender=Employee)
+def detach_reports(sender, instance, **kwargs):
+    """Les subordonnés de l'employé supprimé deviennent des racines."""
+    hierarchy.detach_reports(instance.pk)
@@ -0,0 +1,296 @@
+"""
+Historique daté des employés : maintenance et requêtes de `EmployeeState`.
+
+Chaque employé a une suite d'intervalles `[valid_from, valid_to)` portant
+son département, son manager, son statut et son salaire ; l'intervalle
+courant a `valid_to` NULL et commence, pour un nouvel employé, à sa date
+d'embauche. Les signaux de `employee.signals`, `employee.history.update()`
+/ `bulk_update()` et l'import en masse appellent :
+- `open_states()` à la création d'employés ;
+- `record_changes()` lorsqu'un de ces champs change : les intervalles
+  courants sont fermés et de nouveaux ouverts, en trois requêtes pour tout
+  un lot d'employés.
+
+Toute autre écriture qui contourne les signaux (`update()`, SQL) doit être
+suivie de `rebuild()` (commande `rebuild_employee_timeline`), qui
+reconstitue les intervalles à partir de l'état courant et de
+`EmployeeHistory`.
+
+Requêtes (une requête indexée chacune) :
+    states_at(moment).filter(department=it).count()       # effectif à la date
+    filter_as_of(Employee.objects.all(), moment)          # employés à la date
+    apply_as_of(page, moment)                             # valeurs à la date
+"""
+
+import datetime
+from decimal import Decimal, InvalidOperation
+from itertools import groupby
+from operator import itemgetter
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q, prefetch_related_objects
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from employee.models import Employee, EmployeeState
+
+# Champs datés et colonnes correspondantes
+FIELDS = ("department", "manager", "status", "salary")
+ATTNAMES = ("department_id", "manager_id", "status", "salary")
+
+BATCH_SIZE = 1000
+
+# Lignes d'historique à moins d'une seconde d'écart : une même sauvegarde
+SAME_CHANGE = datetime.timedelta(seconds=1)
+
+# Ancienne valeur illisible : la valeur plus récente est conservée
+UNKNOWN = object()
+
+
+def _aware(value):
+    if settings.USE_TZ and timezone.is_naive(value):
+        return timezone.make_aware(value)
+    return value
+
+
+def start_of(day):
+    """Début (00:00) d'une journée, dans le fuseau courant."""
+    return _aware(datetime.datetime.combine(day, datetime.time.min))
+
+
+def parse_as_of(value):
+    """
+    Instant désigné par `?as_of=` : une date et heure ISO 8601, ou une date
+    seule (état à la fin de cette journée). Lève `ValueError` sinon.
+    """
+    # Date seule d'abord : `parse_datetime()` l'accepte aussi (minuit)
+    day = parse_date(value)
+    if day is not None:
+        return _aware(datetime.datetime.combine(day, datetime.time.max))
+    moment = parse_datetime(value)
+    if moment is None:
+        raise ValueError(value)
+    return _aware(moment)
+
+
+def valid_at(moment):
+    """Condition des intervalles contenant `moment`."""
+    return Q(valid_from__lte=moment) & (Q(valid_to__isnull=True) | Q(valid_to__gt=moment))
+
+
+def states_at(moment):
+    """États des employés à `moment` (au plus un par employé)."""
+    return EmployeeState.objects.filter(valid_at(moment))
+
+
+def filter_as_of(queryset, moment, **filters):
+    """Employés du queryset présents à `moment`, filtrés sur leur état à cette date."""
+    return queryset.filter(
+        pk__in=states_at(moment).filter(**filters).values("employee_id")
+    )
+
+
+def apply_as_of(employees, moment):
+    """
+    Remplace sur les instances chargées les valeurs courantes des champs
+    datés par celles à `moment` (une requête). Les départements et managers
+    déjà chargés (`select_related`) sont rechargés en une requête chacun.
+    """
+    employees = list(employees)
+    states = {
+        row[0]: row[1:]
+        for row in states_at(moment)
+        .filter(employee_id__in=[employee.pk for employee in employees])
+        .values_list("employee_id", *ATTNAMES)
+    }
+    related = [
+        name
+        for name in ("department", "manager")
+        if any(Employee._meta.get_field(name).is_cached(e) for e in employees)
+    ]
+    for employee in employees:
+        # L'affectation d'un id différent vide le cache de la relation
+        for attname, value in zip(ATTNAMES, states.get(employee.pk, ())):
+            setattr(employee, attname, value)
+    if related:
+        prefetch_related_objects(employees, *related)
+    return employees
+
+
+def values_of(employee):
+    """Valeurs des champs datés d'une instance (ordre de `ATTNAMES`)."""
+    return tuple(getattr(employee, attname) for attname in ATTNAMES)
+
+
+def _state(employee_id, values, valid_from, valid_to=None):
+    return EmployeeState(
+        employee_id=employee_id,
+        valid_from=valid_from,
+        valid_to=valid_to,
+        **dict(zip(ATTNAMES, values)),
+    )
+
+
+def open_states(employees):
+    """Premier intervalle d'employés créés, à partir de leur date d'embauche."""
+    now = timezone.now()
+    EmployeeState.objects.bulk_create(
+        [
+            _state(
+                employee.pk,
+                values_of(employee),
+                start_of(employee.hire_date) if employee.hire_date else now,
+            )
+            for employee in employees
+        ],
+        batch_size=BATCH_SIZE,
+    )
+
+
+def record_changes(changes, at=None):
+    """
+    Ferme les intervalles courants et ouvre les nouveaux à `at` (défaut :
+    maintenant). `changes` associe à chaque id d'employé ses nouvelles
+    valeurs (ordre de `ATTNAMES`).
+
+    Un intervalle courant qui n'a pas encore commencé (embauche future) est
+    remplacé : le nouveau commence à la même date, jamais avant l'embauche.
+    """
+    if not changes:
+        return
+    at = at or timezone.now()
+    current = EmployeeState.objects.filter(
+        employee_id__in=list(changes), valid_to__isnull=True
+    )
+    upcoming = dict(
+        current.filter(valid_from__gt=at).values_list("employee_id", "valid_from")
+    )
+    if upcoming:
+        current.filter(valid_from__gt=at).delete()
+    current.update(valid_to=at)
+    EmployeeState.objects.bulk_create(
+        [
+            _state(employee_id, values, upcoming.get(employee_id, at))
+            for employee_id, values in changes.items()
+        ],
+        batch_size=BATCH_SIZE,
+    )
+
+
+def build_intervals(current, start, changes):
+    """
+    Intervalles `(valeurs, valid_from, valid_to)` d'un employé, du plus
+    récent au plus ancien.
+
+    `current` : valeurs actuelles par colonne ; `start` : début du premier
+    intervalle (embauche) ; `changes` : `(date, colonne, ancienne valeur)`
+    du plus récent au plus ancien. Les lignes à moins de `SAME_CHANGE`
+    d'écart forment un seul changement.
+    """
+    values, valid_to, boundary = dict(current), None, None
+    for at, attname, old in changes:
+        if boundary is None or boundary - at > SAME_CHANGE:
+            yield dict(values), at, valid_to
+            valid_to = boundary = at
+        if old is not UNKNOWN:
+            values[attname] = old
+    yield values, min(start, valid_to) if valid_to else start, valid_to
+
+
+class _OldValues:
+    """Lecture des anciennes valeurs de `EmployeeHistory` (texte libre)."""
+
+    def __init__(self, Department, Employee):
+        self._models = {"department_id": Department, "manager_id": Employee}
+        self._names = {}
+
+    def _by_name(self, attname):
+        # Historique antérieur aux ids : nom du département ou de l'employé
+        if attname not in self._names:
+            model = self._models[attname]
+            if attname == "department_id":
+                rows = model.objects.values_list("name", "pk")
+            else:
+                rows = (
+                    (f"{first} {last}", pk)
+                    for pk, first, last in model.objects.values_list(
+                        "pk", "first_name", "last_name"
+                    )
+                )
+            self._names[attname] = dict(rows)
+        return self._names[attname]
+
+    def __call__(self, attname, text):
+        if attname == "status":
+            valid = {value for value, _ in Employee.STATUS_CHOICES}
+            return text if text in valid else UNKNOWN
+        if attname == "salary":
+            try:
+                return Decimal(text)
+            except InvalidOperation:
+                return UNKNOWN
+        if not text:
+            return None
+        if text.isdigit():
+            return int(text)
+        return self._by_name(attname).get(text, UNKNOWN)
+
+
+def backfill(Employee, EmployeeHistory, EmployeeState, Department):
+    """
+    Crée les intervalles de tous les employés à partir de leur état courant
+    et de leur historique. Les modèles sont passés en paramètre : la fonction
+    sert aussi à la migration qui crée la table. Retourne le nombre d'employés.
+    """
+    change_types = {f"{field}_changed": attname for field, attname in zip(FIELDS, ATTNAMES)}
+    old_value = _OldValues(Department, Employee)
+    history = groupby(
+        EmployeeHistory.objects.filter(change_type__in=change_types)
+        .order_by("employee_id", "-changed_at", "-pk")
+        .values_list("employee_id", "changed_at", "change_type", "old_value")
+        .iterator(chunk_size=BATCH_SIZE),
+        key=itemgetter(0),
+    )
+    group = next(history, None)
+    batch, count = [], 0
+    for pk, hire_date, *current in (
+        Employee.objects.order_by("pk")
+        .values_list("pk", "hire_date", *ATTNAMES)
+        .iterator(chunk_size=BATCH_SIZE)
+    ):
+        changes = []
+        while group is not None and group[0] <= pk:
+            if group[0] == pk:
+                changes = [
+                    (at, change_types[kind], old_value(change_types[kind], text))
+                    for _, at, kind, text in group[1]
+                ]
+            group = next(history, None)
+        for values, valid_from, valid_to in build_intervals(
+            dict(zip(ATTNAMES, current)), start_of(hire_date), changes
+        ):
+            batch.append(
+                EmployeeState(
+                    employee_id=pk, valid_from=valid_from, valid_to=valid_to, **values
+                )
+            )
+        count += 1
+        if len(batch) >= BATCH_SIZE:
+            EmployeeState.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        EmployeeState.objects.bulk_create(batch)
+    return count
+
+
+def rebuild():
+    """Reconstruit toute la table à partir de l'état courant et de l'historique."""
+    from department.models import Department
+    from employee.models import EmployeeHistory
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {connection.ops.quote_name(EmployeeState._meta.db_table)}"
+        )
+    return backfill(Employee, EmployeeHistory, EmployeeState, Department)
@@ -6,9 +6,16 @@ from django.contrib.auth import get_user_model
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
 from rest_framework_simplejwt.tokens import RefreshToken
-from employee.models import Employee
+from employee import hierarchy, history, importer, temporal
+from employee.models import Employee, EmployeeHierarchy, EmployeeHistory, EmployeeState
 from department.models import Department
-from datetime import date
+from datetime import date, time, timedelta
+import io
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.utils import timezone
 
 CustomUser = get_user_model()
 
@@ -165,3 +172,682 @@ class EmployeeAPITest(APITestCase):
         response = self.client.get(f'/api/employee/employees/{self.employee.id}/')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['first_name'], 'John')
+
+    def test_statistics_single_pass(self):
+        """Les statistiques sont calculées en deux requêtes (agrégat + GROUP BY)."""
+        self.client.force_authenticate(user=self.user)
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/employee/employees/statistics/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['total'], 1)
+        self.assertEqual(response.data['by_status'][Employee.STATUS_ACTIVE], 1)
+        self.assertEqual(response.data['by_gender'][Employee.GENDER_MALE], 1)
+        self.assertEqual(response.data['average_salary'], 50000.0)
+        self.assertEqual(
+            response.data['by_department'], [{'department__name': 'IT', 'count': 1}]
+        )
+
+
+class EmployeeHierarchyTest(APITestCase):
+    """Tests pour la table de fermeture de l'organigramme et ses endpoints."""
+
+    def setUp(self):
+        """Organigramme : ceo → cto → lead → dev, et ceo → cfo."""
+        self.department = Department.objects.create(
+            name='IT', code='IT001', budget=100000.00
+        )
+        self.ceo = self._employee('ceo')
+        self.cto = self._employee('cto', manager=self.ceo)
+        self.cfo = self._employee('cfo', manager=self.ceo)
+        self.lead = self._employee('lead', manager=self.cto)
+        self.dev = self._employee('dev', manager=self.lead)
+        self.hr = CustomUser.objects.create_user(
+            username='hr', email='hr@example.com', password='testpass123', role='hr_manager'
+        )
+
+    def _employee(self, name, manager=None):
+        return Employee.objects.create(
+            first_name=name.title(),
+            last_name='Doe',
+            email=f'{name}@example.com',
+            phone='+33123456789',
+            date_of_birth=date(1990, 1, 1),
+            gender=Employee.GENDER_MALE,
+            employee_id=name.upper(),
+            hire_date=date(2020, 1, 1),
+            department=self.department,
+            manager=manager,
+            salary=50000.00,
+            status=Employee.STATUS_ACTIVE,
+            address='123 Main St',
+            city='Paris',
+            country='France',
+        )
+
+    def _reports(self, employee, **kwargs):
+        return set(Employee.objects.filter(id__in=hierarchy.subtree(employee.pk, **kwargs)))
+
+    def _links(self):
+        return set(EmployeeHierarchy.objects.values_list('ancestor_id', 'descendant_id', 'depth'))
+
+    def test_transitive_reports_and_chain(self):
+        """Sous-arbre, chaîne et étendue de contrôle."""
+        self.assertEqual(self._reports(self.cto), {self.lead, self.dev})
+        self.assertEqual(self._reports(self.ceo, max_depth=1), {self.cto, self.cfo})
+        self.assertEqual(
+            set(Employee.objects.filter(id__in=hierarchy.chain(self.dev.pk))),
+            {self.lead, self.cto, self.ceo},
+        )
+        with self.assertNumQueries(1):
+            span = hierarchy.span_of_control(self.cto.pk)
+        self.assertEqual(
+            span, {'direct_reports': 1, 'total_reports': 2, 'levels_below': 2, 'depth': 1}
+        )
+
+    def test_move_subtree(self):
+        """Changer de manager déplace tout le sous-arbre."""
+        self.cto.manager = self.cfo
+        self.cto.save()
+        self.assertEqual(self._reports(self.cfo), {self.cto, self.lead, self.dev})
+        self.assertEqual(hierarchy.span_of_control(self.dev.pk)['depth'], 4)
+
+        self.lead.manager = None
+        self.lead.save()
+        self.assertEqual(self._reports(self.cfo), {self.cto})
+        self.assertEqual(hierarchy.span_of_control(self.dev.pk)['depth'], 1)
+        # Les mises à jour incrémentales donnent la même table qu'une reconstruction
+        links = self._links()
+        hierarchy.rebuild()
+        self.assertEqual(self._links(), links)
+
+    def test_cycle_rejected(self):
+        """Un employé ne peut pas être rattaché à l'un de ses subordonnés."""
+        self.ceo.manager = self.dev
+        with self.assertRaises(hierarchy.HierarchyCycleError):
+            self.ceo.save()
+
+        self.client.force_authenticate(user=self.hr)
+        response = self.client.patch(
+            f'/api/employee/employees/{self.cto.pk}/', {'manager': self.dev.pk}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_delete_detaches_reports(self):
+        """Les subordonnés d'un employé supprimé deviennent des racines."""
+        self.cto.delete()
+        self.assertEqual(self._reports(self.ceo), {self.cfo})
+        self.assertEqual(self._reports(self.lead), {self.dev})
+        self.assertEqual(hierarchy.span_of_control(self.lead.pk)['depth'], 0)
+
+    def test_skip_level_manager_scope(self):
+        """Un manager voit ses subordonnés indirects, sans requête par niveau."""
+        user = CustomUser.objects.create_user(
+            username='cto', email='cto.user@example.com', password='testpass123',
+            role='manager', employee=self.cto,
+        )
+        self.client.force_authenticate(user=user)
+        response = self.client.get('/api/employee/employees/')
+        self.assertEqual(
+            {row['id'] for row in response.data['results']},
+            {self.cto.pk, self.lead.pk, self.dev.pk},
+        )
+        response = self.client.get(f'/api/employee/employees/{self.dev.pk}/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.get(f'/api/employee/employees/{self.cfo.pk}/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_endpoints(self):
+        """Sous-arbre, chaîne, étendue et organigramme."""
+        self.client.force_authenticate(user=self.hr)
+        base = '/api/employee/employees'
+
+        response = self.client.get(f'{base}/{self.ceo.pk}/reports/?max_depth=2')
+        self.assertEqual(
+            {row['id'] for row in response.data['results']},
+            {self.cto.pk, self.cfo.pk, self.lead.pk},
+        )
+        response = self.client.get(f'{base}/{self.ceo.pk}/reports/?max_depth=0')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get(f'{base}/{self.dev.pk}/chain/')
+        self.assertEqual(
+            [(node['id'], node['depth']) for node in response.data],
+            [(self.lead.pk, 1), (self.cto.pk, 2), (self.ceo.pk, 3)],
+        )
+
+        response = self.client.get(f'{base}/{self.ceo.pk}/span/')
+        self.assertEqual(response.data['total_reports'], 4)
+        self.assertEqual(response.data['direct_reports'], 2)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(f'{base}/org-chart/')
+        [ceo] = response.data
+        self.assertEqual(ceo['full_name'], 'Ceo Doe')
+        self.assertEqual([node['id'] for node in ceo['reports']], [self.cfo.pk, self.cto.pk])
+        cto = ceo['reports'][1]
+        self.assertEqual(cto['reports'][0]['reports'][0]['id'], self.dev.pk)
+
+        response = self.client.get(f'{base}/org-chart/?root={self.cto.pk}&max_depth=1')
+        self.assertEqual(
+            [(node['id'], [r['id'] for r in node['reports']]) for node in response.data],
+            [(self.cto.pk, [self.lead.pk])],
+        )
+        self.assertEqual(response.data[0]['reports'][0]['reports'], [])
+
+
+class EmployeeImportTest(APITestCase):
+    """Tests pour l'import en masse (employee.importer)."""
+
+    HEADER = (
+        'first_name,last_name,email,phone,date_of_birth,gender,employee_id,'
+        'hire_date,department,manager_employee_id,salary,address,city,country\n'
+    )
+
+    def setUp(self):
+        self.department = Department.objects.create(
+            name='IT', code='IT001', budget=100000.00
+        )
+        self.boss = Employee.objects.create(
+            first_name='Boss',
+            last_name='Doe',
+            email='boss@example.com',
+            phone='+33123456789',
+            date_of_birth=date(1980, 1, 1),
+            gender=Employee.GENDER_MALE,
+            employee_id='BOSS',
+            hire_date=date(2010, 1, 1),
+            department=self.department,
+            salary=90000.00,
+            status=Employee.STATUS_ACTIVE,
+            address='1 rue de Paris',
+            city='Paris',
+            country='France',
+        )
+        self.hr = CustomUser.objects.create_user(
+            username='hr', email='hr@example.com', password='testpass123', role='hr_manager'
+        )
+
+    def _row(self, name, employee_id='', manager='', department=None, salary='40000'):
+        department = self.department.pk if department is None else department
+        return (
+            f'{name.title()},Doe,{name}@example.com,+33100000000,1990-01-01,M,'
+            f'{employee_id},2020-01-01,{department},{manager},{salary},1 rue,Paris,France\n'
+        )
+
+    def _run(self, content, **kwargs):
+        return importer.EmployeeImporter(**kwargs).run(
+            importer.read_csv(io.BytesIO(content.encode()))
+        )
+
+    def test_import_creates_employees_history_and_hierarchy(self):
+        report = self._run(
+            self.HEADER
+            + self._row('lead', employee_id='LEAD', manager='BOSS')
+            + self._row('dev', manager='LEAD')
+        )
+        self.assertEqual((report.rows, report.created, report.errors), (2, 2, []))
+        lead = Employee.objects.get(employee_id='LEAD')
+        dev = Employee.objects.get(email='dev@example.com')
+        # Identifiant généré par la séquence du jour
+        self.assertTrue(dev.employee_id.startswith(f"EMP{date.today():%Y%m%d}"))
+        self.assertEqual(lead.manager, self.boss)
+        self.assertEqual(dev.manager, lead)
+        self.assertEqual(
+            EmployeeHistory.objects.filter(change_type='created', employee__in=[lead, dev]).count(),
+            2,
+        )
+        self.assertTrue(hierarchy.is_report(self.boss.pk, dev.pk))
+
+    def test_invalid_rows_are_reported_without_blocking_others(self):
+        report = self._run(
+            self.HEADER
+            + self._row('boss')  # email déjà pris
+            + self._row('ok')
+            + self._row('ok')  # email en double dans le fichier
+            + self._row('other', employee_id='BOSS')
+            + self._row('nodept', department=999999)
+            + self._row('orphan', manager='NOBODY')
+            + self._row('poor', salary='-1')
+        )
+        self.assertEqual(report.rows, 7)
+        self.assertEqual(report.created, 1)
+        errors = {error['line']: set(error['errors']) for error in report.errors}
+        self.assertEqual(
+            errors,
+            {
+                2: {'email'},
+                4: {'email'},
+                5: {'employee_id'},
+                6: {'department'},
+                7: {'manager_employee_id'},
+                8: {'salary'},
+            },
+        )
+
+    def test_sequence_does_not_reuse_ids(self):
+        self._run(self.HEADER + self._row('a') + self._row('b'))
+        self._run(self.HEADER + self._row('c'))
+        ids = list(Employee.objects.exclude(pk=self.boss.pk).values_list('employee_id', flat=True))
+        self.assertEqual(len(set(ids)), 3)
+
+    def test_generated_ids_skip_explicit_ids(self):
+        prefix = f"EMP{date.today():%Y%m%d}"
+        Employee.objects.filter(pk=self.boss.pk).update(employee_id=f'{prefix}0003')
+        report = self._run(
+            self.HEADER
+            + self._row('given', employee_id=f'{prefix}0005')
+            + ''.join(self._row(f'auto{i}') for i in range(2))
+        )
+        self.assertEqual((report.created, report.errors), (3, []))
+        # Séquence reprise après le plus grand suffixe en base, 0005 sauté
+        self.assertEqual(
+            set(
+                Employee.objects.filter(email__startswith='auto').values_list(
+                    'employee_id', flat=True
+                )
+            ),
+            {f'{prefix}0004', f'{prefix}0006'},
+        )
+
+    def test_generated_id_after_explicit_first_id_of_the_day(self):
+        prefix = f"EMP{date.today():%Y%m%d}"
+        report = self._run(
+            self.HEADER + self._row('given', employee_id=f'{prefix}0001') + self._row('auto')
+        )
+        self.assertEqual((report.created, report.errors), (2, []))
+        self.assertEqual(
+            Employee.objects.get(email='auto@example.com').employee_id, f'{prefix}0002'
+        )
+
+    def test_queries_do_not_grow_with_rows(self):
+        # Premier import : crée la séquence du jour et les métriques du dashboard
+        self._run(self.HEADER + self._row('first'))
+        with CaptureQueriesContext(connection) as small:
+            self._run(self.HEADER + ''.join(self._row(f'a{i}', manager='BOSS') for i in range(2)))
+        with CaptureQueriesContext(connection) as large:
+            self._run(self.HEADER + ''.join(self._row(f'b{i}', manager='BOSS') for i in range(40)))
+        self.assertEqual(len(small), len(large))
+
+    def test_jsonl_import_endpoint(self):
+        self.client.force_authenticate(user=self.hr)
+        lines = (
+            '{"first_name": "Json", "last_name": "Doe", "email": "json@example.com",'
+            ' "phone": "+33100000000", "date_of_birth": "1990-01-01", "gender": "F",'
+            ' "hire_date": "2020-01-01", "salary": "40000", "address": "1 rue",'
+            ' "city": "Paris", "country": "France", "manager": %d}\n'
+            'pas du json\n' % self.boss.pk
+        )
+        response = self.client.post(
+            '/api/employee/employees/import/',
+            {'file': SimpleUploadedFile('employes.jsonl', lines.encode())},
+            format='multipart',
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual(response.data['errors'][0]['line'], 2)
+        self.assertEqual(Employee.objects.get(email='json@example.com').manager, self.boss)
+
+    def test_non_utf8_lines_are_reported(self):
+        self.client.force_authenticate(user=self.hr)
+        content = (
+            self.HEADER.encode()
+            + self._row('ok').encode()
+            + self._row('zoe').replace('Zoe', 'Zoé').encode('latin-1')
+            + self._row('other').encode()
+        )
+        response = self.client.post(
+            '/api/employee/employees/import/',
+            {'file': SimpleUploadedFile('employes.csv', content)},
+            format='multipart',
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual((response.data['rows'], response.data['created']), (3, 2))
+        self.assertEqual(
+            response.data['errors'],
+            [{'line': 3, 'errors': {'non_field_errors': ['Encodage invalide (UTF-8 attendu).']}}],
+        )
+
+        report = importer.EmployeeImporter().run(
+            importer.read_jsonl(io.BytesIO('{"first_name": "Zoé"}\n'.encode('latin-1')))
+        )
+        self.assertEqual([error['line'] for error in report.errors], [1])
+
+    def test_non_utf8_header_is_reported(self):
+        report = importer.EmployeeImporter().run(
+            importer.read_csv(io.BytesIO('prénom,nom\nA,B\n'.encode('latin-1')))
+        )
+        self.assertEqual((report.rows, report.created), (1, 0))
+        self.assertEqual(report.errors[0]['line'], 1)
+
+    def test_import_endpoint_rejects_unknown_format(self):
+        self.client.force_authenticate(user=self.hr)
+        response = self.client.post(
+            '/api/employee/employees/import/',
+            {'file': SimpleUploadedFile('e.csv', b''), 'format': 'xml'},
+            format='multipart',
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class EmployeeHistoryRecordingTest(APITestCase):
+    """Tests pour l'historique des modifications (employee.history)."""
+
+    def setUp(self):
+        self.it = Department.objects.create(name='IT', code='IT001', budget=100000.00)
+        self.sales = Department.objects.create(name='Ventes', code='VTE001', budget=100000.00)
+        self.hr_employee = self._employee('rh')
+        self.alice = self._employee('alice')
+        self.bob = self._employee('bob')
+        self.hr = CustomUser.objects.create_user(
+            username='hr',
+            email='hr@example.com',
+            password='testpass123',
+            role='hr_manager',
+            employee=self.hr_employee,
+        )
+
+    def _employee(self, name):
+        return Employee.objects.create(
+            first_name=name.title(),
+            last_name='Doe',
+            email=f'{name}@example.com',
+            phone='+33123456789',
+            date_of_birth=date(1990, 1, 1),
+            gender=Employee.GENDER_FEMALE,
+            employee_id=name.upper(),
+            hire_date=date(2020, 1, 1),
+            department=self.it,
+            salary=50000.00,
+            status=Employee.STATUS_ACTIVE,
+            address='1 rue de Paris',
+            city='Paris',
+            country='France',
+        )
+
+    def _changes(self, employee):
+        return {
+            entry.change_type: (entry.old_value, entry.new_value, entry.changed_by_id)
+            for entry in EmployeeHistory.objects.filter(employee=employee).exclude(
+                change_type='created'
+            )
+        }
+
+    def test_api_update_writes_changes_in_one_insert(self):
+        """Une mise à jour API : une lecture de l'employé, un INSERT d'historique."""
+        self.client.force_authenticate(user=self.hr)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(
+                f'/api/employee/employees/{self.alice.pk}/',
+                {'salary': '65000.00', 'department': self.sales.pk, 'city': 'Paris'},
+                format='json',
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            self._changes(self.alice),
+            {
+                'salary_changed': ('50000.00', '65000.00', self.hr_employee.pk),
+                'department_changed': (str(self.it.pk), str(self.sales.pk), self.hr_employee.pk),
+            },
+        )
+        inserts = [q for q in queries if q['sql'].startswith('INSERT INTO "employee_employeehistory"')]
+        self.assertEqual(len(inserts), 1)
+        # L'ancienne version n'est pas relue (un seul get_object())
+        lookups = [
+            q for q in queries
+            if f'WHERE "employee_employee"."id" = {self.alice.pk} LIMIT 21' in q['sql']
+        ]
+        self.assertEqual(len(lookups), 1)
+
+    def test_save_records_only_real_changes(self):
+        """Hors API : auteur inconnu, et rien si rien n'a changé depuis la lecture."""
+        employee = Employee.objects.get(pk=self.bob.pk)
+        employee.status = Employee.STATUS_ON_LEAVE
+        employee.save()
+        employee.save()
+        employee.city = 'Lyon'
+        employee.save()
+        self.assertEqual(
+            self._changes(self.bob),
+            {'status_changed': ('active', 'on_leave', None)},
+        )
+
+    def test_create_records_created_row(self):
+        with history.changed_by(self.hr_employee.pk):
+            employee = self._employee('carol')
+        entry = EmployeeHistory.objects.get(employee=employee)
+        self.assertEqual((entry.change_type, entry.changed_by_id), ('created', self.hr_employee.pk))
+
+    def test_queryset_update_is_recorded(self):
+        """`history.update()` : avant / après, et relations de l'organigramme."""
+        from django.db.models import F
+
+        before = Employee.objects.get(pk=self.alice.pk).updated_at
+        with history.changed_by(self.hr_employee.pk):
+            count = history.update(
+                Employee.objects.filter(pk__in=[self.alice.pk, self.bob.pk]),
+                salary=F('salary') + 1000,
+                manager=self.hr_employee,
+            )
+        self.assertEqual(count, 2)
+        for employee in (self.alice, self.bob):
+            changes = self._changes(employee)
+            self.assertEqual(
+                changes['salary_changed'], ('50000.00', '51000.00', self.hr_employee.pk)
+            )
+            self.assertEqual(changes['manager_changed'][:2], ('', str(self.hr_employee.pk)))
+            self.assertTrue(hierarchy.is_report(self.hr_employee.pk, employee.pk))
+        self.assertGreater(Employee.objects.get(pk=self.alice.pk).updated_at, before)
+
+    def test_bulk_update_is_recorded(self):
+        employees = list(Employee.objects.filter(pk__in=[self.alice.pk, self.bob.pk]))
+        for employee in employees:
+            employee.status = Employee.STATUS_INACTIVE
+            employee.phone = '+33999999999'
+        before = employees[0].updated_at
+        history.bulk_update(employees, ['status'])
+        for employee in employees:
+            self.assertEqual(set(self._changes(employee)), {'status_changed'})
+        self.assertGreater(Employee.objects.get(pk=self.alice.pk).updated_at, before)
+
+    def test_admin_edit_is_recorded(self):
+        from django.contrib import admin
+        from django.test import RequestFactory
+
+        from employee.admin import EmployeeAdmin
+
+        request = RequestFactory().post('/admin/')
+        request.user = self.hr
+        employee = Employee.objects.get(pk=self.alice.pk)
+        employee.last_name = 'Martin'
+        EmployeeAdmin(Employee, admin.site).save_model(request, employee, None, True)
+        self.assertEqual(
+            self._changes(self.alice),
+            {'last_name_changed': ('Doe', 'Martin', self.hr_employee.pk)},
+        )
+
+
+class EmployeeTimelineTest(APITestCase):
+    """Tests pour les intervalles datés (employee.temporal) et `?as_of=`."""
+
+    def setUp(self):
+        self.it = Department.objects.create(name='IT', code='IT001', budget=100000.00)
+        self.sales = Department.objects.create(name='Ventes', code='VTE001', budget=100000.00)
+        self.alice = self._employee('alice')
+        self.bob = self._employee('bob')
+        self.hr = CustomUser.objects.create_user(
+            username='hr',
+            email='hr@example.com',
+            password='testpass123',
+            role='hr_manager',
+        )
+        self.client.force_authenticate(user=self.hr)
+
+    def _employee(self, name, **fields):
+        values = {
+            'first_name': name.title(),
+            'last_name': 'Doe',
+            'email': f'{name}@example.com',
+            'phone': '+33123456789',
+            'date_of_birth': date(1990, 1, 1),
+            'gender': Employee.GENDER_FEMALE,
+            'employee_id': name.upper(),
+            'hire_date': date(2020, 1, 1),
+            'department': self.it,
+            'salary': 50000.00,
+            'status': Employee.STATUS_ACTIVE,
+            'address': '1 rue de Paris',
+            'city': 'Paris',
+            'country': 'France',
+        }
+        values.update(fields)
+        return Employee.objects.create(**values)
+
+    def _intervals(self, employee):
+        return list(
+            EmployeeState.objects.filter(employee=employee)
+            .order_by('valid_from')
+            .values_list('department_id', 'status', 'valid_to')
+        )
+
+    def _move_alice_to_sales(self):
+        employee = Employee.objects.get(pk=self.alice.pk)
+        employee.department = self.sales
+        employee.salary = 60000
+        employee.save()
+
+    def test_create_opens_interval_at_hire_date(self):
+        state = EmployeeState.objects.get(employee=self.alice)
+        self.assertEqual(state.valid_from, temporal.start_of(date(2020, 1, 1)))
+        self.assertIsNone(state.valid_to)
+        self.assertEqual(state.department_id, self.it.pk)
+
+    def test_save_closes_and_opens_interval(self):
+        """Un changement daté ferme l'intervalle courant ; les autres champs non."""
+        self._move_alice_to_sales()
+        employee = Employee.objects.get(pk=self.alice.pk)
+        employee.city = 'Lyon'
+        employee.save()
+        (old_department, _, closed_at), (new_department, _, open_to) = self._intervals(self.alice)
+        self.assertEqual((old_department, new_department), (self.it.pk, self.sales.pk))
+        self.assertIsNotNone(closed_at)
+        self.assertIsNone(open_to)
+
+    def test_change_before_future_hire_date(self):
+        """Avant l'embauche, l'intervalle initial est remplacé, pas fermé."""
+        hire_date = timezone.localdate() + timedelta(days=30)
+        carol = self._employee('carol', hire_date=hire_date)
+        employee = Employee.objects.get(pk=carol.pk)
+        employee.department = self.sales
+        employee.save()
+        state = EmployeeState.objects.get(employee=carol)
+        self.assertEqual(
+            (state.department_id, state.valid_from, state.valid_to),
+            (self.sales.pk, temporal.start_of(hire_date), None),
+        )
+        self.assertFalse(temporal.states_at(timezone.now()).filter(employee=carol).exists())
+
+    def test_history_update_records_intervals(self):
+        history.update(Employee.objects.all(), status=Employee.STATUS_INACTIVE)
+        for employee in (self.alice, self.bob):
+            self.assertEqual(
+                [state for _, state, _ in self._intervals(employee)],
+                [Employee.STATUS_ACTIVE, Employee.STATUS_INACTIVE],
+            )
+
+    def test_list_as_of_returns_past_state(self):
+        """`?as_of=` : présence, filtres et valeurs à la date demandée."""
+        self._move_alice_to_sales()
+        self._employee('carol', hire_date=date(2023, 6, 1))
+        response = self.client.get(
+            '/api/employee/employees/', {'as_of': '2021-01-01', 'department': self.it.pk}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = {row['employee_id']: row for row in response.data['results']}
+        self.assertEqual(set(results), {'ALICE', 'BOB'})
+        self.assertEqual(results['ALICE']['department_name'], 'IT')
+
+        response = self.client.get('/api/employee/employees/', {'department': self.it.pk})
+        self.assertEqual(
+            {row['employee_id'] for row in response.data['results']}, {'BOB', 'CAROL'}
+        )
+
+    def test_list_as_of_adds_one_query(self):
+        """Les valeurs à la date sont lues en une requête pour toute la page."""
+        self._move_alice_to_sales()
+        with CaptureQueriesContext(connection) as current:
+            self.client.get('/api/employee/employees/', {'fields': 'employee_id,status'})
+        with CaptureQueriesContext(connection) as past:
+            self.client.get(
+                '/api/employee/employees/', {'fields': 'employee_id,status', 'as_of': '2021-01-01'}
+            )
+        self.assertEqual(len(past), len(current) + 1)
+
+    def test_statistics_as_of(self):
+        self._move_alice_to_sales()
+        response = self.client.get('/api/employee/employees/statistics/', {'as_of': '2021-01-01'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['total'], 2)
+        self.assertEqual(response.data['total_salary'], 100000)
+        self.assertEqual(
+            {row['department__name']: row['count'] for row in response.data['by_department']},
+            {'IT': 2},
+        )
+
+        response = self.client.get('/api/employee/employees/statistics/', {'as_of': '2019-01-01'})
+        self.assertEqual(response.data['total'], 0)
+
+    def test_as_of_date_includes_changes_of_that_day(self):
+        """Une date seule désigne la fin de la journée, pas son début."""
+        self._move_alice_to_sales()
+        today = timezone.localdate().isoformat()
+        self.assertEqual(temporal.parse_as_of(today).time(), time.max)
+        self.assertEqual(temporal.parse_as_of('2021-12-31T10:00:00').hour, 10)
+        response = self.client.get('/api/employee/employees/statistics/', {'as_of': today})
+        self.assertEqual(response.data['total_salary'], 110000)
+        self.assertEqual(
+            {row['department__name']: row['count'] for row in response.data['by_department']},
+            {'IT': 1, 'Ventes': 1},
+        )
+
+    def test_invalid_as_of(self):
+        response = self.client.get('/api/employee/employees/', {'as_of': 'hier'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('as_of', response.data)
+
+    def test_rebuild_from_legacy_history(self):
+        """Ancien historique (noms en texte libre) : intervalles reconstitués."""
+        Employee.objects.filter(pk=self.alice.pk).update(department=self.sales, salary=70000)
+        changed_at = temporal.start_of(date(2022, 3, 1))
+        EmployeeHistory.objects.bulk_create([
+            EmployeeHistory(
+                employee=self.alice, change_type='department_changed',
+                old_value='IT', new_value='Ventes',
+            ),
+            EmployeeHistory(
+                employee=self.alice, change_type='salary_changed',
+                old_value='50000.00', new_value='70000.00',
+            ),
+        ])
+        EmployeeHistory.objects.filter(employee=self.alice).exclude(
+            change_type='created'
+        ).update(changed_at=changed_at)
+
+        self.assertEqual(temporal.rebuild(), 2)
+        states = list(
+            EmployeeState.objects.filter(employee=self.alice)
+            .order_by('valid_from')
+            .values_list('department_id', 'salary', 'valid_from', 'valid_to')
+        )
+        self.assertEqual(
+            states,
+            [
+                (self.it.pk, 50000, temporal.start_of(date(2020, 1, 1)), changed_at),
+                (self.sales.pk, 70000, changed_at, None),
+            ],
+        )
+        self.assertEqual(
+            temporal.states_at(temporal.parse_as_of('2021-12-31'))
+            .filter(department=self.it)
+            .count(),
+            2,
+        )
@@ -11,6 +11,8 @@ from rest_framework import viewsets, permissions
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 
+from backend.conditional import ConditionalRequestMixin
+from backend.fieldsets import SparseFieldsetMixin
 from employee.models.employee_history import EmployeeHistory
 from employee.serializers.employee_history_serializer import (
     EmployeeHistorySerializer,
@@ -28,7 +30,7 @@ class IsOwnerOrAdmin(permissions.BasePermission):
         return request.user and request.user.is_authenticated
 
 
-class EmployeeHistoryViewSet(viewsets.ReadOnlyModelViewSet):
+class EmployeeHistoryViewSet(ConditionalRequestMixin, SparseFieldsetMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet en lecture seule pour l'historique des changements.
     
@@ -61,8 +63,9 @@ class EmployeeHistoryViewSet(viewsets.ReadOnlyModelViewSet):
             return queryset
 
         # Sinon, filtrer par employé associé
-        if hasattr(self.request.user, "employee") and self.request.user.employee:
-            return queryset.filter(employee=self.request.user.employee)
+        employee_id = getattr(self.request.user, "employee_id", None)
+        if employee_id:
+            return queryset.filter(employee_id=employee_id)
 
         return queryset.none()
 
@@ -4,30 +4,118 @@ ViewSet pour la gestion des employés (Employee).
 Ce ViewSet implémente les opérations CRUD complètes pour les employés :
 - Liste, détail, création, modification, suppression
 - Actions personnalisées : employés actifs, par département, par manager, statistiques
+- Organigramme : subordonnés directs et indirects, chaîne hiérarchique,
+  étendue de contrôle et export, via la table de fermeture (`employee.hierarchy`)
 - Permissions : admins/HR peuvent tout faire, managers peuvent voir leurs équipes
 - Historique automatique des changements
+- État à une date passée (`?as_of=`) sur la liste et les statistiques, via
+  les intervalles datés (`employee.temporal`)
 """
 
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.parsers import FormParser, MultiPartParser
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
-from django.db.models import Q, Count, Avg, Sum
-
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import F, Q, Count, Avg, Sum
+
+from backend.cache import cached_response
+from backend.conditional import ConditionalRequestMixin
+from backend.export import ExportMixin
+from backend.fieldsets import SparseFieldsetMixin
+from backend.statistics import StatisticsBuilder
+from employee import hierarchy, history, importer, temporal
 from employee.models.employee import Employee
 from employee.models.employee_history import EmployeeHistory
+from employee.models.employee_id_sequence import EmployeeIdSequence
+from employee.models.employee_state import EmployeeState
 from employee.serializers.employee_serializer import (
     EmployeeSerializer,
     EmployeeListSerializer,
 )
 
 
+# Champs d'un nœud de l'organigramme (et de la chaîne hiérarchique)
+ORG_CHART_FIELDS = (
+    "id",
+    "employee_id",
+    "first_name",
+    "last_name",
+    "status",
+    "position__name",
+    "department__name",
+)
+
+
+def _org_node(row):
+    """Nœud de l'organigramme à partir d'une ligne `values()`."""
+    node = {
+        "id": row["id"],
+        "employee_id": row["employee_id"],
+        "full_name": f"{row['first_name']} {row['last_name']}",
+        "status": row["status"],
+        "position_name": row["position__name"],
+        "department_name": row["department__name"],
+    }
+    if "depth" in row:
+        node["depth"] = row["depth"]
+    return node
+
+
+def _prune(nodes, max_depth, depth=0):
+    """Coupe l'arbre sous `max_depth` niveaux de subordonnés."""
+    for node in nodes:
+        if depth >= max_depth:
+            node["reports"] = []
+        else:
+            _prune(node["reports"], max_depth, depth + 1)
+
+
+# Paramètre de l'état à une date passée et filtres qui portent alors sur cet état
+AS_OF_PARAM = "as_of"
+AS_OF_FILTERS = ("department", "manager", "status")
+
+
+class AsOfFilterBackend(DjangoFilterBackend):
+    """
+    `DjangoFilterBackend` qui, avec `?as_of=`, restreint la liste aux
+    employés présents à cette date et applique `department`, `manager` et
+    `status` à leur état à cette date plutôt qu'à l'état courant.
+    """
+
+    def get_filterset_kwargs(self, request, queryset, view):
+        kwargs = super().get_filterset_kwargs(request, queryset, view)
+        if view.get_as_of() is not None:
+            data = kwargs["data"].copy()
+            for name in AS_OF_FILTERS:
+                data.pop(name, None)
+            kwargs["data"] = data
+        return kwargs
+
+    def filter_queryset(self, request, queryset, view):
+        moment = view.get_as_of()
+        if moment is not None:
+            filters = {}
+            for name in AS_OF_FILTERS:
+                value = request.query_params.get(name)
+                if not value:
+                    continue
+                try:
+                    filters[name] = EmployeeState._meta.get_field(name).to_python(value)
+                except DjangoValidationError as exc:
+                    raise ValidationError({name: exc.messages})
+            queryset = temporal.filter_as_of(queryset, moment, **filters)
+        return super().filter_queryset(request, queryset, view)
+
+
 class IsHRManagerOrAdmin(permissions.BasePermission):
     """
     Permission personnalisée :
     - Les admins et HR managers peuvent tout faire
-    - Les managers peuvent voir leurs équipes
+    - Les managers peuvent voir leurs équipes (subordonnés directs ou non)
     - Les autres utilisateurs peuvent uniquement lire
     """
 
@@ -48,20 +136,22 @@ class IsHRManagerOrAdmin(permissions.BasePermission):
         if request.user.is_staff or request.user.role in ["admin", "hr_manager"]:
             return True
 
-        # Managers peuvent voir leurs subordonnés
-        if hasattr(request.user, "employee") and request.user.employee:
-            if obj.manager == request.user.employee:
-                return request.method in permissions.SAFE_METHODS
+        # Managers peuvent voir leurs subordonnés (comparaison par id : pas
+        # de requête pour un subordonné direct, une requête indexée au-delà)
+        employee_id = getattr(request.user, "employee_id", None)
+        if employee_id and (
+            obj.manager_id == employee_id or hierarchy.is_report(employee_id, obj.pk)
+        ):
+            return request.method in permissions.SAFE_METHODS
 
         # Les employés peuvent voir leurs propres informations
-        if hasattr(request.user, "employee") and request.user.employee:
-            if obj == request.user.employee:
-                return request.method in permissions.SAFE_METHODS
+        if employee_id and obj.pk == employee_id:
+            return request.method in permissions.SAFE_METHODS
 
         return False
 
 
-class EmployeeViewSet(viewsets.ModelViewSet):
+class EmployeeViewSet(ConditionalRequestMixin, SparseFieldsetMixin, ExportMixin, viewsets.ModelViewSet):
     """
     ViewSet pour les employés.
     
@@ -75,7 +165,14 @@ class EmployeeViewSet(viewsets.ModelViewSet):
     - GET /api/employee/employees/by-department/{dept_id}/ : Employés par département
     - GET /api/employee/employees/my-team/ : Mon équipe (si manager)
     - GET /api/employee/employees/statistics/ : Statistiques globales
+      (`?as_of=AAAA-MM-JJ` : liste et statistiques à une date passée)
     - GET /api/employee/employees/{id}/subordinates/ : Subordonnés d'un employé
+    - GET /api/employee/employees/{id}/reports/ : Subordonnés directs et indirects
+    - GET /api/employee/employees/{id}/chain/ : Chaîne hiérarchique
+    - GET /api/employee/employees/{id}/span/ : Étendue de contrôle et profondeur
+    - GET /api/employee/employees/org-chart/ : Organigramme (arbre imbriqué)
+    - POST /api/employee/employees/import/ : Import en masse (CSV, JSON Lines)
+    - GET /api/employee/employees/export/{csv|jsonl|xlsx}/ : Export en flux
     """
     
     queryset = Employee.objects.select_related(
@@ -83,7 +180,7 @@ class EmployeeViewSet(viewsets.ModelViewSet):
     ).prefetch_related("subordinates").all()
     serializer_class = EmployeeSerializer
     permission_classes = [permissions.IsAuthenticated, IsHRManagerOrAdmin]
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [AsOfFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = [
         "status",
         "gender",
@@ -106,6 +203,24 @@ class EmployeeViewSet(viewsets.ModelViewSet):
         "salary",
     ]
     ordering = ["last_name", "first_name"]
+    export_fields = [
+        "id",
+        "employee_id",
+        "first_name",
+        "last_name",
+        "email",
+        "phone",
+        "gender",
+        "date_of_birth",
+        "hire_date",
+        "department__name",
+        "position__name",
+        "manager__employee_id",
+        "salary",
+        "status",
+        "city",
+        "country",
+    ]
 
     def get_serializer_class(self):
         """Utilise un serializer simplifié pour les listes."""
@@ -113,6 +228,28 @@ class EmployeeViewSet(viewsets.ModelViewSet):
             return EmployeeListSerializer
         return EmployeeSerializer
 
+    def get_as_of(self):
+        """Instant demandé par `?as_of=` (liste et statistiques), None sinon."""
+        if not hasattr(self, "_as_of"):
+            self._as_of = None
+            value = self.request.query_params.get(AS_OF_PARAM)
+            if value and self.action in ("list", "statistics"):
+                try:
+                    self._as_of = temporal.parse_as_of(value)
+                except ValueError:
+                    raise ValidationError(
+                        {AS_OF_PARAM: ["Date invalide (AAAA-MM-JJ ou date et heure ISO 8601)."]}
+                    )
+        return self._as_of
+
+    def paginate_queryset(self, queryset):
+        """Avec `?as_of=`, les champs datés de la page sont ceux de cette date."""
+        page = super().paginate_queryset(queryset)
+        moment = self.get_as_of()
+        if page is not None and moment is not None:
+            page = temporal.apply_as_of(page, moment)
+        return page
+
     def get_queryset(self):
         """Filtre le queryset selon les permissions."""
         queryset = super().get_queryset()
@@ -124,11 +261,11 @@ class EmployeeViewSet(viewsets.ModelViewSet):
         ]:
             return queryset
 
-        # Si manager, retourner ses subordonnés + lui-même
-        if hasattr(self.request.user, "employee") and self.request.user.employee:
-            employee = self.request.user.employee
+        # Si manager, retourner ses subordonnés (directs ou non) + lui-même
+        employee_id = getattr(self.request.user, "employee_id", None)
+        if employee_id:
             return queryset.filter(
-                Q(id=employee.id) | Q(manager=employee)
+                id__in=hierarchy.subtree(employee_id, include_self=True)
             )
 
         # Sinon, uniquement soi-même
@@ -139,65 +276,22 @@ class EmployeeViewSet(viewsets.ModelViewSet):
 
     def perform_create(self, serializer):
         """Lors de la création, générer automatiquement l'employee_id si non fourni."""
-        employee = serializer.save()
+        # Ligne "created" de l'historique écrite par employee.signals
+        with history.changed_by(getattr(self.request.user, "employee_id", None)):
+            employee = serializer.save()
 
-        # Générer un employee_id unique si non fourni
-        if not employee.employee_id:
-            from datetime import datetime
-
-            prefix = "EMP"
-            timestamp = datetime.now().strftime("%Y%m%d")
-            count = Employee.objects.filter(
-                employee_id__startswith=f"{prefix}{timestamp}"
-            ).count() + 1
-            employee.employee_id = f"{prefix}{timestamp}{count:04d}"
-            employee.save()
-
-        # Enregistrer dans l'historique
-        EmployeeHistory.objects.create(
-            employee=employee,
-            change_type="created",
-            new_value=f"Employé créé : {employee.first_name} {employee.last_name}",
-            changed_by=self.request.user.employee
-            if hasattr(self.request.user, "employee")
-            else None,
-        )
+            # Générer un employee_id unique si non fourni (séquence par jour)
+            if not employee.employee_id:
+                [employee.employee_id] = EmployeeIdSequence.next_ids(1)
+                employee.save(update_fields=["employee_id", "updated_at"])
 
     def perform_update(self, serializer):
-        """Lors de la mise à jour, enregistrer les changements dans l'historique."""
-        old_instance = self.get_object()
-        employee = serializer.save()
-
-        # Détecter les changements et les enregistrer
-        changes = []
-        for field in [
-            "first_name",
-            "last_name",
-            "email",
-            "phone",
-            "department",
-            "position",
-            "manager",
-            "salary",
-            "status",
-        ]:
-            old_value = getattr(old_instance, field, None)
-            new_value = getattr(employee, field, None)
-
-            if old_value != new_value:
-                change_type = f"{field}_changed"
-                old_str = str(old_value) if old_value else ""
-                new_str = str(new_value) if new_value else ""
-
-                EmployeeHistory.objects.create(
-                    employee=employee,
-                    change_type=change_type,
-                    old_value=old_str[:255],
-                    new_value=new_str[:255],
-                    changed_by=self.request.user.employee
-                    if hasattr(self.request.user, "employee")
-                    else None,
-                )
+        """
+        Lors de la mise à jour, les champs modifiés sont historisés par
+        employee.signals (comparaison avec les valeurs lues par get_object()).
+        """
+        with history.changed_by(getattr(self.request.user, "employee_id", None)):
+            serializer.save()
 
     def perform_destroy(self, instance):
         """Lors de la suppression, enregistrer dans l'historique."""
@@ -205,9 +299,7 @@ class EmployeeViewSet(viewsets.ModelViewSet):
             employee=instance,
             change_type="deleted",
             new_value=f"Employé supprimé : {instance.first_name} {instance.last_name}",
-            changed_by=self.request.user.employee
-            if hasattr(self.request.user, "employee")
-            else None,
+            changed_by_id=getattr(self.request.user, "employee_id", None),
         )
         instance.delete()
 
@@ -218,6 +310,11 @@ class EmployeeViewSet(viewsets.ModelViewSet):
         GET /api/employee/employees/active/
         """
         queryset = self.get_queryset().filter(status=Employee.STATUS_ACTIVE)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
 
@@ -232,6 +329,11 @@ class EmployeeViewSet(viewsets.ModelViewSet):
         GET /api/employee/employees/by-department/{department_id}/
         """
         queryset = self.get_queryset().filter(department_id=department_id)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
 
@@ -241,50 +343,66 @@ class EmployeeViewSet(viewsets.ModelViewSet):
         Action personnalisée : Récupérer mon équipe (si je suis manager).
         GET /api/employee/employees/my-team/
         """
-        if not hasattr(request.user, "employee") or not request.user.employee:
+        if not getattr(request.user, "employee_id", None):
             return Response(
                 {"detail": "Vous n'êtes pas associé à un employé."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        manager = request.user.employee
-        queryset = self.get_queryset().filter(manager=manager)
+        queryset = self.get_queryset().filter(manager_id=request.user.employee_id)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
 
     @action(detail=False, methods=["get"], url_path="statistics")
+    @cached_response("employee", "department")
     def statistics(self, request):
         """
         Action personnalisée : Statistiques globales des employés.
         GET /api/employee/employees/statistics/
         """
-        queryset = self.get_queryset()
-
-        stats = {
-            "total": queryset.count(),
-            "by_status": {
-                status: queryset.filter(status=status).count()
-                for status, _ in Employee.STATUS_CHOICES
-            },
-            "by_gender": {
-                gender: queryset.filter(gender=gender).count()
-                for gender, _ in Employee.GENDER_CHOICES
-            },
-            "average_salary": float(
-                queryset.aggregate(avg=Avg("salary"))["avg"] or 0
-            ),
-            "total_salary": float(
-                queryset.aggregate(total=Sum("salary"))["total"] or 0
-            ),
-            "by_department": list(
-                queryset.values("department__name")
-                .annotate(count=Count("id"))
-                .order_by("-count")
-            ),
-        }
+        moment = self.get_as_of()
+        if moment is not None:
+            return Response(self._statistics_as_of(moment))
+
+        # Une requête d'agrégation conditionnelle + un GROUP BY par département
+        stats = (
+            StatisticsBuilder(self.get_queryset())
+            .count("total")
+            .count_by("by_status", "status", Employee.STATUS_CHOICES)
+            .count_by("by_gender", "gender", Employee.GENDER_CHOICES)
+            .aggregate("average_salary", Avg("salary"))
+            .aggregate("total_salary", Sum("salary"))
+            .group_by("by_department", "department__name")
+            .build()
+        )
 
         return Response(stats)
 
+    def _statistics_as_of(self, moment):
+        """Mêmes statistiques, calculées sur les états valides à `moment`."""
+        states = temporal.states_at(moment)
+        queryset = self.get_queryset()
+        if queryset.query.has_filters():
+            # Périmètre restreint (manager, employé) : ses employés actuels
+            states = states.filter(employee__in=queryset.values("pk"))
+        stats = (
+            StatisticsBuilder(states)
+            .count("total")
+            .count_by("by_status", "status", Employee.STATUS_CHOICES)
+            .count_by("by_gender", "employee__gender", Employee.GENDER_CHOICES)
+            .aggregate("average_salary", Avg("salary"))
+            .aggregate("total_salary", Sum("salary"))
+            .group_by("by_department", "department__name")
+            .build()
+        )
+        stats["as_of"] = moment
+        return stats
+
     @action(detail=True, methods=["get"], url_path="subordinates")
     def subordinates(self, request, pk=None):
         """
@@ -293,6 +411,148 @@ class EmployeeViewSet(viewsets.ModelViewSet):
         """
         employee = self.get_object()
         subordinates = self.get_queryset().filter(manager=employee)
+        page = self.paginate_queryset(subordinates)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
         serializer = self.get_serializer(subordinates, many=True)
         return Response(serializer.data)
 
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="import",
+        parser_classes=[MultiPartParser, FormParser],
+    )
+    def bulk_import(self, request):
+        """
+        Action personnalisée : Import en masse d'employés (voir employee.importer).
+        POST /api/employee/employees/import/ (multipart : file, format=csv|jsonl)
+
+        Retourne le nombre de lignes lues, d'employés créés et les erreurs par
+        ligne ; 201 si au moins un employé a été créé, 400 sinon.
+        """
+        upload = request.FILES.get("file")
+        if upload is None:
+            return Response(
+                {"file": ["Un fichier CSV ou JSON Lines est requis."]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            read = importer.reader_for(request.data.get("format"), upload.name)
+        except ValueError as exc:
+            return Response({"format": [str(exc)]}, status=status.HTTP_400_BAD_REQUEST)
+
+        report = importer.EmployeeImporter(
+            changed_by_id=getattr(request.user, "employee_id", None)
+        ).run(read(upload))
+        return Response(
+            report.as_dict(),
+            status=status.HTTP_201_CREATED if report.created else status.HTTP_400_BAD_REQUEST,
+        )
+
+    def _max_depth(self, request):
+        """Paramètre `?max_depth=` (entier positif), None s'il est absent."""
+        value = request.query_params.get("max_depth")
+        if value is None:
+            return None
+        try:
+            max_depth = int(value)
+        except ValueError:
+            max_depth = 0
+        if max_depth < 1:
+            raise ValidationError({"max_depth": "Entier positif attendu."})
+        return max_depth
+
+    @action(detail=True, methods=["get"], url_path="reports")
+    def reports(self, request, pk=None):
+        """
+        Action personnalisée : Subordonnés directs et indirects d'un employé.
+        GET /api/employee/employees/{id}/reports/?max_depth=2
+        """
+        employee = self.get_object()
+        queryset = self.filter_queryset(
+            self.get_queryset().filter(
+                id__in=hierarchy.subtree(employee.pk, max_depth=self._max_depth(request))
+            )
+        )
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+        serializer = self.get_serializer(queryset, many=True)
+        return Response(serializer.data)
+
+    @action(detail=True, methods=["get"], url_path="chain")
+    def chain(self, request, pk=None):
+        """
+        Action personnalisée : Chaîne hiérarchique d'un employé, du manager
+        direct jusqu'à la racine de l'organigramme (nœuds de l'organigramme :
+        nom, poste, département, même hors des employés visibles).
+        GET /api/employee/employees/{id}/chain/
+        """
+        employee = self.get_object()
+        managers = (
+            Employee.objects.filter(
+                descendant_links__descendant_id=employee.pk,
+                descendant_links__depth__gt=0,
+            )
+            .order_by("descendant_links__depth")
+            .values(*ORG_CHART_FIELDS, depth=F("descendant_links__depth"))
+        )
+        return Response([_org_node(row) for row in managers])
+
+    @action(detail=True, methods=["get"], url_path="span")
+    def span(self, request, pk=None):
+        """
+        Action personnalisée : Étendue de contrôle et profondeur d'un employé.
+        GET /api/employee/employees/{id}/span/
+        """
+        employee = self.get_object()
+        return Response({"id": employee.pk, **hierarchy.span_of_control(employee.pk)})
+
+    @action(detail=False, methods=["get"], url_path="org-chart")
+    @cached_response("employee", "department")
+    def org_chart(self, request):
+        """
+        Action personnalisée : Organigramme des employés visibles, en arbre.
+        GET /api/employee/employees/org-chart/?root={id}&max_depth=2
+
+        Sans `root`, les racines sont les employés visibles dont le manager
+        ne l'est pas. Une seule requête, quelle que soit la profondeur.
+        """
+        max_depth = self._max_depth(request)
+        queryset = self.get_queryset()
+        root = request.query_params.get("root")
+        if root is not None:
+            root = self._visible_employee_id(queryset, root)
+            queryset = queryset.filter(
+                id__in=hierarchy.subtree(root, include_self=True, max_depth=max_depth)
+            )
+        rows = list(
+            queryset.order_by("last_name", "first_name", "pk").values(
+                *ORG_CHART_FIELDS, "manager_id"
+            )
+        )
+
+        nodes = {row["id"]: {**_org_node(row), "reports": []} for row in rows}
+        roots = []
+        for row in rows:
+            parent = nodes.get(row["manager_id"]) if row["id"] != root else None
+            (parent["reports"] if parent else roots).append(nodes[row["id"]])
+        if root is None and max_depth is not None:
+            _prune(roots, max_depth)
+        return Response(roots)
+
+    def _visible_employee_id(self, queryset, pk):
+        """Id d'un employé visible, 404 sinon."""
+        try:
+            pk = int(pk)
+        except ValueError:
+            raise NotFound()
+        if not queryset.filter(pk=pk).exists():
+            raise NotFound()
+        return pk
+
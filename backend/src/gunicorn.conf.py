@@ -0,0 +1,67 @@
+"""
+Configuration gunicorn du serveur de production (ASGI, workers uvicorn).
+Usage: gunicorn backend.asgi:application -c gunicorn.conf.py
+
+Chaque worker est un processus uvicorn : une boucle asyncio qui sert
+plusieurs requêtes à la fois (vues asynchrones, flux SSE), les vues
+synchrones s'exécutant dans des threads.
+
+Le cache (invalidation des réponses, versions d'ETag, cache des utilisateurs
+JWT) et les événements SSE ne sont partagés entre workers qu'avec un cache
+Redis ou fichier (`CACHE_BACKEND`) et le courtier Redis (`EVENTS_BROKER`) :
+sans eux, un seul worker est lancé par défaut.
+
+Variables d'environnement :
+- WEB_CONCURRENCY : nombre de workers (défaut : 2 × cœurs + 1, au plus 8,
+  avec un cache et un courtier partagés ; 1 sinon),
+- PORT : port d'écoute (défaut : 8000),
+- GUNICORN_TIMEOUT : délai avant redémarrage d'un worker bloqué (défaut : 60 s),
+- GUNICORN_MAX_REQUESTS : requêtes avant recyclage d'un worker (défaut : 1000,
+  0 pour désactiver).
+"""
+
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+worker_class = "uvicorn.workers.UvicornWorker"
+
+
+def _shared_state():
+    """Cache et événements partagés entre processus (sinon : un seul worker)."""
+    cache = os.environ.get("CACHE_BACKEND", "locmem") in ("redis", "file")
+    events = (
+        os.environ.get("EVENTS_ENABLED", "True") != "True"
+        or os.environ.get("EVENTS_BROKER", "local") != "local"
+    )
+    return cache and events
+
+
+# Au-delà de quelques processus, SQLite (un seul écrivain) sature avant le CPU
+workers = int(
+    os.environ.get(
+        "WEB_CONCURRENCY",
+        min(multiprocessing.cpu_count() * 2 + 1, 8) if _shared_state() else 1,
+    )
+)
+
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "60"))
+graceful_timeout = 30
+keepalive = 5
+# Recyclage périodique des workers (fuites mémoire), étalé dans le temps
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", "1000"))
+max_requests_jitter = max_requests // 10
+
+# En-têtes X-Forwarded-* du proxy (frontend nginx)
+forwarded_allow_ips = os.environ.get("FORWARDED_ALLOW_IPS", "*")
+
+accesslog = "-"
+errorlog = "-"
+
+
+def child_exit(server, worker):
+    # Métriques Prometheus multi-processus : libère les jauges du worker
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
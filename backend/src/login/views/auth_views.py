@@ -14,6 +14,7 @@ from django.contrib.auth import authenticate
 from django.utils import timezone
 from datetime import timedelta
 
+from backend import metrics
 from users.models import CustomUser
 from login.models.login_attempt import LoginAttempt
 from login.models.login_history import LoginHistory
@@ -72,6 +73,7 @@ def login_view(request):
         ).first()
         
         if login_attempt:
+            metrics.count(metrics.LOGIN_ATTEMPTS, "locked")
             remaining_time = (login_attempt.locked_until - timezone.now()).seconds
             return Response(
                 {
@@ -86,6 +88,7 @@ def login_view(request):
         
         if user is None:
             # Enregistrer la tentative échouée
+            metrics.count(metrics.LOGIN_ATTEMPTS, "failure")
             record_failed_login_attempt(username, ip_address)
             
             return Response(
@@ -94,6 +97,7 @@ def login_view(request):
             )
         
         if not user.is_active:
+            metrics.count(metrics.LOGIN_ATTEMPTS, "inactive")
             return Response(
                 {"detail": "Compte désactivé."},
                 status=status.HTTP_403_FORBIDDEN
@@ -104,6 +108,7 @@ def login_view(request):
         access_token = refresh.access_token
         
         # Enregistrer la connexion réussie
+        metrics.count(metrics.LOGIN_ATTEMPTS, "success")
         record_successful_login(user, request)
         
         # Réinitialiser les tentatives échouées
@@ -251,8 +256,13 @@ def record_failed_login_attempt(username: str, ip_address: str):
     
     # Bloquer si plus de 5 tentatives
     if attempt.failed_attempts >= 5:
-        attempt.locked_until = timezone.now() + timedelta(minutes=15)
+        now = timezone.now()
+        # Un échec pendant un blocage le prolonge sans en déclencher un nouveau
+        already_locked = attempt.locked_until is not None and attempt.locked_until > now
+        attempt.locked_until = now + timedelta(minutes=15)
         attempt.save()
+        if not already_locked:
+            metrics.count(metrics.LOGIN_LOCKOUTS)
 
 
 def record_successful_login(user: CustomUser, request):
@@ -309,6 +319,7 @@ def register_view(request):
         access_token = refresh.access_token
         
         # Enregistrer la connexion réussie
+        metrics.count(metrics.LOGIN_ATTEMPTS, "success")
         record_successful_login(user, request)
         
         # Retourner les tokens et les infos utilisateur
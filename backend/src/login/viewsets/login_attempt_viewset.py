@@ -11,11 +11,13 @@ from rest_framework import viewsets, permissions
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 
+from backend.conditional import ConditionalRequestMixin
+from backend.fieldsets import SparseFieldsetMixin
 from login.models.login_attempt import LoginAttempt
 from login.serializers.login_attempt_serializer import LoginAttemptSerializer
 
 
-class LoginAttemptViewSet(viewsets.ReadOnlyModelViewSet):
+class LoginAttemptViewSet(ConditionalRequestMixin, SparseFieldsetMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet en lecture seule pour les tentatives de connexion.
     
@@ -13,6 +13,9 @@ from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 
+from backend.conditional import ConditionalRequestMixin
+from backend.export import ExportMixin
+from backend.fieldsets import SparseFieldsetMixin
 from login.models.login_history import LoginHistory
 from login.serializers.login_history_serializer import LoginHistorySerializer
 
@@ -33,7 +36,7 @@ class IsOwnerOrAdmin(permissions.BasePermission):
         return request.user and request.user.is_authenticated
 
 
-class LoginHistoryViewSet(viewsets.ReadOnlyModelViewSet):
+class LoginHistoryViewSet(ConditionalRequestMixin, SparseFieldsetMixin, ExportMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet en lecture seule pour l'historique de connexion.
     
@@ -42,6 +45,7 @@ class LoginHistoryViewSet(viewsets.ReadOnlyModelViewSet):
     - GET /api/login/history/{id}/ : Détails d'une entrée
     - GET /api/login/history/my-history/ : Mon historique
     - GET /api/login/history/recent/ : Connexions récentes
+    - GET /api/login/history/export/{csv|jsonl|xlsx}/ : Export en flux
     """
     
     serializer_class = LoginHistorySerializer
@@ -51,6 +55,17 @@ class LoginHistoryViewSet(viewsets.ReadOnlyModelViewSet):
     search_fields = ["ip_address", "user_agent"]
     ordering_fields = ["login_time", "logout_time"]
     ordering = ["-login_time"]
+    export_fields = [
+        "id",
+        "user__username",
+        "ip_address",
+        "device_type",
+        "browser",
+        "login_time",
+        "logout_time",
+        "is_successful",
+        "failure_reason",
+    ]
 
     def get_queryset(self):
         """Filtre le queryset selon les permissions."""
@@ -70,6 +85,11 @@ class LoginHistoryViewSet(viewsets.ReadOnlyModelViewSet):
         GET /api/login/history/my-history/
         """
         queryset = self.get_queryset().filter(user=request.user)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
 
@@ -84,6 +104,11 @@ class LoginHistoryViewSet(viewsets.ReadOnlyModelViewSet):
 
         seven_days_ago = timezone.now() - timedelta(days=7)
         queryset = self.get_queryset().filter(login_time__gte=seven_days_ago)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
 
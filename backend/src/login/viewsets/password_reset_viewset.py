@@ -17,13 +17,15 @@ from django.utils import timezone
 from datetime import timedelta
 import secrets
 
+from backend.conditional import ConditionalRequestMixin
+from backend.fieldsets import SparseFieldsetMixin
 from login.models.password_reset_token import PasswordResetToken
 from login.serializers.password_reset_token_serializer import PasswordResetTokenSerializer
 
 User = get_user_model()
 
 
-class PasswordResetViewSet(viewsets.ModelViewSet):
+class PasswordResetViewSet(ConditionalRequestMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet pour la réinitialisation de mot de passe.
     
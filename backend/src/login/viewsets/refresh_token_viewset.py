@@ -12,6 +12,8 @@ from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import OrderingFilter
 
+from backend.conditional import ConditionalRequestMixin
+from backend.fieldsets import SparseFieldsetMixin
 from login.models.refresh_token import RefreshToken
 from login.serializers.refresh_token_serializer import RefreshTokenSerializer
 
@@ -32,7 +34,7 @@ class IsOwnerOrAdmin(permissions.BasePermission):
         return request.user and request.user.is_authenticated
 
 
-class RefreshTokenViewSet(viewsets.ModelViewSet):
+class RefreshTokenViewSet(ConditionalRequestMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet pour les tokens de rafraîchissement.
     
@@ -99,6 +101,11 @@ class RefreshTokenViewSet(viewsets.ModelViewSet):
         GET /api/login/refresh-tokens/my-tokens/
         """
         queryset = self.get_queryset().filter(user=request.user)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
 
@@ -16,6 +16,8 @@ from django.utils import timezone
 import pyotp
 import secrets
 
+from backend.conditional import ConditionalRequestMixin
+from backend.fieldsets import SparseFieldsetMixin
 from login.models.two_factor_auth import TwoFactorAuth
 from login.serializers.two_factor_auth_serializer import (
     TwoFactorAuthSerializer,
@@ -42,7 +44,7 @@ class IsOwnerOrAdmin(permissions.BasePermission):
         return request.user and request.user.is_authenticated
 
 
-class TwoFactorAuthViewSet(viewsets.ModelViewSet):
+class TwoFactorAuthViewSet(ConditionalRequestMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet pour l'authentification à deux facteurs.
     
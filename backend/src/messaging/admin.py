@@ -6,7 +6,21 @@ avec des options de modération.
 """
 
 from django.contrib import admin
-from messaging.models import Conversation, Message, MessageReadStatus
+from messaging.models import (
+    Conversation,
+    ConversationParticipant,
+    Message,
+    MessageReadStatus,
+)
+
+
+class ConversationParticipantInline(admin.TabularInline):
+    """Participants d'une conversation avec leur état de lecture."""
+    
+    model = ConversationParticipant
+    extra = 0
+    raw_id_fields = ["user", "last_read_message"]
+    readonly_fields = ["unread_count", "joined_at"]
 
 
 @admin.register(Conversation)
@@ -16,8 +30,8 @@ class ConversationAdmin(admin.ModelAdmin):
     list_display = ["id", "subject", "conversation_type", "created_by", "participants_count", "last_message_at", "is_deleted", "created_at"]
     list_filter = ["conversation_type", "is_archived", "is_deleted", "created_at"]
     search_fields = ["subject", "participants__username", "participants__email"]
-    readonly_fields = ["created_at", "updated_at", "last_message_at", "deleted_at"]
-    filter_horizontal = ["participants"]
+    readonly_fields = ["created_at", "updated_at", "last_message_at", "last_message", "deleted_at"]
+    inlines = [ConversationParticipantInline]
     
     def participants_count(self, obj):
         """Retourne le nombre de participants."""
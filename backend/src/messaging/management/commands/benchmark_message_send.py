@@ -0,0 +1,81 @@
+"""
+Commande de management pour mesurer le coût d'envoi d'un message.
+Usage: python manage.py benchmark_message_send [--participants 2 10 50] [--messages 20]
+
+Crée des conversations de groupe de tailles croissantes, y envoie des
+messages via `Message.send` et affiche, par taille, la latence médiane et
+le nombre de requêtes SQL par envoi (médiane et maximum sur les envois). Toutes les écritures sont annulées
+à la fin (transaction en rollback) : la base n'est pas modifiée.
+"""
+
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from messaging.models import Conversation, Message
+from users.models import CustomUser
+
+
+class Command(BaseCommand):
+    help = "Mesure la latence d'envoi d'un message selon le nombre de participants"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--participants',
+            type=int,
+            nargs='+',
+            default=[2, 10, 25, 50],
+            help='Tailles de conversation à mesurer (défaut : 2 10 25 50)',
+        )
+        parser.add_argument(
+            '--messages',
+            type=int,
+            default=20,
+            help='Nombre de messages envoyés par taille (défaut : 20)',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"{'participants':>12} {'médiane (ms)':>13} {'p95 (ms)':>9}"
+            f" {'requêtes (méd.)':>16} {'(max)':>6}"
+        )
+        with transaction.atomic():
+            for size in options['participants']:
+                timings, queries = self._measure(size, options['messages'])
+                p95 = sorted(timings)[int(len(timings) * 0.95) - 1 if len(timings) > 1 else 0]
+                self.stdout.write(
+                    f'{size:>12} {statistics.median(timings):>13.2f} '
+                    f'{p95:>9.2f} {statistics.median(queries):>16g} {max(queries):>6}'
+                )
+            transaction.set_rollback(True)
+
+    def _measure(self, size, count):
+        """Envoie `count` messages dans une conversation de `size` participants."""
+        users = CustomUser.objects.bulk_create(
+            CustomUser(
+                username=f'bench-{size}-{index}',
+                email=f'bench-{size}-{index}@benchmark.local',
+            )
+            for index in range(size)
+        )
+        conversation = Conversation.objects.create(
+            created_by=users[0], conversation_type='group'
+        )
+        conversation.participants.add(*users)
+
+        timings = []
+        queries = []
+        for index in range(count):
+            with CaptureQueriesContext(connection) as captured:
+                start = time.perf_counter()
+                Message.send(
+                    conversation=conversation,
+                    sender=users[index % size],
+                    content=f'Message {index}',
+                )
+                timings.append((time.perf_counter() - start) * 1000)
+            queries.append(len(captured))
+        return timings, queries
@@ -0,0 +1,101 @@
+# Generated by Django 5.2.8 on 2026-10-17 00:51
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Exists, OuterRef
+
+
+def copy_participants(apps, schema_editor):
+    """
+    Reprend les participants de l'ancienne table M2M et initialise les
+    compteurs de non-lus et le pointeur vers le dernier message.
+    """
+    Conversation = apps.get_model("messaging", "Conversation")
+    ConversationParticipant = apps.get_model("messaging", "ConversationParticipant")
+    Message = apps.get_model("messaging", "Message")
+    MessageReadStatus = apps.get_model("messaging", "MessageReadStatus")
+    Through = Conversation.participants.through
+
+    memberships = []
+    for row in Through.objects.all().iterator():
+        unread_count = (
+            Message.objects.filter(conversation_id=row.conversation_id, is_deleted=False)
+            .exclude(sender_id=row.customuser_id)
+            .exclude(recipient_id=row.customuser_id, is_read=True)
+            .exclude(
+                Exists(
+                    MessageReadStatus.objects.filter(
+                        message=OuterRef("pk"), user_id=row.customuser_id, is_read=True
+                    )
+                )
+            )
+            .count()
+        )
+        memberships.append(
+            ConversationParticipant(
+                conversation_id=row.conversation_id,
+                user_id=row.customuser_id,
+                unread_count=unread_count,
+            )
+        )
+    ConversationParticipant.objects.bulk_create(memberships, batch_size=500)
+
+    for conversation in Conversation.objects.all().iterator():
+        last_message = (
+            Message.objects.filter(conversation=conversation, is_deleted=False)
+            .order_by("-created_at", "-pk")
+            .first()
+        )
+        if last_message is not None:
+            Conversation.objects.filter(pk=conversation.pk).update(last_message=last_message)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messaging', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='conversation',
+            name='last_message',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='messaging.message', verbose_name='Dernier message (pointeur)'),
+        ),
+        migrations.CreateModel(
+            name='ConversationParticipant',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('unread_count', models.PositiveIntegerField(default=0, verbose_name='Messages non lus')),
+                ('joined_at', models.DateTimeField(auto_now_add=True, verbose_name="Date d'ajout")),
+                ('conversation', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='memberships', to='messaging.conversation', verbose_name='Conversation')),
+                ('last_read_message', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='messaging.message', verbose_name='Dernier message lu')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='conversation_memberships', to=settings.AUTH_USER_MODEL, verbose_name='Utilisateur')),
+            ],
+            options={
+                'verbose_name': 'Participant',
+                'verbose_name_plural': 'Participants',
+                'indexes': [models.Index(fields=['user', 'unread_count'], name='messaging_c_user_id_022c98_idx')],
+                'unique_together': {('conversation', 'user')},
+            },
+        ),
+        migrations.RunPython(copy_participants, migrations.RunPython.noop),
+        # La table M2M automatique est remplacée par ConversationParticipant
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RemoveField(
+                    model_name='conversation',
+                    name='participants',
+                ),
+            ],
+            state_operations=[
+                migrations.AlterField(
+                    model_name='conversation',
+                    name='participants',
+                    field=models.ManyToManyField(related_name='conversations', through='messaging.ConversationParticipant', to=settings.AUTH_USER_MODEL, verbose_name='Participants'),
+                ),
+            ],
+        ),
+    ]
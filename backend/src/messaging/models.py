@@ -5,7 +5,8 @@ Ce module définit les modèles pour les conversations et messages
 avec une sécurité robuste et des contraintes strictes.
 """
 
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Exists, F, OuterRef, Q
 from django.utils import timezone
 from django.core.exceptions import ValidationError
 from users.models import CustomUser
@@ -22,6 +23,7 @@ class Conversation(models.Model):
     
     participants = models.ManyToManyField(
         CustomUser,
+        through="ConversationParticipant",
         related_name="conversations",
         verbose_name="Participants"
     )
@@ -61,6 +63,15 @@ class Conversation(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Date de création")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="Date de mise à jour")
     last_message_at = models.DateTimeField(null=True, blank=True, verbose_name="Dernier message")
+    # Dénormalisé : évite une requête par conversation pour l'aperçu
+    last_message = models.ForeignKey(
+        "Message",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+        verbose_name="Dernier message (pointeur)"
+    )
     
     class Meta:
         verbose_name = "Conversation"
@@ -107,19 +118,57 @@ class Conversation(models.Model):
     
     def get_unread_count_for_user(self, user):
         """Retourne le nombre de messages non lus pour un utilisateur."""
-        return self.messages.filter(
-            is_read=False,
-            recipient=user
-        ).exclude(sender=user).count()
+        unread_count = self.memberships.filter(user=user).values_list(
+            "unread_count", flat=True
+        ).first()
+        return unread_count or 0
     
     def mark_as_read_for_user(self, user):
         """Marque tous les messages comme lus pour un utilisateur."""
-        self.messages.filter(
-            is_read=False,
-            recipient=user
-        ).exclude(sender=user).update(
-            is_read=True,
-            read_at=timezone.now()
+        with transaction.atomic():
+            self.messages.filter(
+                is_read=False,
+                recipient=user
+            ).exclude(sender=user).update(
+                is_read=True,
+                read_at=timezone.now()
+            )
+            self.memberships.filter(user=user).update(
+                unread_count=0,
+                last_read_message_id=self.last_message_id
+            )
+    
+    def register_message(self, message):
+        """
+        Prend en compte un nouveau message : pointeur vers le dernier message
+        et incrément du compteur de non-lus des autres participants.
+        
+        Appelé dans la transaction de création du message (voir `Message.save`).
+        """
+        now = timezone.now()
+        Conversation.objects.filter(pk=self.pk).update(
+            last_message=message,
+            last_message_at=message.created_at,
+            updated_at=now
+        )
+        self.last_message = message
+        self.last_message_at = message.created_at
+        self.updated_at = now
+        
+        self.memberships.exclude(user_id=message.sender_id).update(
+            unread_count=F("unread_count") + 1
+        )
+    
+    def refresh_last_message(self):
+        """Recalcule le pointeur vers le dernier message non supprimé."""
+        last_message = self.messages.filter(is_deleted=False).order_by(
+            "-created_at", "-pk"
+        ).first()
+        self.last_message = last_message
+        self.last_message_at = last_message.created_at if last_message else None
+        Conversation.objects.filter(pk=self.pk).update(
+            last_message=self.last_message,
+            last_message_at=self.last_message_at
         )
 
 
@@ -207,37 +256,117 @@ class Message(models.Model):
         if len(self.content) > 5000:
             raise ValidationError("Le message ne peut pas dépasser 5000 caractères.")
         
+        # Les participants sont chargés une seule fois (identifiants uniquement)
+        participant_ids = set()
+        if self.conversation_id:
+            participant_ids = set(
+                self.conversation.memberships.values_list("user_id", flat=True)
+            )
+        
         # Vérifier que l'expéditeur est dans les participants de la conversation
         if self.conversation_id and self.sender_id:
-            if self.sender not in self.conversation.participants.all():
+            if self.sender_id not in participant_ids:
                 raise ValidationError("L'expéditeur doit être un participant de la conversation.")
         
         # Pour les messages directs, vérifier le destinataire
         if self.conversation_id and self.conversation.conversation_type == "direct":
             if not self.recipient_id:
                 raise ValidationError("Un message direct doit avoir un destinataire.")
-            if self.recipient == self.sender:
+            if self.recipient_id == self.sender_id:
                 raise ValidationError("Vous ne pouvez pas vous envoyer un message à vous-même.")
-            if self.recipient not in self.conversation.participants.all():
+            if self.recipient_id not in participant_ids:
                 raise ValidationError("Le destinataire doit être un participant de la conversation.")
     
     def save(self, *args, **kwargs):
         """Override save pour validation et mise à jour de la conversation."""
         self.full_clean()
         
-        # Mettre à jour la date du dernier message de la conversation
-        if not self.pk:  # Nouveau message
-            self.conversation.last_message_at = timezone.now()
-            self.conversation.save(update_fields=["last_message_at", "updated_at"])
+        # Le message et la mise à jour de la conversation et des compteurs
+        # des participants (signal post_save) forment une seule transaction
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+    
+    @classmethod
+    def send(cls, conversation, sender, content, recipient=None, attachment=None):
+        """
+        Envoie un message dans une conversation.
         
-        super().save(*args, **kwargs)
-    
-    def mark_as_read(self):
-        """Marque le message comme lu."""
-        if not self.is_read:
-            self.is_read = True
-            self.read_at = timezone.now()
-            self.save(update_fields=["is_read", "read_at"])
+        Le message, les statuts de lecture de tous les participants (un seul
+        `bulk_create`) et la mise à jour de la conversation sont écrits dans
+        une transaction, en un nombre de requêtes indépendant du nombre de
+        participants.
+        """
+        with transaction.atomic():
+            message = cls(
+                conversation=conversation,
+                sender=sender,
+                recipient=recipient,
+                content=content,
+                attachment=attachment,
+            )
+            message.save()
+            
+            # L'expéditeur a déjà lu son propre message
+            now = timezone.now()
+            MessageReadStatus.objects.bulk_create(
+                [
+                    MessageReadStatus(
+                        message=message,
+                        user_id=user_id,
+                        is_read=user_id == sender.pk,
+                        read_at=now if user_id == sender.pk else None,
+                    )
+                    for user_id in conversation.memberships.values_list(
+                        "user_id", flat=True
+                    )
+                ],
+                ignore_conflicts=True,
+            )
+        return message
+    
+    def mark_as_read(self, user=None):
+        """
+        Marque le message comme lu par `user` (défaut : le destinataire).
+        
+        Message de groupe (sans destinataire) : seul le statut de lecture de
+        `user` change, le message reste non lu pour les autres participants.
+        """
+        user_id = user.pk if user is not None else self.recipient_id
+        if user_id is None or user_id == self.sender_id:
+            return
+        now = timezone.now()
+        with transaction.atomic():
+            if user_id == self.recipient_id:
+                newly_read = not self.is_read
+                if newly_read:
+                    self.is_read = True
+                    self.read_at = now
+                    self.save(update_fields=["is_read", "read_at"])
+                MessageReadStatus.objects.update_or_create(
+                    message=self,
+                    user_id=user_id,
+                    defaults={"is_read": True, "read_at": now}
+                )
+            else:
+                newly_read = MessageReadStatus.objects.filter(
+                    message=self, user_id=user_id, is_read=False
+                ).update(is_read=True, read_at=now) > 0
+                if not newly_read:
+                    _, newly_read = MessageReadStatus.objects.get_or_create(
+                        message=self,
+                        user_id=user_id,
+                        defaults={"is_read": True, "read_at": now}
+                    )
+            
+            # Le message n'est compté que s'il suit le dernier message lu
+            if newly_read:
+                ConversationParticipant.objects.filter(
+                    Q(last_read_message__isnull=True)
+                    | Q(last_read_message_id__lt=self.pk),
+                    conversation_id=self.conversation_id,
+                    user_id=user_id,
+                    unread_count__gt=0,
+                ).update(unread_count=F("unread_count") - 1)
 
 
 class MessageReadStatus(models.Model):
@@ -277,3 +406,87 @@ class MessageReadStatus(models.Model):
     
     def __str__(self):
         return f"{self.user.username} - {self.message.id} - {'Lu' if self.is_read else 'Non lu'}"
+
+
+class ConversationParticipant(models.Model):
+    """
+    Participation d'un utilisateur à une conversation.
+    
+    Table intermédiaire de `Conversation.participants`, qui porte l'état de
+    lecture de chaque participant :
+    - `unread_count` : messages des autres participants non lus, tenu à jour
+      à la création et à la lecture des messages
+    - `last_read_message` : dernier message marqué comme lu
+    """
+    
+    conversation = models.ForeignKey(
+        Conversation,
+        on_delete=models.CASCADE,
+        related_name="memberships",
+        verbose_name="Conversation"
+    )
+    
+    user = models.ForeignKey(
+        CustomUser,
+        on_delete=models.CASCADE,
+        related_name="conversation_memberships",
+        verbose_name="Utilisateur"
+    )
+    
+    unread_count = models.PositiveIntegerField(default=0, verbose_name="Messages non lus")
+    last_read_message = models.ForeignKey(
+        Message,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+        verbose_name="Dernier message lu"
+    )
+    
+    joined_at = models.DateTimeField(auto_now_add=True, verbose_name="Date d'ajout")
+    
+    class Meta:
+        verbose_name = "Participant"
+        verbose_name_plural = "Participants"
+        unique_together = [["conversation", "user"]]
+        indexes = [
+            models.Index(fields=["user", "unread_count"]),
+        ]
+    
+    def __str__(self):
+        return f"{self.user.username} - Conversation #{self.conversation_id}"
+    
+    def compute_unread_count(self):
+        """
+        Recompte les messages non lus depuis les messages eux-mêmes.
+        
+        Un message est non lu s'il n'est pas supprimé, provient d'un autre
+        participant, suit le dernier message lu et n'a pas été lu
+        individuellement (destinataire ou statut de lecture).
+        """
+        messages = Message.objects.filter(
+            conversation_id=self.conversation_id,
+            is_deleted=False
+        ).exclude(sender_id=self.user_id)
+        if self.last_read_message_id:
+            messages = messages.filter(pk__gt=self.last_read_message_id)
+        return messages.exclude(
+            recipient_id=self.user_id,
+            is_read=True
+        ).exclude(
+            Exists(
+                MessageReadStatus.objects.filter(
+                    message=OuterRef("pk"),
+                    user_id=self.user_id,
+                    is_read=True
+                )
+            )
+        ).count()
+    
+    @classmethod
+    def recount(cls, conversation):
+        """Recalcule les compteurs de non-lus de tous les participants."""
+        memberships = list(cls.objects.filter(conversation=conversation))
+        for membership in memberships:
+            membership.unread_count = membership.compute_unread_count()
+        cls.objects.bulk_update(memberships, ["unread_count"])
@@ -14,6 +14,22 @@ from messaging.models import Conversation, Message
 from users.models import CustomUser
 
 
+def _unread_count(serializer, obj):
+    """
+    Nombre de messages non lus de l'utilisateur connecté.
+    
+    Lu depuis l'annotation `viewer_unread_count` posée par le ViewSet,
+    sinon depuis la table des participants.
+    """
+    unread_count = getattr(obj, "viewer_unread_count", None)
+    if unread_count is not None:
+        return unread_count
+    request = serializer.context.get("request")
+    if request and request.user and request.user.is_authenticated:
+        return obj.get_unread_count_for_user(request.user)
+    return 0
+
+
 class ConversationSerializer(serializers.ModelSerializer):
     """
     Serializer complet pour une conversation.
@@ -66,6 +82,14 @@ class ConversationSerializer(serializers.ModelSerializer):
             "updated_at",
             "last_message_at",
         ]
+        # Chargements lus par les champs calculés (voir backend.fieldsets)
+        field_dependencies = {
+            "participants": ("participants",),
+            "participants_names": ("participants",),
+            "participants_count": ("participants",),
+            "last_message": ("last_message",),
+            "unread_count": ("viewer_unread_count",),
+        }
     
     def get_participants(self, obj):
         """Retourne les informations des participants."""
@@ -90,7 +114,7 @@ class ConversationSerializer(serializers.ModelSerializer):
     
     def get_last_message(self, obj):
         """Retourne le dernier message de la conversation."""
-        last_message = obj.messages.filter(is_deleted=False).last()
+        last_message = obj.last_message
         if last_message:
             return {
                 "id": last_message.id,
@@ -103,10 +127,7 @@ class ConversationSerializer(serializers.ModelSerializer):
     
     def get_unread_count(self, obj):
         """Retourne le nombre de messages non lus pour l'utilisateur connecté."""
-        request = self.context.get("request")
-        if request and request.user:
-            return obj.get_unread_count_for_user(request.user)
-        return 0
+        return _unread_count(self, obj)
     
     def validate_participants_ids(self, value):
         """Valide les participants."""
@@ -182,6 +203,12 @@ class ConversationListSerializer(serializers.ModelSerializer):
             "last_message_at",
             "created_at",
         ]
+        field_dependencies = {
+            "participants_count": ("participants",),
+            "participants_preview": ("participants",),
+            "last_message_preview": ("last_message",),
+            "unread_count": ("viewer_unread_count",),
+        }
     
     def get_participants_count(self, obj):
         """Retourne le nombre de participants."""
@@ -207,7 +234,7 @@ class ConversationListSerializer(serializers.ModelSerializer):
     
     def get_last_message_preview(self, obj):
         """Retourne un aperçu du dernier message."""
-        last_message = obj.messages.filter(is_deleted=False).last()
+        last_message = obj.last_message
         if last_message:
             return {
                 "content": last_message.content[:50] + "..." if len(last_message.content) > 50 else last_message.content,
@@ -218,10 +245,7 @@ class ConversationListSerializer(serializers.ModelSerializer):
     
     def get_unread_count(self, obj):
         """Retourne le nombre de messages non lus."""
-        request = self.context.get("request")
-        if request and request.user:
-            return obj.get_unread_count_for_user(request.user)
-        return 0
+        return _unread_count(self, obj)
 
 
 class ConversationCreateSerializer(serializers.ModelSerializer):
@@ -9,9 +9,8 @@ Validation stricte et sécurité renforcée :
 """
 
 from rest_framework import serializers
-from django.utils import timezone
 from django.core.exceptions import ValidationError
-from messaging.models import Message, Conversation, MessageReadStatus
+from messaging.models import Message, Conversation
 from users.models import CustomUser
 
 
@@ -159,7 +158,7 @@ class MessageCreateSerializer(serializers.ModelSerializer):
         # Vérifier que l'utilisateur connecté est un participant
         request = self.context.get("request")
         if request and request.user:
-            if request.user not in value.participants.all():
+            if not value.memberships.filter(user_id=request.user.pk).exists():
                 raise serializers.ValidationError("Vous n'êtes pas autorisé à envoyer un message dans cette conversation.")
         
         return value
@@ -187,7 +186,7 @@ class MessageCreateSerializer(serializers.ModelSerializer):
                     if value == request.user:
                         raise serializers.ValidationError("Vous ne pouvez pas vous envoyer un message à vous-même.")
                 
-                if value not in conversation_obj.participants.all():
+                if not conversation_obj.memberships.filter(user_id=value.pk).exists():
                     raise serializers.ValidationError("Le destinataire doit être un participant de la conversation.")
         
         return value
@@ -209,35 +208,12 @@ class MessageCreateSerializer(serializers.ModelSerializer):
         """Créer un message avec validation et sécurité."""
         request = self.context.get("request")
         
-        # Définir automatiquement l'expéditeur
-        message = Message.objects.create(
-            sender=request.user if request else None,
-            **validated_data
-        )
-        
-        # Validation finale
+        # L'expéditeur est défini automatiquement ; le message, les statuts de
+        # lecture et la conversation sont écrits dans une seule transaction
         try:
-            message.full_clean()
+            return Message.send(
+                sender=request.user if request else None,
+                **validated_data
+            )
         except ValidationError as e:
-            message.delete()
             raise serializers.ValidationError(str(e))
-        
-        # Créer le statut de lecture pour les autres participants
-        conversation = message.conversation
-        for participant in conversation.participants.all():
-            if participant != request.user:
-                MessageReadStatus.objects.get_or_create(
-                    message=message,
-                    user=participant,
-                    defaults={"is_read": False}
-                )
-            else:
-                # L'expéditeur a déjà lu son propre message
-                MessageReadStatus.objects.get_or_create(
-                    message=message,
-                    user=participant,
-                    defaults={"is_read": True, "read_at": timezone.now()}
-                )
-        
-        return message
-
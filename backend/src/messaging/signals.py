@@ -8,19 +8,57 @@ de conversations et messages.
 from django.db.models.signals import post_save, pre_delete
 from django.dispatch import receiver
 from django.utils import timezone
-from messaging.models import Conversation, Message, MessageReadStatus
+
+from backend import events, metrics
+from messaging.models import (
+    Conversation,
+    ConversationParticipant,
+    Message,
+    MessageReadStatus,
+)
 
 
 @receiver(post_save, sender=Message)
-def update_conversation_last_message(sender, instance, created, **kwargs):
+def update_conversation_last_message(sender, instance, created, update_fields=None, **kwargs):
     """
-    Met à jour la date du dernier message de la conversation
-    lorsqu'un nouveau message est créé.
+    Met à jour le dernier message de la conversation et les compteurs de
+    non-lus des participants lorsqu'un message est créé ou supprimé.
+    
+    Exécuté dans la transaction ouverte par `Message.save`.
     """
     if created and not instance.is_deleted:
-        conversation = instance.conversation
-        conversation.last_message_at = timezone.now()
-        conversation.save(update_fields=["last_message_at", "updated_at"])
+        instance.conversation.register_message(instance)
+        metrics.count(metrics.MESSAGES_SENT, instance.conversation.conversation_type)
+        _publish_message(instance)
+    elif (
+        not created
+        and instance.is_deleted
+        and (update_fields is None or "is_deleted" in update_fields)
+    ):
+        # Suppression (logique) : le message ne compte plus
+        instance.conversation.refresh_last_message()
+        ConversationParticipant.recount(instance.conversation)
+
+
+def _publish_message(message):
+    """Pousse le nouveau message aux autres participants (flux SSE)."""
+    recipients = list(
+        message.conversation.memberships.exclude(
+            user_id=message.sender_id
+        ).values_list("user_id", flat=True)
+    )
+    events.publish(
+        "message.created",
+        {
+            "id": message.id,
+            "conversation": message.conversation_id,
+            "sender": message.sender_id,
+            "sender_name": message.sender.get_full_name() or message.sender.username,
+            "content": message.content[:100],
+            "created_at": message.created_at,
+        },
+        users=recipients,
+    )
 
 
 @receiver(pre_delete, sender=Conversation)
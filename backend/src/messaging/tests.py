@@ -7,7 +7,14 @@ from django.core.exceptions import ValidationError
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
 from rest_framework_simplejwt.tokens import RefreshToken
-from messaging.models import Conversation, Message, MessageReadStatus
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from messaging.models import (
+    Conversation,
+    ConversationParticipant,
+    Message,
+    MessageReadStatus,
+)
 from django.utils import timezone
 
 CustomUser = get_user_model()
@@ -263,3 +270,193 @@ class MessagingAPITest(APITestCase):
         }
         response = self.client.post('/api/messages/messages/', data, format='json')
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+
+class ConversationMembershipTest(APITestCase):
+    """Tests pour les compteurs de non-lus et le pointeur vers le dernier message."""
+    
+    def setUp(self):
+        """Configuration initiale."""
+        self.client = APIClient()
+        self.user1 = CustomUser.objects.create_user(
+            username='user1',
+            email='user1@example.com',
+            password='pass123'
+        )
+        self.user2 = CustomUser.objects.create_user(
+            username='user2',
+            email='user2@example.com',
+            password='pass123'
+        )
+        self.conversation = self._conversation(self.user1, self.user2)
+    
+    def _conversation(self, user, other):
+        conversation = Conversation.objects.create(
+            created_by=user,
+            conversation_type='direct'
+        )
+        conversation.participants.add(user, other)
+        return conversation
+    
+    def _send(self, conversation, sender, recipient, content='Bonjour'):
+        return Message.objects.create(
+            conversation=conversation,
+            sender=sender,
+            recipient=recipient,
+            content=content
+        )
+    
+    def _unread(self, user, conversation=None):
+        return ConversationParticipant.objects.get(
+            conversation=conversation or self.conversation, user=user
+        ).unread_count
+    
+    def test_new_message_updates_counters_and_pointer(self):
+        """Un nouveau message incrémente les non-lus des autres participants."""
+        first = self._send(self.conversation, self.user1, self.user2)
+        second = self._send(self.conversation, self.user1, self.user2)
+        self.conversation.refresh_from_db()
+        self.assertEqual(self.conversation.last_message, second)
+        self.assertEqual(self.conversation.last_message_at, second.created_at)
+        self.assertEqual(self._unread(self.user2), 2)
+        self.assertEqual(self._unread(self.user1), 0)
+        
+        first.mark_as_read()
+        self.assertEqual(self._unread(self.user2), 1)
+        
+        self.client.force_authenticate(user=self.user2)
+        response = self.client.post(f'/api/messages/messages/{second.pk}/mark-read/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self._unread(self.user2), 0)
+    
+    def test_mark_conversation_read(self):
+        """Marquer la conversation comme lue remet le compteur à zéro."""
+        self._send(self.conversation, self.user1, self.user2)
+        last = self._send(self.conversation, self.user1, self.user2)
+        self.conversation.refresh_from_db()
+        self.conversation.mark_as_read_for_user(self.user2)
+        membership = ConversationParticipant.objects.get(
+            conversation=self.conversation, user=self.user2
+        )
+        self.assertEqual(membership.unread_count, 0)
+        self.assertEqual(membership.last_read_message, last)
+        self.assertEqual(membership.compute_unread_count(), 0)
+    
+    def test_soft_delete_moves_pointer_and_recounts(self):
+        """La suppression du dernier message recule le pointeur et décompte le message."""
+        first = self._send(self.conversation, self.user1, self.user2)
+        last = self._send(self.conversation, self.user1, self.user2)
+        last.is_deleted = True
+        last.deleted_at = timezone.now()
+        last.save(update_fields=['is_deleted', 'deleted_at', 'updated_at'])
+        self.conversation.refresh_from_db()
+        self.assertEqual(self.conversation.last_message, first)
+        self.assertEqual(self._unread(self.user2), 1)
+    
+    def test_inbox_query_count_is_constant(self):
+        """Le listing des conversations ne dépend pas du nombre de conversations."""
+        self.client.force_authenticate(user=self.user2)
+        self._send(self.conversation, self.user1, self.user2)
+        with CaptureQueriesContext(connection) as small:
+            response = self.client.get('/api/messages/conversations/')
+        self.assertEqual(response.data['results'][0]['unread_count'], 1)
+        self.assertEqual(
+            response.data['results'][0]['last_message_preview']['content'], 'Bonjour'
+        )
+        
+        for index in range(5):
+            other = CustomUser.objects.create_user(
+                username=f'other{index}',
+                email=f'other{index}@example.com',
+                password='pass123'
+            )
+            conversation = self._conversation(other, self.user2)
+            for _ in range(3):
+                self._send(conversation, other, self.user2)
+        with CaptureQueriesContext(connection) as large:
+            response = self.client.get('/api/messages/conversations/')
+        self.assertEqual(len(response.data['results']), 6)
+        self.assertEqual(len(large), len(small))
+    
+    def test_group_message_read_by_each_participant(self):
+        """Message de groupe : chaque participant le marque lu pour lui-même."""
+        user3 = CustomUser.objects.create_user(
+            username='user3', email='user3@example.com', password='pass123'
+        )
+        group = Conversation.objects.create(created_by=self.user1, conversation_type='group')
+        group.participants.add(self.user1, self.user2, user3)
+        message = self._send(group, self.user1, None)
+        self.assertEqual((self._unread(self.user2, group), self._unread(user3, group)), (1, 1))
+        
+        url = f'/api/messages/messages/{message.pk}/mark-read/'
+        self.client.force_authenticate(user=self.user2)
+        self.assertEqual(self.client.post(url).status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.post(url).status_code, status.HTTP_200_OK)
+        self.assertEqual((self._unread(self.user2, group), self._unread(user3, group)), (0, 1))
+        for user in (self.user2, user3):
+            membership = ConversationParticipant.objects.get(conversation=group, user=user)
+            self.assertEqual(membership.compute_unread_count(), membership.unread_count)
+        
+        # L'expéditeur n'a rien à marquer
+        self.client.force_authenticate(user=self.user1)
+        self.assertEqual(self.client.post(url).status_code, status.HTTP_403_FORBIDDEN)
+    
+    def test_unread_action_uses_counters(self):
+        """L'action `unread` ne renvoie que les conversations avec des non-lus."""
+        other = self._conversation(
+            self.user1,
+            CustomUser.objects.create_user(
+                username='user3', email='user3@example.com', password='pass123'
+            )
+        )
+        self._send(self.conversation, self.user2, self.user1)
+        self.client.force_authenticate(user=self.user1)
+        response = self.client.get('/api/messages/conversations/unread/')
+        ids = [item['id'] for item in response.data['results']]
+        self.assertEqual(ids, [self.conversation.id])
+        self.assertNotIn(other.id, ids)
+
+
+class MessageSendTest(TestCase):
+    """Tests pour l'envoi de messages (statuts de lecture en masse)."""
+    
+    def _group(self, size):
+        users = [
+            CustomUser.objects.create_user(
+                username=f'member{size}-{index}',
+                email=f'member{size}-{index}@example.com',
+                password='pass123'
+            )
+            for index in range(size)
+        ]
+        conversation = Conversation.objects.create(
+            created_by=users[0],
+            conversation_type='group'
+        )
+        conversation.participants.add(*users)
+        return conversation, users
+    
+    def test_send_creates_read_statuses(self):
+        """Un statut de lecture est créé par participant, lu pour l'expéditeur."""
+        conversation, users = self._group(4)
+        message = Message.send(conversation=conversation, sender=users[0], content='Bonjour')
+        statuses = {
+            read_status.user_id: read_status.is_read
+            for read_status in MessageReadStatus.objects.filter(message=message)
+        }
+        self.assertEqual(statuses, {
+            users[0].id: True,
+            users[1].id: False,
+            users[2].id: False,
+            users[3].id: False,
+        })
+    
+    def test_send_query_count_is_independent_of_participants(self):
+        """Le nombre de requêtes d'un envoi ne dépend pas du nombre de participants."""
+        counts = []
+        for size in (2, 30):
+            conversation, users = self._group(size)
+            with CaptureQueriesContext(connection) as captured:
+                Message.send(conversation=conversation, sender=users[0], content='Bonjour')
+            counts.append(len(captured))
+        self.assertEqual(counts[0], counts[1])
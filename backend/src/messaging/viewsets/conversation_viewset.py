@@ -14,9 +14,17 @@ from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django.utils import timezone
-from django.db.models import Q, Count, Max
+from django.db.models import OuterRef, Subquery
+from django.db.models.functions import Coalesce
 
-from messaging.models import Conversation, Message, MessageReadStatus
+from backend.conditional import ConditionalRequestMixin
+from backend.fieldsets import SparseFieldsetMixin
+from messaging.models import (
+    Conversation,
+    ConversationParticipant,
+    Message,
+    MessageReadStatus,
+)
 from users.models import CustomUser
 from messaging.serializers import (
     ConversationSerializer,
@@ -26,7 +34,7 @@ from messaging.serializers import (
 from messaging.permissions import IsParticipantOrAdmin
 
 
-class ConversationViewSet(viewsets.ModelViewSet):
+class ConversationViewSet(ConditionalRequestMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet pour les conversations.
     
@@ -42,11 +50,12 @@ class ConversationViewSet(viewsets.ModelViewSet):
     - GET /api/messages/conversations/with-user/{user_id}/ : Conversation avec un utilisateur spécifique
     """
     
-    queryset = Conversation.objects.filter(is_deleted=False).prefetch_related(
-        "participants",
-        "messages"
-    ).annotate(
-        unread_count=Count("messages", filter=Q(messages__is_read=False))
+    # Le dernier message et les compteurs de non-lus sont dénormalisés :
+    # le listing coûte un nombre constant de requêtes.
+    queryset = Conversation.objects.filter(is_deleted=False).select_related(
+        "last_message__sender"
+    ).prefetch_related(
+        "participants"
     ).order_by("-last_message_at", "-created_at")
     
     permission_classes = [permissions.IsAuthenticated, IsParticipantOrAdmin]
@@ -72,7 +81,17 @@ class ConversationViewSet(viewsets.ModelViewSet):
         - Un utilisateur ne voit que ses propres conversations
         - Les admins voient toutes les conversations (pour modération)
         """
-        queryset = super().get_queryset()
+        queryset = super().get_queryset().annotate(
+            viewer_unread_count=Coalesce(
+                Subquery(
+                    ConversationParticipant.objects.filter(
+                        conversation=OuterRef("pk"),
+                        user_id=self.request.user.pk
+                    ).values("unread_count")[:1]
+                ),
+                0
+            )
+        )
         
         # Les admins voient tout (pour modération)
         if self.request.user.is_staff or self.request.user.is_superuser:
@@ -141,13 +160,7 @@ class ConversationViewSet(viewsets.ModelViewSet):
         Action personnalisée : Conversations avec messages non lus.
         GET /api/messages/conversations/unread/
         """
-        queryset = self.get_queryset().annotate(
-            unread_messages=Count(
-                "messages",
-                filter=Q(messages__is_read=False, messages__is_deleted=False) &
-                       ~Q(messages__sender=request.user)
-            )
-        ).filter(unread_messages__gt=0)
+        queryset = self.get_queryset().filter(viewer_unread_count__gt=0)
         
         page = self.paginate_queryset(queryset)
         if page is not None:
@@ -16,7 +16,9 @@ from rest_framework.filters import SearchFilter, OrderingFilter
 from django.utils import timezone
 from django.db.models import Q
 
-from messaging.models import Message, Conversation, MessageReadStatus
+from backend.conditional import ConditionalRequestMixin
+from backend.fieldsets import SparseFieldsetMixin
+from messaging.models import Message, Conversation
 from messaging.serializers import (
     MessageSerializer,
     MessageListSerializer,
@@ -25,7 +27,7 @@ from messaging.serializers import (
 from messaging.permissions import CanSendMessage, CanModifyMessage
 
 
-class MessageViewSet(viewsets.ModelViewSet):
+class MessageViewSet(ConditionalRequestMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet pour les messages.
     
@@ -110,22 +112,21 @@ class MessageViewSet(viewsets.ModelViewSet):
         """
         message = self.get_object()
         
-        # Vérifier que l'utilisateur est le destinataire
-        if message.recipient != request.user:
+        # Destinataire du message, ou participant d'un message de groupe
+        allowed = (
+            message.recipient_id == request.user.pk
+            if message.recipient_id
+            else message.sender_id != request.user.pk
+            and message.conversation.memberships.filter(user=request.user).exists()
+        )
+        if not allowed:
             return Response(
                 {"detail": "Vous n'êtes pas autorisé à marquer ce message comme lu."},
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        # Marquer comme lu
-        message.mark_as_read()
-        
-        # Mettre à jour le statut de lecture
-        MessageReadStatus.objects.update_or_create(
-            message=message,
-            user=request.user,
-            defaults={"is_read": True, "read_at": timezone.now()}
-        )
+        # Marquer comme lu (statut de lecture et compteur du participant)
+        message.mark_as_read(request.user)
         
         serializer = self.get_serializer(message)
         return Response(serializer.data)
@@ -149,9 +150,12 @@ class MessageViewSet(viewsets.ModelViewSet):
         - CREATE : Vérifie que l'utilisateur peut envoyer
         - UPDATE/DELETE : Vérifie que l'utilisateur peut modifier
         - READ : Vérifie que l'utilisateur peut voir
+        - MARK-READ : Destinataire ou participant (vérifié par l'action)
         """
         if self.action in ["create"]:
             permission_classes = [permissions.IsAuthenticated, CanSendMessage]
+        elif self.action == "mark_read":
+            permission_classes = [permissions.IsAuthenticated]
         elif self.action in ["update", "partial_update", "destroy"]:
             permission_classes = [permissions.IsAuthenticated, CanModifyMessage]
         else:
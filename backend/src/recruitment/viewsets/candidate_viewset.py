@@ -13,6 +13,9 @@ from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 
+from backend.conditional import ConditionalRequestMixin
+from backend.export import ExportMixin
+from backend.fieldsets import SparseFieldsetMixin
 from recruitment.models.candidate import Candidate
 from recruitment.serializers.candidate_serializer import CandidateSerializer
 
@@ -34,7 +37,7 @@ class IsHRManagerOrAdmin(permissions.BasePermission):
         )
 
 
-class CandidateViewSet(viewsets.ModelViewSet):
+class CandidateViewSet(ConditionalRequestMixin, SparseFieldsetMixin, ExportMixin, viewsets.ModelViewSet):
     """
     ViewSet pour les candidats.
     
@@ -47,6 +50,7 @@ class CandidateViewSet(viewsets.ModelViewSet):
     - POST /api/recruitment/candidates/{id}/change-status/ : Changer le statut
     - GET /api/recruitment/candidates/by-position/{position_id}/ : Candidats par offre
     - GET /api/recruitment/candidates/active/ : Candidats actifs
+    - GET /api/recruitment/candidates/export/{csv|jsonl|xlsx}/ : Export en flux
     """
     
     serializer_class = CandidateSerializer
@@ -56,6 +60,17 @@ class CandidateViewSet(viewsets.ModelViewSet):
     search_fields = ["first_name", "last_name", "email", "phone"]
     ordering_fields = ["applied_date", "updated_at", "first_name", "last_name"]
     ordering = ["-applied_date"]
+    export_fields = [
+        "id",
+        "first_name",
+        "last_name",
+        "email",
+        "phone",
+        "position__title",
+        "status",
+        "applied_date",
+        "updated_at",
+    ]
 
     def get_queryset(self):
         """Retourne tous les candidats avec relations optimisées."""
@@ -103,6 +118,11 @@ class CandidateViewSet(viewsets.ModelViewSet):
         GET /api/recruitment/candidates/by-position/{position_id}/
         """
         queryset = self.get_queryset().filter(position_id=position_id)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
 
@@ -115,6 +135,11 @@ class CandidateViewSet(viewsets.ModelViewSet):
         queryset = self.get_queryset().exclude(
             status__in=[Candidate.STATUS_REJECTED, Candidate.STATUS_HIRED]
         )
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
 
@@ -13,6 +13,8 @@ from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 
+from backend.conditional import ConditionalRequestMixin
+from backend.fieldsets import SparseFieldsetMixin
 from recruitment.models.hiring_process import HiringProcess
 from recruitment.serializers.hiring_process_serializer import HiringProcessSerializer
 
@@ -38,7 +40,7 @@ class IsHRManagerOrAdmin(permissions.BasePermission):
         )
 
 
-class HiringProcessViewSet(viewsets.ModelViewSet):
+class HiringProcessViewSet(ConditionalRequestMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet pour le processus d'embauche.
     
@@ -73,6 +75,11 @@ class HiringProcessViewSet(viewsets.ModelViewSet):
         GET /api/recruitment/hiring-process/by-candidate/{candidate_id}/
         """
         queryset = self.get_queryset().filter(candidate_id=candidate_id)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
 
@@ -88,6 +95,11 @@ class HiringProcessViewSet(viewsets.ModelViewSet):
             scheduled_date__gte=timezone.now()
         ).order_by("scheduled_date")
         
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
 
@@ -12,7 +12,12 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
+from django.db.models import Q
 
+from backend.cache import cached_response
+from backend.conditional import ConditionalRequestMixin
+from backend.fieldsets import SparseFieldsetMixin
+from backend.statistics import StatisticsBuilder
 from recruitment.models.job_position import JobPosition
 from recruitment.serializers.job_position_serializer import JobPositionSerializer
 
@@ -34,7 +39,7 @@ class IsHRManagerOrAdmin(permissions.BasePermission):
         )
 
 
-class JobPositionViewSet(viewsets.ModelViewSet):
+class JobPositionViewSet(ConditionalRequestMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet pour les offres d'emploi.
     
@@ -70,6 +75,11 @@ class JobPositionViewSet(viewsets.ModelViewSet):
         GET /api/recruitment/job-positions/urgent/
         """
         queryset = self.get_queryset().filter(urgency=True, status=JobPosition.STATUS_OPEN)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
 
@@ -80,10 +90,16 @@ class JobPositionViewSet(viewsets.ModelViewSet):
         GET /api/recruitment/job-positions/open/
         """
         queryset = self.get_queryset().filter(status=JobPosition.STATUS_OPEN)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
 
     @action(detail=True, methods=["get"], url_path="statistics")
+    @cached_response("recruitment", "department")
     def statistics(self, request, pk=None):
         """
         Action personnalisée : Statistiques détaillées d'une offre.
@@ -93,19 +109,17 @@ class JobPositionViewSet(viewsets.ModelViewSet):
         
         from recruitment.models.candidate import Candidate
         
-        stats = {
-            "total_candidates": job_position.candidates.count(),
-            "by_status": {
-                status: job_position.candidates.filter(status=status).count()
-                for status, _ in Candidate.STATUS_CHOICES
-            },
-            "active_candidates": job_position.candidates.exclude(
-                status__in=[Candidate.STATUS_REJECTED, Candidate.STATUS_HIRED]
-            ).count(),
-            "hired_count": job_position.candidates.filter(
-                status=Candidate.STATUS_HIRED
-            ).count(),
-        }
+        stats = (
+            StatisticsBuilder(job_position.candidates.all())
+            .count("total_candidates")
+            .count_by("by_status", "status", Candidate.STATUS_CHOICES)
+            .count(
+                "active_candidates",
+                ~Q(status__in=[Candidate.STATUS_REJECTED, Candidate.STATUS_HIRED]),
+            )
+            .count("hired_count", Q(status=Candidate.STATUS_HIRED))
+            .build()
+        )
         
         return Response(stats)
 
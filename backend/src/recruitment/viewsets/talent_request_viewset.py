@@ -13,6 +13,8 @@ from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 
+from backend.conditional import ConditionalRequestMixin
+from backend.fieldsets import SparseFieldsetMixin
 from recruitment.models.talent_request import TalentRequest
 from recruitment.serializers.talent_request_serializer import TalentRequestSerializer
 
@@ -39,7 +41,7 @@ class IsHRManagerOrAdmin(permissions.BasePermission):
         return request.user and request.user.is_authenticated
 
 
-class TalentRequestViewSet(viewsets.ModelViewSet):
+class TalentRequestViewSet(ConditionalRequestMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet pour les demandes de talents.
     
@@ -152,6 +154,11 @@ class TalentRequestViewSet(viewsets.ModelViewSet):
         GET /api/recruitment/talent-requests/pending/
         """
         queryset = self.get_queryset().filter(status=TalentRequest.STATUS_PENDING)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
 
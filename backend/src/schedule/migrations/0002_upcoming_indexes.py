@@ -0,0 +1,21 @@
+# Generated by Django 5.2.8 on 2026-10-17 03:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schedule', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='meeting',
+            index=models.Index(fields=['start_time'], name='schedule_me_start_t_743b1b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='schedule',
+            index=models.Index(fields=['completed', 'scheduled_date'], name='schedule_sc_complet_9260ef_idx'),
+        ),
+    ]
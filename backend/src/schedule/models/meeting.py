@@ -34,6 +34,10 @@ class Meeting(models.Model):
         verbose_name = "Réunion"
         verbose_name_plural = "Réunions"
         ordering = ["-start_time"]
+        indexes = [
+            # Réunions à venir (dashboard)
+            models.Index(fields=["start_time"]),
+        ]
 
     def __str__(self) -> str:
         return self.title
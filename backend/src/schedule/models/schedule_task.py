@@ -48,6 +48,10 @@ class Schedule(models.Model):
         verbose_name = "Tâche planifiée"
         verbose_name_plural = "Tâches planifiées"
         ordering = ["-scheduled_date"]
+        indexes = [
+            # Tâches à venir non terminées (dashboard)
+            models.Index(fields=["completed", "scheduled_date"]),
+        ]
 
     def __str__(self) -> str:
         return self.title
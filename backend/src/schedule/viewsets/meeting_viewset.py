@@ -14,12 +14,14 @@ from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django.db.models import Q
 
+from backend.conditional import ConditionalRequestMixin
+from backend.fieldsets import SparseFieldsetMixin
 from schedule.models.meeting import Meeting
 from schedule.serializers.meeting_serializer import MeetingSerializer
 from employee.models.employee import Employee
 
 
-class MeetingViewSet(viewsets.ModelViewSet):
+class MeetingViewSet(ConditionalRequestMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet pour les réunions.
     
@@ -70,6 +72,11 @@ class MeetingViewSet(viewsets.ModelViewSet):
             start_time__gte=timezone.now()
         ).order_by('start_time')
         
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
 
@@ -91,6 +98,11 @@ class MeetingViewSet(viewsets.ModelViewSet):
             Q(organizer=employee) | Q(attendees=employee)
         ).distinct()
         
+        page = self.paginate_queryset(meetings)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
         serializer = self.get_serializer(meetings, many=True)
         return Response(serializer.data)
 
@@ -13,6 +13,8 @@ from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 
+from backend.conditional import ConditionalRequestMixin
+from backend.fieldsets import SparseFieldsetMixin
 from schedule.models.schedule_task import Schedule
 from schedule.serializers.schedule_serializer import ScheduleSerializer
 from employee.models.employee import Employee
@@ -42,7 +44,7 @@ class IsAssignedEmployeeOrAdmin(permissions.BasePermission):
         return request.user and request.user.is_authenticated
 
 
-class ScheduleViewSet(viewsets.ModelViewSet):
+class ScheduleViewSet(ConditionalRequestMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet pour les tâches planifiées.
     
@@ -123,6 +125,11 @@ class ScheduleViewSet(viewsets.ModelViewSet):
             )
         
         tasks = self.get_queryset().filter(assigned_to=request.user.employee)
+        page = self.paginate_queryset(tasks)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
         serializer = self.get_serializer(tasks, many=True)
         return Response(serializer.data)
 
@@ -139,6 +146,11 @@ class ScheduleViewSet(viewsets.ModelViewSet):
             scheduled_date__gte=timezone.now()
         ).order_by('scheduled_date')
         
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
 
@@ -13,6 +13,8 @@ from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 
+from backend.conditional import ConditionalRequestMixin
+from backend.fieldsets import SparseFieldsetMixin
 from settings.models import EmailTemplate
 from settings.serializers.email_template_serializer import (
     EmailTemplateSerializer,
@@ -20,7 +22,7 @@ from settings.serializers.email_template_serializer import (
 )
 
 
-class EmailTemplateViewSet(viewsets.ModelViewSet):
+class EmailTemplateViewSet(ConditionalRequestMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet pour les modèles d'emails.
     
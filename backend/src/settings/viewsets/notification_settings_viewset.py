@@ -12,15 +12,19 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
-from django.db.models import Count
+from django.db.models import Count, Q
 
+from backend.cache import cached_response
+from backend.conditional import ConditionalRequestMixin
+from backend.fieldsets import SparseFieldsetMixin
+from backend.statistics import StatisticsBuilder
 from settings.models import NotificationSettings
 from settings.serializers.notification_settings_serializer import (
     NotificationSettingsSerializer,
 )
 
 
-class NotificationSettingsViewSet(viewsets.ModelViewSet):
+class NotificationSettingsViewSet(ConditionalRequestMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet pour les paramètres de notifications.
     
@@ -88,6 +92,7 @@ class NotificationSettingsViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
     @action(detail=False, methods=["get"], url_path="statistics")
+    @cached_response("settings")
     def statistics(self, request):
         """
         Action personnalisée : Statistiques sur les paramètres de notifications.
@@ -95,17 +100,21 @@ class NotificationSettingsViewSet(viewsets.ModelViewSet):
         """
         queryset = self.get_queryset()
         
-        stats = {
-            "total": queryset.count(),
-            "enabled": queryset.filter(enabled=True).count(),
-            "disabled": queryset.filter(enabled=False).count(),
-            "by_type": queryset.values("notification_type")
+        stats = (
+            StatisticsBuilder(queryset)
+            .count("total")
+            .count("enabled", Q(enabled=True))
+            .count("disabled", Q(enabled=False))
+            .count("email_enabled", Q(send_email=True))
+            .count("sms_enabled", Q(send_sms=True))
+            .count("push_enabled", Q(send_push=True))
+            .build()
+        )
+        stats["by_type"] = (
+            queryset.values("notification_type")
             .annotate(count=Count("id"))
-            .order_by("notification_type"),
-            "email_enabled": queryset.filter(send_email=True).count(),
-            "sms_enabled": queryset.filter(send_sms=True).count(),
-            "push_enabled": queryset.filter(send_push=True).count(),
-        }
+            .order_by("notification_type")
+        )
         
         return Response(stats)
 
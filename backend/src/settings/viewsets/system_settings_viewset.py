@@ -12,11 +12,14 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.filters import SearchFilter, OrderingFilter
 
+from backend.cache import cached_response, SCOPE_GLOBAL
+from backend.conditional import ConditionalRequestMixin
+from backend.fieldsets import SparseFieldsetMixin
 from settings.models import SystemSettings
 from settings.serializers.system_settings_serializer import SystemSettingsSerializer
 
 
-class SystemSettingsViewSet(viewsets.ModelViewSet):
+class SystemSettingsViewSet(ConditionalRequestMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet pour les paramètres système.
     
@@ -45,6 +48,7 @@ class SystemSettingsViewSet(viewsets.ModelViewSet):
         """Retourne toujours l'instance unique des paramètres système."""
         return SystemSettings.get_settings()
 
+    @cached_response("settings", scope=SCOPE_GLOBAL)
     def list(self, request, *args, **kwargs):
         """Redirige vers l'instance unique."""
         instance = self.get_object()
@@ -77,6 +77,16 @@ class SupportTicketSerializer(serializers.ModelSerializer):
             "closed_at",
             "duration_days",
         ]
+        # Chargements lus par les champs calculés (voir backend.fieldsets)
+        field_dependencies = {
+            "created_by_name": ("created_by",),
+            "assigned_to_name": ("assigned_to",),
+            "comments_count": ("comments",),
+            "duration_days": (),
+            "is_open": (),
+            "is_resolved": (),
+            "is_closed": (),
+        }
 
     def get_created_by_name(self, obj):
         """Retourne le nom complet du créateur."""
@@ -152,6 +162,11 @@ class SupportTicketListSerializer(serializers.ModelSerializer):
             "updated_at",
             "comments_count",
         ]
+        field_dependencies = {
+            "created_by_name": ("created_by",),
+            "assigned_to_name": ("assigned_to",),
+            "comments_count": ("comments",),
+        }
 
     def get_created_by_name(self, obj):
         """Retourne le nom complet du créateur."""
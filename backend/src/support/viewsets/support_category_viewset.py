@@ -12,8 +12,12 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
-from django.db.models import Count
+from django.db.models import Count, Q
 
+from backend.cache import cached_response
+from backend.conditional import ConditionalRequestMixin
+from backend.fieldsets import SparseFieldsetMixin
+from backend.statistics import StatisticsBuilder
 from support.models import SupportCategory
 from support.serializers.support_category_serializer import SupportCategorySerializer
 
@@ -38,7 +42,7 @@ class IsHRManagerOrAdmin(permissions.BasePermission):
         )
 
 
-class SupportCategoryViewSet(viewsets.ModelViewSet):
+class SupportCategoryViewSet(ConditionalRequestMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet pour les catégories de support.
     
@@ -116,18 +120,21 @@ class SupportCategoryViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
     @action(detail=False, methods=["get"], url_path="statistics")
+    @cached_response("support")
     def statistics(self, request):
         """Statistiques sur les catégories."""
         queryset = self.get_queryset()
         
-        stats = {
-            "total": queryset.count(),
-            "active": queryset.filter(is_active=True).count(),
-            "inactive": queryset.filter(is_active=False).count(),
-            "by_category": queryset.annotate(
-                tickets_count=Count("tickets")
-            ).values("id", "name", "tickets_count").order_by("-tickets_count"),
-        }
+        stats = (
+            StatisticsBuilder(queryset)
+            .count("total")
+            .count("active", Q(is_active=True))
+            .count("inactive", Q(is_active=False))
+            .build()
+        )
+        stats["by_category"] = queryset.annotate(
+            tickets_count=Count("tickets")
+        ).values("id", "name", "tickets_count").order_by("-tickets_count")
         
         return Response(stats)
 
@@ -13,8 +13,13 @@ from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django.utils import timezone
-from django.db.models import Count, Q
+from django.db.models import Q
 
+from backend.cache import cached_response
+from backend.conditional import ConditionalRequestMixin
+from backend.export import ExportMixin
+from backend.fieldsets import SparseFieldsetMixin
+from backend.statistics import StatisticsBuilder
 from support.models import SupportTicket
 from support.serializers.support_ticket_serializer import (
     SupportTicketSerializer,
@@ -51,7 +56,7 @@ class IsOwnerOrAdmin(permissions.BasePermission):
         return False
 
 
-class SupportTicketViewSet(viewsets.ModelViewSet):
+class SupportTicketViewSet(ConditionalRequestMixin, SparseFieldsetMixin, ExportMixin, viewsets.ModelViewSet):
     """
     ViewSet pour les tickets de support.
     
@@ -69,6 +74,7 @@ class SupportTicketViewSet(viewsets.ModelViewSet):
     - GET /api/support/support-tickets/assigned-to-me/ : Tickets assignés à moi
     - GET /api/support/support-tickets/open/ : Tickets ouverts
     - GET /api/support/support-tickets/statistics/ : Statistiques
+    - GET /api/support/support-tickets/export/{csv|jsonl|xlsx}/ : Export en flux
     """
     
     queryset = SupportTicket.objects.select_related(
@@ -81,6 +87,19 @@ class SupportTicketViewSet(viewsets.ModelViewSet):
     search_fields = ["title", "description"]
     ordering_fields = ["created_at", "updated_at", "priority"]
     ordering = ["-created_at"]
+    export_fields = [
+        "id",
+        "title",
+        "category__name",
+        "priority",
+        "status",
+        "created_by__username",
+        "assigned_to__username",
+        "created_at",
+        "resolved_at",
+        "closed_at",
+        "satisfaction_rating",
+    ]
 
     def get_serializer_class(self):
         """Utilise un serializer simplifié pour les listes."""
@@ -219,26 +238,24 @@ class SupportTicketViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
     @action(detail=False, methods=["get"], url_path="statistics")
+    @cached_response("support")
     def statistics(self, request):
         """Statistiques sur les tickets."""
-        queryset = self.get_queryset()
-        
-        stats = {
-            "total": queryset.count(),
-            "by_status": queryset.values("status")
-            .annotate(count=Count("id"))
-            .order_by("-count"),
-            "by_priority": queryset.values("priority")
-            .annotate(count=Count("id"))
-            .order_by("-count"),
-            "by_category": queryset.values("category__name")
-            .annotate(count=Count("id"))
-            .order_by("-count"),
-            "open": queryset.filter(status__in=["open", "in_progress", "waiting"]).count(),
-            "resolved": queryset.filter(status="resolved").count(),
-            "closed": queryset.filter(status="closed").count(),
-            "average_resolution_time_days": None,  # À implémenter avec calcul
-        }
+        # Une requête d'agrégation conditionnelle + un GROUP BY par catégorie
+        stats = (
+            StatisticsBuilder(self.get_queryset())
+            .count("total")
+            .count_by("by_status", "status", SupportTicket.STATUS_CHOICES, rows=True)
+            .count_by(
+                "by_priority", "priority", SupportTicket.PRIORITY_CHOICES, rows=True
+            )
+            .group_by("by_category", "category__name")
+            .count("open", Q(status__in=["open", "in_progress", "waiting"]))
+            .count("resolved", Q(status="resolved"))
+            .count("closed", Q(status="closed"))
+            .build()
+        )
+        stats["average_resolution_time_days"] = None  # À implémenter avec calcul
         
         return Response(stats)
 
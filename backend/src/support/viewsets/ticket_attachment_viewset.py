@@ -14,6 +14,8 @@ from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django.db.models import Q
 
+from backend.conditional import ConditionalRequestMixin
+from backend.fieldsets import SparseFieldsetMixin
 from support.models import TicketAttachment
 from support.serializers.ticket_attachment_serializer import (
     TicketAttachmentSerializer,
@@ -58,7 +60,7 @@ class IsOwnerOrAdmin(permissions.BasePermission):
         return False
 
 
-class TicketAttachmentViewSet(viewsets.ModelViewSet):
+class TicketAttachmentViewSet(ConditionalRequestMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet pour les pièces jointes de tickets.
     
@@ -12,7 +12,10 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
+from django.db.models import Q
 
+from backend.conditional import ConditionalRequestMixin
+from backend.fieldsets import SparseFieldsetMixin
 from support.models import TicketComment
 from support.serializers.ticket_comment_serializer import TicketCommentSerializer
 
@@ -54,7 +57,7 @@ class IsOwnerOrAdmin(permissions.BasePermission):
         return False
 
 
-class TicketCommentViewSet(viewsets.ModelViewSet):
+class TicketCommentViewSet(ConditionalRequestMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet pour les commentaires de tickets.
     
@@ -1,26 +1,118 @@
 """
 Commande de management pour remplir la base de données avec des données de test.
-Usage: python manage.py seed_database
+Usage: python manage.py seed_database [--scale 10] [--employees 100000] [--seed 42]
+
+Les volumes par défaut donnent un petit jeu de démonstration. `--scale`
+multiplie tous les volumes ; chaque volume peut aussi être fixé
+individuellement (`--employees`, `--messages`, `--activities`, ...).
+Exemple de jeu de données « production » :
+
+    python manage.py seed_database --employees 100000 --messages 1000000 \\
+        --activities 500000 --conversations 150000
+
+Les lignes sont insérées par lots (`bulk_create`) avec des clés étrangères
+pré-calculées, y compris les tables M2M (participants des conversations,
+participants des réunions, départements des annonces). Le tirage est
+déterministe pour une graine (`--seed`) et un état initial de la base donnés.
+
+`bulk_create` ne déclenche ni `save()` ni signaux : les données dérivées
+(dernier message et non-lus des conversations, compteurs du dashboard,
+hiérarchie des employés, cache des réponses) sont recalculées à la fin. Les statuts de lecture par
+message (`MessageReadStatus`) ne sont pas générés.
 """
 
-from django.core.management.base import BaseCommand
-from django.utils import timezone
-from datetime import timedelta, date
 import random
+import time
+from contextlib import contextmanager
+from datetime import timedelta, date
 from decimal import Decimal
+from itertools import islice
+
+from django.conf import settings as django_settings
+from django.contrib.auth.hashers import make_password
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Count, Max, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 from faker import Faker
 
 # Imports des modèles
+from backend.cache import invalidate
+from dashboard import counters
 from users.models import CustomUser
 from department.models import Department
-from employee.models import Employee
-from recruitment.models import JobPosition, Candidate, TalentRequest, HiringProcess
-from support.models import SupportCategory, SupportTicket, TicketComment
+from employee import hierarchy, temporal
+from employee.models import Employee, EmployeeHierarchy, EmployeeState
+from recruitment.models import JobPosition, Candidate
+from support.models import SupportCategory, SupportTicket
 from announcement.models import Announcement
 from schedule.models import Meeting, Schedule
-from messaging.models import Conversation, Message
+from messaging.models import (
+    Conversation,
+    ConversationParticipant,
+    Message,
+    MessageReadStatus,
+)
 from settings.models import SystemSettings, EmailTemplate, NotificationSettings
-from dashboard.models import Activity, DashboardMetric
+from dashboard.models import Activity
+
+# Volumes par défaut (multipliés par --scale)
+DEFAULT_COUNTS = {
+    'departments': 8,
+    'users': 20,
+    'employees': 30,
+    'job_positions': 12,
+    'candidates': 25,
+    'tickets': 30,
+    'announcements': 15,
+    'meetings': 20,
+    'schedules': 25,
+    'conversations': 15,
+    'messages': 100,
+    'activities': 50,
+}
+
+DEPARTMENTS_DATA = [
+    {'name': 'Ressources Humaines', 'code': 'RH', 'location': 'Abidjan, Plateau'},
+    {'name': 'Informatique', 'code': 'IT', 'location': 'Abidjan, Cocody'},
+    {'name': 'Finance', 'code': 'FIN', 'location': 'Abidjan, Plateau'},
+    {'name': 'Marketing', 'code': 'MKT', 'location': 'Abidjan, Marcory'},
+    {'name': 'Commercial', 'code': 'COM', 'location': 'Abidjan, Yopougon'},
+    {'name': 'Production', 'code': 'PROD', 'location': 'Abidjan, Port-Bouët'},
+    {'name': 'Qualité', 'code': 'QUAL', 'location': 'Abidjan, Cocody'},
+    {'name': 'Logistique', 'code': 'LOG', 'location': 'Abidjan, Port-Bouët'},
+]
+
+JOB_TITLES = [
+    'Développeur Full Stack', 'Développeur Frontend', 'Développeur Backend',
+    'Chef de Projet', 'Analyste Business', 'Comptable',
+    'Responsable Marketing', 'Commercial', 'Designer',
+    'DevOps Engineer', 'Data Analyst', 'RH Assistant'
+]
+
+ACTIVITY_TYPES = [code for code, _ in Activity.ACTIVITY_TYPES]
+
+# Taille des réservoirs de textes pré-générés (Faker est trop lent par ligne)
+POOL_SIZE = 500
+
+
+@contextmanager
+def explicit_timestamps(*fields):
+    """
+    Désactive temporairement `auto_now_add` / `auto_now` sur des champs,
+    pour insérer des dates étalées dans le temps.
+    """
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field, _, _ in saved:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
 
 
 class Command(BaseCommand):
@@ -32,12 +124,152 @@ class Command(BaseCommand):
             action='store_true',
             help='Vider les tables avant de les remplir',
         )
+        parser.add_argument(
+            '--scale',
+            type=float,
+            default=1.0,
+            help='Multiplicateur appliqué à tous les volumes (défaut : 1)',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=42,
+            help='Graine du générateur aléatoire (défaut : 42)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Nombre de lignes par INSERT (défaut : 5000)',
+        )
+        for name, default in DEFAULT_COUNTS.items():
+            parser.add_argument(
+                f"--{name.replace('_', '-')}",
+                type=int,
+                dest=name,
+                help=f'Nombre de lignes à créer (défaut : {default} × scale)',
+            )
 
     def handle(self, *args, **options):
-        fake = Faker('fr_FR')
-        
+        self.rng = random.Random(options['seed'])
+        self.fake = Faker('fr_FR')
+        self.fake.seed_instance(options['seed'])
+        self.batch_size = options['batch_size']
+        self.now = timezone.now()
+        self.counts = {
+            name: options[name]
+            if options[name] is not None
+            else max(1, round(default * options['scale']))
+            for name, default in DEFAULT_COUNTS.items()
+        }
+
         if options['clear']:
             self.stdout.write(self.style.WARNING('Vidage des tables...'))
+            self.clear()
+            self.stdout.write(self.style.SUCCESS('Tables vidées'))
+
+        self.stdout.write(self.style.SUCCESS('Début du remplissage de la base de données...'))
+        self.build_pools()
+
+        with transaction.atomic():
+            self.step('Configuration des paramètres système', self.seed_system_settings)
+            departments = self.step('Création des départements', self.seed_departments)
+            employees = self.step('Création des employés', self.seed_employees, departments)
+            users = self.step('Création des utilisateurs', self.seed_users, employees)
+            positions = self.step('Création des offres d\'emploi', self.seed_job_positions, departments)
+            candidates = self.step('Création des candidats', self.seed_candidates, positions)
+            self.step('Création des tickets de support', self.seed_tickets, users)
+            self.step('Création des annonces', self.seed_announcements, employees, departments)
+            self.step('Création des réunions', self.seed_meetings, employees)
+            self.step('Création des tâches planifiées', self.seed_schedules, employees)
+            self.step('Création des conversations et messages', self.seed_conversations, users)
+            self.step('Création des activités', self.seed_activities, employees, positions, candidates)
+            self.step('Création des modèles d\'email', self.seed_email_templates)
+            self.step('Création des paramètres de notifications', self.seed_notification_settings)
+
+            # bulk_create ne déclenche pas les signaux : recalcul des dérivés
+            self.step('Recalcul des compteurs du dashboard', counters.reconcile)
+            self.step('Construction de la hiérarchie des employés', hierarchy.rebuild)
+            self.step('Construction des états datés des employés', temporal.rebuild)
+        invalidate(*getattr(django_settings, 'RESPONSE_CACHE_NAMESPACES', ()))
+
+        self.stdout.write(self.style.SUCCESS('\n✅ Base de données remplie avec succès!'))
+        self.stdout.write(f'   - {Department.objects.count()} départements')
+        self.stdout.write(f'   - {CustomUser.objects.count()} utilisateurs')
+        self.stdout.write(f'   - {Employee.objects.count()} employés')
+        self.stdout.write(f'   - {JobPosition.objects.count()} offres d\'emploi')
+        self.stdout.write(f'   - {Candidate.objects.count()} candidats')
+        self.stdout.write(f'   - {SupportTicket.objects.count()} tickets de support')
+        self.stdout.write(f'   - {Announcement.objects.count()} annonces')
+        self.stdout.write(f'   - {Meeting.objects.count()} réunions')
+        self.stdout.write(f'   - {Schedule.objects.count()} tâches planifiées')
+        self.stdout.write(f'   - {Conversation.objects.count()} conversations')
+        self.stdout.write(f'   - {Message.objects.count()} messages')
+        self.stdout.write(f'   - {Activity.objects.count()} activités')
+
+    # Outils
+
+    def step(self, label, func, *args):
+        """Exécute une étape en affichant sa durée."""
+        self.stdout.write(f'{label}...')
+        start = time.perf_counter()
+        result = func(*args)
+        self.stdout.write(f'   ({time.perf_counter() - start:.1f} s)')
+        return result
+
+    def bulk_create(self, model, objects):
+        """
+        Insère des objets par lots sans matérialiser tout l'itérable.
+
+        Retourne les clés primaires créées.
+        """
+        objects = iter(objects)
+        pks = []
+        while True:
+            batch = list(islice(objects, self.batch_size))
+            if not batch:
+                return pks
+            model.objects.bulk_create(batch, batch_size=self.batch_size)
+            pks.extend(obj.pk for obj in batch)
+
+    def next_index(self, model):
+        """Premier suffixe libre pour les champs uniques générés."""
+        return (model.objects.aggregate(last=Max('pk'))['last'] or 0) + 1
+
+    def build_pools(self):
+        """Pré-génère des textes réutilisés à la place d'appels Faker par ligne."""
+        fake = self.fake
+        self.first_names = [fake.first_name() for _ in range(POOL_SIZE)]
+        self.last_names = [fake.last_name() for _ in range(POOL_SIZE)]
+        self.phones = [fake.phone_number()[:20] for _ in range(POOL_SIZE)]
+        self.sentences = [fake.sentence(nb_words=8) for _ in range(POOL_SIZE)]
+        self.short_texts = [fake.text(max_nb_chars=200) for _ in range(POOL_SIZE)]
+        self.long_texts = [fake.text(max_nb_chars=1000) for _ in range(POOL_SIZE)]
+        self.addresses = [fake.address() for _ in range(POOL_SIZE)]
+        self.cities = [fake.city() for _ in range(POOL_SIZE)]
+
+    def past(self, days):
+        """Date aléatoire dans les `days` derniers jours."""
+        return self.now - timedelta(seconds=self.rng.randint(0, days * 86400))
+
+    def clear(self):
+        """
+        Vide les tables remplies par la commande.
+
+        Les tables volumineuses de la messagerie et des activités sont vidées
+        en SQL direct : la suppression par l'ORM chargerait chaque ligne pour
+        les signaux `post_delete`. Les compteurs du dashboard sont suspendus
+        pendant la purge et recalculés une seule fois.
+        """
+        with transaction.atomic(), counters.suspended():
+            with connection.cursor() as cursor:
+                for model in (
+                    MessageReadStatus, ConversationParticipant, Message, Conversation, Activity,
+                    EmployeeHierarchy, EmployeeState,
+                ):
+                    cursor.execute(
+                        f'DELETE FROM {connection.ops.quote_name(model._meta.db_table)}'
+                    )
             # Ne pas vider les tables système critiques
             Employee.objects.all().delete()
             CustomUser.objects.filter(is_superuser=False).delete()
@@ -49,59 +281,96 @@ class Command(BaseCommand):
             Announcement.objects.all().delete()
             Meeting.objects.all().delete()
             Schedule.objects.all().delete()
-            Conversation.objects.all().delete()
-            Message.objects.all().delete()
-            Activity.objects.all().delete()
-            self.stdout.write(self.style.SUCCESS('Tables vidées'))
 
-        self.stdout.write(self.style.SUCCESS('Début du remplissage de la base de données...'))
+    # Étapes
+
+    def seed_system_settings(self):
+        # Déjà créé, on le met à jour
+        system_settings, _ = SystemSettings.objects.get_or_create(pk=1)
+        system_settings.company_name = "WeHR Côte d'Ivoire"
+        system_settings.company_email = "contact@wehr-ci.com"
+        system_settings.currency = "XOF"
+        system_settings.save()
+
+    def seed_departments(self):
+        departments_data = list(DEPARTMENTS_DATA)
+        for index in range(len(departments_data), self.counts['departments']):
+            departments_data.append({
+                'name': f'Département {index + 1}',
+                'code': f'DEP{index + 1:03d}',
+                'location': self.rng.choice(DEPARTMENTS_DATA)['location'],
+            })
 
-        # 1. SystemSettings (déjà créé, on le met à jour)
-        self.stdout.write('Configuration des paramètres système...')
-        settings, _ = SystemSettings.objects.get_or_create(pk=1)
-        settings.company_name = "WeHR Côte d'Ivoire"
-        settings.company_email = "contact@wehr-ci.com"
-        settings.currency = "XOF"
-        settings.save()
-
-        # 2. Departments
-        self.stdout.write('Création des départements...')
-        departments_data = [
-            {'name': 'Ressources Humaines', 'code': 'RH', 'location': 'Abidjan, Plateau'},
-            {'name': 'Informatique', 'code': 'IT', 'location': 'Abidjan, Cocody'},
-            {'name': 'Finance', 'code': 'FIN', 'location': 'Abidjan, Plateau'},
-            {'name': 'Marketing', 'code': 'MKT', 'location': 'Abidjan, Marcory'},
-            {'name': 'Commercial', 'code': 'COM', 'location': 'Abidjan, Yopougon'},
-            {'name': 'Production', 'code': 'PROD', 'location': 'Abidjan, Port-Bouët'},
-            {'name': 'Qualité', 'code': 'QUAL', 'location': 'Abidjan, Cocody'},
-            {'name': 'Logistique', 'code': 'LOG', 'location': 'Abidjan, Port-Bouët'},
-        ]
-        
         departments = []
-        for dept_data in departments_data:
+        for dept_data in departments_data[:self.counts['departments']]:
             dept, _ = Department.objects.get_or_create(
                 code=dept_data['code'],
                 defaults={
                     'name': dept_data['name'],
                     'location': dept_data['location'],
                     'description': f"Description du département {dept_data['name']}",
-                    'budget': Decimal(random.randint(5000000, 50000000))
+                    'budget': Decimal(self.rng.randint(5000000, 50000000))
                 }
             )
-            departments.append(dept)
+            departments.append(dept.pk)
+        return departments
+
+    def seed_employees(self, departments):
+        rng = self.rng
+        start = self.next_index(Employee)
+        today = date.today()
+
+        def build():
+            for index in range(start, start + self.counts['employees']):
+                dept = rng.choice(departments)
+                yield Employee(
+                    first_name=rng.choice(self.first_names),
+                    last_name=rng.choice(self.last_names),
+                    email=f'employee{index}@wehr-ci.com',
+                    phone=rng.choice(self.phones),
+                    date_of_birth=today - timedelta(days=rng.randint(22 * 365, 65 * 365)),
+                    gender=rng.choice(['M', 'F', 'F']),  # Plus de femmes
+                    employee_id=f'EMP{index:06d}',
+                    hire_date=today - timedelta(days=rng.randint(0, 5 * 365)),
+                    department_id=dept,
+                    position_id=dept,
+                    # Plus d'actifs
+                    status=rng.choice(['active', 'active', 'active', 'on_leave', 'inactive']),
+                    salary=Decimal(rng.randint(200000, 2000000)),  # Salaires en XOF
+                    address=rng.choice(self.addresses),
+                    city=rng.choice(self.cities),
+                    country="Côte d'Ivoire",
+                )
+
+        employees = self.bulk_create(Employee, build())
+
+        # Un manager par département, rattaché à tous les employés du département
+        for dept in departments:
+            manager = (
+                Employee.objects.filter(department_id=dept)
+                .order_by('pk').values_list('pk', flat=True).first()
+            )
+            if manager is None:
+                continue
+            Department.objects.filter(pk=dept).update(manager_id=manager)
+            Employee.objects.filter(department_id=dept).exclude(pk=manager).update(
+                manager_id=manager
+            )
+        return employees
+
+    def seed_users(self, employees):
+        rng = self.rng
+        # Un seul hachage : PBKDF2 coûte plusieurs dizaines de ms par appel
+        password = make_password('password123')
 
-        # 3. Users (Créer quelques utilisateurs de base)
-        self.stdout.write('Création des utilisateurs...')
         users_data = [
             {'username': 'admin', 'email': 'admin@wehr-ci.com', 'first_name': 'Admin', 'last_name': 'System', 'role': 'admin', 'is_staff': True, 'is_superuser': True},
             {'username': 'hr_manager', 'email': 'hr@wehr-ci.com', 'first_name': 'Marie', 'last_name': 'Kouassi', 'role': 'hr_manager'},
             {'username': 'recruiter1', 'email': 'recruiter1@wehr-ci.com', 'first_name': 'Jean', 'last_name': 'Yao', 'role': 'recruiter'},
             {'username': 'manager1', 'email': 'manager1@wehr-ci.com', 'first_name': 'Sophie', 'last_name': 'Diabaté', 'role': 'manager'},
         ]
-        
-        users = []
         for user_data in users_data:
-            user, created = CustomUser.objects.get_or_create(
+            CustomUser.objects.get_or_create(
                 username=user_data['username'],
                 defaults={
                     'email': user_data['email'],
@@ -110,126 +379,79 @@ class Command(BaseCommand):
                     'role': user_data['role'],
                     'is_staff': user_data.get('is_staff', False),
                     'is_superuser': user_data.get('is_superuser', False),
+                    'password': password,
                 }
             )
-            if created:
-                user.set_password('password123')
-                user.save()
-            users.append(user)
-
-        # Créer plus d'utilisateurs
-        for i in range(20):
-            username = f"user{i+1}"
-            # Vérifier que le username n'existe pas déjà
-            if CustomUser.objects.filter(username=username).exists():
-                continue
-                
-            email = fake.email()
-            while CustomUser.objects.filter(email=email).exists():
-                email = fake.email()
-            
-            user = CustomUser.objects.create(
-                username=username,
-                email=email,
-                first_name=fake.first_name(),
-                last_name=fake.last_name(),
-                role=random.choice(['employee', 'manager', 'recruiter']),
-                phone=fake.phone_number()[:20],
-                is_active=True,
-            )
-            user.set_password('password123')
-            user.save()
-        
-        all_users = list(CustomUser.objects.all())
-
-        # 4. Employees
-        self.stdout.write('Création des employés...')
-        employee_count = 0
-        for user in all_users[:30]:  # Limiter à 30 employés
-            if not hasattr(user, 'employee') or user.employee is None:
-                employee_id = f"EMP{str(employee_count + 1).zfill(4)}"
-                dept = random.choice(departments)
-                status = random.choice(['active', 'active', 'active', 'on_leave', 'inactive'])  # Plus d'actifs
-                
-                employee = Employee.objects.create(
-                    first_name=user.first_name,
-                    last_name=user.last_name,
-                    email=user.email if not Employee.objects.filter(email=user.email).exists() else f"{user.email}.emp",
-                    phone=fake.phone_number()[:20],
-                    date_of_birth=fake.date_of_birth(minimum_age=22, maximum_age=65),
-                    gender=random.choice(['M', 'F', 'F']),  # Plus de femmes
-                    employee_id=employee_id,
-                    hire_date=fake.date_between(start_date=date.today() - timedelta(days=5*365), end_date=date.today()),
-                    department=dept,
-                    position=dept,
-                    status=status,
-                    salary=Decimal(random.randint(200000, 2000000)),  # Salaires en XOF
-                    manager=None,  # Sera mis à jour après
+
+        # Les premiers utilisateurs sont rattachés aux nouveaux employés
+        linked = dict(
+            Employee.objects.filter(pk__in=employees[:self.counts['users']])
+            .values_list('pk', 'first_name')
+        )
+        start = self.next_index(CustomUser)
+
+        def build():
+            for offset, index in enumerate(range(start, start + self.counts['users'])):
+                employee = employees[offset] if offset < len(employees) else None
+                yield CustomUser(
+                    username=f'user{index}',
+                    email=f'user{index}@wehr-ci.com',
+                    first_name=linked.get(employee) or rng.choice(self.first_names),
+                    last_name=rng.choice(self.last_names),
+                    role=rng.choice(['employee', 'manager', 'recruiter']),
+                    phone=rng.choice(self.phones),
+                    is_active=True,
+                    password=password,
+                    employee_id=employee,
                 )
-                user.employee = employee
-                user.save()
-                employee_count += 1
 
-        # Mettre à jour les managers
-        employees = list(Employee.objects.all())
-        for dept in departments:
-            dept_employees = [e for e in employees if e.department == dept]
-            if dept_employees:
-                manager = random.choice(dept_employees)
-                dept.manager = manager
-                dept.save()
-                # Mettre à jour les employés du département
-                for emp in dept_employees:
-                    if emp != manager:
-                        emp.manager = manager
-                        emp.save()
-
-        # 5. JobPositions
-        self.stdout.write('Création des offres d\'emploi...')
-        job_titles = [
-            'Développeur Full Stack', 'Développeur Frontend', 'Développeur Backend',
-            'Chef de Projet', 'Analyste Business', 'Comptable',
-            'Responsable Marketing', 'Commercial', 'Designer',
-            'DevOps Engineer', 'Data Analyst', 'RH Assistant'
-        ]
-        
-        for title in job_titles:
-            JobPosition.objects.get_or_create(
+        self.bulk_create(CustomUser, build())
+        return list(CustomUser.objects.values_list('pk', flat=True))
+
+    def seed_job_positions(self, departments):
+        positions = []
+        for index in range(self.counts['job_positions']):
+            title = JOB_TITLES[index % len(JOB_TITLES)]
+            if index >= len(JOB_TITLES):
+                title = f'{title} ({index // len(JOB_TITLES) + 1})'
+            position, _ = JobPosition.objects.get_or_create(
                 title=title,
                 defaults={
                     'description': f"Description détaillée du poste {title}",
-                    'department': random.choice(departments),
-                    'status': random.choice(['open', 'open', 'open', 'on_hold', 'closed']),
-                    'urgency': random.choice([True, False]),
+                    'department_id': self.rng.choice(departments),
+                    'status': self.rng.choice(['open', 'open', 'open', 'on_hold', 'closed']),
+                    'urgency': self.rng.choice([True, False]),
                 }
             )
+            positions.append(position.pk)
+        return positions
 
-        # 6. Candidates
-        self.stdout.write('Création des candidats...')
-        job_positions = list(JobPosition.objects.all())
-        if job_positions:
-            for _ in range(25):
-                email = fake.email()
-                while Candidate.objects.filter(email=email).exists():
-                    email = fake.email()
-                
-                # Créer un fichier résumé factice (vide)
-                from django.core.files.base import ContentFile
-                resume_file = ContentFile(b'Fake resume content')
-                resume_file.name = f'resume_{fake.uuid4()}.pdf'
-                
-                Candidate.objects.create(
-                    first_name=fake.first_name(),
-                    last_name=fake.last_name(),
-                    email=email,
-                    phone=fake.phone_number()[:20],
-                    position=random.choice(job_positions),
-                    resume=resume_file,
-                    status=random.choice(['applied', 'reviewing', 'interview', 'offered', 'rejected', 'hired']),
+    def seed_candidates(self, positions):
+        rng = self.rng
+        # Un seul CV factice partagé par tous les candidats
+        resume = 'resumes/seed_resume.pdf'
+        if not default_storage.exists(resume):
+            resume = default_storage.save(resume, ContentFile(b'Fake resume content'))
+        start = self.next_index(Candidate)
+
+        def build():
+            for index in range(start, start + self.counts['candidates']):
+                yield Candidate(
+                    first_name=rng.choice(self.first_names),
+                    last_name=rng.choice(self.last_names),
+                    email=f'candidate{index}@example.com',
+                    phone=rng.choice(self.phones),
+                    position_id=rng.choice(positions),
+                    resume=resume,
+                    status=rng.choice(['applied', 'reviewing', 'interview', 'offered', 'rejected', 'hired']),
+                    applied_date=self.past(180),
                 )
 
-        # 7. SupportCategories
-        self.stdout.write('Création des catégories de support...')
+        with explicit_timestamps(Candidate._meta.get_field('applied_date')):
+            return self.bulk_create(Candidate, build())
+
+    def seed_tickets(self, users):
+        rng = self.rng
         categories_data = [
             {'name': 'Bug Technique', 'icon': 'bug', 'color': '#dc3545'},
             {'name': 'Question Générale', 'icon': 'question', 'color': '#007bff'},
@@ -237,120 +459,207 @@ class Command(BaseCommand):
             {'name': 'Problème de Connexion', 'icon': 'wifi', 'color': '#ffc107'},
             {'name': 'Autre', 'icon': 'info', 'color': '#6c757d'},
         ]
-        
-        categories = []
-        for cat_data in categories_data:
-            cat, _ = SupportCategory.objects.get_or_create(
-                name=cat_data['name'],
-                defaults=cat_data
-            )
-            categories.append(cat)
-
-        # 8. SupportTickets
-        self.stdout.write('Création des tickets de support...')
-        for _ in range(30):
-            SupportTicket.objects.create(
-                title=fake.sentence(nb_words=6),
-                description=fake.text(max_nb_chars=500),
-                priority=random.choice(['low', 'medium', 'high', 'urgent']),
-                status=random.choice(['open', 'in_progress', 'waiting', 'resolved', 'closed']),
-                category=random.choice(categories),
-                created_by=random.choice(all_users),
-                assigned_to=random.choice(all_users) if random.random() > 0.3 else None,
-            )
+        categories = [
+            SupportCategory.objects.get_or_create(name=cat_data['name'], defaults=cat_data)[0].pk
+            for cat_data in categories_data
+        ]
 
-        # 9. Announcements
-        self.stdout.write('Création des annonces...')
-        employees_list = list(Employee.objects.all())
-        if employees_list:
-            for _ in range(15):
-                Announcement.objects.create(
-                    title=fake.sentence(nb_words=8),
-                    content=fake.text(max_nb_chars=1000),
-                    published=random.choice([True, True, True, False]),  # Plus de publiées
-                    author=random.choice(employees_list),
-                    visible_to_all=random.choice([True, True, False]),
+        def build():
+            for _ in range(self.counts['tickets']):
+                yield SupportTicket(
+                    title=rng.choice(self.sentences),
+                    description=rng.choice(self.long_texts)[:500],
+                    priority=rng.choice(['low', 'medium', 'high', 'urgent']),
+                    status=rng.choice(['open', 'in_progress', 'waiting', 'resolved', 'closed']),
+                    category_id=rng.choice(categories),
+                    created_by_id=rng.choice(users),
+                    assigned_to_id=rng.choice(users) if rng.random() > 0.3 else None,
+                    created_at=self.past(365),
                 )
 
-        # 10. Meetings
-        self.stdout.write('Création des réunions...')
-        employees_list = list(Employee.objects.all())
-        if employees_list:
-            for _ in range(20):
-                start = timezone.now() + timedelta(days=random.randint(-7, 30))
-                Meeting.objects.create(
-                    title=fake.sentence(nb_words=5),
-                    description=fake.text(max_nb_chars=300),
+        with explicit_timestamps(SupportTicket._meta.get_field('created_at')):
+            self.bulk_create(SupportTicket, build())
+
+    def seed_announcements(self, employees, departments):
+        rng = self.rng
+        if not employees:
+            return
+        visibility = []
+
+        def build():
+            for _ in range(self.counts['announcements']):
+                visible_to_all = rng.choice([True, True, False])
+                visibility.append(visible_to_all)
+                yield Announcement(
+                    title=rng.choice(self.sentences),
+                    content=rng.choice(self.long_texts),
+                    published=rng.choice([True, True, True, False]),  # Plus de publiées
+                    author_id=rng.choice(employees),
+                    visible_to_all=visible_to_all,
+                    published_date=self.past(180),
+                )
+
+        with explicit_timestamps(Announcement._meta.get_field('published_date')):
+            announcements = self.bulk_create(Announcement, build())
+
+        # Départements ciblés des annonces restreintes (table M2M)
+        Through = Announcement.departments.through
+        self.bulk_create(Through, (
+            Through(announcement_id=announcement, department_id=department)
+            for announcement, visible_to_all in zip(announcements, visibility)
+            if not visible_to_all
+            for department in rng.sample(departments, k=min(rng.randint(1, 3), len(departments)))
+        ))
+
+    def seed_meetings(self, employees):
+        rng = self.rng
+        if not employees:
+            return
+
+        def build():
+            for _ in range(self.counts['meetings']):
+                start = self.now + timedelta(minutes=rng.randint(-7 * 1440, 30 * 1440))
+                yield Meeting(
+                    title=rng.choice(self.sentences),
+                    description=rng.choice(self.short_texts),
                     start_time=start,
-                    end_time=start + timedelta(hours=random.randint(1, 3)),
-                    location=fake.address(),
-                    organizer=random.choice(employees_list),
+                    end_time=start + timedelta(hours=rng.randint(1, 3)),
+                    location=rng.choice(self.addresses)[:255],
+                    organizer_id=rng.choice(employees),
+                )
+
+        meetings = self.bulk_create(Meeting, build())
+
+        # Participants des réunions (table M2M)
+        Through = Meeting.attendees.through
+        self.bulk_create(Through, (
+            Through(meeting_id=meeting, employee_id=employee)
+            for meeting in meetings
+            for employee in rng.sample(employees, k=min(rng.randint(2, 6), len(employees)))
+        ))
+
+    def seed_schedules(self, employees):
+        rng = self.rng
+        if not employees:
+            return
+
+        def build():
+            for _ in range(self.counts['schedules']):
+                yield Schedule(
+                    title=rng.choice(self.sentences),
+                    description=rng.choice(self.short_texts),
+                    scheduled_date=self.now + timedelta(minutes=rng.randint(-14 * 1440, 60 * 1440)),
+                    priority=rng.choice(['high', 'medium', 'low']),
+                    # Plus de non complétées
+                    completed=rng.choice([True, False, False, False]),
+                    assigned_to_id=rng.choice(employees),
+                    assigned_by_id=rng.choice(employees) if rng.random() > 0.2 else None,
                 )
 
-        # 11. Schedules
-        self.stdout.write('Création des tâches planifiées...')
-        employees_list = list(Employee.objects.all())
-        if employees_list:
-            for _ in range(25):
-                scheduled = timezone.now() + timedelta(days=random.randint(-14, 60))
-                Schedule.objects.create(
-                    title=fake.sentence(nb_words=6),
-                    description=fake.text(max_nb_chars=400),
-                    scheduled_date=scheduled,
-                    priority=random.choice(['high', 'medium', 'low']),
-                    completed=random.choice([True, False, False, False]),  # Plus de non complétées
-                    assigned_to=random.choice(employees_list),
-                    assigned_by=random.choice(employees_list) if random.random() > 0.2 else None,
+        self.bulk_create(Schedule, build())
+
+    def seed_conversations(self, users):
+        rng = self.rng
+        if len(users) < 2:
+            return
+        participants = []
+
+        def build_conversations():
+            for _ in range(self.counts['conversations']):
+                members = rng.sample(users, k=min(rng.randint(2, 5), len(users)))
+                participants.append(members)
+                is_direct = len(members) == 2
+                yield Conversation(
+                    conversation_type='direct' if is_direct else 'group',
+                    subject=None if is_direct else rng.choice(self.sentences)[:255],
+                    created_by_id=members[0],
                 )
 
-        # 12. Conversations et Messages
-        self.stdout.write('Création des conversations et messages...')
-        for _ in range(15):
-            participants = random.sample(all_users, k=min(random.randint(2, 5), len(all_users)))
-            creator = participants[0]
-            is_direct = len(participants) == 2
-            conversation = Conversation.objects.create(
-                conversation_type='direct' if is_direct else 'group',
-                subject=fake.sentence(nb_words=4) if not is_direct else None,
-                created_by=creator,
-            )
-            conversation.participants.set(participants)
-            
-            # Créer quelques messages
-            for _ in range(random.randint(3, 10)):
-                sender = random.choice(participants)
+        conversations = self.bulk_create(Conversation, build_conversations())
+
+        # Participants (table intermédiaire ConversationParticipant)
+        self.bulk_create(ConversationParticipant, (
+            ConversationParticipant(conversation_id=conversation, user_id=user)
+            for conversation, members in zip(conversations, participants)
+            for user in members
+        ))
+
+        # Dates croissantes : l'ordre des clés suit l'ordre chronologique,
+        # comme pour des messages envoyés un à un
+        step = timedelta(days=180) / self.counts['messages']
+
+        def build_messages():
+            for index in range(self.counts['messages']):
+                position = rng.randrange(len(conversations))
+                members = participants[position]
+                sender = rng.choice(members)
                 # Pour les messages directs, il faut un destinataire
-                if is_direct:
-                    recipient = [p for p in participants if p != sender][0]
-                else:
-                    recipient = None
-                
-                Message.objects.create(
-                    conversation=conversation,
-                    sender=sender,
-                    recipient=recipient,
-                    content=fake.text(max_nb_chars=200),
+                recipient = None
+                if len(members) == 2:
+                    recipient = members[1] if sender == members[0] else members[0]
+                created_at = self.now - timedelta(days=180) + index * step
+                is_read = rng.random() < 0.8
+                yield Message(
+                    conversation_id=conversations[position],
+                    sender_id=sender,
+                    recipient_id=recipient,
+                    content=rng.choice(self.short_texts),
+                    is_read=is_read,
+                    read_at=created_at if is_read else None,
+                    created_at=created_at,
                 )
 
-        # 13. Activities
-        self.stdout.write('Création des activités...')
-        employees_list = list(Employee.objects.all())
-        job_positions = list(JobPosition.objects.all())
-        candidates = list(Candidate.objects.all())
-        if employees_list:
-            activity_types = ['job_posted', 'candidate_applied', 'employee_added', 'announcement_posted', 'schedule_created', 'meeting_scheduled']
-            for _ in range(50):
-                Activity.objects.create(
-                    user=random.choice(employees_list),
-                    activity_type=random.choice(activity_types),
-                    description=fake.sentence(nb_words=8),
-                    related_position=random.choice(job_positions) if job_positions and random.random() > 0.5 else None,
-                    related_candidate=random.choice(candidates) if candidates and random.random() > 0.7 else None,
-                    related_employee=random.choice(employees_list) if random.random() > 0.7 else None,
+        with explicit_timestamps(Message._meta.get_field('created_at')):
+            self.bulk_create(Message, build_messages())
+
+        # Données dénormalisées (voir Message.save / Conversation.register_message)
+        messages = Message.objects.filter(is_deleted=False).order_by('-created_at', '-pk')
+        last_message = messages.filter(conversation=OuterRef('pk'))
+        Conversation.objects.filter(pk__in=conversations).update(
+            last_message=Subquery(last_message.values('pk')[:1]),
+            last_message_at=Subquery(last_message.values('created_at')[:1]),
+        )
+        # Chaque participant a lu la conversation jusqu'à une semaine avant
+        # aujourd'hui ; les messages plus récents restent non lus
+        memberships = ConversationParticipant.objects.filter(conversation_id__in=conversations)
+        memberships.update(last_read_message=Subquery(
+            messages.filter(
+                conversation=OuterRef('conversation_id'),
+                created_at__lt=self.now - timedelta(days=7),
+            ).values('pk')[:1]
+        ))
+        # Même règle que ConversationParticipant.compute_unread_count
+        unread = Message.objects.filter(
+            Q(recipient__isnull=True) | ~Q(recipient_id=OuterRef('user_id')) | Q(is_read=False),
+            conversation_id=OuterRef('conversation_id'),
+            pk__gt=Coalesce(OuterRef('last_read_message_id'), 0),
+            is_deleted=False,
+        ).exclude(sender_id=OuterRef('user_id')).order_by().values('conversation_id')
+        memberships.update(unread_count=Coalesce(
+            Subquery(unread.annotate(total=Count('pk')).values('total')[:1]), 0
+        ))
+
+    def seed_activities(self, employees, positions, candidates):
+        rng = self.rng
+        if not employees:
+            return
+
+        def build():
+            for _ in range(self.counts['activities']):
+                yield Activity(
+                    user_id=rng.choice(employees),
+                    activity_type=rng.choice(ACTIVITY_TYPES),
+                    description=rng.choice(self.sentences),
+                    related_position_id=rng.choice(positions) if positions and rng.random() > 0.5 else None,
+                    related_candidate_id=rng.choice(candidates) if candidates and rng.random() > 0.7 else None,
+                    related_employee_id=rng.choice(employees) if rng.random() > 0.7 else None,
+                    created_at=self.past(365),
                 )
 
-        # 14. EmailTemplates
-        self.stdout.write('Création des modèles d\'email...')
+        with explicit_timestamps(Activity._meta.get_field('created_at')):
+            self.bulk_create(Activity, build())
+
+    def seed_email_templates(self):
         templates_data = [
             {'name': 'Bienvenue', 'template_type': 'welcome', 'subject': 'Bienvenue dans WeHR', 'body_html': '<p>Bienvenue {{user_name}}!</p>'},
             {'name': 'Réinitialisation mot de passe', 'template_type': 'password_reset', 'subject': 'Réinitialisation de votre mot de passe', 'body_html': '<p>Cliquez sur ce lien pour réinitialiser votre mot de passe.</p>'},
@@ -361,8 +670,7 @@ class Command(BaseCommand):
                 defaults=template_data
             )
 
-        # 15. NotificationSettings
-        self.stdout.write('Création des paramètres de notifications...')
+    def seed_notification_settings(self):
         notification_types = [
             'user_registration', 'password_reset', 'employee_created',
             'employee_updated', 'announcement_published', 'ticket_created',
@@ -373,18 +681,3 @@ class Command(BaseCommand):
                 notification_type=notif_type,
                 defaults={'enabled': True, 'send_email': True, 'send_sms': False, 'send_push': True}
             )
-
-        self.stdout.write(self.style.SUCCESS('\n✅ Base de données remplie avec succès!'))
-        self.stdout.write(f'   - {Department.objects.count()} départements')
-        self.stdout.write(f'   - {CustomUser.objects.count()} utilisateurs')
-        self.stdout.write(f'   - {Employee.objects.count()} employés')
-        self.stdout.write(f'   - {JobPosition.objects.count()} offres d\'emploi')
-        self.stdout.write(f'   - {Candidate.objects.count()} candidats')
-        self.stdout.write(f'   - {SupportTicket.objects.count()} tickets de support')
-        self.stdout.write(f'   - {Announcement.objects.count()} annonces')
-        self.stdout.write(f'   - {Meeting.objects.count()} réunions')
-        self.stdout.write(f'   - {Schedule.objects.count()} tâches planifiées')
-        self.stdout.write(f'   - {Conversation.objects.count()} conversations')
-        self.stdout.write(f'   - {Message.objects.count()} messages')
-        self.stdout.write(f'   - {Activity.objects.count()} activités')
-
@@ -0,0 +1,53 @@
+"""
+Signaux Django pour l'application users.
+
+Pousse les nouvelles notifications à leur destinataire sur le flux temps
+réel (`backend.events`), ce qui évite d'interroger `unread-count/`.
+
+Retire du cache d'authentification (`backend.authentication`) un utilisateur
+sauvegardé (y compris désactivé) ou supprimé, ainsi que l'utilisateur lié à
+un employé sauvegardé ou supprimé.
+"""
+
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from backend import events
+from backend.authentication import invalidate_users
+from employee.models import Employee
+from users.models import CustomUser, UserNotification
+
+
+@receiver(post_save, sender=UserNotification)
+def publish_notification(sender, instance, created, **kwargs):
+    """Pousse une nouvelle notification à son destinataire."""
+    if not created:
+        return
+    events.publish(
+        "notification.created",
+        {
+            "id": instance.id,
+            "title": instance.title,
+            "message": instance.message,
+            "notification_type": instance.notification_type,
+            "related_link": instance.related_link,
+            "created_at": instance.created_at,
+        },
+        users=[instance.user_id],
+    )
+
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def invalidate_cached_user(sender, instance, **kwargs):
+    """Retire l'utilisateur du cache d'authentification."""
+    invalidate_users(instance.pk)
+
+
+@receiver(post_save, sender=Employee)
+@receiver(pre_delete, sender=Employee)
+def invalidate_cached_employee_user(sender, instance, **kwargs):
+    """Retire du cache l'utilisateur lié à l'employé (avant le SET_NULL)."""
+    invalidate_users(
+        *CustomUser.objects.filter(employee_id=instance.pk).values_list("pk", flat=True)
+    )
@@ -157,3 +157,55 @@ class CustomUserAPITest(APITestCase):
         response = self.client.post('/api/users/custom-users/', data)
         # Peut être 403 ou 201 selon les permissions configurées
         self.assertIn(response.status_code, [status.HTTP_201_CREATED, status.HTTP_403_FORBIDDEN])
+
+
+class SeedDatabaseCommandTest(TestCase):
+    """Tests pour la commande seed_database."""
+
+    def setUp(self):
+        import shutil
+        import tempfile
+        from django.test import override_settings
+
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def _seed(self, *args):
+        from io import StringIO
+        from django.core.management import call_command
+
+        call_command('seed_database', *args, stdout=StringIO())
+
+    def test_seed_volumes_and_denormalized_data(self):
+        """Les volumes demandés sont créés et les données dérivées sont cohérentes."""
+        from dashboard.models import Activity, DashboardMetric
+        from employee.models import Employee
+        from messaging.models import Conversation, ConversationParticipant, Message
+        from schedule.models import Meeting
+
+        self._seed('--employees', '40', '--conversations', '10', '--messages', '120',
+                   '--activities', '30', '--meetings', '5')
+
+        self.assertEqual(Employee.objects.count(), 40)
+        self.assertEqual(Message.objects.count(), 120)
+        self.assertEqual(Activity.objects.count(), 30)
+        self.assertTrue(Meeting.attendees.through.objects.exists())
+        self.assertEqual(
+            DashboardMetric.objects.get(metric_type='total_employees').value, 40
+        )
+        self.assertFalse(Conversation.objects.filter(last_message__isnull=True).exists())
+        for membership in ConversationParticipant.objects.all():
+            self.assertEqual(membership.unread_count, membership.compute_unread_count())
+
+    def test_seed_is_deterministic(self):
+        """Une même graine produit les mêmes données."""
+        from employee.models import Employee
+
+        self._seed('--scale', '0.5', '--seed', '7')
+        first = list(Employee.objects.order_by('pk').values_list('last_name', 'salary'))
+        self._seed('--clear', '--scale', '0.5', '--seed', '7')
+        second = list(Employee.objects.order_by('pk').values_list('last_name', 'salary'))
+        self.assertEqual(first, second)
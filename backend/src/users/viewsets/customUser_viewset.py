@@ -12,10 +12,14 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
-from django.db.models import Count, Q
+from django.db.models import Q
 from django.contrib.auth import update_session_auth_hash
 from django.utils import timezone
 
+from backend.cache import cached_response
+from backend.conditional import ConditionalRequestMixin
+from backend.fieldsets import SparseFieldsetMixin
+from backend.statistics import StatisticsBuilder
 from users.models import CustomUser
 from users.serializers.customUser_serializer import (
     CustomUserSerializer,
@@ -53,7 +57,7 @@ class IsAdminOrSelf(permissions.BasePermission):
         return obj == request.user
 
 
-class CustomUserViewSet(viewsets.ModelViewSet):
+class CustomUserViewSet(ConditionalRequestMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet pour les utilisateurs.
 
@@ -161,6 +165,7 @@ class CustomUserViewSet(viewsets.ModelViewSet):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     @action(detail=False, methods=["get"], url_path="statistics")
+    @cached_response("users")
     def statistics(self, request):
         """
         Action personnalisée : Statistiques globales sur les utilisateurs.
@@ -168,18 +173,18 @@ class CustomUserViewSet(viewsets.ModelViewSet):
         """
         queryset = self.get_queryset()
 
-        stats = {
-            "total_users": queryset.count(),
-            "active_users": queryset.filter(is_active=True).count(),
-            "inactive_users": queryset.filter(is_active=False).count(),
-            "staff_users": queryset.filter(is_staff=True).count(),
-            "by_role": queryset.values("role")
-            .annotate(count=Count("id"))
-            .order_by("-count"),
-            "recent_users": queryset.order_by("-created_at")[:10].values(
-                "id", "username", "email", "role", "created_at"
-            ),
-        }
+        stats = (
+            StatisticsBuilder(queryset)
+            .count("total_users")
+            .count("active_users", Q(is_active=True))
+            .count("inactive_users", Q(is_active=False))
+            .count("staff_users", Q(is_staff=True))
+            .group_by("by_role", "role")
+            .build()
+        )
+        stats["recent_users"] = queryset.order_by("-created_at")[:10].values(
+            "id", "username", "email", "role", "created_at"
+        )
 
         return Response(stats)
 
@@ -14,6 +14,10 @@ from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django.db.models import Count
 
+from backend.cache import cached_response
+from backend.conditional import ConditionalRequestMixin
+from backend.export import ExportMixin
+from backend.fieldsets import SparseFieldsetMixin
 from users.models import UserActivity
 from users.serializers.userActivity_serializer import UserActivitySerializer
 
@@ -39,7 +43,7 @@ class IsOwnerOrAdmin(permissions.BasePermission):
         return obj.user == request.user
 
 
-class UserActivityViewSet(viewsets.ReadOnlyModelViewSet):
+class UserActivityViewSet(ConditionalRequestMixin, SparseFieldsetMixin, ExportMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet pour les activités utilisateur (lecture seule - audit trail).
 
@@ -50,6 +54,7 @@ class UserActivityViewSet(viewsets.ReadOnlyModelViewSet):
     - GET /api/users/user-activities/by-module/{module}/ : Activités par module
     - GET /api/users/user-activities/recent/ : Activités récentes
     - GET /api/users/user-activities/statistics/ : Statistiques des activités
+    - GET /api/users/user-activities/export/{csv|jsonl|xlsx}/ : Export en flux
     """
 
     queryset = UserActivity.objects.select_related("user").all()
@@ -60,6 +65,15 @@ class UserActivityViewSet(viewsets.ReadOnlyModelViewSet):
     search_fields = ["action", "module"]
     ordering_fields = ["timestamp"]
     ordering = ["-timestamp"]
+    export_fields = [
+        "id",
+        "user__username",
+        "action",
+        "module",
+        "ip_address",
+        "user_agent",
+        "timestamp",
+    ]
 
     def get_queryset(self):
         """Filtre le queryset selon les permissions."""
@@ -127,13 +141,14 @@ class UserActivityViewSet(viewsets.ReadOnlyModelViewSet):
         Action personnalisée : Récupérer les activités récentes.
         GET /api/users/user-activities/recent/
         """
-        limit = int(request.query_params.get("limit", 10))
+        limit = min(int(request.query_params.get("limit", 10)), 200)
         activities = self.get_queryset()[:limit]
 
         serializer = self.get_serializer(activities, many=True)
         return Response(serializer.data)
 
     @action(detail=False, methods=["get"], url_path="statistics")
+    @cached_response("users")
     def statistics(self, request):
         """
         Action personnalisée : Statistiques sur les activités.
@@ -13,8 +13,12 @@ from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django.utils import timezone
-from django.db.models import Count, Q
+from django.db.models import Q
 
+from backend.cache import cached_response, invalidate_on_commit
+from backend.conditional import ConditionalRequestMixin
+from backend.fieldsets import SparseFieldsetMixin
+from backend.statistics import StatisticsBuilder
 from users.models import UserNotification
 from users.serializers.userNotification_serializer import (
     UserNotificationSerializer,
@@ -43,7 +47,7 @@ class IsOwnerOrAdmin(permissions.BasePermission):
         return obj.user == request.user
 
 
-class UserNotificationViewSet(viewsets.ModelViewSet):
+class UserNotificationViewSet(ConditionalRequestMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet pour les notifications utilisateur.
 
@@ -134,6 +138,8 @@ class UserNotificationViewSet(viewsets.ModelViewSet):
         """
         queryset = self.get_queryset().filter(is_read=False)
         count = queryset.update(is_read=True, read_at=timezone.now())
+        # update() ne déclenche pas les signaux d'invalidation
+        invalidate_on_commit("users")
 
         return Response(
             {
@@ -170,21 +176,21 @@ class UserNotificationViewSet(viewsets.ModelViewSet):
         return Response({"count": count})
 
     @action(detail=False, methods=["get"], url_path="statistics")
+    @cached_response("users")
     def statistics(self, request):
         """
         Action personnalisée : Statistiques sur les notifications.
         GET /api/users/user-notifications/statistics/
         """
-        queryset = self.get_queryset()
-
-        stats = {
-            "total": queryset.count(),
-            "unread": queryset.filter(is_read=False).count(),
-            "read": queryset.filter(is_read=True).count(),
-            "by_type": queryset.values("notification_type")
-            .annotate(count=Count("id"))
-            .order_by("-count"),
-            "recent": queryset.order_by("-created_at")[:10].count(),
-        }
+        stats = (
+            StatisticsBuilder(self.get_queryset())
+            .count("total")
+            .count("unread", Q(is_read=False))
+            .count("read", Q(is_read=True))
+            .group_by("by_type", "notification_type")
+            .build()
+        )
+        # Les 10 plus récentes : déductible du total sans requête supplémentaire
+        stats["recent"] = min(stats["total"], 10)
 
         return Response(stats)
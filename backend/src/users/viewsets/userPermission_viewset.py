@@ -12,13 +12,17 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
-from django.db.models import Count
+from django.db.models import Q
 
+from backend.cache import cached_response
+from backend.conditional import ConditionalRequestMixin
+from backend.fieldsets import SparseFieldsetMixin
+from backend.statistics import StatisticsBuilder
 from users.models import UserPermission
 from users.serializers.userPermission_serializer import UserPermissionSerializer
 
 
-class UserPermissionViewSet(viewsets.ModelViewSet):
+class UserPermissionViewSet(ConditionalRequestMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet pour les permissions utilisateur.
 
@@ -90,23 +94,20 @@ class UserPermissionViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
     @action(detail=False, methods=["get"], url_path="statistics")
+    @cached_response("users")
     def statistics(self, request):
         """
         Action personnalisée : Statistiques sur les permissions.
         GET /api/users/user-permissions/statistics/
         """
-        queryset = self.get_queryset()
-
-        stats = {
-            "total": queryset.count(),
-            "granted": queryset.filter(granted=True).count(),
-            "revoked": queryset.filter(granted=False).count(),
-            "by_module": queryset.values("module")
-            .annotate(count=Count("id"))
-            .order_by("-count"),
-            "by_action": queryset.values("action")
-            .annotate(count=Count("id"))
-            .order_by("-count"),
-        }
+        stats = (
+            StatisticsBuilder(self.get_queryset())
+            .count("total")
+            .count("granted", Q(granted=True))
+            .count("revoked", Q(granted=False))
+            .group_by("by_module", "module")
+            .group_by("by_action", "action")
+            .build()
+        )
 
         return Response(stats)
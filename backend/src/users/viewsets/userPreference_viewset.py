@@ -13,6 +13,8 @@ from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 
+from backend.conditional import ConditionalRequestMixin
+from backend.fieldsets import SparseFieldsetMixin
 from users.models import UserPreference
 from users.serializers.userPreference_serializer import UserPreferenceSerializer
 
@@ -38,7 +40,7 @@ class IsOwnerOrAdmin(permissions.BasePermission):
         return obj.user == request.user
 
 
-class UserPreferenceViewSet(viewsets.ModelViewSet):
+class UserPreferenceViewSet(ConditionalRequestMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet pour les préférences utilisateur.
 
@@ -14,11 +14,14 @@ from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django.db.models import Count
 
+from backend.cache import cached_response
+from backend.conditional import ConditionalRequestMixin
+from backend.fieldsets import SparseFieldsetMixin
 from users.models import UserRole
 from users.serializers.userRole_serializer import UserRoleSerializer
 
 
-class UserRoleViewSet(viewsets.ModelViewSet):
+class UserRoleViewSet(ConditionalRequestMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet pour les rôles utilisateur.
 
@@ -102,23 +105,27 @@ class UserRoleViewSet(viewsets.ModelViewSet):
         return Response({"message": message, "role": serializer.data})
 
     @action(detail=False, methods=["get"], url_path="statistics")
+    @cached_response("users")
     def statistics(self, request):
         """
         Action personnalisée : Statistiques sur les rôles.
         GET /api/users/user-roles/statistics/
         """
-        queryset = self.get_queryset()
+        # Le nombre de permissions est annoté : une seule requête pour tous les rôles
+        roles = list(
+            self.get_queryset().annotate(permissions_total=Count("permissions"))
+        )
 
         stats = {
-            "total_roles": queryset.count(),
+            "total_roles": len(roles),
             "roles": [
                 {
                     "id": role.id,
                     "name": role.name,
                     "code": role.code,
-                    "permissions_count": role.permissions.count(),
+                    "permissions_count": role.permissions_total,
                 }
-                for role in queryset
+                for role in roles
             ],
         }
 
@@ -1,6 +1,7 @@
 import { Injectable, inject } from '@angular/core';
 import { HttpClient, HttpHeaders, HttpParams } from '@angular/common/http';
-import { Observable } from 'rxjs';
+import { EMPTY, Observable } from 'rxjs';
+import { expand, reduce } from 'rxjs/operators';
 import { environment } from '../../../environments/environment';
 
 @Injectable({
@@ -43,6 +44,26 @@ export class ApiService {
     });
   }
 
+  /**
+   * GET sur un endpoint de liste : renvoie tous les éléments, en suivant les
+   * liens `next` de la pagination par curseur (ou un simple tableau).
+   */
+  getList<T>(endpoint: string, params?: any): Observable<T[]> {
+    type Page = { results: T[]; next?: string | null } | T[];
+    return this.get<Page>(endpoint, params).pipe(
+      expand(response =>
+        Array.isArray(response) || !response?.next
+          ? EMPTY
+          : this.http.get<Page>(response.next, { headers: this.getHeaders() })
+      ),
+      reduce(
+        (items: T[], response: Page) =>
+          items.concat(Array.isArray(response) ? response : response?.results || []),
+        []
+      )
+    );
+  }
+
   post<T>(endpoint: string, data: any, skipAuth: boolean = false): Observable<T> {
     // Ne pas ajouter le token pour les endpoints d'authentification publics
     const isAuthEndpoint = endpoint.includes('/login/login/') || 
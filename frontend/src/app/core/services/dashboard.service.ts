@@ -35,11 +35,11 @@ export class DashboardService {
   }
 
   getRecentActivities(limit: number = 10): Observable<Activity[]> {
-    return this.api.get<Activity[]>('dashboard/activities/recent/', { limit });
+    return this.api.getList<Activity>('dashboard/activities/recent/', { limit });
   }
 
   getUpcomingSchedules(params?: { limit?: number; start_date?: string }): Observable<Schedule[]> {
-    return this.api.get<Schedule[]>('schedule/tasks/upcoming/', params);
+    return this.api.getList<Schedule>('schedule/tasks/upcoming/', params);
   }
 
   getNotifications(params?: { unread?: boolean; limit?: number }): Observable<{ results: Notification[]; count: number }> {
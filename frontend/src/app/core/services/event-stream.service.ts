@@ -0,0 +1,71 @@
+import { Injectable, inject, PLATFORM_ID } from '@angular/core';
+import { isPlatformBrowser } from '@angular/common';
+import { Observable, filter, map, share } from 'rxjs';
+import { AuthService } from './auth.service';
+import { environment } from '../../../environments/environment';
+
+export interface ServerEvent<T = any> {
+  type: string;
+  data: T;
+}
+
+/**
+ * Flux d'événements temps réel (Server-Sent Events) du backend.
+ *
+ * Remplace l'interrogation périodique des compteurs de non-lus :
+ * `message.created`, `notification.created`, `activity.created`.
+ * Une seule connexion est ouverte tant qu'il reste des abonnés.
+ */
+@Injectable({
+  providedIn: 'root'
+})
+export class EventStreamService {
+  private auth = inject(AuthService);
+  private platformId = inject(PLATFORM_ID);
+  private baseUrl = environment.apiUrl || 'http://localhost:8000/api';
+
+  private static readonly EVENT_TYPES = [
+    'message.created',
+    'notification.created',
+    'activity.created',
+  ];
+
+  private events$ = new Observable<ServerEvent>(subscriber => {
+    if (!isPlatformBrowser(this.platformId)) {
+      return;
+    }
+    let source: EventSource | null = null;
+    let closed = false;
+
+    const connect = () => {
+      const token = localStorage.getItem('access_token');
+      if (!token || closed) {
+        return;
+      }
+      source = new EventSource(`${this.baseUrl}/events/?token=${encodeURIComponent(token)}`);
+      EventStreamService.EVENT_TYPES.forEach(type =>
+        source!.addEventListener(type, (event: MessageEvent) =>
+          subscriber.next({ type, data: JSON.parse(event.data) })
+        )
+      );
+      // Jeton expiré : le rafraîchir puis se reconnecter
+      source.addEventListener('token.expired', () => {
+        source?.close();
+        this.auth.refreshToken().subscribe({ next: connect, error: () => source?.close() });
+      });
+    };
+
+    connect();
+    return () => {
+      closed = true;
+      source?.close();
+    };
+  }).pipe(share());
+
+  on<T = any>(type: string): Observable<T> {
+    return this.events$.pipe(
+      filter(event => event.type === type),
+      map(event => event.data as T)
+    );
+  }
+}
@@ -96,7 +96,7 @@ export class SettingsService {
   }
 
   getEmailTemplatesByType(templateType: string): Observable<EmailTemplate[]> {
-    return this.api.get<EmailTemplate[]>(`settings/email-templates/by-type/${templateType}/`);
+    return this.api.getList<EmailTemplate>(`settings/email-templates/by-type/${templateType}/`);
   }
 
   // Notification Settings
@@ -121,7 +121,7 @@ export class SettingsService {
   }
 
   getActiveNotificationSettings(): Observable<NotificationSettings[]> {
-    return this.api.get<NotificationSettings[]>('settings/notification-settings/active/');
+    return this.api.getList<NotificationSettings>('settings/notification-settings/active/');
   }
 
   getNotificationSettingsStatistics(): Observable<any> {
@@ -84,15 +84,15 @@ export class SupportService {
   }
 
   getMyTickets(): Observable<SupportTicket[]> {
-    return this.api.get<SupportTicket[]>('support/support-tickets/my-tickets/');
+    return this.api.getList<SupportTicket>('support/support-tickets/my-tickets/');
   }
 
   getAssignedToMe(): Observable<SupportTicket[]> {
-    return this.api.get<SupportTicket[]>('support/support-tickets/assigned-to-me/');
+    return this.api.getList<SupportTicket>('support/support-tickets/assigned-to-me/');
   }
 
   getOpenTickets(): Observable<SupportTicket[]> {
-    return this.api.get<SupportTicket[]>('support/support-tickets/open/');
+    return this.api.getList<SupportTicket>('support/support-tickets/open/');
   }
 
   getTicketStatistics(): Observable<any> {
@@ -37,11 +37,11 @@ export class DepartmentService {
   }
 
   getDepartmentEmployees(id: number): Observable<any[]> {
-    return this.api.get<any[]>(`department/departments/${id}/employees/`);
+    return this.api.getList<any>(`department/departments/${id}/employees/`);
   }
 
   getDepartmentJobPositions(id: number): Observable<any[]> {
-    return this.api.get<any[]>(`department/departments/${id}/job-positions/`);
+    return this.api.getList<any>(`department/departments/${id}/job-positions/`);
   }
 
   getDepartmentStatistics(id: number): Observable<DepartmentStatistics> {
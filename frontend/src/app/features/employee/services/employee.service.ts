@@ -117,7 +117,7 @@ export class EmployeeService {
    * Récupère les subordonnés d'un employé
    */
   getSubordinates(employeeId: number): Observable<Employee[]> {
-    return this.api.get<Employee[]>(`employee/employees/${employeeId}/subordinates/`);
+    return this.api.getList<Employee>(`employee/employees/${employeeId}/subordinates/`);
   }
 
   /**
@@ -131,7 +131,7 @@ export class EmployeeService {
    * Récupère l'historique d'un employé
    */
   getEmployeeHistory(employeeId: number): Observable<any[]> {
-    return this.api.get<any[]>(`employee/history/?employee=${employeeId}`);
+    return this.api.getList<any>(`employee/history/?employee=${employeeId}`);
   }
 
   /**